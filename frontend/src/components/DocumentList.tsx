@@ -56,14 +56,17 @@ export function DocumentList({ refreshKey }: DocumentListProps) {
   const [details, setDetails] = useState<Record<string, DocumentDetail>>({});
   const [detailLoading, setDetailLoading] = useState<string | null>(null);
   const [urlLoading, setUrlLoading] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const load = async () => {
     setLoading(true);
     setError(null);
     try {
-      const data = await getDocuments();
-      setDocs(data);
-      saveCache(data);
+      const page = await getDocuments();
+      setDocs(page.items);
+      setNextCursor(page.nextCursor);
+      saveCache(page.items);
     } catch (e) {
       setError(e instanceof Error ? e.message : String(e));
     } finally {
@@ -71,6 +74,20 @@ export function DocumentList({ refreshKey }: DocumentListProps) {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await getDocuments(nextCursor);
+      setDocs((prev) => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch {
+      // 失敗時はボタンを残して再試行できるようにする
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     load();
   }, [refreshKey]);
@@ -425,6 +442,18 @@ export function DocumentList({ refreshKey }: DocumentListProps) {
           </li>
         );
       })}
+      {nextCursor && (
+        <li className="px-5 py-3 text-center">
+          <button
+            type="button"
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="text-xs px-3 py-1.5 rounded-lg bg-white border border-gray-200 text-gray-600 hover:bg-gray-50 hover:text-blue-600 hover:border-blue-200 transition-all disabled:opacity-40"
+          >
+            {loadingMore ? "読み込み中..." : "さらに表示"}
+          </button>
+        </li>
+      )}
     </ul>
   );
 }
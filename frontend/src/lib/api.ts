@@ -170,7 +170,23 @@ export async function uploadDocument(
   return handleResponse<{ id: string; status: string }>(res, "POST", "/api/documents/upload");
 }
 
-export const getDocuments = () => get<DocumentRecord[]>("/api/documents");
+export interface DocumentPage {
+  items: DocumentRecord[];
+  /** 次ページのカーソル（最終ページは null） */
+  nextCursor: string | null;
+}
+
+/** ドキュメント一覧を1ページ取得する（新しい順。cursor は前ページの nextCursor） */
+export async function getDocuments(cursor?: string): Promise<DocumentPage> {
+  const path = cursor
+    ? `/api/documents?cursor=${encodeURIComponent(cursor)}`
+    : "/api/documents";
+  const res = await fetch(`${API_BASE}${path}`, {
+    headers: await authHeaders(),
+  });
+  const items = await handleResponse<DocumentRecord[]>(res, "GET", "/api/documents");
+  return { items, nextCursor: res.headers.get("X-Next-Cursor") };
+}
 export const getDocument = (id: string) =>
   get<DocumentRecord>(`/api/documents/${id}`);
 export const getDocumentDetail = (id: string) =>
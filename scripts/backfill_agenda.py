@@ -0,0 +1,96 @@
+"""既存ファミリーのアジェンダ（events/tasks のマテリアライズドビュー）を構築するスクリプト
+
+アジェンダは create_family で新規ファミリーに作成されるが、それ以前のファミリーは
+index の complete が立っておらず、一覧取得がコレクショングループクエリにフォールバックする。
+このスクリプトで各ファミリーのアジェンダを作り直し、complete=True にする。
+タスクが単一の agenda/tasks だった旧形式のファミリー（tasks_bucketed なし）も
+同じ実行でバケット形式に移行する。
+
+実行方法（リポジトリルートから。v2 パッケージを import するため -m で実行する）:
+    # Firestore Emulator で検証する場合
+    FIRESTORE_EMULATOR_HOST=localhost:8080 uv run python -m scripts.backfill_agenda --dry-run
+
+    # 全ファミリー
+    uv run python -m scripts.backfill_agenda
+
+    # 特定ファミリーのみ
+    uv run python -m scripts.backfill_agenda --family-id <familyId>
+
+注意:
+  - 冪等（何度実行してもサブコレクションの内容で上書きされる）
+  - 実行中に解析・削除されたドキュメントは取りこぼす可能性があるため、
+    気になる場合は再実行する
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+
+from google.cloud import firestore
+from v2.adapters.firestore_repository import FirestoreDocumentRepository
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
+
+_FAMILIES = "families"
+
+
+def backfill_family(
+    repo: FirestoreDocumentRepository, family_id: str, dry_run: bool
+) -> bool:
+    """
+    1ファミリーのアジェンダを構築する。
+
+    Returns:
+        True: 構築した場合（または dry_run で構築予定）
+    """
+    if dry_run:
+        logger.info("DRY RUN: Would rebuild agenda for family_id=%s", family_id)
+        return True
+    events, tasks = repo.rebuild_agenda(family_id)
+    logger.info("REBUILT family_id=%s (events=%d, tasks=%d)", family_id, events, tasks)
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Build the per-family agenda view from events/tasks"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Run without making any changes (preview only)",
+    )
+    parser.add_argument(
+        "--family-id",
+        type=str,
+        default=None,
+        help="Backfill only this specific family (optional)",
+    )
+    args = parser.parse_args()
+
+    db = firestore.Client()
+    repo = FirestoreDocumentRepository(db)
+
+    if args.family_id:
+        family_ids = [args.family_id]
+    else:
+        family_ids = [snap.id for snap in db.collection(_FAMILIES).stream()]
+    logger.info("Found %d families to backfill", len(family_ids))
+
+    done = 0
+    errors = 0
+    for family_id in family_ids:
+        try:
+            if backfill_family(repo, family_id, dry_run=args.dry_run):
+                done += 1
+        except Exception:
+            logger.exception("ERROR family_id=%s", family_id)
+            errors += 1
+
+    logger.info("Done: rebuilt=%d, errors=%d", done, errors)
+
+
+if __name__ == "__main__":
+    main()
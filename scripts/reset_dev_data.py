@@ -551,6 +551,100 @@ def _seed_document_pending(
     logger.info("Created pending document: %s (doc_id=%s)", title, doc_id)
 
 
+def seed_bulk_documents(
+    db: firestore.Client,
+    family_id: str,
+    uid: str,
+    num_documents: int,
+    events_per_document: int = 2,
+    tasks_per_document: int = 2,
+) -> None:
+    """解析済みドキュメントを大量にシードする（リポジトリのベンチマーク用）。
+
+    ドキュメントごとにイベント・タスクを作成し、500 件ずつバッチで書き込む。
+    イベントの日付は今日から 1 日ずつずらして複数月にまたがるようにし、
+    タスクの ID は `{documentId}_{uuid}` 形式、完了状態は交互にする。
+    アジェンダは作成しないため、必要に応じて rebuild_agenda() で構築すること。
+
+    Args:
+        num_documents: 作成するドキュメント数
+        events_per_document: 1 ドキュメントあたりのイベント数
+        tasks_per_document: 1 ドキュメントあたりのタスク数
+    """
+    documents_col = db.collection(_FAMILIES).document(family_id).collection(_DOCUMENTS)
+    today = datetime.now(UTC)
+    batch = db.batch()
+    pending = 0
+
+    def stage(ref: firestore.DocumentReference, data: dict) -> None:
+        nonlocal batch, pending
+        batch.set(ref, data)
+        pending += 1
+        if pending >= 500:
+            batch.commit()
+            batch = db.batch()
+            pending = 0
+
+    for i in range(num_documents):
+        doc_id = str(uuid.uuid4())
+        doc_ref = documents_col.document(doc_id)
+        stage(
+            doc_ref,
+            {
+                "uid": uid,
+                "status": "completed",
+                "content_hash": str(uuid.uuid4()),
+                "storage_path": f"uploads/{family_id}/{doc_id}.pdf",
+                "original_filename": f"bench-{i}.pdf",
+                "mime_type": "application/pdf",
+                "summary": f"ベンチマーク用ドキュメント {i}",
+                "category": "EVENT",
+                "archive_filename": f"bench-{i}.pdf",
+                "error_message": None,
+                "created_at": today - timedelta(minutes=i),
+                "updated_at": firestore.SERVER_TIMESTAMP,
+            },
+        )
+        for j in range(events_per_document):
+            day = (today + timedelta(days=i + j)).strftime("%Y-%m-%d")
+            stage(
+                doc_ref.collection(_EVENTS).document(),
+                {
+                    "family_id": family_id,
+                    "document_id": doc_id,
+                    "summary": f"行事 {i}-{j}",
+                    "start": f"{day}T09:00:00",
+                    "end": f"{day}T15:00:00",
+                    "location": "",
+                    "description": "",
+                    "confidence": "HIGH",
+                },
+            )
+        for j in range(tasks_per_document):
+            due = (today + timedelta(days=i + j)).strftime("%Y-%m-%d")
+            stage(
+                doc_ref.collection(_TASKS).document(f"{doc_id}_{uuid.uuid4().hex}"),
+                {
+                    "family_id": family_id,
+                    "document_id": doc_id,
+                    "title": f"提出物 {i}-{j}",
+                    "due_date": due,
+                    "assignee": "PARENT",
+                    "note": "",
+                    "completed": (i + j) % 2 == 1,
+                },
+            )
+    if pending:
+        batch.commit()
+    logger.info(
+        "Seeded bulk documents: family_id=%s, documents=%d, events=%d, tasks=%d",
+        family_id,
+        num_documents,
+        num_documents * events_per_document,
+        num_documents * tasks_per_document,
+    )
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Dev環境のデータをクリーンアップしてデモデータをシードする"
@@ -39,7 +39,12 @@ SELECT
   jsonPayload.method                     AS method,
   jsonPayload.path                       AS path,
   CAST(jsonPayload.status_code AS INT64) AS status_code,
-  CAST(jsonPayload.response_time_ms AS INT64) AS response_time_ms
+  CAST(jsonPayload.response_time_ms AS INT64) AS response_time_ms,
+  CAST(jsonPayload.firestore_reads AS INT64)   AS firestore_reads,
+  CAST(jsonPayload.firestore_writes AS INT64)  AS firestore_writes,
+  CAST(jsonPayload.firestore_queries AS INT64) AS firestore_queries,
+  CAST(jsonPayload.firestore_rpcs AS INT64)    AS firestore_rpcs,
+  CAST(jsonPayload.firestore_rpc_ms AS INT64)  AS firestore_rpc_ms
 FROM \`${PROJECT_ID}.${DATASET}.run_googleapis_com_stdout\`
 WHERE jsonPayload.log_type = 'access_log'"
 
@@ -62,6 +67,7 @@ SELECT
   CAST(jsonPayload.prompt_tokens AS INT64)     AS prompt_tokens,
   CAST(jsonPayload.candidates_tokens AS INT64) AS candidates_tokens,
   CAST(jsonPayload.total_tokens AS INT64)      AS total_tokens,
+  JSON_VALUE(TO_JSON_STRING(jsonPayload), '$.input_mode') AS input_mode,
   JSON_VALUE(TO_JSON_STRING(jsonPayload), '$.error') AS error
 FROM \`${PROJECT_ID}.${DATASET}.run_googleapis_com_stdout\`
 WHERE jsonPayload.log_type IN (
@@ -23,6 +23,17 @@ resource "google_cloud_run_v2_service" "this" {
         }
       }
 
+      # 起動時ウォームアップが終わるまで /health は 503 を返す。
+      # 200 になるまでこのインスタンスへのトラフィックを待たせる。
+      startup_probe {
+        http_get {
+          path = "/health"
+        }
+        period_seconds    = 1
+        timeout_seconds   = 1
+        failure_threshold = 30
+      }
+
       dynamic "env" {
         for_each = var.env_vars
         content {
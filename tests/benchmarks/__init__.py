@@ -0,0 +1 @@
+"""Benchmarks（python -m tests.benchmarks.<module> で実行）"""
@@ -0,0 +1,57 @@
+"""ベンチマーク共通の計測・表示ヘルパー"""
+
+from __future__ import annotations
+
+import math
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Timing:
+    """1ステージ分の計測結果（ミリ秒）"""
+
+    name: str
+    samples: list[float]
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.samples)
+
+    def percentile(self, pct: float) -> float:
+        ordered = sorted(self.samples)
+        rank = max(1, math.ceil(pct / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "n": len(self.samples),
+            "mean_ms": round(self.mean, 3),
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+        }
+
+
+def measure(name: str, fn: Callable[[], object], iterations: int) -> Timing:
+    """fn を iterations 回実行し、1回ごとの所要時間を記録する"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return Timing(name=name, samples=samples)
+
+
+def print_table(timings: list[Timing]) -> None:
+    width = max(len(t.name) for t in timings)
+    print(
+        f"{'stage':<{width}}  {'n':>6}  {'mean ms':>10}  {'p50 ms':>10}  {'p95 ms':>10}"
+    )
+    for t in timings:
+        print(
+            f"{t.name:<{width}}  {len(t.samples):>6}  {t.mean:>10.3f}"
+            f"  {t.percentile(50):>10.3f}  {t.percentile(95):>10.3f}"
+        )
@@ -0,0 +1,193 @@
+"""解析パイプラインのオフラインベンチマーク
+
+Gemini を呼ばずに、録画済み応答（tests/fixtures/gemini_recordings/）を再生して
+GeminiDocumentAnalyzer と run_analysis_sync のオーバーヘッドを計測する。
+録画がないフィクスチャは gemini_responses/ の JSON をレイテンシ 0 で再生する。
+
+計測ステージ:
+  prompt_build   : ユーザープロンプトの構築
+  parse          : 応答テキストの JSON パース
+  convert        : JSON → DocumentAnalysis 変換
+  analyze        : GeminiDocumentAnalyzer.analyze()（再生レイテンシ込み）
+  analyze_async_xN: analyze_async() を N 件同時に実行したときの全体所要時間
+  run_analysis   : run_analysis_sync() 全体（in-memory リポジトリ・ストレージ使用）
+
+実行例:
+    uv run python -m tests.benchmarks.bench_analyzer
+    uv run python -m tests.benchmarks.bench_analyzer --iterations 200 --latency-scale 0
+    uv run python -m tests.benchmarks.bench_analyzer --fixtures excursion_notice --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+from pathlib import Path
+
+from v2.adapters.gemini import GeminiDocumentAnalyzer
+from v2.adapters.gemini_replay import GeminiRecording, ReplayGenerativeModel
+from v2.adapters.pdf_text_layer import PypdfTextLayerExtractor
+from v2.domain.models import DocumentRecord, UserProfile
+from v2.entrypoints.worker import run_analysis_sync
+from v2.services.document_processor import DocumentProcessor
+
+from tests.benchmarks._timing import Timing, measure, print_table
+from tests.in_memory import (
+    InMemoryBlobStorage,
+    InMemoryDocumentRepository,
+    InMemoryFamilyRepository,
+    InMemoryUserConfigRepository,
+)
+
+_FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+RECORDINGS_DIR = _FIXTURES_DIR / "gemini_recordings"
+RESPONSES_DIR = _FIXTURES_DIR / "gemini_responses"
+DEFAULT_FIXTURES = ["excursion_notice", "cost_notice", "schedule_only"]
+
+_FAMILY_ID = "bench-family"
+_UID = "bench-uid"
+_PROFILES = [
+    UserProfile(id="CHILD1", name="太郎", grade="小3", keywords="サッカー,遠足"),
+    UserProfile(id="CHILD2", name="花子", grade="小1", keywords="ダンス"),
+]
+# 画像として送る最小限のバイナリ（テキストレイヤー判定を通らない入力）
+_SAMPLE_CONTENT = b"\xff\xd8\xff\xe0" + b"\x00" * 2048
+_SAMPLE_MIME = "image/jpeg"
+
+
+def run(
+    fixtures: list[str],
+    iterations: int,
+    latency_scale: float,
+    concurrency: int = 100,
+) -> list[Timing]:
+    """全ステージを計測して結果を返す"""
+    recordings = [
+        GeminiRecording.load(RECORDINGS_DIR / f"{name}.json")
+        if (RECORDINGS_DIR / f"{name}.json").exists()
+        else GeminiRecording.from_response_json(RESPONSES_DIR / f"{name}.json")
+        for name in fixtures
+    ]
+    model = ReplayGenerativeModel(recordings, latency_scale=latency_scale)
+    analyzer = GeminiDocumentAnalyzer(model=model)
+    profiles = {p.id: p for p in _PROFILES}
+    texts = [r.text for r in recordings]
+    raws = [analyzer._parse_response(t) for t in texts]
+
+    timings = [
+        measure(
+            "prompt_build",
+            lambda: analyzer._build_user_prompt(profiles, []),
+            iterations,
+        ),
+        measure(
+            "parse",
+            lambda: [analyzer._parse_response(t) for t in texts],
+            iterations,
+        ),
+        measure(
+            "convert",
+            lambda: [analyzer._convert_to_domain_model(r) for r in raws],
+            iterations,
+        ),
+        measure(
+            "analyze",
+            lambda: analyzer.analyze(_SAMPLE_CONTENT, _SAMPLE_MIME, profiles),
+            iterations,
+        ),
+    ]
+
+    async def _analyze_concurrently() -> None:
+        await asyncio.gather(
+            *(
+                analyzer.analyze_async(_SAMPLE_CONTENT, _SAMPLE_MIME, profiles)
+                for _ in range(concurrency)
+            )
+        )
+
+    timings.append(
+        measure(
+            f"analyze_async_x{concurrency}",
+            lambda: asyncio.run(_analyze_concurrently()),
+            max(1, iterations // 10),
+        )
+    )
+
+    doc_repo = InMemoryDocumentRepository()
+    family_repo = InMemoryFamilyRepository()
+    user_repo = InMemoryUserConfigRepository()
+    blob_storage = InMemoryBlobStorage()
+    processor = DocumentProcessor(
+        analyzer=analyzer, text_extractor=PypdfTextLayerExtractor()
+    )
+    family_repo.create_family(_FAMILY_ID, _UID, "bench")
+    for profile in _PROFILES:
+        family_repo.create_profile(_FAMILY_ID, profile)
+    storage_path = f"uploads/{_FAMILY_ID}/bench.jpg"
+    blob_storage.upload(storage_path, _SAMPLE_CONTENT, _SAMPLE_MIME)
+
+    counter = iter(range(iterations))
+
+    def _run_once() -> None:
+        doc_id = doc_repo.create(
+            _FAMILY_ID,
+            DocumentRecord(
+                id=f"bench-{next(counter)}",
+                uid=_UID,
+                status="pending",
+                content_hash="",
+                storage_path=storage_path,
+                original_filename="bench.jpg",
+                mime_type=_SAMPLE_MIME,
+            ),
+        )
+        run_analysis_sync(
+            _UID,
+            _FAMILY_ID,
+            doc_id,
+            storage_path,
+            _SAMPLE_MIME,
+            doc_repo=doc_repo,
+            family_repo=family_repo,
+            user_repo=user_repo,
+            blob_storage=blob_storage,
+            processor=processor,
+        )
+
+    timings.append(measure("run_analysis", _run_once, iterations))
+    return timings
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument(
+        "--latency-scale",
+        type=float,
+        default=1.0,
+        help="録画レイテンシに掛ける倍率（0 でオーバーヘッドのみを計測）",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=100,
+        help="analyze_async を同時に実行する件数",
+    )
+    parser.add_argument("--fixtures", nargs="+", default=DEFAULT_FIXTURES)
+    parser.add_argument("--json", action="store_true", help="結果を JSON で出力")
+    args = parser.parse_args(argv)
+
+    # 計測対象のログ出力がノイズにならないよう抑制する
+    logging.basicConfig(level=logging.WARNING)
+
+    timings = run(args.fixtures, args.iterations, args.latency_scale, args.concurrency)
+    if args.json:
+        print(json.dumps([t.as_dict() for t in timings], indent=2))
+    else:
+        print_table(timings)
+
+
+if __name__ == "__main__":
+    main()
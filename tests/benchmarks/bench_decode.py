@@ -0,0 +1,137 @@
+"""スナップショット → モデル変換のオフラインベンチマーク
+
+数千件のイベントを持つアジェンダの月別バケット（iCal・ダイジェストの全件走査と同じ形）を
+DocumentSnapshot として組み立て、次の2通りの変換の CPU 時間とピークメモリを比較する。
+
+  to_dict   : snap.to_dict()（deepcopy）→ キーワード引数で EventData を組み立てる（従来の方式）
+  codec     : firestore_codec.snapshot_data()（コピーなし）→ decode_event()
+
+Firestore には接続しない。
+
+実行例（リポジトリルートから）:
+    uv run python -m tests.benchmarks.bench_decode
+    uv run python -m tests.benchmarks.bench_decode --events 1000 5000 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import tracemalloc
+from collections.abc import Callable
+
+from google.cloud.firestore_v1.document import DocumentSnapshot
+from v2.adapters.firestore_codec import decode_event, snapshot_data
+from v2.domain.models import EventData
+
+from tests.benchmarks._timing import measure
+
+DEFAULT_EVENT_COUNTS = [1000, 5000]
+
+
+def _bucket_snapshot(num_events: int) -> DocumentSnapshot:
+    events = {
+        f"doc{i // 2}_{i}": {
+            "summary": f"[長男] 行事 {i}",
+            "start": f"2026-05-{i % 28 + 1:02d}T09:00:00",
+            "end": f"2026-05-{i % 28 + 1:02d}T12:00:00",
+            "location": "体育館",
+            "description": "持ち物: 水筒、体操服",
+            "confidence": "HIGH",
+            "document_id": f"doc{i // 2}",
+        }
+        for i in range(num_events)
+    }
+    return DocumentSnapshot(
+        None,
+        {"events": events},
+        True,
+        read_time=None,
+        create_time=None,
+        update_time=None,
+    )
+
+
+def _decode_with_to_dict(snap: DocumentSnapshot) -> list[EventData]:
+    return [
+        EventData(
+            summary=d.get("summary") or "",
+            start=d.get("start") or "",
+            end=d.get("end") or "",
+            location=d.get("location") or "",
+            description=d.get("description") or "",
+            confidence=d.get("confidence") or "HIGH",
+        )
+        for d in ((snap.to_dict() or {}).get("events") or {}).values()
+    ]
+
+
+def _decode_with_codec(snap: DocumentSnapshot) -> list[EventData]:
+    return [decode_event(d) for d in (snapshot_data(snap).get("events") or {}).values()]
+
+
+def _peak_kib(fn: Callable[[], object]) -> float:
+    """fn 1回分のピーク追加メモリ（KiB）。戻り値は計測中保持する"""
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak / 1024
+
+
+def run(event_counts: list[int], iterations: int) -> list[dict]:
+    """イベント数ごとに両方式を計測して結果を返す"""
+    results = []
+    for num_events in event_counts:
+        snap = _bucket_snapshot(num_events)
+        decoders = [("to_dict", _decode_with_to_dict), ("codec", _decode_with_codec)]
+        for name, decode in decoders:
+            timing = measure(name, functools.partial(decode, snap), iterations)
+            results.append(
+                {
+                    "events": num_events,
+                    **timing.as_dict(),
+                    "peak_kib": round(_peak_kib(functools.partial(decode, snap)), 1),
+                }
+            )
+    return results
+
+
+def print_results(results: list[dict]) -> None:
+    print(
+        f"{'events':>7}  {'decoder':<8}  {'n':>4}  {'mean ms':>10}"
+        f"  {'p95 ms':>10}  {'peak KiB':>10}"
+    )
+    for r in results:
+        print(
+            f"{r['events']:>7}  {r['name']:<8}  {r['n']:>4}  {r['mean_ms']:>10.3f}"
+            f"  {r['p95_ms']:>10.3f}  {r['peak_kib']:>10.1f}"
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--events",
+        type=int,
+        nargs="+",
+        default=DEFAULT_EVENT_COUNTS,
+        help="バケットに入れるイベント数",
+    )
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="結果を JSON で出力")
+    args = parser.parse_args(argv)
+
+    results = run(args.events, args.iterations)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results)
+
+
+if __name__ == "__main__":
+    main()
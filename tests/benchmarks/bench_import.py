@@ -0,0 +1,129 @@
+"""API アプリの import 時間レポート（コールドスタートの目安）
+
+新しいインタプリタで `python -X importtime -c "import v2.entrypoints.api.app"` を実行し、
+合計時間と累積時間の大きいモジュールを表示する。APP_ROLE ごとに比較できる。
+--budget-ms（既定は IMPORT_TIME_BUDGET_MS、なければ 2500）を超えた場合は終了コード 1 で終わる。
+Vertex AI SDK を読み込むと超える値（遅延 import 導入前は約 3.6 秒）で、
+実行環境の揺らぎがあるためユニットテストではなくここで確認する。
+
+実行例（リポジトリルートから）:
+    uv run python -m tests.benchmarks.bench_import
+    uv run python -m tests.benchmarks.bench_import --role api --top 30 --json
+    uv run python -m tests.benchmarks.bench_import --budget-ms 0  # 予算チェックなし
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+_TARGET = "v2.entrypoints.api.app"
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    """-X importtime の1行（マイクロ秒）"""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> list[ImportRecord]:
+    """-X importtime の出力を ImportRecord のリストにする"""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # ヘッダー行
+        stripped = name.lstrip(" ")
+        records.append(
+            ImportRecord(
+                module=stripped,
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=(len(name) - len(stripped) - 1) // 2,
+            )
+        )
+    return records
+
+
+def measure_imports(role: str = "all", module: str = _TARGET) -> list[ImportRecord]:
+    """新しいプロセスで module を import し、読み込まれたモジュールの記録を返す"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=_REPO_ROOT,
+        env={**os.environ, "APP_ROLE": role},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def total_ms(records: list[ImportRecord], module: str = _TARGET) -> float:
+    """module 自身の累積 import 時間（ミリ秒）"""
+    return next(r.cumulative_us for r in records if r.module == module) / 1000
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--role", default="all", choices=["all", "api", "worker"])
+    parser.add_argument("--top", type=int, default=20, help="表示するモジュール数")
+    parser.add_argument("--json", action="store_true", help="結果を JSON で出力")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.environ.get("IMPORT_TIME_BUDGET_MS", "2500")),
+        help="累積 import 時間の上限（ミリ秒、0 でチェックしない）",
+    )
+    args = parser.parse_args(argv)
+
+    records = measure_imports(args.role)
+    total = total_ms(records)
+    over_budget = 0 < args.budget_ms < total
+    top = sorted(records, key=lambda r: r.cumulative_us, reverse=True)[: args.top]
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "role": args.role,
+                    "total_ms": total,
+                    "budget_ms": args.budget_ms,
+                    "modules": len(records),
+                    "top": [
+                        {"module": r.module, "cumulative_ms": r.cumulative_us / 1000}
+                        for r in top
+                    ],
+                },
+                indent=2,
+            )
+        )
+    else:
+        print(f"role={args.role}  total={total:.1f} ms  modules={len(records)}")
+        print(f"{'cumulative ms':>14}  {'self ms':>8}  module")
+        for r in top:
+            print(
+                f"{r.cumulative_us / 1000:>14.1f}  {r.self_us / 1000:>8.1f}  "
+                f"{'  ' * r.depth}{r.module}"
+            )
+
+    if over_budget:
+        print(
+            f"import time {total:.1f} ms exceeds budget {args.budget_ms:.0f} ms",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
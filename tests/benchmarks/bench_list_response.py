@@ -0,0 +1,248 @@
+"""一覧 API のレスポンス直列化のオフラインベンチマーク
+
+/api/events・/api/tasks・/api/documents と同じ形の一覧（1k / 10k 件）を返すルートを
+ASGI で直接呼び出し、1リクエストの所要時間を次の方式で比較する。
+
+  pydantic    : 要素ごとに Pydantic モデルを作り response_model で返す（従来の方式）
+  fast_json   : FastJSONResponse（orjson）
+
+リポジトリは使わず、ドメインの dataclass のリストを事前に作っておく。
+
+実行例（リポジトリルートから）:
+    uv run python -m tests.benchmarks.bench_list_response
+    uv run python -m tests.benchmarks.bench_list_response --items 1000 10000 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import json
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from fastapi import FastAPI
+from v2.domain.models import DocumentRecord, EventData, StoredTaskData
+from v2.entrypoints.api.json_response import FastJSONResponse
+from v2.entrypoints.api.routes.documents import (
+    DocumentResponse,
+    _to_response,
+    _to_row,
+)
+from v2.entrypoints.api.routes.events import EventResponse
+from v2.entrypoints.api.routes.tasks import TaskResponse
+
+from tests.benchmarks._timing import Timing
+
+DEFAULT_ITEM_COUNTS = [1000, 10000]
+
+
+def _events(n: int) -> list[EventData]:
+    return [
+        EventData(
+            summary=f"[長男] 行事 {i}",
+            start=f"2026-05-{i % 28 + 1:02d}T09:00:00",
+            end=f"2026-05-{i % 28 + 1:02d}T12:00:00",
+            location="体育館",
+            description="持ち物: 水筒、体操服",
+            confidence="HIGH",
+        )
+        for i in range(n)
+    ]
+
+
+def _tasks(n: int) -> list[StoredTaskData]:
+    return [
+        StoredTaskData(
+            id=f"doc{i}_{i}",
+            title=f"提出物 {i}",
+            due_date=f"2026-05-{i % 28 + 1:02d}",
+            assignee="PARENT",
+            note="署名が必要です",
+            completed=i % 3 == 0,
+        )
+        for i in range(n)
+    ]
+
+
+def _records(n: int) -> list[DocumentRecord]:
+    base = datetime(2026, 4, 1, tzinfo=UTC)
+    return [
+        DocumentRecord(
+            id=f"doc{i}",
+            uid="uid-1",
+            status="completed",
+            content_hash=f"{i:064x}",
+            storage_path=f"uploads/uid-1/doc{i}.pdf",
+            original_filename=f"おたより{i}.pdf",
+            mime_type="application/pdf",
+            summary="遠足のお知らせ",
+            category="EVENT",
+            archive_filename=f"20260401_遠足_{i}.pdf",
+            created_at=base + timedelta(minutes=i),
+        )
+        for i in range(n)
+    ]
+
+
+def _build_app(n: int) -> FastAPI:
+    """同じデータを pydantic 経路と fast 経路で返すルートを持つアプリ"""
+    events, tasks, records = _events(n), _tasks(n), _records(n)
+    app = FastAPI()
+
+    @app.get("/pydantic/events", response_model=list[EventResponse])
+    async def events_pydantic() -> list[EventResponse]:
+        return [
+            EventResponse(
+                summary=e.summary,
+                start=e.start,
+                end=e.end,
+                location=e.location,
+                description=e.description,
+                confidence=e.confidence,
+            )
+            for e in events
+        ]
+
+    @app.get("/pydantic/tasks", response_model=list[TaskResponse])
+    async def tasks_pydantic() -> list[TaskResponse]:
+        return [
+            TaskResponse(
+                id=t.id,
+                title=t.title,
+                due_date=t.due_date,
+                assignee=t.assignee,
+                note=t.note,
+                completed=t.completed,
+            )
+            for t in tasks
+        ]
+
+    @app.get("/pydantic/documents", response_model=list[DocumentResponse])
+    async def documents_pydantic() -> list[DocumentResponse]:
+        return [_to_response(r) for r in records]
+
+    @app.get("/fast/events")
+    async def events_fast() -> FastJSONResponse:
+        return FastJSONResponse(events)
+
+    @app.get("/fast/tasks")
+    async def tasks_fast() -> FastJSONResponse:
+        return FastJSONResponse(tasks)
+
+    @app.get("/fast/documents")
+    async def documents_fast() -> FastJSONResponse:
+        return FastJSONResponse([_to_row(r) for r in records])
+
+    return app
+
+
+async def _call(app: FastAPI, path: str) -> int:
+    """ASGI で GET し、レスポンスボディのバイト数を返す"""
+    body_size = 0
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        nonlocal body_size
+        if message["type"] == "http.response.body":
+            body_size += len(message.get("body", b""))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 12345),
+        "server": ("testserver", 80),
+    }
+    await app(scope, receive, send)
+    return body_size
+
+
+def _call_sync(loop: asyncio.AbstractEventLoop, app: FastAPI, path: str) -> int:
+    return loop.run_until_complete(_call(app, path))
+
+
+def _measure(name: str, fn: Callable[[], int], iterations: int) -> tuple[Timing, int]:
+    body_size = fn()  # ウォームアップ（ルートの初回解決などを計測から外す）
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return Timing(name=name, samples=samples), body_size
+
+
+def run(item_counts: list[int], iterations: int) -> list[dict]:
+    """件数・一覧の種類・方式ごとに計測して結果を返す"""
+    variants = [("pydantic", "pydantic"), ("fast_json", "fast")]
+
+    results = []
+    loop = asyncio.new_event_loop()
+    try:
+        for n in item_counts:
+            app = _build_app(n)
+            for kind in ("events", "tasks", "documents"):
+                for name, prefix in variants:
+                    timing, body_size = _measure(
+                        name,
+                        functools.partial(_call_sync, loop, app, f"/{prefix}/{kind}"),
+                        iterations,
+                    )
+                    results.append(
+                        {
+                            "items": n,
+                            "list": kind,
+                            **timing.as_dict(),
+                            "body_bytes": body_size,
+                        }
+                    )
+    finally:
+        loop.close()
+    return results
+
+
+def print_results(results: list[dict]) -> None:
+    print(
+        f"{'items':>6}  {'list':<9}  {'variant':<11}  {'n':>4}"
+        f"  {'mean ms':>9}  {'p95 ms':>9}  {'bytes':>9}"
+    )
+    for r in results:
+        print(
+            f"{r['items']:>6}  {r['list']:<9}  {r['name']:<11}  {r['n']:>4}"
+            f"  {r['mean_ms']:>9.2f}  {r['p95_ms']:>9.2f}  {r['body_bytes']:>9}"
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--items",
+        type=int,
+        nargs="+",
+        default=DEFAULT_ITEM_COUNTS,
+        help="一覧の件数",
+    )
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="結果を JSON で出力")
+    args = parser.parse_args(argv)
+
+    results = run(args.items, args.iterations)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""アクセスログ出力の呼び出し側レイテンシのオフラインベンチマーク
+
+access_log と同じ形の log_event() を1件出す処理の所要時間を、次の2通りのハンドラで比較する。
+
+  sync     : logging.StreamHandler + CloudLoggingFormatter（ログを出した処理の中で JSON 化・書き込み）
+  batching : BatchingStreamHandler + CloudLoggingFormatter（キューに積むだけ）
+
+出力先は stdout の代わりに OS パイプ（読み手は別スレッド）を使う。
+batching は最後に flush() で書き出し完了まで待った合計時間も表示する。
+
+実行例（リポジトリルートから）:
+    uv run python -m tests.benchmarks.bench_logging
+    uv run python -m tests.benchmarks.bench_logging --records 20000 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+
+from v2.analytics import log_event
+from v2.logging_config import BatchingStreamHandler, CloudLoggingFormatter
+
+from tests.benchmarks._timing import Timing, measure, print_table
+
+
+def _access_log() -> None:
+    log_event(
+        "access_log",
+        uid="uid-0123456789",
+        method="GET",
+        path="/api/documents",
+        status_code=200,
+        response_time_ms=42,
+        firestore_reads=3,
+        firestore_writes=0,
+        firestore_queries=1,
+        firestore_rpc_ms=18,
+    )
+
+
+def _drain(fd: int) -> None:
+    while os.read(fd, 65536):
+        pass
+
+
+def _run_with(handler: logging.Handler, name: str, records: int) -> dict:
+    handler.setFormatter(CloudLoggingFormatter())
+    analytics_logger = logging.getLogger("v2.analytics")
+    analytics_logger.addHandler(handler)
+    analytics_logger.propagate = False
+    try:
+        start = time.perf_counter()
+        timing: Timing = measure(name, _access_log, records)
+        handler.flush()
+        total_ms = (time.perf_counter() - start) * 1000
+    finally:
+        analytics_logger.removeHandler(handler)
+        analytics_logger.propagate = True
+        handler.close()
+    return {**timing.as_dict(), "total_ms": round(total_ms, 1), "timing": timing}
+
+
+def run(records: int) -> list[dict]:
+    """ハンドラごとに records 件のアクセスログを出して計測する"""
+    logging.getLogger("v2.analytics").setLevel(logging.INFO)
+    results = []
+    for name in ("sync", "batching"):
+        read_fd, write_fd = os.pipe()
+        reader = threading.Thread(target=_drain, args=(read_fd,), daemon=True)
+        reader.start()
+        with os.fdopen(write_fd, "w", encoding="utf-8") as stream:
+            handler = (
+                logging.StreamHandler(stream)
+                if name == "sync"
+                else BatchingStreamHandler(stream, max_records=records)
+            )
+            results.append(_run_with(handler, name, records))
+        reader.join(timeout=5)
+        os.close(read_fd)
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--json", action="store_true", help="結果を JSON で出力")
+    args = parser.parse_args(argv)
+
+    results = run(args.records)
+    if args.json:
+        print(
+            json.dumps(
+                [{k: v for k, v in r.items() if k != "timing"} for r in results],
+                indent=2,
+            )
+        )
+        return
+    print_table([r["timing"] for r in results])
+    for r in results:
+        print(f"{r['name']}: total (incl. flush) {r['total_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""HTTP ミドルウェアのリクエストごとのオーバーヘッドのオフラインベンチマーク
+
+何もしないルート1つの FastAPI アプリにアクセスログ・例外キャッチのミドルウェアを
+次の方式で載せ、ASGI アプリを直接呼び出したときの1リクエストの所要時間を比較する。
+
+  http_decorator : app.middleware("http")（BaseHTTPMiddleware）の関数ミドルウェア（従来の方式）
+  pure_asgi      : AccessLogMiddleware / UnhandledExceptionMiddleware
+  none           : ミドルウェアなし（基準）
+
+http_decorator と pure_asgi はどちらもアクセスログで log_event() を呼ぶ（出力先はなし）。HTTP サーバーは起動しない。
+
+実行例（リポジトリルートから）:
+    uv run python -m tests.benchmarks.bench_middleware
+    uv run python -m tests.benchmarks.bench_middleware --requests 20000 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Callable
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from starlette.responses import Response
+from v2.adapters.firestore_instrumentation import firestore_request_stats
+from v2.analytics import log_event
+from v2.entrypoints.api.middleware import (
+    AccessLogMiddleware,
+    UnhandledExceptionMiddleware,
+)
+
+from tests.benchmarks._timing import Timing, print_table
+
+_SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/api/ping",
+    "raw_path": b"/api/ping",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"testserver")],
+    "client": ("127.0.0.1", 12345),
+    "server": ("testserver", 80),
+}
+
+
+async def _log_access(
+    request: Request, call_next: Callable[[Request], Response]
+) -> Response:
+    """従来の app.middleware("http") 版アクセスログ（uid の JWT デコードは除く）"""
+    start = time.monotonic()
+    with firestore_request_stats() as firestore_stats:
+        response = await call_next(request)
+    log_event(
+        "access_log",
+        uid=None,
+        method=request.method,
+        path=request.url.path,
+        status_code=response.status_code,
+        response_time_ms=round((time.monotonic() - start) * 1000),
+        **firestore_stats.as_log_fields(),
+    )
+    return response
+
+
+async def _catch_unhandled_exceptions(
+    request: Request, call_next: Callable[[Request], Response]
+) -> Response:
+    try:
+        return await call_next(request)
+    except Exception:
+        return JSONResponse(
+            status_code=500, content={"detail": "Internal server error"}
+        )
+
+
+def _build_app(variant: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/ping")
+    async def ping() -> dict:
+        return {"ok": True}
+
+    if variant == "http_decorator":
+        app.middleware("http")(_log_access)
+        app.middleware("http")(_catch_unhandled_exceptions)
+    elif variant == "pure_asgi":
+        app.add_middleware(AccessLogMiddleware)
+        app.add_middleware(UnhandledExceptionMiddleware)
+    return app
+
+
+async def _measure(app: FastAPI, name: str, requests: int) -> Timing:
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        pass
+
+    for _ in range(100):  # ミドルウェアスタックの構築などを計測から外す
+        await app(dict(_SCOPE), receive, send)
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await app(dict(_SCOPE), receive, send)
+        samples.append((time.perf_counter() - start) * 1000)
+    return Timing(name=name, samples=samples)
+
+
+def run(requests: int) -> list[Timing]:
+    """ミドルウェアの方式ごとに requests 回のリクエストを計測する"""
+    analytics_logger = logging.getLogger("v2.analytics")
+    analytics_logger.setLevel(logging.INFO)
+    analytics_logger.propagate = False
+    analytics_logger.addHandler(logging.NullHandler())
+    return [
+        asyncio.run(_measure(_build_app(name), name, requests))
+        for name in ("none", "http_decorator", "pure_asgi")
+    ]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--json", action="store_true", help="結果を JSON で出力")
+    args = parser.parse_args(argv)
+
+    timings = run(args.requests)
+    if args.json:
+        print(json.dumps([t.as_dict() for t in timings], indent=2))
+    else:
+        print_table(timings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""Firestore リポジトリのエミュレーターベンチマーク
+
+docker compose の Firestore Emulator に、scripts/reset_dev_data.py の
+seed_bulk_documents() でドキュメント数の異なるファミリーをシードし、
+FirestoreDocumentRepository の主要メソッドのレイテンシと
+ドキュメント読み取り件数（1 呼び出しあたり）を計測する。
+
+計測メソッド:
+  list_events            : 全期間のイベント一覧
+  list_events_month      : 1 か月分のイベント一覧
+  list_tasks             : 未完了タスク一覧
+  update_task_completed  : タスクの完了状態の切り替え
+  get_document_detail    : ドキュメント詳細（親 + events + tasks）
+
+読み取り件数はクライアント側で数える（DocumentReference.get は 1 件、
+get_all / クエリは返ったスナップショット数。結果 0 件のクエリも 1 件として数える）。
+Firestore の課金上の読み取り数の目安であり、エミュレーターの値ではない。
+
+実行例（リポジトリルートから）:
+    docker compose up -d firestore-emulator
+    FIRESTORE_EMULATOR_HOST=localhost:8089 \\
+        uv run python -m tests.benchmarks.bench_repository
+    FIRESTORE_EMULATOR_HOST=localhost:8089 \\
+        uv run python -m tests.benchmarks.bench_repository --sizes 10 100 --fallback --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime
+import itertools
+import json
+import logging
+import os
+import threading
+import uuid
+from collections.abc import Callable, Iterator
+from unittest.mock import patch
+
+from google.cloud import firestore
+from google.cloud.firestore_v1.client import Client
+from google.cloud.firestore_v1.document import DocumentReference
+from google.cloud.firestore_v1.field_path import FieldPath
+from google.cloud.firestore_v1.query import Query
+from scripts.reset_dev_data import seed_bulk_documents
+from v2.adapters.firestore_repository import (
+    FirestoreDocumentRepository,
+    FirestoreFamilyRepository,
+)
+
+from tests.benchmarks._timing import Timing, measure
+
+DEFAULT_SIZES = [10, 100, 1000]
+_EMULATOR_PROJECT = "demo-clearbag"
+_UID = "bench-uid"
+
+
+class ReadCounter:
+    """Firestore クライアントの読み取り件数をプロセス全体で数える"""
+
+    def __init__(self) -> None:
+        self.reads = 0
+        self._lock = threading.Lock()
+
+    def add(self, n: int) -> None:
+        with self._lock:
+            self.reads += n
+
+    @contextlib.contextmanager
+    def installed(self) -> Iterator[ReadCounter]:
+        """計測中だけ読み取り系メソッドをラップする"""
+        counter = self
+        original_get = DocumentReference.get
+        original_get_all = Client.get_all
+        original_stream = Query.stream
+
+        def get(self, *args, **kwargs):
+            counter.add(1)
+            return original_get(self, *args, **kwargs)
+
+        def get_all(self, *args, **kwargs):
+            for snap in original_get_all(self, *args, **kwargs):
+                counter.add(1)
+                yield snap
+
+        def stream(self, *args, **kwargs):
+            count = 0
+            for snap in original_stream(self, *args, **kwargs):
+                count += 1
+                counter.add(1)
+                yield snap
+            if count == 0:
+                counter.add(1)
+
+        with (
+            patch.object(DocumentReference, "get", get),
+            patch.object(Client, "get_all", get_all),
+            patch.object(Query, "stream", stream),
+        ):
+            yield self
+
+
+def _measure_with_reads(
+    name: str,
+    fn: Callable[[], object],
+    iterations: int,
+    counter: ReadCounter,
+) -> tuple[Timing, float]:
+    before = counter.reads
+    timing = measure(name, fn, iterations)
+    return timing, (counter.reads - before) / iterations
+
+
+def _seed_family(
+    db: firestore.Client,
+    doc_repo: FirestoreDocumentRepository,
+    family_repo: FirestoreFamilyRepository,
+    size: int,
+    fallback: bool,
+) -> str:
+    family_id = f"bench-{size}-{uuid.uuid4().hex[:8]}"
+    family_repo.create_family(family_id, _UID, f"bench {size}")
+    seed_bulk_documents(db, family_id, _UID, size)
+    if fallback:
+        # アジェンダ未構築のファミリー（コレクショングループクエリ）を計測する
+        db.collection("families").document(family_id).collection("agenda").document(
+            "index"
+        ).delete()
+    else:
+        doc_repo.rebuild_agenda(family_id)
+    return family_id
+
+
+def _bench_family(
+    db: firestore.Client,
+    doc_repo: FirestoreDocumentRepository,
+    family_id: str,
+    iterations: int,
+    counter: ReadCounter,
+) -> list[tuple[Timing, float]]:
+    """シード済みファミリーに対して各メソッドを計測する"""
+    document_ids = [
+        snap.id
+        for snap in db.collection("families")
+        .document(family_id)
+        .collection("documents")
+        .select([FieldPath.document_id()])
+        .stream()
+    ]
+    completed = {task.id: task.completed for task in doc_repo.list_tasks(family_id)}
+    task_cycle = itertools.cycle(list(completed))
+    document_cycle = itertools.cycle(document_ids)
+    month_start = datetime.date.today().replace(day=1)
+    month_end = (month_start + datetime.timedelta(days=31)).replace(
+        day=1
+    ) - datetime.timedelta(days=1)
+
+    def toggle_task() -> None:
+        task_id = next(task_cycle)
+        completed[task_id] = not completed[task_id]
+        doc_repo.update_task_completed(family_id, task_id, completed[task_id])
+
+    benchmarks: list[tuple[str, Callable[[], object]]] = [
+        ("list_events", lambda: doc_repo.list_events(family_id)),
+        (
+            "list_events_month",
+            lambda: doc_repo.list_events(
+                family_id,
+                from_date=month_start.isoformat(),
+                to_date=month_end.isoformat(),
+            ),
+        ),
+        ("list_tasks", lambda: doc_repo.list_tasks(family_id, completed=False)),
+        ("update_task_completed", toggle_task),
+        (
+            "get_document_detail",
+            lambda: doc_repo.get_document_detail(family_id, next(document_cycle)),
+        ),
+    ]
+    with counter.installed():
+        return [
+            _measure_with_reads(name, fn, iterations, counter)
+            for name, fn in benchmarks
+        ]
+
+
+def run(sizes: list[int], iterations: int, fallback: bool = False) -> list[dict]:
+    """ファミリーサイズごとに全メソッドを計測して結果を返す"""
+    db = firestore.Client(project=os.environ.get("PROJECT_ID", _EMULATOR_PROJECT))
+    doc_repo = FirestoreDocumentRepository(db)
+    family_repo = FirestoreFamilyRepository(db)
+    counter = ReadCounter()
+    results = []
+
+    for size in sizes:
+        family_id = _seed_family(db, doc_repo, family_repo, size, fallback)
+        try:
+            for timing, reads in _bench_family(
+                db, doc_repo, family_id, iterations, counter
+            ):
+                results.append(
+                    {
+                        "size": size,
+                        **timing.as_dict(),
+                        "reads_per_call": round(reads, 1),
+                    }
+                )
+        finally:
+            family_repo.delete_family_cascade(family_id)
+    return results
+
+
+def print_results(results: list[dict]) -> None:
+    width = max(len(r["name"]) for r in results)
+    print(
+        f"{'size':>6}  {'method':<{width}}  {'n':>4}  {'mean ms':>10}"
+        f"  {'p50 ms':>10}  {'p95 ms':>10}  {'reads/call':>10}"
+    )
+    for r in results:
+        print(
+            f"{r['size']:>6}  {r['name']:<{width}}  {r['n']:>4}  {r['mean_ms']:>10.3f}"
+            f"  {r['p50_ms']:>10.3f}  {r['p95_ms']:>10.3f}  {r['reads_per_call']:>10.1f}"
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="シードするファミリーのドキュメント数",
+    )
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument(
+        "--fallback",
+        action="store_true",
+        help="アジェンダを構築せず、コレクショングループクエリの経路を計測する",
+    )
+    parser.add_argument("--json", action="store_true", help="結果を JSON で出力")
+    args = parser.parse_args(argv)
+
+    if not os.environ.get("FIRESTORE_EMULATOR_HOST"):
+        raise SystemExit(
+            "FIRESTORE_EMULATOR_HOST が未設定です。"
+            " docker compose up -d firestore-emulator の後、"
+            "FIRESTORE_EMULATOR_HOST=localhost:8089 を指定して実行してください。"
+        )
+
+    # シード・計測対象のログ出力がノイズにならないよう抑制する
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = run(args.sizes, args.iterations, fallback=args.fallback)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results)
+
+
+if __name__ == "__main__":
+    main()
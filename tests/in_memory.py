@@ -0,0 +1,333 @@
+"""In-memory Adapters（テスト・ベンチマーク用のフェイク）
+
+DocumentRepository, UserConfigRepository, FamilyRepository, BlobStorage の
+プロセス内メモリ実装。
+
+Firestore / GCS に接続せずにパイプライン全体（run_analysis_sync 等）を実行できるため、
+ベンチマークやテストで外部 I/O を除いたオーバーヘッドを計測する用途に使う。
+本番パッケージ（v2）には含めない。
+"""
+
+from __future__ import annotations
+
+import copy
+import dataclasses
+import uuid
+from datetime import UTC, datetime
+
+from google.cloud.firestore import DELETE_FIELD
+from v2.domain.models import (
+    DocumentAnalysis,
+    DocumentRecord,
+    EventData,
+    StoredTaskData,
+    UserProfile,
+)
+from v2.domain.ports import (
+    BlobStorage,
+    DocumentRepository,
+    FamilyRepository,
+    UserConfigRepository,
+)
+
+
+def _apply_update(target: dict, data: dict) -> None:
+    """
+    Firestore の update() と同じ規則で data を target に反映する。
+
+    dot-notation キー（"a.b"）はネストしたフィールドとして更新し、
+    値が DELETE_FIELD のフィールドは削除する。
+    """
+    for key, value in data.items():
+        *parents, leaf = key.split(".")
+        node = target
+        if value is DELETE_FIELD:
+            # 存在しないフィールドの削除では親のマップも作らない
+            for part in parents:
+                node = node.get(part)
+                if not isinstance(node, dict):
+                    break
+            else:
+                node.pop(leaf, None)
+            continue
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = value
+
+
+class InMemoryDocumentRepository(DocumentRepository):
+    """メモリ上の DocumentRepository 実装（family_id ごとに保持）"""
+
+    def __init__(self) -> None:
+        self._records: dict[tuple[str, str], DocumentRecord] = {}
+        self._events: dict[tuple[str, str], list[EventData]] = {}
+        self._tasks: dict[tuple[str, str], list[StoredTaskData]] = {}
+
+    def create(self, uid: str, record: DocumentRecord) -> str:
+        doc_id = record.id or str(uuid.uuid4())
+        self._records[(uid, doc_id)] = dataclasses.replace(
+            record,
+            id=doc_id,
+            uid=uid,
+            created_at=record.created_at or datetime.now(UTC),
+        )
+        return doc_id
+
+    def get(self, uid: str, document_id: str) -> DocumentRecord | None:
+        return self._records.get((uid, document_id))
+
+    def list(
+        self,
+        uid: str,
+        limit: int | None = None,
+        start_after: datetime | None = None,
+        start_after_id: str | None = None,
+    ) -> list[DocumentRecord]:
+        records = sorted(
+            (r for (fid, _), r in self._records.items() if fid == uid),
+            key=lambda r: (r.created_at or datetime.min.replace(tzinfo=UTC), r.id),
+            reverse=True,
+        )
+        if start_after is not None:
+            records = [
+                r
+                for r in records
+                if r.created_at
+                and (
+                    r.created_at < start_after
+                    or (
+                        start_after_id is not None
+                        and r.created_at == start_after
+                        and r.id < start_after_id
+                    )
+                )
+            ]
+        return records[:limit] if limit is not None else records
+
+    def update_status(
+        self,
+        uid: str,
+        document_id: str,
+        status: str,
+        error_message: str | None = None,
+    ) -> None:
+        record = self._records[(uid, document_id)]
+        changes: dict = {"status": status}
+        if error_message is not None:
+            changes["error_message"] = error_message
+        self._records[(uid, document_id)] = dataclasses.replace(record, **changes)
+
+    def save_analysis(
+        self, uid: str, document_id: str, analysis: DocumentAnalysis
+    ) -> None:
+        key = (uid, document_id)
+        self._records[key] = dataclasses.replace(
+            self._records[key],
+            status="completed",
+            summary=analysis.summary,
+            category=analysis.category.value,
+            archive_filename=analysis.archive_filename,
+        )
+        self._events.setdefault(key, []).extend(analysis.events)
+        self._tasks.setdefault(key, []).extend(
+            StoredTaskData(
+                id=f"{document_id}_{uuid.uuid4().hex}",
+                title=t.title,
+                due_date=t.due_date,
+                assignee=t.assignee,
+                note=t.note,
+                completed=False,
+            )
+            for t in analysis.tasks
+        )
+
+    def delete(self, uid: str, document_id: str) -> None:
+        key = (uid, document_id)
+        for store in (self._records, self._events, self._tasks):
+            store.pop(key, None)
+
+    def find_by_content_hash(
+        self, uid: str, content_hash: str
+    ) -> DocumentRecord | None:
+        for (fid, _), record in self._records.items():
+            if fid == uid and record.content_hash == content_hash:
+                return record
+        return None
+
+    def list_events(
+        self,
+        uid: str,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        profile_id: str | None = None,
+    ) -> list[EventData]:
+        events = [
+            e for (fid, _), evs in self._events.items() if fid == uid for e in evs
+        ]
+        if from_date:
+            events = [e for e in events if e.start >= from_date]
+        if to_date:
+            events = [e for e in events if e.start <= to_date + "T23:59:59"]
+        return sorted(events, key=lambda e: e.start)
+
+    def list_tasks(
+        self, uid: str, completed: bool | None = None
+    ) -> list[StoredTaskData]:
+        tasks = [t for (fid, _), ts in self._tasks.items() if fid == uid for t in ts]
+        if completed is not None:
+            tasks = [t for t in tasks if t.completed == completed]
+        return sorted(tasks, key=lambda t: t.completed)
+
+    def update_task_completed(self, uid: str, task_id: str, completed: bool) -> bool:
+        for (fid, _), tasks in self._tasks.items():
+            if fid != uid:
+                continue
+            for i, task in enumerate(tasks):
+                if task.id == task_id:
+                    tasks[i] = dataclasses.replace(task, completed=completed)
+                    return True
+        return False
+
+    def list_events_by_document(self, uid: str, document_id: str) -> list[EventData]:
+        return list(self._events.get((uid, document_id), []))
+
+    def list_tasks_by_document(
+        self, uid: str, document_id: str
+    ) -> list[StoredTaskData]:
+        return list(self._tasks.get((uid, document_id), []))
+
+
+class InMemoryUserConfigRepository(UserConfigRepository):
+    """メモリ上の UserConfigRepository 実装"""
+
+    def __init__(self) -> None:
+        self._users: dict[str, dict] = {}
+
+    def get_user(self, uid: str) -> dict:
+        return copy.deepcopy(self._users.get(uid, {}))
+
+    def update_user(self, uid: str, data: dict) -> None:
+        _apply_update(self._users.setdefault(uid, {}), data)
+
+    def delete_user(self, uid: str) -> None:
+        self._users.pop(uid, None)
+
+
+class InMemoryFamilyRepository(FamilyRepository):
+    """メモリ上の FamilyRepository 実装"""
+
+    def __init__(self) -> None:
+        self._families: dict[str, dict] = {}
+        self._members: dict[str, dict[str, dict]] = {}
+        self._invitations: dict[str, dict] = {}
+        self._profiles: dict[str, dict[str, UserProfile]] = {}
+
+    def create_family(self, family_id: str, owner_uid: str, name: str) -> None:
+        self._families[family_id] = {
+            "name": name,
+            "owner_uid": owner_uid,
+            "plan": "free",
+            "documents_this_month": 0,
+        }
+
+    def get_family(self, family_id: str) -> dict | None:
+        family = self._families.get(family_id)
+        return dict(family) if family is not None else None
+
+    def update_family(self, family_id: str, data: dict) -> None:
+        _apply_update(self._families.setdefault(family_id, {}), data)
+
+    def add_member(
+        self, family_id: str, uid: str, role: str, display_name: str, email: str
+    ) -> None:
+        self._members.setdefault(family_id, {})[uid] = {
+            "uid": uid,
+            "role": role,
+            "display_name": display_name,
+            "email": email,
+        }
+
+    def remove_member(self, family_id: str, uid: str) -> None:
+        self._members.get(family_id, {}).pop(uid, None)
+
+    def list_members(self, family_id: str) -> list[dict]:
+        return [dict(m) for m in self._members.get(family_id, {}).values()]
+
+    def get_member_role(self, family_id: str, uid: str) -> str | None:
+        member = self._members.get(family_id, {}).get(uid)
+        return member["role"] if member else None
+
+    def create_invitation(
+        self, family_id: str, email: str, invited_by_uid: str, token: str
+    ) -> str:
+        invitation_id = str(uuid.uuid4())
+        self._invitations[invitation_id] = {
+            "id": invitation_id,
+            "family_id": family_id,
+            "email": email,
+            "token": token,
+            "status": "pending",
+            "invited_by_uid": invited_by_uid,
+        }
+        return invitation_id
+
+    def get_invitation_by_token(self, token: str) -> dict | None:
+        for invitation in self._invitations.values():
+            if invitation["token"] == token and invitation["status"] == "pending":
+                return dict(invitation)
+        return None
+
+    def accept_invitation(self, invitation_id: str, family_id: str) -> None:
+        self._invitations[invitation_id]["status"] = "accepted"
+
+    def list_profiles(self, family_id: str) -> list[UserProfile]:
+        return list(self._profiles.get(family_id, {}).values())
+
+    def create_profile(self, family_id: str, profile: UserProfile) -> str:
+        profile_id = profile.id or str(uuid.uuid4())
+        self._profiles.setdefault(family_id, {})[profile_id] = dataclasses.replace(
+            profile, id=profile_id
+        )
+        return profile_id
+
+    def update_profile(
+        self, family_id: str, profile_id: str, profile: UserProfile
+    ) -> None:
+        self._profiles.setdefault(family_id, {})[profile_id] = dataclasses.replace(
+            profile, id=profile_id
+        )
+
+    def delete_profile(self, family_id: str, profile_id: str) -> None:
+        self._profiles.get(family_id, {}).pop(profile_id, None)
+
+    def delete_family_cascade(self, family_id: str) -> None:
+        self._families.pop(family_id, None)
+        self._members.pop(family_id, None)
+        self._profiles.pop(family_id, None)
+        self._invitations = {
+            k: v for k, v in self._invitations.items() if v["family_id"] != family_id
+        }
+
+
+class InMemoryBlobStorage(BlobStorage):
+    """メモリ上の BlobStorage 実装"""
+
+    def __init__(self) -> None:
+        self._blobs: dict[str, bytes] = {}
+
+    def upload(self, blob_path: str, content: bytes, content_type: str) -> str:
+        self._blobs[blob_path] = content
+        return blob_path
+
+    def download(self, blob_path: str) -> bytes:
+        return self._blobs[blob_path]
+
+    def delete(self, blob_path: str) -> None:
+        self._blobs.pop(blob_path, None)
+
+    def generate_signed_url(self, blob_path: str, expiration_minutes: int = 15) -> str:
+        return f"memory://{blob_path}"
+
+    def delete_by_prefix(self, prefix: str) -> None:
+        for path in [p for p in self._blobs if p.startswith(prefix)]:
+            del self._blobs[path]
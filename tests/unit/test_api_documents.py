@@ -4,24 +4,33 @@ dependency_overrides を使ってリポジトリ・ストレージをモック
 実際の Firestore / GCS は使わない。
 """
 
+import base64
+import dataclasses
 import datetime
 import hashlib
 import io
-from unittest.mock import MagicMock
+import re
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from fastapi.testclient import TestClient
-from v2.adapters.firestore_repository import StoredTaskData
-from v2.domain.models import DocumentRecord, EventData
+from v2.domain.models import (
+    DocumentDetail,
+    DocumentRecord,
+    EventData,
+    StoredTaskData,
+)
 from v2.entrypoints.api.app import app
 from v2.entrypoints.api.deps import (
     FamilyContext,
+    get_async_document_repo,
     get_blob_storage,
     get_document_repo,
     get_family_context,
     get_family_repo,
     get_task_queue,
 )
+from v2.entrypoints.api.routes.documents import _decode_cursor, _encode_cursor
 
 _UID = "test-user-uid"
 _FAMILY_ID = "test-family-id"
@@ -66,11 +75,18 @@ def mock_doc_repo():
     repo = MagicMock()
     repo.find_by_content_hash.return_value = None  # 重複なし
     repo.create.return_value = _DOC_ID
+    repo.get.return_value = _DEFAULT_RECORD
+    return repo
+
+
+@pytest.fixture
+def mock_async_doc_repo():
+    """読み取り系ルート（一覧・取得・詳細）が使う AsyncDocumentRepository のモック"""
+    repo = AsyncMock()
     repo.list.return_value = []
     repo.get.return_value = _DEFAULT_RECORD
-    repo.list_events_by_document.return_value = []
-    repo.list_tasks_by_document.return_value = []
-    repo.get_document_extras_raw.return_value = None  # extrasなし（デフォルト）
+    # イベント・タスク・extras なし（デフォルト）
+    repo.get_document_detail.return_value = DocumentDetail(record=_DEFAULT_RECORD)
     return repo
 
 
@@ -94,10 +110,13 @@ def mock_queue():
 
 
 @pytest.fixture
-def client(mock_doc_repo, mock_family_repo, mock_storage, mock_queue):
+def client(
+    mock_doc_repo, mock_async_doc_repo, mock_family_repo, mock_storage, mock_queue
+):
     """モックを差し込んだ FastAPI テストクライアント"""
     app.dependency_overrides[get_family_context] = lambda: _FAMILY_CONTEXT
     app.dependency_overrides[get_document_repo] = lambda: mock_doc_repo
+    app.dependency_overrides[get_async_document_repo] = lambda: mock_async_doc_repo
     app.dependency_overrides[get_family_repo] = lambda: mock_family_repo
     app.dependency_overrides[get_blob_storage] = lambda: mock_storage
     app.dependency_overrides[get_task_queue] = lambda: mock_queue
@@ -273,9 +292,11 @@ class TestListDocuments:
         assert response.status_code == 200
         assert response.json() == []
 
-    def test_list_with_null_archive_filename_returns_200(self, client, mock_doc_repo):
+    def test_list_with_null_archive_filename_returns_200(
+        self, client, mock_async_doc_repo
+    ):
         """archive_filename が None のドキュメントが存在しても 500 にならず空文字で返る"""
-        mock_doc_repo.list.return_value = [
+        mock_async_doc_repo.list.return_value = [
             DocumentRecord(
                 id=_DOC_ID,
                 uid=_UID,
@@ -291,6 +312,75 @@ class TestListDocuments:
         assert response.status_code == 200
         assert response.json()[0]["archive_filename"] == ""
 
+    def test_list_without_limit_uses_default_page_size(
+        self, client, mock_async_doc_repo
+    ):
+        """limit 省略時は既定の件数（50件）で1ページ分だけ取得する"""
+        response = client.get("/api/documents")
+        assert response.status_code == 200
+        mock_async_doc_repo.list.assert_called_once_with(
+            _FAMILY_ID, limit=51, start_after=None, start_after_id=None
+        )
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_list_with_limit_returns_next_cursor(self, client, mock_async_doc_repo):
+        """limit+1 件取得でき次ページがある場合、最後の要素の created_at と ID をカーソルで返す"""
+        mock_async_doc_repo.list.return_value = [
+            dataclasses.replace(
+                _DEFAULT_RECORD,
+                id=f"doc-{i}",
+                created_at=_CREATED_AT - datetime.timedelta(days=i),
+            )
+            for i in range(3)
+        ]
+        response = client.get("/api/documents?limit=2")
+
+        assert response.status_code == 200
+        assert [d["id"] for d in response.json()] == ["doc-0", "doc-1"]
+        mock_async_doc_repo.list.assert_called_once_with(
+            _FAMILY_ID, limit=3, start_after=None, start_after_id=None
+        )
+        cursor = response.headers["X-Next-Cursor"]
+        # クエリ文字列にそのまま載せられる不透明な値
+        assert re.fullmatch(r"[A-Za-z0-9_-]+", cursor)
+        assert _decode_cursor(cursor) == (
+            _CREATED_AT - datetime.timedelta(days=1),
+            "doc-1",
+        )
+
+    def test_list_last_page_has_no_cursor(self, client, mock_async_doc_repo):
+        mock_async_doc_repo.list.return_value = [_DEFAULT_RECORD]
+        response = client.get("/api/documents?limit=2")
+        assert response.status_code == 200
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_list_passes_cursor_as_start_after(self, client, mock_async_doc_repo):
+        response = client.get(
+            "/api/documents",
+            params={"limit": 2, "cursor": _encode_cursor(_CREATED_AT, "doc-1")},
+        )
+        assert response.status_code == 200
+        mock_async_doc_repo.list.assert_called_once_with(
+            _FAMILY_ID, limit=3, start_after=_CREATED_AT, start_after_id="doc-1"
+        )
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "not-a-cursor",
+            _CREATED_AT.isoformat(),
+            base64.urlsafe_b64encode(b"2026-01-01T00:00:00|").decode(),
+            base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+        ],
+    )
+    def test_list_invalid_cursor_returns_400(self, client, cursor):
+        response = client.get("/api/documents", params={"limit": 2, "cursor": cursor})
+        assert response.status_code == 400
+
+    def test_list_limit_out_of_range_returns_422(self, client):
+        assert client.get("/api/documents?limit=0").status_code == 422
+        assert client.get("/api/documents?limit=1000").status_code == 422
+
 
 class TestGetDocument:
     """GET /api/documents/{id} のテスト"""
@@ -303,9 +393,9 @@ class TestGetDocument:
         assert data["id"] == _DOC_ID
         assert data["status"] == "completed"
 
-    def test_get_nonexistent_returns_404(self, client, mock_doc_repo):
+    def test_get_nonexistent_returns_404(self, client, mock_async_doc_repo):
         """存在しないドキュメントは 404 を返す"""
-        mock_doc_repo.get.return_value = None
+        mock_async_doc_repo.get.return_value = None
         response = client.get("/api/documents/nonexistent-id")
         assert response.status_code == 404
 
@@ -323,9 +413,11 @@ class TestGetDocument:
         data = response.json()
         assert data["created_at"] == _CREATED_AT.isoformat()
 
-    def test_get_document_created_at_none_when_missing(self, client, mock_doc_repo):
+    def test_get_document_created_at_none_when_missing(
+        self, client, mock_async_doc_repo
+    ):
         """created_at が None のとき null を返すこと"""
-        mock_doc_repo.get.return_value = DocumentRecord(
+        mock_async_doc_repo.get.return_value = DocumentRecord(
             id=_DOC_ID,
             uid=_UID,
             status="completed",
@@ -365,28 +457,31 @@ class TestGetDocumentDetail:
         assert data["events"] == []
         assert data["tasks"] == []
 
-    def test_detail_returns_events_and_tasks(self, client, mock_doc_repo):
+    def test_detail_returns_events_and_tasks(self, client, mock_async_doc_repo):
         """イベント・タスクが存在する場合はそれぞれのリストを返す"""
-        mock_doc_repo.list_events_by_document.return_value = [
-            EventData(
-                summary="遠足",
-                start="2025-10-25",
-                end="2025-10-25",
-                location="動物園",
-                description="",
-                confidence="HIGH",
-            )
-        ]
-        mock_doc_repo.list_tasks_by_document.return_value = [
-            StoredTaskData(
-                id="task-1",
-                title="同意書の提出",
-                due_date="2025-10-10",
-                assignee="PARENT",
-                note="",
-                completed=False,
-            )
-        ]
+        mock_async_doc_repo.get_document_detail.return_value = DocumentDetail(
+            record=_DEFAULT_RECORD,
+            events=[
+                EventData(
+                    summary="遠足",
+                    start="2025-10-25",
+                    end="2025-10-25",
+                    location="動物園",
+                    description="",
+                    confidence="HIGH",
+                )
+            ],
+            tasks=[
+                StoredTaskData(
+                    id="task-1",
+                    title="同意書の提出",
+                    due_date="2025-10-10",
+                    assignee="PARENT",
+                    note="",
+                    completed=False,
+                )
+            ],
+        )
 
         response = client.get(f"/api/documents/{_DOC_ID}/detail")
         assert response.status_code == 200
@@ -400,28 +495,33 @@ class TestGetDocumentDetail:
         assert data["tasks"][0]["title"] == "同意書の提出"
         assert data["tasks"][0]["completed"] is False
 
-    def test_detail_nonexistent_document_returns_404(self, client, mock_doc_repo):
+    def test_detail_nonexistent_document_returns_404(self, client, mock_async_doc_repo):
         """存在しないドキュメントは 404 を返す"""
-        mock_doc_repo.get.return_value = None
+        mock_async_doc_repo.get_document_detail.return_value = None
         response = client.get("/api/documents/nonexistent/detail")
         assert response.status_code == 404
 
-    def test_detail_returns_extras_when_present(self, client, mock_doc_repo):
+    def test_detail_returns_extras_when_present(self, client, mock_async_doc_repo):
         """extrasが存在する場合はレスポンスに含まれること"""
-        mock_doc_repo.get_document_extras_raw.return_value = {
-            "items_to_bring": [{"item": "水筒", "event_index": -1, "source_text": ""}],
-            "dress_code": ["体操服"],
-            "costs": [
-                {
-                    "description": "遠足代",
-                    "amount": 500,
-                    "due_date": "2025-10-10",
-                    "source_text": "",
-                }
-            ],
-            "notes": ["雨天中止"],
-            "source_texts": [],
-        }
+        mock_async_doc_repo.get_document_detail.return_value = DocumentDetail(
+            record=_DEFAULT_RECORD,
+            extras={
+                "items_to_bring": [
+                    {"item": "水筒", "event_index": -1, "source_text": ""}
+                ],
+                "dress_code": ["体操服"],
+                "costs": [
+                    {
+                        "description": "遠足代",
+                        "amount": 500,
+                        "due_date": "2025-10-10",
+                        "source_text": "",
+                    }
+                ],
+                "notes": ["雨天中止"],
+                "source_texts": [],
+            },
+        )
 
         response = client.get(f"/api/documents/{_DOC_ID}/detail")
         assert response.status_code == 200
@@ -444,21 +544,24 @@ class TestGetDocumentDetail:
         data = response.json()
         assert data["extras"] is None
 
-    def test_detail_extras_filters_invalid_entries(self, client, mock_doc_repo):
+    def test_detail_extras_filters_invalid_entries(self, client, mock_async_doc_repo):
         """extras内の不正エントリ（item/descriptionなし）はフィルタされること"""
-        mock_doc_repo.get_document_extras_raw.return_value = {
-            "items_to_bring": [
-                {"item": "水筒", "event_index": 0},
-                {"event_index": 0},  # item欠損 → フィルタされる
-            ],
-            "dress_code": [],
-            "costs": [
-                {"description": "遠足代", "amount": None},
-                {},  # description欠損 → フィルタされる
-            ],
-            "notes": [],
-            "source_texts": [],
-        }
+        mock_async_doc_repo.get_document_detail.return_value = DocumentDetail(
+            record=_DEFAULT_RECORD,
+            extras={
+                "items_to_bring": [
+                    {"item": "水筒", "event_index": 0},
+                    {"event_index": 0},  # item欠損 → フィルタされる
+                ],
+                "dress_code": [],
+                "costs": [
+                    {"description": "遠足代", "amount": None},
+                    {},  # description欠損 → フィルタされる
+                ],
+                "notes": [],
+                "source_texts": [],
+            },
+        )
 
         response = client.get(f"/api/documents/{_DOC_ID}/detail")
         assert response.status_code == 200
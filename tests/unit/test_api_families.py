@@ -6,6 +6,7 @@ dependency_overrides を使ってリポジトリをモックに差し替える
 from unittest.mock import MagicMock, patch
 
 import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 from v2.entrypoints.api.app import app
 from v2.entrypoints.api.deps import (
@@ -15,6 +16,7 @@ from v2.entrypoints.api.deps import (
     get_family_context,
     get_family_repo,
     get_user_config_repo,
+    require_member,
     require_owner,
 )
 
@@ -60,6 +62,7 @@ def mock_user_repo():
 def owner_client(mock_family_repo, mock_user_repo):
     """オーナー権限のテストクライアント"""
     app.dependency_overrides[get_family_context] = lambda: _OWNER_CONTEXT
+    app.dependency_overrides[require_member] = lambda: _OWNER_CONTEXT
     app.dependency_overrides[require_owner] = lambda: _OWNER_CONTEXT
     app.dependency_overrides[get_family_repo] = lambda: mock_family_repo
     app.dependency_overrides[get_user_config_repo] = lambda: mock_user_repo
@@ -74,6 +77,7 @@ def owner_client(mock_family_repo, mock_user_repo):
 def member_client(mock_family_repo, mock_user_repo):
     """メンバー権限のテストクライアント（招待ができないケース用）"""
     app.dependency_overrides[get_family_context] = lambda: _MEMBER_CONTEXT
+    app.dependency_overrides[require_member] = lambda: _MEMBER_CONTEXT
     app.dependency_overrides[require_owner] = _raise_forbidden
     app.dependency_overrides[get_family_repo] = lambda: mock_family_repo
     app.dependency_overrides[get_user_config_repo] = lambda: mock_user_repo
@@ -255,10 +259,14 @@ class TestJoinFamily:
             )
         assert response.status_code == 200
         # is_activated: True が update_user に渡されていることを確認
-        mock_user_repo.update_user.assert_called_once_with(
-            _JOIN_AUTH_INFO.uid,
-            {"family_id": _FAMILY_ID, "is_activated": True},
-        )
+        mock_user_repo.update_user.assert_called_once()
+        uid, updates = mock_user_repo.update_user.call_args.args
+        assert uid == _JOIN_AUTH_INFO.uid
+        assert updates["family_id"] == _FAMILY_ID
+        assert updates["is_activated"] is True
+        # 同じファミリーへの再参加でも古いロールが残らないようスナップショットを書き直す
+        assert updates["member"]["family_id"] == _FAMILY_ID
+        assert updates["member"]["role"] == "member"
         # Custom Claims が設定されていることを確認
         mock_set_claims.assert_called_once_with(
             _JOIN_AUTH_INFO.uid, {"is_activated": True}
@@ -288,7 +296,111 @@ class TestRemoveMember:
         # Custom Claims がクリアされていることを確認
         mock_set_claims.assert_called_once_with(member_uid, {"is_activated": False})
 
+    def test_invalidates_removed_member_context(self, owner_client, mock_family_repo):
+        """削除したメンバーの FamilyContext キャッシュを破棄する"""
+        member_uid = "member-to-remove"
+        mock_family_repo.list_members.return_value = [
+            {"uid": _UID, "role": "owner"},
+            {"uid": member_uid, "role": "member"},
+        ]
+        with (
+            patch("v2.entrypoints.api.routes.families.fb_auth.set_custom_user_claims"),
+            patch(
+                "v2.entrypoints.api.routes.families.invalidate_family_context"
+            ) as mock_invalidate,
+        ):
+            response = owner_client.delete(f"/api/families/members/{member_uid}")
+        assert response.status_code == 204
+        mock_invalidate.assert_called_once_with(member_uid)
+
     def test_cannot_remove_self(self, owner_client):
         """オーナー自身は削除できない（400）"""
         response = owner_client.delete(f"/api/families/members/{_UID}")
         assert response.status_code == 400
+
+
+class TestRequireOwner:
+    """require_owner() はメンバードキュメントのロールで判定する"""
+
+    def test_owner_passes_without_snapshot_rewrite(self, mock_family_repo):
+        mock_family_repo.get_member.return_value = {"role": "owner"}
+        user_repo = MagicMock()
+
+        ctx = require_owner(_OWNER_CONTEXT, mock_family_repo, user_repo)
+
+        assert ctx == _OWNER_CONTEXT
+        mock_family_repo.get_member.assert_called_once_with(_FAMILY_ID, _UID)
+        user_repo.update_user.assert_not_called()
+
+    def test_demoted_owner_is_rejected_and_snapshot_repaired(self, mock_family_repo):
+        """スナップショットが owner のままでも、メンバードキュメントが member なら 403"""
+        mock_family_repo.get_member.return_value = {
+            "role": "member",
+            "email": "papa@example.com",
+            "display_name": "パパ",
+        }
+        user_repo = MagicMock()
+
+        with (
+            patch("v2.entrypoints.api.deps.invalidate_family_context") as invalidate,
+            pytest.raises(HTTPException) as exc_info,
+        ):
+            require_owner(_OWNER_CONTEXT, mock_family_repo, user_repo)
+
+        assert exc_info.value.status_code == 403
+        user_repo.update_user.assert_called_once()
+        assert user_repo.update_user.call_args.args[1]["member"]["role"] == "member"
+        invalidate.assert_called_once_with(_UID)
+
+    def test_promoted_member_passes(self, mock_family_repo):
+        mock_family_repo.get_member.return_value = {"role": "owner"}
+
+        ctx = require_owner(_MEMBER_CONTEXT, mock_family_repo, MagicMock())
+
+        assert ctx.role == "owner"
+
+    def test_missing_member_is_rejected(self, mock_family_repo):
+        mock_family_repo.get_member.return_value = None
+
+        with pytest.raises(HTTPException):
+            require_owner(_OWNER_CONTEXT, mock_family_repo, MagicMock())
+
+
+class TestRequireMember:
+    """require_member() は別インスタンスで削除されたメンバーをキャッシュの TTL 内でも拒否する"""
+
+    def test_member_passes(self, mock_family_repo):
+        mock_family_repo.get_member.return_value = {"role": "member"}
+        user_repo = MagicMock()
+
+        ctx = require_member(_MEMBER_CONTEXT, mock_family_repo, user_repo)
+
+        assert ctx == _MEMBER_CONTEXT
+        user_repo.update_user.assert_not_called()
+
+    def test_removed_member_is_rejected_and_cache_invalidated(self, mock_family_repo):
+        mock_family_repo.get_member.return_value = None
+
+        with (
+            patch("v2.entrypoints.api.deps.invalidate_family_context") as invalidate,
+            pytest.raises(HTTPException) as exc_info,
+        ):
+            require_member(_MEMBER_CONTEXT, mock_family_repo, MagicMock())
+
+        assert exc_info.value.status_code == 403
+        invalidate.assert_called_once_with(_MEMBER_CONTEXT.uid)
+
+    def test_list_members_rechecks_membership(self, mock_family_repo, mock_user_repo):
+        """GET /members は get_family_context のキャッシュだけで通さない"""
+        mock_family_repo.get_member.return_value = None
+        app.dependency_overrides[get_family_context] = lambda: _MEMBER_CONTEXT
+        app.dependency_overrides[get_family_repo] = lambda: mock_family_repo
+        app.dependency_overrides[get_user_config_repo] = lambda: mock_user_repo
+        try:
+            with TestClient(app) as c:
+                response = c.get("/api/families/members")
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 403
+        mock_family_repo.list_members.assert_not_called()
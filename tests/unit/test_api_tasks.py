@@ -3,14 +3,14 @@
 dependency_overrides を使ってリポジトリをモックに差し替える。
 """
 
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock
 
 import pytest
 from fastapi.testclient import TestClient
 from v2.entrypoints.api.app import app
 from v2.entrypoints.api.deps import (
     FamilyContext,
-    get_document_repo,
+    get_async_document_repo,
     get_family_context,
 )
 
@@ -21,14 +21,14 @@ _FAMILY_CONTEXT = FamilyContext(uid=_UID, family_id=_FAMILY_ID, role="owner")
 
 @pytest.fixture
 def mock_doc_repo():
-    return MagicMock()
+    return AsyncMock()
 
 
 @pytest.fixture
 def client(mock_doc_repo):
     """モックを差し込んだ FastAPI テストクライアント"""
     app.dependency_overrides[get_family_context] = lambda: _FAMILY_CONTEXT
-    app.dependency_overrides[get_document_repo] = lambda: mock_doc_repo
+    app.dependency_overrides[get_async_document_repo] = lambda: mock_doc_repo
 
     with TestClient(app) as c:
         yield c
@@ -0,0 +1,85 @@
+"""create_app()（APP_ROLE ごとのアプリ組み立て）と import 対象のユニットテスト
+
+import 時間そのものは環境で揺らぐため、ここでは検証しない（make bench-import で予算を確認する）。
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from v2.entrypoints.api.app import create_app
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# API のコールドスタートで読み込んではいけない重い SDK
+_HEAVY_MODULES = (
+    "vertexai",
+    "google.cloud.aiplatform",
+    "google.cloud.tasks_v2",
+    "pypdf",
+)
+
+
+def _paths(app) -> set[str]:
+    return set(app.openapi()["paths"])
+
+
+class TestCreateApp:
+    def test_all_includes_api_and_worker(self):
+        paths = _paths(create_app("all"))
+
+        assert "/api/documents" in paths
+        assert "/worker/analyze" in paths
+        assert "/health" in paths
+
+    def test_api_role_excludes_worker_routes(self):
+        paths = _paths(create_app("api"))
+
+        assert "/api/documents" in paths
+        assert not any(p.startswith("/worker") for p in paths)
+
+    def test_worker_role_excludes_api_routes(self):
+        paths = _paths(create_app("worker"))
+
+        assert "/worker/analyze" in paths
+        assert "/health" in paths
+        assert not any(p.startswith("/api") for p in paths)
+
+    def test_role_from_env(self, monkeypatch):
+        monkeypatch.setenv("APP_ROLE", "worker")
+
+        assert not any(p.startswith("/api") for p in _paths(create_app()))
+
+    def test_unknown_role(self):
+        with pytest.raises(ValueError, match="APP_ROLE"):
+            create_app("batch")
+
+
+def _imported_modules(role: str) -> set[str]:
+    """新しいプロセスで API アプリを import し、読み込まれたモジュール名を返す"""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, v2.entrypoints.api.app; print(*sys.modules, sep='\\n')",
+        ],
+        cwd=_REPO_ROOT,
+        env={**os.environ, "APP_ROLE": role},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+class TestImportGraph:
+    """新しいプロセスでの import（Cloud Run のコールドスタート相当）"""
+
+    def test_heavy_sdks_are_not_imported(self):
+        imported = _imported_modules("all")
+
+        assert not [m for m in imported if any(m.startswith(h) for h in _HEAVY_MODULES)]
@@ -0,0 +1,178 @@
+"""caching_repository.py（DocumentRepository のリードスルーキャッシュ）のユニットテスト"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from v2.adapters.caching_repository import (
+    _MISSING,
+    AsyncCachingDocumentRepository,
+    CachingDocumentRepository,
+    DocumentReadCache,
+)
+from v2.domain.models import EventData, StoredTaskData
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _task(task_id: str, completed: bool = False) -> StoredTaskData:
+    return StoredTaskData(
+        id=task_id,
+        title="提出",
+        due_date="2026-05-01",
+        assignee="",
+        note="",
+        completed=completed,
+    )
+
+
+def _inner() -> MagicMock:
+    inner = MagicMock()
+    inner.list_tasks.return_value = [_task("d_1")]
+    inner.list_events.return_value = [
+        EventData(summary="遠足", start="2026-05-01", end="2026-05-01")
+    ]
+    inner.list.return_value = []
+    return inner
+
+
+class TestDocumentReadCache:
+    def test_expires_after_ttl(self):
+        clock = _FakeClock()
+        cache = DocumentReadCache(ttl_seconds=10, clock=clock)
+        cache.put(("f1", "list_tasks", None), ["x"], cache.generation("f1"))
+
+        assert cache.get(("f1", "list_tasks", None)) == ["x"]
+        clock.now += 11
+        cache.get(("f1", "list_tasks", None))
+        assert cache.stats() == {
+            "hits": 1,
+            "misses": 1,
+            "entries": 0,
+            "generations": 0,
+        }
+
+    def test_evicts_least_recently_used(self):
+        cache = DocumentReadCache(ttl_seconds=60, max_entries=2)
+        for name in ("a", "b"):
+            cache.put(("f1", name), [name], 0)
+        cache.get(("f1", "a"))
+        cache.put(("f1", "c"), ["c"], 0)
+
+        assert cache.get(("f1", "a")) == ["a"]
+        assert cache.stats()["entries"] == 2
+        cache.get(("f1", "b"))
+        assert cache.misses == 1
+
+    def test_stale_load_is_not_stored_after_invalidation(self):
+        """読み込み中に無効化された結果は保存しない"""
+        cache = DocumentReadCache(ttl_seconds=60)
+        generation = cache.generation("f1")
+        cache.invalidate_family("f1")
+        cache.put(("f1", "list_tasks", None), ["stale"], generation)
+
+        assert cache.stats()["entries"] == 0
+
+    def test_generations_are_bounded(self):
+        """無効化したファミリーの世代番号もエントリ数の上限までしか保持しない"""
+        cache = DocumentReadCache(ttl_seconds=60, max_entries=2)
+        for family_id in ("f1", "f2", "f3", "f4"):
+            cache.invalidate_family(family_id)
+
+        assert cache.stats()["generations"] == 2
+
+    def test_stale_load_is_not_stored_after_generation_eviction(self):
+        """世代番号が上限で捨てられたあとも、無効化前に読み込んだ結果は保存しない"""
+        cache = DocumentReadCache(ttl_seconds=60, max_entries=1)
+        generation = cache.generation("f1")
+        cache.invalidate_family("f1")
+        cache.invalidate_family("f2")  # f1 の世代番号を押し出す
+        cache.put(("f1", "list_tasks", None), ["stale"], generation)
+
+        assert cache.get(("f1", "list_tasks", None)) is _MISSING
+        cache.put(("f1", "list_tasks", None), ["fresh"], cache.generation("f1"))
+        assert cache.get(("f1", "list_tasks", None)) == ["fresh"]
+
+
+class TestCachingDocumentRepository:
+    def test_repeated_reads_hit_cache(self):
+        inner = _inner()
+        cache = DocumentReadCache(ttl_seconds=60)
+        repo = CachingDocumentRepository(inner, cache)
+
+        repo.list_tasks("f1", completed=False)
+        tasks = repo.list_tasks("f1", completed=False)
+
+        assert [t.id for t in tasks] == ["d_1"]
+        inner.list_tasks.assert_called_once_with("f1", completed=False)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_arguments_and_families_are_cached_separately(self):
+        inner = _inner()
+        repo = CachingDocumentRepository(inner, DocumentReadCache(ttl_seconds=60))
+
+        repo.list_events("f1", from_date="2026-05-01")
+        repo.list_events("f1", from_date="2026-06-01")
+        repo.list_events("f2", from_date="2026-05-01")
+
+        assert inner.list_events.call_count == 3
+
+    def test_writes_invalidate_only_that_family(self):
+        inner = _inner()
+        repo = CachingDocumentRepository(inner, DocumentReadCache(ttl_seconds=60))
+        repo.list_tasks("f1")
+        repo.list_tasks("f2")
+
+        repo.update_task_completed("f1", "d_1", True)
+        repo.list_tasks("f1")
+        repo.list_tasks("f2")
+
+        assert inner.list_tasks.call_count == 3
+
+    def test_each_write_method_invalidates(self):
+        inner = _inner()
+        repo = CachingDocumentRepository(inner, DocumentReadCache(ttl_seconds=60))
+        writes = [
+            lambda: repo.create("f1", MagicMock()),
+            lambda: repo.update_status("f1", "doc-1", "processing"),
+            lambda: repo.save_analysis("f1", "doc-1", MagicMock()),
+            lambda: repo.delete("f1", "doc-1"),
+            lambda: repo.update_task_completed("f1", "d_1", True),
+        ]
+        for write in writes:
+            repo.list("f1")
+            write()
+        repo.list("f1")
+
+        assert inner.list.call_count == len(writes) + 1
+
+    def test_returned_list_is_a_copy(self):
+        repo = CachingDocumentRepository(_inner(), DocumentReadCache(ttl_seconds=60))
+        repo.list_tasks("f1").clear()
+
+        assert len(repo.list_tasks("f1")) == 1
+
+
+class TestAsyncCachingDocumentRepository:
+    def test_shares_cache_with_sync_writes(self):
+        """同期版の書き込みで async 版のキャッシュも無効化される"""
+        cache = DocumentReadCache(ttl_seconds=60)
+        inner = AsyncMock()
+        inner.list_tasks.return_value = [_task("d_1")]
+        async_repo = AsyncCachingDocumentRepository(inner, cache)
+        sync_repo = CachingDocumentRepository(_inner(), cache)
+
+        asyncio.run(async_repo.list_tasks("f1"))
+        asyncio.run(async_repo.list_tasks("f1"))
+        assert inner.list_tasks.await_count == 1
+
+        sync_repo.save_analysis("f1", "doc-1", MagicMock())
+        asyncio.run(async_repo.list_tasks("f1"))
+        assert inner.list_tasks.await_count == 2
@@ -5,9 +5,14 @@
   2. Cloud Run 環境 (SERVICE_ACCOUNT_EMAIL 設定) → IAM signBlob API
      2a. credentials が期限切れ → refresh() が呼ばれる
      2b. credentials が有効 → refresh() はスキップ
+     2c. ADC の取得は初回のみ（インスタンスはプロセスで共有される）
+     2d. 並行に署名しても期限切れの credentials の refresh() は1回だけ
   3. ローカルデフォルト (いずれも未設定) → service_account_email なしで署名
 """
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 from google.cloud import storage as gcs
@@ -121,6 +126,72 @@ class TestGenerateSignedUrlCloudRun:
 
         mock_credentials.refresh.assert_not_called()
 
+    def test_loads_default_credentials_once(self, monkeypatch):
+        """google.auth.default() は初回の署名時のみ呼ぶ。"""
+        monkeypatch.delenv("STORAGE_EMULATOR_HOST", raising=False)
+        monkeypatch.setenv(
+            "SERVICE_ACCOUNT_EMAIL", "sa@project.iam.gserviceaccount.com"
+        )
+
+        mock_credentials = MagicMock()
+        mock_credentials.valid = True
+        mock_credentials.token = "valid-token"
+
+        storage_adapter, mock_bucket = _make_storage()
+        mock_bucket.blob.return_value.generate_signed_url.return_value = "https://x"
+
+        with patch(
+            "google.auth.default", return_value=(mock_credentials, "project-id")
+        ) as mock_default:
+            storage_adapter.generate_signed_url("uploads/uid/a.pdf")
+            storage_adapter.generate_signed_url("uploads/uid/b.pdf")
+
+        mock_default.assert_called_once()
+
+    def test_concurrent_signing_refreshes_once(self, monkeypatch):
+        """スレッドプールから同時に署名しても refresh() は1回だけ呼ぶ。"""
+        monkeypatch.delenv("STORAGE_EMULATOR_HOST", raising=False)
+        monkeypatch.setenv(
+            "SERVICE_ACCOUNT_EMAIL", "sa@project.iam.gserviceaccount.com"
+        )
+
+        mock_credentials = MagicMock()
+        mock_credentials.valid = False
+        mock_credentials.token = None
+        refreshes = []
+        refresh_lock = threading.Lock()
+
+        def refresh(request):
+            with refresh_lock:
+                refreshes.append(request)
+            time.sleep(0.05)  # 更新中に他のスレッドが valid を確認する
+            mock_credentials.token = "refreshed-token"
+            mock_credentials.valid = True
+
+        mock_credentials.refresh.side_effect = refresh
+
+        storage_adapter, mock_bucket = _make_storage()
+        mock_blob = mock_bucket.blob.return_value
+        mock_blob.generate_signed_url.return_value = "https://x"
+
+        with (
+            patch("google.auth.default", return_value=(mock_credentials, "p")),
+            ThreadPoolExecutor(8) as executor,
+        ):
+            list(
+                executor.map(
+                    storage_adapter.generate_signed_url,
+                    [f"uploads/uid/{i}.pdf" for i in range(8)],
+                )
+            )
+
+        assert len(refreshes) == 1
+        tokens = {
+            c.kwargs["access_token"]
+            for c in mock_blob.generate_signed_url.call_args_list
+        }
+        assert tokens == {"refreshed-token"}
+
 
 class TestGenerateSignedUrlLocal:
     def test_no_service_account_email_in_kwargs(self, monkeypatch):
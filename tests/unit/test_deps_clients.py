@@ -0,0 +1,54 @@
+"""deps.get_blob_storage / get_task_queue（プロセス共有クライアント）のユニットテスト"""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from v2.entrypoints.api import deps
+
+
+@pytest.fixture(autouse=True)
+def _reset_singletons(monkeypatch):
+    monkeypatch.setattr(deps, "_blob_storage", None)
+    monkeypatch.setattr(deps, "_task_queue", None)
+
+
+class TestGetBlobStorage:
+    def test_constructs_client_once(self, monkeypatch):
+        monkeypatch.setenv("GCS_BUCKET_NAME", "bucket")
+        with patch("v2.entrypoints.api.deps.GCSBlobStorage") as storage_cls:
+            first = deps.get_blob_storage()
+            second = deps.get_blob_storage()
+
+        assert first is second
+        storage_cls.assert_called_once_with(bucket_name="bucket")
+
+
+class TestGetTaskQueue:
+    @pytest.fixture
+    def queue_env(self, monkeypatch):
+        monkeypatch.delenv("LOCAL_MODE", raising=False)
+        for name, value in {
+            "PROJECT_ID": "proj",
+            "CLOUD_TASKS_QUEUE": "document-analysis",
+            "WORKER_URL": "https://worker",
+            "SERVICE_ACCOUNT_EMAIL": "sa@example.com",
+        }.items():
+            monkeypatch.setenv(name, value)
+
+    def test_constructs_client_once(self, queue_env):
+        with patch("v2.entrypoints.api.deps.CloudTasksQueue") as queue_cls:
+            first = deps.get_task_queue()
+            second = deps.get_task_queue()
+
+        assert first is second
+        queue_cls.assert_called_once()
+        assert queue_cls.call_args.kwargs["location"] == "asia-northeast1"
+
+    def test_local_mode_returns_none(self, queue_env, monkeypatch):
+        monkeypatch.setenv("LOCAL_MODE", "true")
+        with patch("v2.entrypoints.api.deps.CloudTasksQueue") as queue_cls:
+            assert deps.get_task_queue() is None
+
+        queue_cls.assert_not_called()
@@ -1,11 +1,13 @@
 """DocumentProcessor のユニットテスト"""
 
+import asyncio
 import logging
 from unittest.mock import MagicMock
 
 import pytest
-from v2.domain.models import AnalysisResult, UserProfile
-from v2.domain.ports import DocumentAnalyzer
+from v2.adapters.pdf_text_layer import PypdfTextLayerExtractor
+from v2.domain.models import AnalysisResult, DocumentInput, TokenUsage, UserProfile
+from v2.domain.ports import DocumentAnalyzer, TextLayerExtractor
 from v2.services.document_processor import DocumentProcessor
 
 
@@ -94,3 +96,247 @@ class TestDocumentProcessor:
         assert any(
             "Document processing failed" in r.getMessage() for r in caplog.records
         )
+
+
+# ─── テキストレイヤー優先モード ──────────────────────────────────────────────
+
+
+def _text_pdf(page_texts: list[str]) -> bytes:
+    """各ページに ASCII テキストを描画した最小限の PDF を生成する"""
+    n = len(page_texts)
+    font_id = 3 + 2 * n
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        (
+            "<< /Type /Pages /Kids ["
+            + " ".join(f"{3 + 2 * i} 0 R" for i in range(n))
+            + f"] /Count {n} >>"
+        ).encode(),
+    ]
+    for i, text in enumerate(page_texts):
+        stream = f"BT /F1 10 Tf 20 700 Td ({text}) Tj ET".encode()
+        objects.append(
+            (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                f"/Contents {4 + 2 * i} 0 R "
+                f"/Resources << /Font << /F1 {font_id} 0 R >> >> >>"
+            ).encode()
+        )
+        objects.append(
+            f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream"
+        )
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for num, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{num} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_offset = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref_offset}\n%%EOF\n"
+    ).encode()
+    return out
+
+
+class TestPypdfTextLayerExtractor:
+    """PypdfTextLayerExtractor の単体テスト"""
+
+    def test_extracts_text_per_page(self):
+        extractor = PypdfTextLayerExtractor()
+        pages = extractor.extract_pages(
+            _text_pdf(["Sports day notice", "Bring a water bottle"]),
+            "application/pdf",
+        )
+        assert pages == ["Sports day notice", "Bring a water bottle"]
+
+    def test_non_pdf_returns_none(self):
+        assert PypdfTextLayerExtractor().extract_pages(b"jpeg", "image/jpeg") is None
+
+    def test_corrupted_pdf_returns_none(self):
+        assert (
+            PypdfTextLayerExtractor().extract_pages(b"not-a-pdf", "application/pdf")
+            is None
+        )
+
+
+class TestTextLayerMode:
+    """DocumentProcessor のテキストレイヤー優先モード"""
+
+    _LONG_PAGE = "運動会のお知らせ " * 30
+
+    def _processor(self, mock_analyzer, pages):
+        extractor = MagicMock(spec=TextLayerExtractor)
+        extractor.extract_pages.return_value = pages
+        return DocumentProcessor(
+            analyzer=mock_analyzer, text_extractor=extractor, min_chars_per_page=50
+        )
+
+    def test_text_rich_pdf_sends_text_instead_of_binary(
+        self, mock_analyzer, sample_analysis
+    ):
+        """全ページに十分なテキストがあれば text/plain で送信し input_mode を記録する"""
+        mock_analyzer.analyze.return_value = AnalysisResult(
+            analysis=sample_analysis, token_usage=TokenUsage(prompt_tokens=100)
+        )
+        processor = self._processor(mock_analyzer, [self._LONG_PAGE, self._LONG_PAGE])
+
+        result = processor.process(b"%PDF-binary", "application/pdf", {})
+
+        sent_content, sent_mime = mock_analyzer.analyze.call_args.args[:2]
+        assert sent_mime == "text/plain"
+        text = sent_content.decode("utf-8")
+        assert "[page 1]" in text and "[page 2]" in text
+        assert "運動会のお知らせ" in text
+        assert result.token_usage.input_mode == "text_layer"
+        assert result.token_usage.prompt_tokens == 100
+
+    def test_scanned_page_falls_back_to_binary(self, mock_analyzer):
+        """テキストの乏しいページが1枚でもあればバイナリを送信する"""
+        processor = self._processor(mock_analyzer, [self._LONG_PAGE, ""])
+
+        processor.process(b"%PDF-binary", "application/pdf", {})
+
+        mock_analyzer.analyze.assert_called_once_with(
+            b"%PDF-binary", "application/pdf", {}, None
+        )
+
+    def test_garbled_text_falls_back_to_binary(self, mock_analyzer):
+        """置換文字だらけのテキストレイヤーは採用しない"""
+        processor = self._processor(mock_analyzer, ["�" * 100])
+
+        processor.process(b"%PDF-binary", "application/pdf", {})
+
+        assert mock_analyzer.analyze.call_args.args[1] == "application/pdf"
+
+    def test_no_text_layer_keeps_binary_mode(self, mock_analyzer, sample_analysis):
+        mock_analyzer.analyze.return_value = AnalysisResult(
+            analysis=sample_analysis, token_usage=TokenUsage()
+        )
+        processor = self._processor(mock_analyzer, None)
+
+        result = processor.process(b"img", "image/png", {})
+
+        assert result.token_usage.input_mode == "binary"
+        assert mock_analyzer.analyze.call_args.args[1] == "image/png"
+
+
+class TestProcessPacked:
+    """DocumentProcessor.process_packed() のテスト"""
+
+    def test_default_port_implementation_analyzes_one_by_one(self, sample_analysis):
+        """analyze_packed をオーバーライドしない Analyzer は1件ずつ analyze する"""
+
+        class _SingleAnalyzer(DocumentAnalyzer):
+            def __init__(self) -> None:
+                self.calls: list[str] = []
+
+            def analyze(self, content, mime_type, profiles, rules=None):
+                self.calls.append(mime_type)
+                return AnalysisResult(analysis=sample_analysis)
+
+        analyzer = _SingleAnalyzer()
+        processor = DocumentProcessor(analyzer=analyzer)
+
+        results = processor.process_packed(
+            [
+                DocumentInput(content=b"a", mime_type="image/png"),
+                DocumentInput(content=b"b", mime_type="application/pdf"),
+            ],
+            {},
+        )
+
+        assert len(results) == 2
+        assert analyzer.calls == ["image/png", "application/pdf"]
+
+    def test_text_layer_applied_per_document(self, mock_analyzer, sample_analysis):
+        """文書ごとにテキストレイヤー判定を行い input_mode を記録する"""
+        mock_analyzer.analyze_packed.return_value = [
+            AnalysisResult(analysis=sample_analysis, token_usage=TokenUsage()),
+            AnalysisResult(analysis=sample_analysis, token_usage=TokenUsage()),
+        ]
+        extractor = MagicMock(spec=TextLayerExtractor)
+        extractor.extract_pages.side_effect = [["運動会のお知らせ " * 30], None]
+        processor = DocumentProcessor(
+            analyzer=mock_analyzer, text_extractor=extractor, min_chars_per_page=50
+        )
+
+        results = processor.process_packed(
+            [
+                DocumentInput(content=b"%PDF", mime_type="application/pdf"),
+                DocumentInput(content=b"img", mime_type="image/jpeg"),
+            ],
+            {},
+        )
+
+        sent = mock_analyzer.analyze_packed.call_args.args[0]
+        assert [d.mime_type for d in sent] == ["text/plain", "image/jpeg"]
+        assert [r.token_usage.input_mode for r in results] == ["text_layer", "binary"]
+
+
+class TestProcessAsync:
+    """DocumentProcessor.process_async() のテスト"""
+
+    def test_delegates_to_analyze_async(self, mock_analyzer, sample_analysis_result):
+        mock_analyzer.analyze_async.return_value = sample_analysis_result
+        processor = DocumentProcessor(analyzer=mock_analyzer)
+
+        result = asyncio.run(processor.process_async(b"img", "image/png", {}))
+
+        assert result is sample_analysis_result
+        mock_analyzer.analyze_async.assert_awaited_once_with(
+            b"img", "image/png", {}, None
+        )
+        mock_analyzer.analyze.assert_not_called()
+
+    def test_text_layer_applied(self, mock_analyzer, sample_analysis):
+        mock_analyzer.analyze_async.return_value = AnalysisResult(
+            analysis=sample_analysis, token_usage=TokenUsage()
+        )
+        extractor = MagicMock(spec=TextLayerExtractor)
+        extractor.extract_pages.return_value = ["運動会のお知らせ " * 30]
+        processor = DocumentProcessor(
+            analyzer=mock_analyzer, text_extractor=extractor, min_chars_per_page=50
+        )
+
+        result = asyncio.run(processor.process_async(b"%PDF", "application/pdf", {}))
+
+        assert mock_analyzer.analyze_async.call_args.args[1] == "text/plain"
+        assert result.token_usage.input_mode == "text_layer"
+
+    def test_failure_log_keeps_original_mime_type(self, mock_analyzer, caplog):
+        """テキストレイヤー送信で失敗しても、元の MIME タイプと入力モードを分けて記録する"""
+        mock_analyzer.analyze_async.side_effect = ValueError("bad input")
+        extractor = MagicMock(spec=TextLayerExtractor)
+        extractor.extract_pages.return_value = ["運動会のお知らせ " * 30]
+        processor = DocumentProcessor(
+            analyzer=mock_analyzer, text_extractor=extractor, min_chars_per_page=50
+        )
+
+        with (
+            caplog.at_level(logging.ERROR, logger="v2.services.document_processor"),
+            pytest.raises(ValueError),
+        ):
+            asyncio.run(processor.process_async(b"%PDF", "application/pdf", {}))
+
+        assert caplog.messages == [
+            "Document processing failed: mime_type=application/pdf, "
+            "input_mode=text_layer"
+        ]
+
+    def test_default_port_implementation_runs_analyze_in_thread(self, sample_analysis):
+        """analyze_async をオーバーライドしない Analyzer は analyze() が使われる"""
+
+        class _SyncAnalyzer(DocumentAnalyzer):
+            def analyze(self, content, mime_type, profiles, rules=None):
+                return AnalysisResult(analysis=sample_analysis)
+
+        processor = DocumentProcessor(analyzer=_SyncAnalyzer())
+
+        result = asyncio.run(processor.process_async(b"img", "image/png", {}))
+
+        assert result.analysis is sample_analysis
@@ -3,14 +3,14 @@
 未処理例外が 500 JSON レスポンスになること、かつ CORS ヘッダーが付与されることを検証する。
 """
 
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock
 
 import pytest
 from fastapi.testclient import TestClient
 from v2.entrypoints.api.app import app
 from v2.entrypoints.api.deps import (
     FamilyContext,
-    get_document_repo,
+    get_async_document_repo,
     get_family_context,
 )
 
@@ -23,11 +23,11 @@ _ORIGIN = "http://localhost:3000"
 @pytest.fixture
 def client_with_broken_repo():
     """list_tasks が RuntimeError を投げるリポジトリを差し込んだクライアント"""
-    broken_repo = MagicMock()
+    broken_repo = AsyncMock()
     broken_repo.list_tasks.side_effect = RuntimeError("Firestore index not ready")
 
     app.dependency_overrides[get_family_context] = lambda: _FAMILY_CONTEXT
-    app.dependency_overrides[get_document_repo] = lambda: broken_repo
+    app.dependency_overrides[get_async_document_repo] = lambda: broken_repo
 
     # raise_server_exceptions=False で 500 をレスポンスとして受け取る
     with TestClient(app, raise_server_exceptions=False) as c:
@@ -39,11 +39,11 @@ def client_with_broken_repo():
 @pytest.fixture
 def normal_client():
     """正常なモックを差し込んだクライアント（既存挙動の回帰確認用）"""
-    normal_repo = MagicMock()
+    normal_repo = AsyncMock()
     normal_repo.list_tasks.return_value = []
 
     app.dependency_overrides[get_family_context] = lambda: _FAMILY_CONTEXT
-    app.dependency_overrides[get_document_repo] = lambda: normal_repo
+    app.dependency_overrides[get_async_document_repo] = lambda: normal_repo
 
     with TestClient(app) as c:
         yield c
@@ -0,0 +1,212 @@
+"""get_family_context のファミリー解決（キャッシュミス時）のユニットテスト
+
+users/{uid}.member（メンバースナップショット）があればメンバードキュメントを読まずに
+1回の読み取りで解決すること、プロフィール同期の書き込みが BackgroundTasks に
+回されることを確認する。
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import BackgroundTasks, HTTPException
+from v2.entrypoints.api.deps import AuthInfo, _resolve_family_context
+
+_AUTH_INFO = AuthInfo(uid="u1", email="a@example.com", display_name="A")
+
+
+@pytest.fixture
+def repos():
+    user_repo = MagicMock()
+    family_repo = MagicMock()
+    with (
+        patch("v2.entrypoints.api.deps._get_firestore_client"),
+        patch(
+            "v2.entrypoints.api.deps.FirestoreUserConfigRepository",
+            return_value=user_repo,
+        ),
+        patch(
+            "v2.entrypoints.api.deps.FirestoreFamilyRepository",
+            return_value=family_repo,
+        ),
+    ):
+        yield user_repo, family_repo
+
+
+def _resolve(background_tasks: BackgroundTasks | None = None):
+    """解決した後、レスポンス後と同じように BackgroundTasks を実行する"""
+    background_tasks = background_tasks or BackgroundTasks()
+    ctx = _resolve_family_context(_AUTH_INFO, background_tasks)
+    asyncio.run(background_tasks())
+    return ctx
+
+
+def _user(**fields) -> dict:
+    return {
+        "is_activated": True,
+        "email": "a@example.com",
+        "display_name": "A",
+        **fields,
+    }
+
+
+class TestResolveFamilyContext:
+    def test_snapshot_resolves_without_member_read(self, repos):
+        user_repo, family_repo = repos
+        user_repo.get_user.return_value = _user(
+            family_id="f1",
+            member={
+                "family_id": "f1",
+                "role": "owner",
+                "email": "a@example.com",
+                "display_name": "A",
+            },
+        )
+
+        ctx = _resolve()
+
+        assert (ctx.family_id, ctx.role) == ("f1", "owner")
+        family_repo.get_member.assert_not_called()
+        user_repo.update_user.assert_not_called()
+
+    def test_missing_snapshot_is_backfilled_from_member(self, repos):
+        """スナップショット導入前のユーザーはメンバーを読み、スナップショットを書き戻す"""
+        user_repo, family_repo = repos
+        user_repo.get_user.return_value = _user(family_id="f1")
+        family_repo.get_member.return_value = {
+            "role": "member",
+            "email": "a@example.com",
+            "display_name": "A",
+        }
+
+        ctx = _resolve()
+
+        assert ctx.role == "member"
+        family_repo.get_member.assert_called_once_with("f1", "u1")
+        user_repo.update_user.assert_called_once_with(
+            "u1",
+            {
+                "member": {
+                    "family_id": "f1",
+                    "role": "member",
+                    "email": "a@example.com",
+                    "display_name": "A",
+                }
+            },
+        )
+
+    def test_snapshot_of_previous_family_is_ignored(self, repos):
+        """join で family_id が変わった後は古いスナップショットを使わない"""
+        user_repo, family_repo = repos
+        user_repo.get_user.return_value = _user(
+            family_id="f2",
+            member={"family_id": "f1", "role": "owner"},
+        )
+        family_repo.get_member.return_value = {
+            "role": "member",
+            "email": "a@example.com",
+            "display_name": "A",
+        }
+
+        ctx = _resolve()
+
+        assert (ctx.family_id, ctx.role) == ("f2", "member")
+        family_repo.get_member.assert_called_once_with("f2", "u1")
+
+    def test_empty_member_profile_is_synced(self, repos):
+        user_repo, family_repo = repos
+        user_repo.get_user.return_value = _user(
+            family_id="f1",
+            member={
+                "family_id": "f1",
+                "role": "owner",
+                "email": "",
+                "display_name": "",
+            },
+        )
+
+        _resolve()
+
+        family_repo.update_member.assert_called_once_with(
+            "f1", "u1", {"email": "a@example.com", "display_name": "A"}
+        )
+        snapshot = user_repo.update_user.call_args.args[1]["member"]
+        assert (snapshot["email"], snapshot["display_name"]) == ("a@example.com", "A")
+
+    def test_auto_created_family_writes_snapshot(self, repos):
+        user_repo, family_repo = repos
+        user_repo.get_user.return_value = _user()
+
+        ctx = _resolve()
+
+        assert ctx.role == "owner"
+        family_repo.get_member.assert_not_called()
+        updates = user_repo.update_user.call_args.args[1]
+        assert updates["family_id"] == ctx.family_id
+        assert updates["member"]["role"] == "owner"
+
+    def test_not_activated(self, repos):
+        user_repo, _ = repos
+        user_repo.get_user.return_value = {"is_activated": False}
+
+        with pytest.raises(HTTPException) as exc_info:
+            _resolve()
+
+        assert exc_info.value.detail == "ACTIVATION_REQUIRED"
+
+
+class TestProfileSyncInBackground:
+    def test_writes_are_deferred_until_after_response(self, repos):
+        user_repo, family_repo = repos
+        user_repo.get_user.return_value = _user(
+            family_id="f1",
+            email="",
+            member={
+                "family_id": "f1",
+                "role": "owner",
+                "email": "",
+                "display_name": "A",
+            },
+        )
+        background_tasks = BackgroundTasks()
+
+        ctx = _resolve_family_context(_AUTH_INFO, background_tasks)
+
+        assert ctx.role == "owner"
+        user_repo.update_user.assert_not_called()
+        family_repo.update_member.assert_not_called()
+
+        asyncio.run(background_tasks())
+        user_repo.update_user.assert_called_once()
+        family_repo.update_member.assert_called_once_with(
+            "f1", "u1", {"email": "a@example.com"}
+        )
+
+    def test_pending_sync_is_not_scheduled_twice(self, repos):
+        """同期の書き込み前に来た後続リクエストは同じ同期を重ねない"""
+        user_repo, family_repo = repos
+        user_repo.get_user.return_value = _user(family_id="f1")
+        family_repo.get_member.return_value = {"role": "member"}
+        first, second = BackgroundTasks(), BackgroundTasks()
+
+        _resolve_family_context(_AUTH_INFO, first)
+        _resolve_family_context(_AUTH_INFO, second)
+        asyncio.run(first())
+
+        assert (len(first.tasks), len(second.tasks)) == (1, 0)
+        # 同期が終われば再びスケジュールできる
+        third = BackgroundTasks()
+        _resolve_family_context(_AUTH_INFO, third)
+        assert len(third.tasks) == 1
+
+    def test_failed_sync_is_logged_not_raised(self, repos):
+        user_repo, family_repo = repos
+        user_repo.get_user.return_value = _user(family_id="f1")
+        family_repo.get_member.return_value = {"role": "member"}
+        user_repo.update_user.side_effect = RuntimeError("unavailable")
+
+        ctx = _resolve()
+
+        assert ctx.role == "member"
@@ -0,0 +1,92 @@
+"""family_context_cache.py と get_family_context のキャッシュ利用のユニットテスト"""
+
+from __future__ import annotations
+
+from unittest.mock import ANY, patch
+
+import pytest
+from fastapi import BackgroundTasks, HTTPException
+from v2.entrypoints.api.deps import AuthInfo, FamilyContext, get_family_context
+from v2.entrypoints.api.family_context_cache import FamilyContextCache
+
+_AUTH_INFO = AuthInfo(uid="u1", email="a@example.com", display_name="A")
+_CTX = FamilyContext(uid="u1", family_id="f1", role="owner")
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestFamilyContextCache:
+    def test_expires_after_ttl(self):
+        clock = _FakeClock()
+        cache = FamilyContextCache(ttl_seconds=30, clock=clock)
+        cache.put("u1", _CTX)
+
+        assert cache.get("u1") is _CTX
+        clock.now += 31
+        assert cache.get("u1") is None
+        assert cache.stats() == {"hits": 1, "misses": 1, "entries": 0}
+
+    def test_invalidate(self):
+        cache = FamilyContextCache(ttl_seconds=30)
+        cache.put("u1", _CTX)
+        cache.put("u2", _CTX)
+
+        cache.invalidate("u1")
+
+        assert cache.get("u1") is None
+        assert cache.get("u2") is _CTX
+
+    def test_evicts_least_recently_used(self):
+        cache = FamilyContextCache(ttl_seconds=30, max_entries=2)
+        cache.put("a", _CTX)
+        cache.put("b", _CTX)
+        cache.get("a")
+        cache.put("c", _CTX)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is _CTX
+
+
+class TestGetFamilyContextCaching:
+    @pytest.fixture
+    def cache(self):
+        cache = FamilyContextCache(ttl_seconds=30)
+        with patch(
+            "v2.entrypoints.api.deps.get_family_context_cache", return_value=cache
+        ):
+            yield cache
+
+    def test_resolves_once_per_uid(self, cache):
+        with patch(
+            "v2.entrypoints.api.deps._resolve_family_context", return_value=_CTX
+        ) as resolve:
+            assert get_family_context(BackgroundTasks(), _AUTH_INFO) == _CTX
+            assert get_family_context(BackgroundTasks(), _AUTH_INFO) == _CTX
+
+        resolve.assert_called_once_with(_AUTH_INFO, ANY)
+
+    def test_resolves_again_after_invalidation(self, cache):
+        with patch(
+            "v2.entrypoints.api.deps._resolve_family_context", return_value=_CTX
+        ) as resolve:
+            get_family_context(BackgroundTasks(), _AUTH_INFO)
+            cache.invalidate(_AUTH_INFO.uid)
+            get_family_context(BackgroundTasks(), _AUTH_INFO)
+
+        assert resolve.call_count == 2
+
+    def test_activation_required_is_not_cached(self, cache):
+        """未アクティベートの 403 はキャッシュせず、アクティベート後すぐ反映される"""
+        with patch(
+            "v2.entrypoints.api.deps._resolve_family_context",
+            side_effect=[HTTPException(status_code=403), _CTX],
+        ):
+            with pytest.raises(HTTPException):
+                get_family_context(BackgroundTasks(), _AUTH_INFO)
+            assert get_family_context(BackgroundTasks(), _AUTH_INFO) == _CTX
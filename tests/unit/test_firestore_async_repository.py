@@ -0,0 +1,130 @@
+"""AsyncFirestore リポジトリのユニットテスト
+
+AsyncClient をモックし、同期版と同じ保存形式で読み書きすることと、
+独立した読み取りを同時に待つことを検証する。
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from v2.adapters.firestore_async_repository import AsyncFirestoreDocumentRepository
+
+
+async def _aiter(items: list):
+    for item in items:
+        yield item
+
+
+def _make_snap(data: dict | None, snap_id: str = "", exists: bool = True) -> MagicMock:
+    """Firestore DocumentSnapshot のモックを生成する"""
+    snap = MagicMock()
+    snap.id = snap_id
+    snap.exists = exists
+    snap.to_dict.return_value = data
+    return snap
+
+
+def _stream_of(snaps: list) -> MagicMock:
+    """呼び出しごとに新しい非同期イテレータを返す stream() のモック"""
+    return MagicMock(side_effect=lambda: _aiter(snaps))
+
+
+def _doc_ref(mock_db: MagicMock) -> MagicMock:
+    return mock_db.collection.return_value.document.return_value.collection.return_value.document.return_value
+
+
+class TestGetDocumentDetail:
+    """get_document_detail() の並列読み取り"""
+
+    def _setup(self, mock_db: MagicMock, parent: MagicMock) -> None:
+        doc_ref = _doc_ref(mock_db)
+        doc_ref.get = AsyncMock(return_value=parent)
+        events_col, tasks_col = MagicMock(), MagicMock()
+        events_col.stream = _stream_of(
+            [_make_snap({"summary": "遠足", "start": "2026-05-01"})]
+        )
+        tasks_col.stream = _stream_of(
+            [_make_snap({"title": "持ち物準備", "completed": False}, "doc-1_t1")]
+        )
+        doc_ref.collection.side_effect = lambda name: (
+            events_col if name == "events" else tasks_col
+        )
+
+    def test_returns_aggregate(self):
+        """親ドキュメント・events・tasks を集約し、extras は親から取り出す"""
+        mock_db = MagicMock()
+        self._setup(
+            mock_db,
+            _make_snap({"status": "completed", "extras": {"notes": ["雨天中止"]}}),
+        )
+        repo = AsyncFirestoreDocumentRepository(mock_db)
+
+        detail = asyncio.run(repo.get_document_detail("family-1", "doc-1"))
+
+        assert detail.record.id == "doc-1"
+        assert detail.record.status == "completed"
+        assert [e.summary for e in detail.events] == ["遠足"]
+        assert [t.id for t in detail.tasks] == ["doc-1_t1"]
+        assert detail.extras == {"notes": ["雨天中止"]}
+        _doc_ref(mock_db).get.assert_awaited_once()
+
+    def test_returns_none_when_parent_missing(self):
+        """親ドキュメントが存在しない場合は None"""
+        mock_db = MagicMock()
+        self._setup(mock_db, _make_snap(None, exists=False))
+        repo = AsyncFirestoreDocumentRepository(mock_db)
+
+        assert asyncio.run(repo.get_document_detail("family-1", "doc-1")) is None
+
+
+class TestListTasks:
+    """list_tasks() のアジェンダ読み取りとフォールバック"""
+
+    def test_reads_agenda_when_complete(self):
+        """アジェンダ構築済みなら index に載ったバケットだけを読み、未完了を先に返す"""
+        mock_db = MagicMock()
+        _doc_ref(mock_db).get = AsyncMock(
+            return_value=_make_snap(
+                {"complete": True, "tasks_bucketed": True, "task_buckets": ["07"]},
+                "index",
+            )
+        )
+        mock_db.get_all = MagicMock(
+            return_value=_aiter(
+                [
+                    _make_snap(
+                        {
+                            "tasks": {
+                                "d_a": {"title": "済", "completed": True},
+                                "d_b": {"title": "未", "completed": False},
+                            }
+                        },
+                        "tasks_07",
+                    ),
+                ]
+            )
+        )
+        repo = AsyncFirestoreDocumentRepository(mock_db)
+
+        tasks = asyncio.run(repo.list_tasks("family-1"))
+
+        assert [t.id for t in tasks] == ["d_b", "d_a"]
+        assert len(mock_db.get_all.call_args.args[0]) == 1
+        mock_db.collection_group.assert_not_called()
+
+    def test_falls_back_to_collection_group(self):
+        """アジェンダ未構築ならコレクショングループクエリで取得する"""
+        mock_db = MagicMock()
+        _doc_ref(mock_db).get = AsyncMock(
+            return_value=_make_snap(None, "index", exists=False)
+        )
+        query = mock_db.collection_group.return_value.where.return_value.order_by.return_value
+        query.stream = _stream_of(
+            [_make_snap({"title": "提出", "completed": False}, "t1")]
+        )
+        repo = AsyncFirestoreDocumentRepository(mock_db)
+
+        tasks = asyncio.run(repo.list_tasks("family-1"))
+
+        assert [t.title for t in tasks] == ["提出"]
+        mock_db.collection_group.assert_called_once_with("tasks")
@@ -0,0 +1,88 @@
+"""firestore_bulk.py（一括削除）のユニットテスト"""
+
+import asyncio
+import logging
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from google.api_core.exceptions import PermissionDenied, ResourceExhausted
+from v2.adapters import firestore_bulk
+from v2.adapters.firestore_bulk import delete_refs_async
+
+
+def _mock_db(commit_side_effect=None) -> tuple[MagicMock, list[MagicMock]]:
+    """batch() のたびに新しいバッチを返す db のモック（commit の結果は全バッチで通し）"""
+    mock_db = MagicMock()
+    batches: list[MagicMock] = []
+    commit = AsyncMock(side_effect=commit_side_effect)
+
+    def new_batch():
+        batch = MagicMock()
+        batch.commit = commit
+        batches.append(batch)
+        return batch
+
+    mock_db.batch.side_effect = new_batch
+    return mock_db, batches
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff(monkeypatch):
+    monkeypatch.setattr(firestore_bulk, "_RETRY_BASE_SECONDS", 0)
+
+
+class TestDeleteRefsAsync:
+    """delete_refs_async() のバッチ分割・再送・進捗ログ"""
+
+    def test_splits_into_batches_and_reports_progress(self, monkeypatch, caplog):
+        """バッチ上限ごとにコミットし、最終件数をログに出す"""
+        monkeypatch.setattr(firestore_bulk, "_DELETE_BATCH_SIZE", 2)
+        mock_db, batches = _mock_db()
+
+        with caplog.at_level(logging.INFO):
+            deleted = asyncio.run(
+                delete_refs_async(mock_db, ["r1", "r2", "r3", "r4", "r5"], "test")
+            )
+
+        assert deleted == 5
+        assert [b.delete.call_count for b in batches] == [2, 2, 1]
+        assert batches[0].commit.await_count == 3
+        assert caplog.messages[-1] == "Bulk delete progress: test, deleted=5"
+
+    def test_batch_size_follows_ops_limit(self, monkeypatch):
+        """バッチの件数は FIRESTORE_BULK_MAX_OPS_PER_SECOND を超えない"""
+        monkeypatch.setenv("FIRESTORE_BULK_MAX_OPS_PER_SECOND", "3")
+        mock_db, batches = _mock_db()
+
+        asyncio.run(delete_refs_async(mock_db, ["r1", "r2", "r3"], "test"))
+
+        assert [b.delete.call_count for b in batches] == [3]
+
+    def test_retries_transient_errors(self):
+        mock_db, batches = _mock_db([ResourceExhausted("quota"), None])
+
+        deleted = asyncio.run(delete_refs_async(mock_db, ["r1", "r2"], "test"))
+
+        assert deleted == 2
+        # 再送は新しいバッチで同じ参照を削除する
+        assert [b.delete.call_count for b in batches] == [2, 2]
+
+    def test_raises_after_max_attempts(self, caplog):
+        mock_db, batches = _mock_db(ResourceExhausted("quota"))
+
+        with (
+            caplog.at_level(logging.ERROR),
+            pytest.raises(RuntimeError, match="failed for 2 documents"),
+        ):
+            asyncio.run(delete_refs_async(mock_db, ["r1", "r2"], "test"))
+
+        assert len(batches) == firestore_bulk._BULK_MAX_ATTEMPTS
+        assert "Bulk delete failed: test, documents=2" in caplog.text
+
+    def test_does_not_retry_permanent_errors(self):
+        mock_db, batches = _mock_db(PermissionDenied("denied"))
+
+        with pytest.raises(PermissionDenied):
+            asyncio.run(delete_refs_async(mock_db, ["r1"], "test"))
+
+        assert len(batches) == 1
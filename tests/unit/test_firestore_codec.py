@@ -0,0 +1,144 @@
+"""firestore_codec.py（スナップショット → モデル変換）のユニットテスト"""
+
+from __future__ import annotations
+
+import dataclasses
+from datetime import UTC, datetime
+from unittest.mock import MagicMock
+
+import pytest
+from google.cloud.firestore_v1.document import DocumentSnapshot
+from v2.adapters.firestore_codec import (
+    decode_event,
+    decode_record,
+    decode_task,
+    event_from_snapshot,
+    snapshot_data,
+    task_from_snapshot,
+)
+from v2.domain.models import DocumentRecord, EventData, StoredTaskData
+
+
+def _snapshot(data: dict | None, exists: bool = True) -> DocumentSnapshot:
+    reference = MagicMock()
+    reference.id = "doc1_abc"
+    return DocumentSnapshot(
+        reference,
+        data,
+        exists,
+        read_time=None,
+        create_time=None,
+        update_time=None,
+    )
+
+
+class TestSnapshotData:
+    def test_returns_snapshot_data_without_copy(self):
+        """to_dict() と違い、スナップショットの dict をコピーせずに返す"""
+        snap = _snapshot({"events": {"e1": {"summary": "遠足"}}})
+
+        assert snapshot_data(snap)["events"] is snapshot_data(snap)["events"]
+        assert snapshot_data(snap) == snap.to_dict()
+
+    def test_is_read_only(self):
+        snap = _snapshot({"summary": "遠足"})
+
+        with pytest.raises(TypeError):
+            snapshot_data(snap)["summary"] = "x"  # type: ignore
+
+    def test_missing_document_is_empty(self):
+        assert snapshot_data(_snapshot(None, exists=False)) == {}
+
+    def test_snapshot_keeps_private_data_dict(self):
+        """
+        snapshot_data() が依存する DocumentSnapshot._data がまだ dict であること。
+
+        google-cloud-firestore の更新でこれが失敗した場合、snapshot_data() は to_dict() に
+        フォールバックして動作は続くが、コピー削減が失われる。
+        """
+        snap = _snapshot({"summary": "遠足"})
+
+        assert isinstance(getattr(snap, "_data", None), dict)
+
+    def test_falls_back_to_to_dict(self):
+        """_data を持たないスナップショット（モック等）は to_dict() を使う"""
+        snap = MagicMock()
+        snap.to_dict.return_value = {"summary": "遠足"}
+
+        assert snapshot_data(snap) == {"summary": "遠足"}
+
+
+class TestDecodeEvent:
+    def test_null_and_missing_fields_use_defaults(self):
+        event = decode_event({"summary": "遠足", "start": "2026-05-01", "end": None})
+
+        assert event == EventData(
+            summary="遠足",
+            start="2026-05-01",
+            end="",
+            location="",
+            description="",
+            confidence="HIGH",
+        )
+
+    def test_from_snapshot(self):
+        snap = _snapshot({"summary": "遠足", "start": "s", "end": "e"})
+
+        assert event_from_snapshot(snap).summary == "遠足"
+
+
+class TestDecodeTask:
+    def test_defaults(self):
+        task = decode_task("d_1", {"title": "提出", "assignee": ""})
+
+        assert task == StoredTaskData(
+            id="d_1",
+            title="提出",
+            due_date="",
+            assignee="PARENT",
+            note="",
+            completed=False,
+        )
+
+    def test_from_snapshot_uses_snapshot_id(self):
+        snap = _snapshot({"title": "提出", "completed": True})
+
+        task = task_from_snapshot(snap)
+
+        assert (task.id, task.completed) == ("doc1_abc", True)
+
+
+class TestDecodeRecord:
+    def test_defaults_match_missing_fields(self):
+        created_at = datetime(2026, 5, 1, tzinfo=UTC)
+        record = decode_record(
+            "doc1",
+            "fam1",
+            {"status": "completed", "archive_filename": None, "created_at": created_at},
+        )
+
+        assert record == DocumentRecord(
+            id="doc1",
+            uid="fam1",
+            status="completed",
+            content_hash="",
+            storage_path="",
+            original_filename="",
+            mime_type="application/octet-stream",
+            archive_filename="",
+            created_at=created_at,
+        )
+
+
+class TestCompactModels:
+    @pytest.mark.parametrize(
+        "model",
+        [
+            EventData(summary="遠足", start="s", end="e"),
+            StoredTaskData("d_1", "提出", "", "PARENT", "", False),
+        ],
+    )
+    def test_models_are_slotted_and_immutable(self, model):
+        assert not hasattr(model, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            setattr(model, dataclasses.fields(model)[0].name, "x")
@@ -0,0 +1,194 @@
+"""firestore_instrumentation.py（リクエスト単位の Firestore 計測）のユニットテスト"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import firestore
+from google.cloud.firestore_v1.types import (
+    BatchGetDocumentsResponse,
+    CommitResponse,
+    Document,
+    RunQueryResponse,
+)
+from v2.adapters import firestore_instrumentation
+from v2.adapters.firestore_instrumentation import (
+    InstrumentedAsyncFirestoreClient,
+    InstrumentedFirestoreClient,
+    _AsyncInstrumentedApi,
+    _InstrumentedApi,
+    _supports_api_override,
+    current_firestore_stats,
+    firestore_request_stats,
+    new_async_firestore_client,
+    new_firestore_client,
+)
+
+_DOC = Document(name="projects/p/databases/(default)/documents/families/f1")
+
+
+class _FakeApi:
+    """GAPIC FirestoreClient の代わりに固定の応答を返す"""
+
+    def __init__(self, query_docs: int = 2) -> None:
+        self.query_docs = query_docs
+        self.transport_name = "fake"
+
+    def run_query(self, request=None, **kwargs):
+        # 最後の応答はドキュメントを含まない（実際の RunQuery と同じ）
+        return iter(
+            [RunQueryResponse(document=_DOC) for _ in range(self.query_docs)]
+            + [RunQueryResponse()]
+        )
+
+    def batch_get_documents(self, request=None, **kwargs):
+        return iter(
+            [
+                BatchGetDocumentsResponse(found=_DOC),
+                BatchGetDocumentsResponse(missing=_DOC.name),
+            ]
+        )
+
+    def commit(self, request=None, **kwargs):
+        return CommitResponse()
+
+
+class _FakeAsyncApi:
+    def __init__(self) -> None:
+        self._sync = _FakeApi()
+
+    async def run_query(self, request=None, **kwargs):
+        responses = list(self._sync.run_query(request))
+
+        async def stream():
+            for r in responses:
+                yield r
+
+        return stream()
+
+    async def commit(self, request=None, **kwargs):
+        return CommitResponse()
+
+
+class TestInstrumentedApi:
+    def test_counts_query_reads_and_queries(self):
+        api = _InstrumentedApi(_FakeApi(query_docs=2))
+        with firestore_request_stats() as stats:
+            list(api.run_query(request={}))
+
+        assert (stats.reads, stats.queries, stats.rpcs) == (2, 1, 1)
+
+    def test_empty_query_counts_one_read(self):
+        api = _InstrumentedApi(_FakeApi(query_docs=0))
+        with firestore_request_stats() as stats:
+            list(api.run_query(request={}))
+
+        assert stats.reads == 1
+
+    def test_batch_get_counts_found_and_missing(self):
+        api = _InstrumentedApi(_FakeApi())
+        with firestore_request_stats() as stats:
+            list(api.batch_get_documents(request={}))
+
+        assert (stats.reads, stats.queries) == (2, 0)
+
+    def test_counts_writes_from_request(self):
+        api = _InstrumentedApi(_FakeApi())
+        with firestore_request_stats() as stats:
+            api.commit(request={"writes": [object(), object(), object()]})
+
+        assert stats.as_log_fields()["firestore_writes"] == 3
+        assert stats.rpcs == 1
+
+    def test_other_attributes_pass_through(self):
+        assert _InstrumentedApi(_FakeApi()).transport_name == "fake"
+
+    def test_no_counting_outside_request(self):
+        api = _InstrumentedApi(_FakeApi())
+        assert current_firestore_stats() is None
+        assert len(list(api.run_query(request={}))) == 3
+
+    def test_copied_context_reaches_executor_threads(self):
+        """copy_context().run で投げたスレッドの呼び出しも同じリクエストに数える"""
+        api = _InstrumentedApi(_FakeApi(query_docs=1))
+        with firestore_request_stats() as stats, ThreadPoolExecutor(2) as executor:
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    lambda: list(api.run_query(request={})),
+                )
+                for _ in range(2)
+            ]
+            for f in futures:
+                f.result()
+
+        assert (stats.reads, stats.queries) == (2, 2)
+
+
+class TestAsyncInstrumentedApi:
+    def test_counts_reads_and_writes_across_tasks(self):
+        api = _AsyncInstrumentedApi(_FakeAsyncApi())
+
+        async def main():
+            with firestore_request_stats() as stats:
+
+                async def query():
+                    return [r async for r in await api.run_query(request={})]
+
+                await asyncio.gather(query(), query())
+                await api.commit(request={"writes": [object()]})
+            return stats
+
+        stats = asyncio.run(main())
+
+        assert (stats.reads, stats.queries, stats.writes, stats.rpcs) == (4, 2, 1, 3)
+
+
+class TestPrivateApiFallback:
+    """ライブラリ非公開の API が変わっても、計測が止まるだけで呼び出しは続く"""
+
+    @pytest.fixture(autouse=True)
+    def _restore_read_counting(self, monkeypatch):
+        monkeypatch.setattr(firestore_instrumentation, "_read_counting_enabled", True)
+
+    def test_installed_client_supports_api_override(self):
+        """google-cloud-firestore の更新で失敗したら計測が止まっている"""
+        assert _supports_api_override(firestore.Client)
+        assert _supports_api_override(firestore.AsyncClient)
+
+    def test_unrecognized_response_disables_read_counting(self):
+        class _PlainApi:
+            def run_query(self, request=None, **kwargs):
+                return iter([object(), object()])
+
+        api = _InstrumentedApi(_PlainApi())
+        with firestore_request_stats() as stats:
+            responses = list(api.run_query(request={}))
+
+        assert len(responses) == 2
+        assert (stats.reads, stats.queries, stats.rpcs) == (0, 1, 1)
+        assert firestore_instrumentation._read_counting_enabled is False
+
+    def test_falls_back_to_plain_clients(self, monkeypatch):
+        monkeypatch.setattr(
+            firestore_instrumentation, "_supports_api_override", lambda cls: False
+        )
+        kwargs = {"project": "p", "credentials": AnonymousCredentials()}
+
+        client = new_firestore_client(**kwargs)
+        async_client = new_async_firestore_client(**kwargs)
+
+        assert type(client) is firestore.Client
+        assert type(async_client) is firestore.AsyncClient
+
+    def test_creates_instrumented_clients(self):
+        kwargs = {"project": "p", "credentials": AnonymousCredentials()}
+
+        assert isinstance(new_firestore_client(**kwargs), InstrumentedFirestoreClient)
+        assert isinstance(
+            new_async_firestore_client(**kwargs), InstrumentedAsyncFirestoreClient
+        )
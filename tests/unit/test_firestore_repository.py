@@ -3,9 +3,19 @@
 Firestore クライアントをモックし、None 値のフォールバック動作を検証する。
 """
 
+import datetime
+import logging
 from unittest.mock import MagicMock
 
-from v2.adapters.firestore_repository import FirestoreDocumentRepository
+import pytest
+from google.api_core.exceptions import NotFound
+from google.cloud.firestore import DELETE_FIELD
+from google.cloud.firestore_v1.document import DocumentSnapshot
+from v2.adapters.firestore_repository import (
+    FirestoreDocumentRepository,
+    FirestoreFamilyRepository,
+)
+from v2.adapters.firestore_schema import stage_agenda_changes, task_bucket
 
 
 def _make_snap(data: dict) -> MagicMock:
@@ -15,6 +25,13 @@ def _make_snap(data: dict) -> MagicMock:
     return snap
 
 
+def _subcollection(snaps: list) -> MagicMock:
+    """select() 付きで stream() するサブコレクションのモックを生成する"""
+    col = MagicMock()
+    col.select.return_value.stream.return_value = snaps
+    return col
+
+
 class TestListEventsNullFallback:
     """list_events() で Firestore の None 値が適切にフォールバックされることを検証"""
 
@@ -24,6 +41,9 @@ class TestListEventsNullFallback:
         mock_query = MagicMock()
         mock_db.collection_group.return_value.where.return_value.order_by.return_value = mock_query
         mock_query.stream.return_value = snaps
+        # アジェンダ未構築（コレクショングループクエリにフォールバック）
+        agenda_index = mock_db.collection.return_value.document.return_value.collection.return_value.document.return_value
+        agenda_index.get.return_value.exists = False
         return FirestoreDocumentRepository(mock_db)
 
     def test_location_none_falls_back_to_empty_string(self):
@@ -148,14 +168,16 @@ class TestUpdateTaskCompleted:
         snap = MagicMock()
         snap.id = "task-1"
         snap.reference = MagicMock()
-        repo, _ = self._make_repo_and_mock([snap])
+        repo, mock_db = self._make_repo_and_mock([snap])
 
         # Act
         result = repo.update_task_completed("fam1", "task-1", True)
 
         # Assert
         assert result is True
-        snap.reference.update.assert_called_once_with({"completed": True})
+        mock_db.batch.return_value.update.assert_called_once_with(
+            snap.reference, {"completed": True}
+        )
 
     def test_not_found_task_returns_false(self):
         """対象タスクが見つからない場合 False を返す"""
@@ -199,3 +221,447 @@ class TestUpdateTaskCompleted:
 
         # Assert
         mock_where.order_by.assert_called_once_with("completed")
+
+
+class TestDirectTaskAddressing:
+    """親ドキュメント ID を含むタスク ID の直接更新"""
+
+    def _task_ref(self, mock_db: MagicMock) -> MagicMock:
+        return mock_db.collection.return_value.document.return_value.collection.return_value.document.return_value.collection.return_value.document.return_value
+
+    def test_updates_task_without_scanning(self):
+        """新形式の ID はコレクショングループを走査せず1回の書き込みで更新する"""
+        mock_db = MagicMock()
+        repo = FirestoreDocumentRepository(mock_db)
+
+        result = repo.update_task_completed("fam1", "doc-1_abc123", True)
+
+        assert result is True
+        mock_db.batch.return_value.update.assert_called_once_with(
+            self._task_ref(mock_db), {"completed": True}
+        )
+        mock_db.batch.return_value.commit.assert_called_once()
+        mock_db.collection_group.assert_not_called()
+        mock_db.collection.assert_called_with("families")
+        docs_col = mock_db.collection.return_value.document.return_value.collection
+        docs_col.return_value.document.assert_any_call("doc-1")
+        docs_col.return_value.document.return_value.collection.return_value.document.assert_called_with(
+            "doc-1_abc123"
+        )
+
+    def test_missing_task_returns_false(self):
+        mock_db = MagicMock()
+        mock_db.batch.return_value.commit.side_effect = NotFound("no task")
+        repo = FirestoreDocumentRepository(mock_db)
+
+        assert repo.update_task_completed("fam1", "doc-1_abc123", True) is False
+        mock_db.collection_group.assert_not_called()
+
+    def test_save_analysis_embeds_document_id_in_task_ids(self, sample_analysis):
+        mock_db = MagicMock()
+        repo = FirestoreDocumentRepository(mock_db)
+
+        repo.save_analysis("fam1", "doc-1", sample_analysis)
+
+        tasks_col = mock_db.collection.return_value.document.return_value.collection.return_value.document.return_value.collection.return_value
+        task_ids = [c.args[0] for c in tasks_col.document.call_args_list if c.args]
+        assert task_ids
+        assert all(t.startswith("doc-1_") for t in task_ids)
+
+
+class TestListDocumentsPagination:
+    """list() のプロジェクション・カーソルページング"""
+
+    def _ordered(self, mock_db: MagicMock) -> MagicMock:
+        docs_col = mock_db.collection.return_value.document.return_value.collection
+        return docs_col.return_value.select.return_value.order_by.return_value.order_by
+
+    def test_selects_listing_fields_and_applies_cursor(self):
+        mock_db = MagicMock()
+        docs_col = mock_db.collection.return_value.document.return_value.collection
+        select = docs_col.return_value.select
+        ordered = self._ordered(mock_db).return_value
+        ordered.start_after.return_value.limit.return_value.stream.return_value = []
+        repo = FirestoreDocumentRepository(mock_db)
+        cursor = datetime.datetime(2026, 1, 1, tzinfo=datetime.UTC)
+
+        repo.list("fam1", limit=20, start_after=cursor, start_after_id="doc-9")
+
+        fields = select.call_args.args[0]
+        assert "extras" not in fields
+        assert {"status", "summary", "created_at"} <= set(fields)
+        # created_at が同じドキュメントはドキュメント ID でタイブレークする
+        assert self._ordered(mock_db).call_args.args == ("__name__",)
+        ordered.start_after.assert_called_once_with(
+            {"created_at": cursor, "__name__": "doc-9"}
+        )
+        ordered.start_after.return_value.limit.assert_called_once_with(20)
+
+    def test_cursor_without_document_id(self):
+        mock_db = MagicMock()
+        ordered = self._ordered(mock_db).return_value
+        repo = FirestoreDocumentRepository(mock_db)
+        cursor = datetime.datetime(2026, 1, 1, tzinfo=datetime.UTC)
+
+        repo.list("fam1", start_after=cursor)
+
+        ordered.start_after.assert_called_once_with({"created_at": cursor})
+
+    def test_no_limit_streams_without_cursor(self):
+        mock_db = MagicMock()
+        ordered = self._ordered(mock_db).return_value
+        ordered.stream.return_value = [
+            _make_snap({"status": "completed", "summary": "s"})
+        ]
+        repo = FirestoreDocumentRepository(mock_db)
+
+        records = repo.list("fam1")
+
+        assert len(records) == 1
+        ordered.start_after.assert_not_called()
+        ordered.limit.assert_not_called()
+
+
+class TestGetDocumentDetail:
+    """get_document_detail() の並列読み取り"""
+
+    def _doc_ref(self, mock_db: MagicMock) -> MagicMock:
+        return mock_db.collection.return_value.document.return_value.collection.return_value.document.return_value
+
+    def _subcollections(self, doc_ref: MagicMock, events: list, tasks: list) -> None:
+        events_col, tasks_col = MagicMock(), MagicMock()
+        events_col.stream.return_value = events
+        tasks_col.stream.return_value = tasks
+        doc_ref.collection.side_effect = lambda name: (
+            events_col if name == "events" else tasks_col
+        )
+
+    def test_returns_aggregate_from_single_parent_read(self):
+        """親ドキュメントは1回だけ読み、extras はそのスナップショットから取り出す"""
+        mock_db = MagicMock()
+        doc_ref = self._doc_ref(mock_db)
+        parent = _make_snap(
+            {
+                "status": "completed",
+                "summary": "遠足",
+                "extras": {"notes": ["雨天中止"]},
+            }
+        )
+        parent.exists = True
+        doc_ref.get.return_value = parent
+        task = _make_snap({"title": "同意書", "completed": True})
+        task.id = "doc-1_abc"
+        self._subcollections(
+            doc_ref, [_make_snap({"summary": "遠足", "start": "2026-04-25"})], [task]
+        )
+        repo = FirestoreDocumentRepository(mock_db)
+
+        detail = repo.get_document_detail("fam1", "doc-1")
+
+        assert detail is not None
+        doc_ref.get.assert_called_once()
+        assert detail.record.id == "doc-1"
+        assert detail.record.summary == "遠足"
+        assert detail.extras == {"notes": ["雨天中止"]}
+        assert [e.summary for e in detail.events] == ["遠足"]
+        assert detail.tasks[0].id == "doc-1_abc"
+        assert detail.tasks[0].completed is True
+
+    def test_extras_do_not_alias_snapshot_data(self):
+        """呼び出し側に返す extras はスナップショットの内部 dict と共有しない"""
+        mock_db = MagicMock()
+        doc_ref = self._doc_ref(mock_db)
+        parent = DocumentSnapshot(
+            doc_ref,
+            {"status": "completed", "extras": {"notes": ["雨天中止"]}},
+            True,
+            read_time=None,
+            create_time=None,
+            update_time=None,
+        )
+        doc_ref.get.return_value = parent
+        self._subcollections(doc_ref, [], [])
+        repo = FirestoreDocumentRepository(mock_db)
+
+        detail = repo.get_document_detail("fam1", "doc-1")
+        raw = repo.get_document_extras_raw("fam1", "doc-1")
+        detail.extras["notes"].append("変更")
+        raw["notes"].clear()
+
+        assert parent.get("extras") == {"notes": ["雨天中止"]}
+
+    def test_missing_document_returns_none(self):
+        mock_db = MagicMock()
+        doc_ref = self._doc_ref(mock_db)
+        doc_ref.get.return_value.exists = False
+        self._subcollections(doc_ref, [], [])
+        repo = FirestoreDocumentRepository(mock_db)
+
+        assert repo.get_document_detail("fam1", "missing") is None
+
+
+class TestAgenda:
+    """ファミリー単位のアジェンダ（マテリアライズドビュー）"""
+
+    def _agenda_doc(self, mock_db: MagicMock) -> MagicMock:
+        # families/{fid}/agenda/{name}（パスによらず同じモックになる）
+        return mock_db.collection.return_value.document.return_value.collection.return_value.document.return_value
+
+    def _snap(self, snap_id: str, data: dict, exists: bool = True) -> MagicMock:
+        snap = _make_snap(data)
+        snap.id = snap_id
+        snap.exists = exists
+        return snap
+
+    def test_save_analysis_merges_agenda_in_same_batch(self, sample_analysis):
+        mock_db = MagicMock()
+        # events は自動採番、tasks は指定 ID の DocumentReference を返す
+        auto_ids = iter(range(100))
+        self._agenda_doc(mock_db).collection.return_value.document.side_effect = (
+            lambda *args: MagicMock(id=args[0] if args else f"auto-{next(auto_ids)}")
+        )
+        repo = FirestoreDocumentRepository(mock_db)
+
+        repo.save_analysis("fam1", "doc-1", sample_analysis)
+
+        batch = mock_db.batch.return_value
+        merged = [c.args[1] for c in batch.set.call_args_list if c.kwargs.get("merge")]
+        events = [e for d in merged for e in (d.get("events") or {}).values()]
+        tasks = [t for d in merged for t in (d.get("tasks") or {}).values()]
+        assert len(events) == len(sample_analysis.events)
+        assert len(tasks) == len(sample_analysis.tasks)
+        assert all(e["document_id"] == "doc-1" for e in events)
+        assert all("family_id" not in t for t in tasks)
+        batch.commit.assert_called_once()
+
+    def test_list_events_reads_month_buckets_without_query(self):
+        mock_db = MagicMock()
+        self._agenda_doc(mock_db).get.return_value = self._snap(
+            "index", {"complete": True, "event_months": ["2026-03", "2026-04"]}
+        )
+        mock_db.get_all.return_value = [
+            self._snap(
+                "events_2026-04",
+                {
+                    "events": {
+                        "e2": {"summary": "運動会", "start": "2026-04-30"},
+                        "e1": {"summary": "遠足", "start": "2026-04-25"},
+                        "e0": {"summary": "始業式", "start": "2026-04-01"},
+                    }
+                },
+            )
+        ]
+        repo = FirestoreDocumentRepository(mock_db)
+
+        events = repo.list_events("fam1", from_date="2026-04-10")
+
+        assert [e.summary for e in events] == ["遠足", "運動会"]
+        mock_db.collection_group.assert_not_called()
+        # 範囲外の 2026-03 バケットは読まない
+        assert len(mock_db.get_all.call_args.args[0]) == 1
+
+    def test_list_tasks_reads_listed_buckets(self):
+        mock_db = MagicMock()
+        self._agenda_doc(mock_db).get.return_value = self._snap(
+            "index",
+            {"complete": True, "tasks_bucketed": True, "task_buckets": ["03", "17"]},
+        )
+        mock_db.get_all.return_value = [
+            self._snap(
+                "tasks_03",
+                {"tasks": {"doc-1_a": {"title": "提出", "completed": True}}},
+            ),
+            self._snap(
+                "tasks_17",
+                {"tasks": {"doc-1_b": {"title": "集金", "completed": False}}},
+            ),
+        ]
+        repo = FirestoreDocumentRepository(mock_db)
+
+        tasks = repo.list_tasks("fam1")
+        open_tasks = repo.list_tasks("fam1", completed=False)
+
+        assert [t.id for t in tasks] == ["doc-1_b", "doc-1_a"]
+        assert [t.title for t in open_tasks] == ["集金"]
+        assert open_tasks[0].assignee == "PARENT"
+        assert len(mock_db.get_all.call_args.args[0]) == 2
+        mock_db.collection_group.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "index",
+        [
+            {"event_months": []},
+            # 単一の agenda/tasks だった旧形式（バケット化のバックフィル前）
+            {"complete": True, "event_months": []},
+        ],
+    )
+    def test_incomplete_agenda_falls_back_to_query(self, index):
+        """バックフィル前のファミリーはコレクショングループクエリを使う"""
+        mock_db = MagicMock()
+        self._agenda_doc(mock_db).get.return_value = self._snap("index", index)
+        query = mock_db.collection_group.return_value.where.return_value.order_by
+        query.return_value.stream.return_value = []
+        repo = FirestoreDocumentRepository(mock_db)
+
+        assert repo.list_tasks("fam1") == []
+        mock_db.collection_group.assert_called_once_with("tasks")
+        mock_db.get_all.assert_not_called()
+
+    def test_task_changes_go_to_hash_buckets(self):
+        """タスクの差分は taskId から決まるバケットに書き、index にバケットを登録する"""
+        batch, agenda = MagicMock(), MagicMock()
+        agenda.document.side_effect = lambda name: name
+
+        stage_agenda_changes(
+            batch,
+            agenda,
+            {},
+            {"doc-1_a": {"completed": True}, "doc-2_b": {}},
+            register_keys=True,
+        )
+
+        written = {c.args[0]: c.args[1] for c in batch.set.call_args_list}
+        buckets = {task_bucket("doc-1_a"), task_bucket("doc-2_b")}
+        assert {name for name in written if name != "index"} == {
+            "tasks_" + b for b in buckets
+        }
+        assert written["tasks_" + task_bucket("doc-1_a")]["tasks"]["doc-1_a"] == {
+            "completed": True
+        }
+        assert sorted(written["index"]["task_buckets"].values) == sorted(buckets)
+        assert "event_months" not in written["index"]
+
+    def test_updates_and_deletes_do_not_touch_index(self):
+        """完了切り替え・削除では agenda/index（全更新が集まる1ドキュメント）に書かない"""
+        batch, agenda = MagicMock(), MagicMock()
+        agenda.document.side_effect = lambda name: name
+
+        stage_agenda_changes(
+            batch,
+            agenda,
+            {"2026-04": {"e1": DELETE_FIELD}},
+            {"doc-1_a": {"completed": True}},
+        )
+
+        written = [c.args[0] for c in batch.set.call_args_list]
+        assert "index" not in written
+        assert len(written) == 2
+
+    def test_task_bucket_is_stable(self):
+        assert task_bucket("doc-1_a") == task_bucket("doc-1_a")
+        assert len({task_bucket(f"doc-{i}_a") for i in range(1000)}) == 32
+
+    def test_delete_removes_agenda_entries(self):
+        mock_db = MagicMock()
+        doc_ref = mock_db.collection.return_value.document.return_value.collection.return_value.document.return_value
+        event = self._snap("e1", {"start": "2026-04-25"})
+        task = self._snap("doc-1_a", {"title": "提出"})
+        doc_ref.collection.side_effect = lambda name: _subcollection(
+            [event] if name == "events" else [task]
+        )
+        repo = FirestoreDocumentRepository(mock_db)
+
+        repo.delete("fam1", "doc-1")
+
+        merged = [
+            c.args[1]
+            for c in mock_db.batch.return_value.set.call_args_list
+            if c.kwargs.get("merge")
+        ]
+        assert {"events": {"e1": DELETE_FIELD}} in merged
+        assert {"tasks": {"doc-1_a": DELETE_FIELD}} in merged
+        doc_ref.delete.assert_called_once()
+
+    def test_rebuild_marks_agenda_complete(self):
+        mock_db = MagicMock()
+        ordered = mock_db.collection_group.return_value.where.return_value.order_by
+        ordered.return_value.stream.side_effect = [
+            [self._snap("e1", {"family_id": "fam1", "start": "2026-04-25"})],
+            [self._snap("doc-1_a", {"family_id": "fam1", "title": "提出"})],
+        ]
+        stale = [self._snap("events_2025-01", {}), self._snap("tasks", {})]
+        mock_db.collection.return_value.document.return_value.collection.return_value.stream.return_value = stale
+        repo = FirestoreDocumentRepository(mock_db)
+
+        assert repo.rebuild_agenda("fam1") == (1, 1)
+
+        batch = mock_db.batch.return_value
+        written = [c.args[1] for c in batch.set.call_args_list]
+        index = next(d for d in written if "complete" in d)
+        assert index["complete"] is True
+        assert index["tasks_bucketed"] is True
+        assert index["event_months"] == ["2026-04"]
+        assert index["task_buckets"] == [task_bucket("doc-1_a")]
+        assert {"tasks": {"doc-1_a": {"title": "提出"}}} in written
+        # 空になったバケットと旧形式の agenda/tasks は削除する
+        assert [c.args[0] for c in batch.delete.call_args_list] == [
+            s.reference for s in stale
+        ]
+
+
+class TestBulkDelete:
+    """BulkWriter による一括削除"""
+
+    def _result_callback(self, mock_db: MagicMock):
+        return mock_db.bulk_writer.return_value.on_write_result.call_args.args[0]
+
+    def test_document_delete_streams_children_into_bulk_writer(self):
+        mock_db = MagicMock()
+        doc_ref = mock_db.collection.return_value.document.return_value.collection.return_value.document.return_value
+        events = [_make_snap({"start": "2026-04-25"}) for _ in range(3)]
+        tasks = [_make_snap({}) for _ in range(2)]
+        for i, snap in enumerate(tasks):
+            snap.id = f"doc-1_{i}"
+        doc_ref.collection.side_effect = lambda name: _subcollection(
+            events if name == "events" else tasks
+        )
+        repo = FirestoreDocumentRepository(mock_db)
+
+        repo.delete("fam1", "doc-1")
+
+        writer = mock_db.bulk_writer.return_value
+        deleted = [c.args[0] for c in writer.delete.call_args_list]
+        assert deleted == [s.reference for s in events + tasks]
+        writer.close.assert_called_once()
+        # 子の削除完了後に親を削除する
+        doc_ref.delete.assert_called_once()
+
+    def test_family_cascade_uses_recursive_delete_and_logs_progress(self, caplog):
+        mock_db = MagicMock()
+        writer = mock_db.bulk_writer.return_value
+
+        def recursive_delete(ref, bulk_writer):
+            callback = self._result_callback(mock_db)
+            for _ in range(3):
+                callback(MagicMock(), MagicMock(), bulk_writer)
+            return 3
+
+        mock_db.recursive_delete.side_effect = recursive_delete
+        repo = FirestoreFamilyRepository(mock_db)
+
+        with caplog.at_level(logging.INFO):
+            repo.delete_family_cascade("fam1")
+
+        mock_db.recursive_delete.assert_called_once_with(
+            mock_db.collection.return_value.document.return_value, bulk_writer=writer
+        )
+        writer.close.assert_called_once()
+        assert "Bulk delete progress: family_id=fam1, deleted=3" in caplog.messages
+
+    def test_family_cascade_raises_when_deletes_give_up(self):
+        mock_db = MagicMock()
+        writer = mock_db.bulk_writer.return_value
+
+        def recursive_delete(ref, bulk_writer):
+            on_error = writer.on_write_error.call_args.args[0]
+            failure = MagicMock(attempts=1)
+            assert on_error(failure, bulk_writer) is True  # 上限まではリトライ
+            failure.attempts = 99
+            assert on_error(failure, bulk_writer) is False
+            return 1
+
+        mock_db.recursive_delete.side_effect = recursive_delete
+        repo = FirestoreFamilyRepository(mock_db)
+
+        with pytest.raises(RuntimeError, match="1 documents"):
+            repo.delete_family_cascade("fam1")
@@ -17,6 +17,8 @@ Gemini APIを呼ばずに、保存済みレスポンスJSON（tests/fixtures/gem
 
 ## Fixture フォーマット
 - gemini_responses/{name}.json : Gemini が返す生 JSON（output schema 準拠）
+- gemini_recordings/{name}.json: 応答テキスト + usage_metadata + レイテンシの録画
+                                 （ReplayGenerativeModel / ベンチマークで再生）
 - expectations/{name}.json    : 期待値の宣言（set-containment 形式）
 """
 
@@ -27,6 +29,7 @@ from pathlib import Path
 
 import pytest
 from v2.adapters.gemini import GeminiDocumentAnalyzer
+from v2.adapters.gemini_replay import GeminiRecording, RecordingGenerativeModel
 from v2.domain.models import DocumentExtras
 
 # ── フィクスチャパス ──────────────────────────────────────────────────────────
@@ -34,6 +37,7 @@ from v2.domain.models import DocumentExtras
 _FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
 _RESPONSES_DIR = _FIXTURES_DIR / "gemini_responses"
 _EXPECTATIONS_DIR = _FIXTURES_DIR / "expectations"
+_RECORDINGS_DIR = _FIXTURES_DIR / "gemini_recordings"
 
 # テスト対象のフィクスチャ名（gemini_responses/ と expectations/ の両方に同名ファイルがある）
 _FIXTURE_NAMES = [
@@ -263,46 +267,30 @@ class TestRecordGeminiResponse:
 
         project_id = os.environ["PROJECT_ID"]
         location = os.environ.get("VERTEX_AI_LOCATION", "us-central1")
+        model_name = os.environ.get("GEMINI_MODEL", "gemini-2.5-pro")
         vertexai.init(project=project_id, location=location)
-        model = GenerativeModel("gemini-2.5-pro")
+
+        # 応答テキスト・usage_metadata・レイテンシを録画しながら解析する
+        recordings: list[GeminiRecording] = []
+        model = RecordingGenerativeModel(
+            GenerativeModel(model_name), recordings.append, model_name=model_name
+        )
         analyzer = GeminiDocumentAnalyzer(model=model)
 
         content = pdf_file.read_bytes()
         result = analyzer.analyze(content, "application/pdf", {})
 
-        # レスポンスをフィクスチャとして保存するため、再度 JSON を取得する必要がある。
-        # analyze() は内部で JSON をパースするので、ここでは直接 Gemini を呼んでrawを取る。
-        import vertexai.preview.generative_models as generative_models
-        from vertexai.generative_models import Part
-
-        document_part = Part.from_data(data=content, mime_type="application/pdf")
-        user_prompt = analyzer._build_user_prompt({}, [])
-        HarmCategory = generative_models.HarmCategory
-        HarmBlock = generative_models.HarmBlockThreshold
-        safety_settings = {
-            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlock.BLOCK_MEDIUM_AND_ABOVE,
-            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlock.BLOCK_MEDIUM_AND_ABOVE,
-            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlock.BLOCK_MEDIUM_AND_ABOVE,
-            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlock.BLOCK_MEDIUM_AND_ABOVE,
-        }
-        response = model.generate_content(
-            [document_part, user_prompt],
-            generation_config={
-                "max_output_tokens": 8192,
-                "temperature": 0.2,
-                "top_p": 0.95,
-                "response_mime_type": "application/json",
-            },
-            safety_settings=safety_settings,
-            stream=False,
-        )
-        raw_json = analyzer._parse_response(response.text)
+        recording = recordings[-1]
+        recording.save(_RECORDINGS_DIR / f"{fixture_name}.json")
+        raw_json = analyzer._parse_response(recording.text)
 
         out_path = _RESPONSES_DIR / f"{fixture_name}.json"
         out_path.write_text(
             json.dumps(raw_json, ensure_ascii=False, indent=2), encoding="utf-8"
         )
         print(f"\n✅ フィクスチャを保存しました: {out_path}")
+        print(f"   録画: {_RECORDINGS_DIR / f'{fixture_name}.json'}")
+        print(f"   latency: {recording.latency_seconds:.1f}s")
         print(f"   次に {_EXPECTATIONS_DIR}/{fixture_name}.json を作成してください")
 
         # 解析結果のサマリーを表示
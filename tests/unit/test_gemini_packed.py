@@ -0,0 +1,137 @@
+"""GeminiDocumentAnalyzer.analyze_packed()（複数文書のパック解析）のユニットテスト"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from google.api_core.exceptions import InvalidArgument
+from v2.adapters.gemini import GeminiDocumentAnalyzer
+from v2.adapters.resilience import CircuitBreaker
+from v2.domain.errors import AnalysisUnavailableError
+from v2.domain.models import Category, DocumentInput
+
+_RESPONSES_DIR = Path(__file__).parent.parent / "fixtures" / "gemini_responses"
+
+
+def _fixture(name: str) -> dict:
+    return json.loads((_RESPONSES_DIR / f"{name}.json").read_text(encoding="utf-8"))
+
+
+def _response(payload: dict | list, prompt_tokens: int = 0) -> SimpleNamespace:
+    usage = SimpleNamespace(
+        prompt_token_count=prompt_tokens,
+        candidates_token_count=prompt_tokens // 10,
+        total_token_count=prompt_tokens + prompt_tokens // 10,
+    )
+    return SimpleNamespace(
+        text=json.dumps(payload, ensure_ascii=False), usage_metadata=usage
+    )
+
+
+def _docs(count: int) -> list[DocumentInput]:
+    return [
+        DocumentInput(content=f"img-{i}".encode(), mime_type="image/jpeg")
+        for i in range(count)
+    ]
+
+
+class TestAnalyzePacked:
+    def test_single_request_split_by_index(self):
+        """1回の呼び出しで全文書を解析し、index の順に結果を返す"""
+        model = MagicMock()
+        model.generate_content.return_value = _response(
+            {
+                "results": [
+                    {"index": 1, **_fixture("cost_notice")},
+                    {"index": 0, **_fixture("excursion_notice")},
+                ]
+            },
+            prompt_tokens=1000,
+        )
+        analyzer = GeminiDocumentAnalyzer(model=model)
+
+        results = analyzer.analyze_packed(_docs(2), {})
+
+        model.generate_content.assert_called_once()
+        contents = model.generate_content.call_args.args[0]
+        # [document 0], 文書0, [document 1], 文書1, プロンプト
+        assert len(contents) == 5
+        assert "## Multiple Documents" in contents[-1]
+        assert results[0].analysis.summary == _fixture("excursion_notice")["summary"]
+        assert results[1].analysis.summary == _fixture("cost_notice")["summary"]
+        assert results[0].token_usage.prompt_tokens == 500
+
+    def test_missing_result_falls_back_to_single_call(self):
+        """結果が欠けた文書だけを単発で再解析する"""
+        model = MagicMock()
+        model.generate_content.side_effect = [
+            _response({"results": [{"index": 0, **_fixture("schedule_only")}]}),
+            _response(_fixture("cost_notice")),
+        ]
+        analyzer = GeminiDocumentAnalyzer(model=model)
+
+        results = analyzer.analyze_packed(_docs(2), {})
+
+        assert model.generate_content.call_count == 2
+        single_contents = model.generate_content.call_args.args[0]
+        assert len(single_contents) == 2
+        assert results[1].analysis.summary == _fixture("cost_notice")["summary"]
+
+    def test_invalid_and_duplicate_indexes_are_ignored(self):
+        model = MagicMock()
+        model.generate_content.side_effect = [
+            _response(
+                [
+                    {"index": 0, **_fixture("schedule_only")},
+                    {"index": 0, **_fixture("cost_notice")},
+                    {"index": 5, **_fixture("cost_notice")},
+                ]
+            ),
+            _response(_fixture("excursion_notice")),
+        ]
+        analyzer = GeminiDocumentAnalyzer(model=model)
+
+        results = analyzer.analyze_packed(_docs(2), {})
+
+        assert results[0].analysis.summary == _fixture("schedule_only")["summary"]
+        assert results[1].analysis.summary == _fixture("excursion_notice")["summary"]
+
+    def test_pack_failure_falls_back_to_single_calls(self):
+        """パック呼び出しが失敗したら全文書を単発で解析する"""
+        model = MagicMock()
+        model.generate_content.side_effect = [
+            InvalidArgument("request too large"),
+            _response({**_fixture("schedule_only"), "category": "EVENT"}),
+            _response({**_fixture("cost_notice"), "category": "TASK"}),
+        ]
+        analyzer = GeminiDocumentAnalyzer(model=model)
+
+        results = analyzer.analyze_packed(_docs(2), {})
+
+        assert model.generate_content.call_count == 3
+        assert [r.analysis.category for r in results] == [Category.EVENT, Category.TASK]
+
+    def test_open_circuit_does_not_fall_back(self):
+        """ブレーカー open 中は単発呼び出しで API を叩き直さない"""
+        model = MagicMock()
+        breaker = MagicMock(spec=CircuitBreaker)
+        breaker.before_call.side_effect = AnalysisUnavailableError("open")
+        analyzer = GeminiDocumentAnalyzer(model=model, circuit_breaker=breaker)
+
+        with pytest.raises(AnalysisUnavailableError):
+            analyzer.analyze_packed(_docs(3), {})
+        model.generate_content.assert_not_called()
+
+    def test_single_document_uses_plain_analyze(self):
+        model = MagicMock()
+        model.generate_content.return_value = _response(_fixture("schedule_only"))
+        analyzer = GeminiDocumentAnalyzer(model=model)
+
+        results = analyzer.analyze_packed(_docs(1), {})
+
+        assert len(results) == 1
+        assert len(model.generate_content.call_args.args[0]) == 2
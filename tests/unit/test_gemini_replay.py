@@ -0,0 +1,212 @@
+"""gemini_replay.py（録画・再生）と in-memory アダプタによる解析パイプラインのテスト"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from v2.adapters.gemini import GeminiDocumentAnalyzer
+from v2.adapters.gemini_replay import (
+    GeminiRecording,
+    RecordingGenerativeModel,
+    ReplayGenerativeModel,
+)
+from v2.domain.models import Category, DocumentRecord
+from v2.entrypoints.worker import run_analysis_async, run_analysis_sync
+from v2.services.document_processor import DocumentProcessor
+
+from tests.in_memory import (
+    InMemoryBlobStorage,
+    InMemoryDocumentRepository,
+    InMemoryFamilyRepository,
+    InMemoryUserConfigRepository,
+)
+
+_RESPONSES_DIR = Path(__file__).parent.parent / "fixtures" / "gemini_responses"
+
+
+def _recording(**kwargs) -> GeminiRecording:
+    raw = json.loads((_RESPONSES_DIR / "excursion_notice.json").read_text("utf-8"))
+    return GeminiRecording(text=json.dumps(raw, ensure_ascii=False), **kwargs)
+
+
+class TestRecordingGenerativeModel:
+    def test_records_text_usage_and_latency(self, tmp_path):
+        """応答テキスト・usage_metadata・レイテンシを録画し、保存・読み込みできる"""
+        inner = MagicMock()
+        inner.generate_content.return_value = SimpleNamespace(
+            text='{"summary": "x"}',
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=100,
+                candidates_token_count=20,
+                total_token_count=120,
+            ),
+        )
+        recordings: list[GeminiRecording] = []
+        model = RecordingGenerativeModel(inner, recordings.append, model_name="m")
+
+        response = model.generate_content(["doc", "prompt"], stream=False)
+
+        assert response is inner.generate_content.return_value
+        assert len(recordings) == 1
+        assert recordings[0].usage_metadata["total_token_count"] == 120
+        assert recordings[0].latency_seconds >= 0
+
+        path = tmp_path / "rec.json"
+        recordings[0].save(path)
+        loaded = GeminiRecording.load(path)
+        assert loaded.text == '{"summary": "x"}'
+        assert loaded.model == "m"
+        assert loaded.usage_metadata == recordings[0].usage_metadata
+
+
+class TestReplayGenerativeModel:
+    def test_replays_with_recorded_latency(self):
+        sleeps: list[float] = []
+        model = ReplayGenerativeModel(
+            [
+                _recording(
+                    latency_seconds=2.0,
+                    usage_metadata={
+                        "prompt_token_count": 1000,
+                        "candidates_token_count": 200,
+                        "total_token_count": 1200,
+                    },
+                )
+            ],
+            latency_scale=0.5,
+            sleep=sleeps.append,
+        )
+        analyzer = GeminiDocumentAnalyzer(model=model)
+
+        result = analyzer.analyze(b"img", "image/jpeg", {})
+
+        assert sleeps == [1.0]
+        assert result.token_usage.prompt_tokens == 1000
+        assert result.analysis.summary
+
+    def test_cycles_through_recordings(self):
+        first = GeminiRecording(text='{"summary": "a"}')
+        second = GeminiRecording(text='{"summary": "b"}')
+        model = ReplayGenerativeModel([first, second])
+
+        texts = [model.generate_content().text for _ in range(3)]
+
+        assert texts == [first.text, second.text, first.text]
+        assert model.call_count == 3
+
+    def test_falls_back_to_response_json_without_latency(self, tmp_path):
+        sleeps: list[float] = []
+        model = ReplayGenerativeModel.from_fixtures(
+            ["excursion_notice"],
+            recordings_dir=tmp_path,
+            responses_dir=_RESPONSES_DIR,
+            sleep=sleeps.append,
+        )
+
+        response = model.generate_content()
+
+        assert sleeps == []
+        assert response.usage_metadata is None
+        assert json.loads(response.text)["category"]
+
+
+class TestRunAnalysisWithInMemoryAdapters:
+    def test_end_to_end_with_replay(self):
+        """in-memory アダプタと再生モデルで run_analysis_sync が完走する"""
+        doc_repo = InMemoryDocumentRepository()
+        family_repo = InMemoryFamilyRepository()
+        blob_storage = InMemoryBlobStorage()
+        family_repo.create_family("f1", "u1", "family")
+        blob_storage.upload("uploads/f1/d1.jpg", b"img", "image/jpeg")
+        doc_repo.create(
+            "f1",
+            DocumentRecord(
+                id="d1",
+                uid="u1",
+                status="pending",
+                content_hash="h",
+                storage_path="uploads/f1/d1.jpg",
+                original_filename="d1.jpg",
+                mime_type="image/jpeg",
+            ),
+        )
+        processor = DocumentProcessor(
+            analyzer=GeminiDocumentAnalyzer(model=ReplayGenerativeModel([_recording()]))
+        )
+
+        run_analysis_sync(
+            "u1",
+            "f1",
+            "d1",
+            "uploads/f1/d1.jpg",
+            "image/jpeg",
+            doc_repo=doc_repo,
+            family_repo=family_repo,
+            user_repo=InMemoryUserConfigRepository(),
+            blob_storage=blob_storage,
+            processor=processor,
+        )
+
+        record = doc_repo.get("f1", "d1")
+        assert record.status == "completed"
+        assert record.category in {c.value for c in Category}
+        assert doc_repo.list_events_by_document("f1", "d1") or (
+            doc_repo.list_tasks_by_document("f1", "d1")
+        )
+
+    def test_async_runs_many_analyses_concurrently(self):
+        """非同期版は多数の解析を1つのイベントループで並行に進められる"""
+        doc_repo = InMemoryDocumentRepository()
+        family_repo = InMemoryFamilyRepository()
+        blob_storage = InMemoryBlobStorage()
+        family_repo.create_family("f1", "u1", "family")
+        blob_storage.upload("uploads/f1/d.jpg", b"img", "image/jpeg")
+        count = 50
+        for i in range(count):
+            doc_repo.create(
+                "f1",
+                DocumentRecord(
+                    id=f"d{i}",
+                    uid="u1",
+                    status="pending",
+                    content_hash=f"h{i}",
+                    storage_path="uploads/f1/d.jpg",
+                    original_filename="d.jpg",
+                    mime_type="image/jpeg",
+                ),
+            )
+        # 録画レイテンシ 0.5 秒 × 50 件: 直列なら 25 秒かかる
+        model = ReplayGenerativeModel([_recording(latency_seconds=0.5)])
+        processor = DocumentProcessor(analyzer=GeminiDocumentAnalyzer(model=model))
+
+        async def main():
+            await asyncio.gather(
+                *(
+                    run_analysis_async(
+                        "u1",
+                        "f1",
+                        f"d{i}",
+                        "uploads/f1/d.jpg",
+                        "image/jpeg",
+                        doc_repo=doc_repo,
+                        family_repo=family_repo,
+                        user_repo=InMemoryUserConfigRepository(),
+                        blob_storage=blob_storage,
+                        processor=processor,
+                    )
+                    for i in range(count)
+                )
+            )
+
+        start = time.monotonic()
+        asyncio.run(main())
+        elapsed = time.monotonic() - start
+
+        assert model.call_count == count
+        assert all(r.status == "completed" for r in doc_repo.list("f1"))
+        assert elapsed < 5
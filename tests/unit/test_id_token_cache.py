@@ -0,0 +1,116 @@
+"""id_token_cache.py（検証済み ID トークンのキャッシュ）と get_auth_info のユニットテスト"""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.requests import Request
+from v2.adapters.id_token_cache import VerifiedTokenCache
+from v2.entrypoints.api.deps import get_auth_info
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _claims(exp: float) -> dict:
+    return {"uid": "u1", "email": "a@example.com", "name": "A", "exp": exp}
+
+
+def _creds(token: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def _request() -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+
+
+class TestVerifiedTokenCache:
+    def test_returns_claims_until_exp(self):
+        clock = _FakeClock()
+        cache = VerifiedTokenCache(clock=clock)
+        cache.put("tok", _claims(exp=clock.now + 60))
+
+        assert cache.get("tok")["uid"] == "u1"
+        clock.now += 60
+        assert cache.get("tok") is None
+        assert cache.stats() == {"hits": 1, "misses": 1, "entries": 0}
+
+    def test_does_not_store_raw_token(self):
+        cache = VerifiedTokenCache(clock=_FakeClock())
+        cache.put("secret-token", _claims(exp=2_000_000))
+
+        keys = cache._entries.keys()
+        assert keys
+        assert all(isinstance(k, bytes) and len(k) == 32 for k in keys)
+
+    def test_claims_without_exp_are_not_cached(self):
+        cache = VerifiedTokenCache(clock=_FakeClock())
+        cache.put("tok", {"uid": "u1"})
+
+        assert cache.get("tok") is None
+
+    def test_evicts_least_recently_used(self):
+        cache = VerifiedTokenCache(max_entries=2, clock=_FakeClock())
+        for token in ("a", "b"):
+            cache.put(token, _claims(exp=2_000_000))
+        cache.get("a")
+        cache.put("c", _claims(exp=2_000_000))
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+
+
+class TestGetAuthInfo:
+    @pytest.fixture(autouse=True)
+    def _cache(self):
+        cache = VerifiedTokenCache()
+        with (
+            patch("v2.entrypoints.api.deps.get_id_token_cache", return_value=cache),
+            patch("v2.entrypoints.api.deps._get_firebase_app"),
+        ):
+            yield cache
+
+    def test_verifies_each_token_once(self):
+        claims = _claims(exp=4_000_000_000)
+        with patch(
+            "v2.entrypoints.api.deps.fb_auth.verify_id_token", return_value=claims
+        ) as verify:
+            first = get_auth_info(_request(), _creds("tok"))
+            second = get_auth_info(_request(), _creds("tok"))
+
+        assert first == second
+        assert first.uid == "u1"
+        verify.assert_called_once_with("tok")
+
+    def test_sets_uid_on_request_state(self):
+        """検証済みの uid を access_log 用に request.state に残す"""
+        request = _request()
+        with patch(
+            "v2.entrypoints.api.deps.fb_auth.verify_id_token",
+            return_value=_claims(exp=4_000_000_000),
+        ):
+            get_auth_info(request, _creds("tok"))
+
+        assert request.state.uid == "u1"
+
+    def test_invalid_token_is_not_cached(self, _cache):
+        with (
+            patch(
+                "v2.entrypoints.api.deps.fb_auth.verify_id_token",
+                side_effect=ValueError("bad"),
+            ) as verify,
+            pytest.raises(HTTPException) as exc_info,
+        ):
+            get_auth_info(_request(), _creds("bad"))
+
+        assert exc_info.value.status_code == 401
+        assert _cache.stats()["entries"] == 0
+        verify.assert_called_once()
@@ -0,0 +1,49 @@
+"""tests/in_memory.py（フェイクリポジトリ）の更新規則のユニットテスト"""
+
+from __future__ import annotations
+
+from google.cloud.firestore import DELETE_FIELD
+
+from tests.in_memory import InMemoryFamilyRepository, InMemoryUserConfigRepository
+
+
+class TestInMemoryUserConfigRepository:
+    def test_dot_notation_updates_nested_field(self):
+        repo = InMemoryUserConfigRepository()
+        repo.update_user("u1", {"web_push_subscriptions.a": {"endpoint": "e"}})
+
+        assert repo.get_user("u1") == {
+            "web_push_subscriptions": {"a": {"endpoint": "e"}}
+        }
+
+    def test_delete_field_removes_field(self):
+        """Firestore と同じく DELETE_FIELD はフィールドを削除する（値として保存しない）"""
+        repo = InMemoryUserConfigRepository()
+        repo.update_user(
+            "u1",
+            {"ical_token": "t", "web_push_subscriptions": {"a": {}, "b": {}}},
+        )
+
+        repo.update_user(
+            "u1", {"ical_token": DELETE_FIELD, "web_push_subscriptions.a": DELETE_FIELD}
+        )
+
+        assert repo.get_user("u1") == {"web_push_subscriptions": {"b": {}}}
+
+    def test_delete_missing_field_is_noop(self):
+        repo = InMemoryUserConfigRepository()
+        repo.update_user("u1", {"missing.leaf": DELETE_FIELD})
+
+        assert repo.get_user("u1") == {}
+
+
+class TestInMemoryFamilyRepository:
+    def test_update_family_deletes_field(self):
+        repo = InMemoryFamilyRepository()
+        repo.create_family("f1", "u1", "田中家")
+
+        repo.update_family("f1", {"plan": DELETE_FIELD, "name": "佐藤家"})
+
+        family = repo.get_family("f1")
+        assert "plan" not in family
+        assert family["name"] == "佐藤家"
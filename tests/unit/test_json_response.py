@@ -0,0 +1,190 @@
+"""json_response.py と一覧 API の高速レスポンス経路のユニットテスト
+
+一覧 API は response_model の検証を通らないため、レスポンスの形（フィールド名・値）が
+response_model と一致することをここで固定する。
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+from v2.adapters.firestore_codec import decode_event, decode_task
+from v2.domain.models import DocumentRecord, EventData, StoredTaskData
+from v2.entrypoints.api.app import app
+from v2.entrypoints.api.deps import (
+    FamilyContext,
+    get_async_document_repo,
+    get_family_context,
+)
+from v2.entrypoints.api.json_response import FastJSONResponse, dumps
+from v2.entrypoints.api.routes.documents import _to_response, _to_row
+from v2.entrypoints.api.routes.events import EventResponse
+from v2.entrypoints.api.routes.tasks import TaskResponse
+
+_EVENT = EventData(
+    summary="[長男] 遠足",
+    start="2026-05-01T08:30:00",
+    end="2026-05-01T15:00:00",
+    location="動物園",
+    description="持ち物: 水筒",
+    confidence="HIGH",
+)
+_TASK = StoredTaskData(
+    id="t1",
+    title="同意書の提出",
+    due_date="2026-04-20",
+    assignee="PARENT",
+    note="",
+    completed=False,
+)
+
+
+def _record(**overrides) -> DocumentRecord:
+    fields = {
+        "id": "d1",
+        "uid": "u1",
+        "status": "completed",
+        "content_hash": "abc",
+        "storage_path": "uploads/u1/d1.pdf",
+        "original_filename": "おたより.pdf",
+        "mime_type": "application/pdf",
+        "archive_filename": "",
+        "created_at": datetime(2026, 4, 1, 9, 0, tzinfo=UTC),
+    }
+    return DocumentRecord(**{**fields, **overrides})
+
+
+class TestDumps:
+    def test_dataclass_matches_pydantic_output(self):
+        """dataclass の直列化結果が response_model を通した JSON と同じになる"""
+        body = dumps([_EVENT])
+
+        assert json.loads(body) == [EventResponse(**_to_fields(_EVENT)).model_dump()]
+        assert "遠足".encode() in body  # 非 ASCII はエスケープしない
+
+    def test_matches_starlette_json_response(self):
+        from starlette.responses import JSONResponse
+
+        content = [{"id": "d1", "summary": "運動会", "error_message": None}]
+        assert dumps(content) == JSONResponse(content).body
+
+    def test_rejects_unknown_objects(self):
+        with pytest.raises(TypeError):
+            dumps([object()])
+
+    def test_response_media_type(self):
+        response = FastJSONResponse([_TASK])
+
+        assert response.media_type == "application/json"
+        assert json.loads(response.body)[0]["id"] == "t1"
+
+
+def _to_fields(obj) -> dict:
+    return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+
+
+class TestResponseContract:
+    """ドメインモデルのフィールドが response_model からずれていないこと"""
+
+    def test_event_fields(self):
+        assert [f.name for f in dataclasses.fields(EventData)] == list(
+            EventResponse.model_fields
+        )
+
+    def test_task_fields(self):
+        assert [f.name for f in dataclasses.fields(StoredTaskData)] == list(
+            TaskResponse.model_fields
+        )
+
+    @pytest.mark.parametrize(
+        "record",
+        [
+            _record(),
+            _record(archive_filename=None, created_at=None, error_message="failed"),
+        ],
+    )
+    def test_document_row_matches_response_model(self, record):
+        assert _to_row(record) == _to_response(record).model_dump()
+
+
+class TestListRoutes:
+    @pytest.fixture
+    def client(self):
+        repo = AsyncMock()
+        repo.list_events.return_value = [_EVENT]
+        repo.list_tasks.return_value = [_TASK]
+        repo.list.return_value = [_record()]
+        app.dependency_overrides[get_family_context] = lambda: FamilyContext(
+            uid="u1", family_id="f1", role="owner"
+        )
+        app.dependency_overrides[get_async_document_repo] = lambda: repo
+        with TestClient(app) as c:
+            yield c
+        app.dependency_overrides.clear()
+
+    def test_list_events(self, client):
+        response = client.get("/api/events")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == [_to_fields(_EVENT)]
+
+    def test_list_tasks(self, client):
+        assert client.get("/api/tasks").json() == [_to_fields(_TASK)]
+
+    def test_list_documents(self, client):
+        body = client.get("/api/documents").json()
+
+        assert body == [_to_response(_record()).model_dump()]
+        assert "uid" not in body[0]
+
+
+class TestNullFieldsContract:
+    """
+    Firestore に null・欠損で保存されたフィールドも、一覧 API では response_model と同じ
+    型（空文字・既定値）で返す。一覧 API は response_model の検証を通らないため、
+    null がそのまま出ないことをここで固定する。
+    """
+
+    @pytest.fixture
+    def client(self):
+        repo = AsyncMock()
+        repo.list_events.return_value = [
+            decode_event({"summary": None, "start": "2026-05-01", "location": None})
+        ]
+        repo.list_tasks.return_value = [
+            decode_task("t1", {"title": "提出", "due_date": None, "assignee": None})
+        ]
+        app.dependency_overrides[get_family_context] = lambda: FamilyContext(
+            uid="u1", family_id="f1", role="owner"
+        )
+        app.dependency_overrides[get_async_document_repo] = lambda: repo
+        with TestClient(app) as c:
+            yield c
+        app.dependency_overrides.clear()
+
+    @pytest.mark.parametrize(
+        ("path", "model"),
+        [("/api/events", EventResponse), ("/api/tasks", TaskResponse)],
+    )
+    def test_list_has_no_nulls(self, client, path, model):
+        body = client.get(path).json()
+
+        assert body
+        for item in body:
+            assert None not in item.values()
+            assert model.model_validate(item).model_dump() == item
+
+    def test_missing_fields_use_defaults(self, client):
+        event = client.get("/api/events").json()[0]
+        task = client.get("/api/tasks").json()[0]
+
+        assert event["summary"] == ""
+        assert event["confidence"] == "HIGH"
+        assert task["assignee"] == "PARENT"
+        assert task["completed"] is False
@@ -1,10 +1,16 @@
 """logging_config モジュールのテスト"""
 
+import io
 import json
 import logging
+import threading
 from unittest.mock import patch
 
-from v2.logging_config import CloudLoggingFormatter, setup_logging
+from v2.logging_config import (
+    BatchingStreamHandler,
+    CloudLoggingFormatter,
+    setup_logging,
+)
 
 
 class TestCloudLoggingFormatter:
@@ -150,6 +156,26 @@ class TestSetupLogging:
         root_logger = logging.getLogger()
         assert isinstance(root_logger.handlers[0].formatter, CloudLoggingFormatter)
 
+    def test_uses_batching_handler_in_cloud_run(self):
+        """Cloud Run 環境ではログの書き込みをバックグラウンドスレッドに回すこと"""
+        with patch.dict("os.environ", {"K_SERVICE": "my-service"}, clear=False):
+            setup_logging()
+
+        assert isinstance(logging.getLogger().handlers[0], BatchingStreamHandler)
+
+    def test_batching_disabled_by_zero_queue_size(self):
+        """LOG_QUEUE_MAX_RECORDS=0 の場合は同期的に書き込む StreamHandler を使うこと"""
+        with patch.dict(
+            "os.environ",
+            {"K_SERVICE": "my-service", "LOG_QUEUE_MAX_RECORDS": "0"},
+            clear=False,
+        ):
+            setup_logging()
+
+        handler = logging.getLogger().handlers[0]
+        assert not isinstance(handler, BatchingStreamHandler)
+        assert isinstance(handler.formatter, CloudLoggingFormatter)
+
     def test_uses_text_formatter_in_local_env(self):
         """Cloud Run 環境変数がない場合、テキスト フォーマッタが使われること"""
         env_without_cloud = {
@@ -179,3 +205,109 @@ class TestSetupLogging:
 
         root_logger = logging.getLogger()
         assert len(root_logger.handlers) == 1
+
+
+class _BlockingStream(io.StringIO):
+    """release されるまで write() をブロックする出力先"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, s: str) -> int:
+        self.release.wait(timeout=5)
+        return super().write(s)
+
+
+def _record(message: str, *args) -> logging.LogRecord:
+    return logging.LogRecord(
+        name="test.logger",
+        level=logging.INFO,
+        pathname="",
+        lineno=0,
+        msg=message,
+        args=args,
+        exc_info=None,
+    )
+
+
+class TestBatchingStreamHandler:
+    """BatchingStreamHandler の単体テスト"""
+
+    def test_writes_formatted_records(self):
+        """キューに積んだレコードが JSON で1行ずつ書き出されること"""
+        stream = io.StringIO()
+        handler = BatchingStreamHandler(stream)
+        handler.setFormatter(CloudLoggingFormatter())
+        try:
+            for i in range(3):
+                handler.handle(_record("request %d", i))
+            handler.flush()
+
+            lines = stream.getvalue().splitlines()
+            assert [json.loads(line)["message"] for line in lines] == [
+                "request 0",
+                "request 1",
+                "request 2",
+            ]
+        finally:
+            handler.close()
+
+    def test_args_are_resolved_at_emit_time(self):
+        """書き込み前に引数が変更されても、ログを出した時点の値で出力されること"""
+        stream = _BlockingStream()
+        handler = BatchingStreamHandler(stream)
+        try:
+            fields = {"status": "pending"}
+            handler.handle(_record("%s", fields))
+            fields["status"] = "completed"
+            stream.release.set()
+            handler.flush()
+
+            assert "pending" in stream.getvalue()
+        finally:
+            stream.release.set()
+            handler.close()
+
+    def test_drops_when_queue_full_and_reports_count(self):
+        """キュー満杯のレコードは捨てて数え、捨てた件数を WARNING で出力すること"""
+        stream = _BlockingStream()
+        handler = BatchingStreamHandler(stream, max_records=2)
+        handler.setFormatter(CloudLoggingFormatter())
+        try:
+            handler.handle(_record("first"))
+            # 書き込みスレッドが first を取り出して write() で止まるまで待つ
+            for _ in range(100):
+                if handler.stats()["queued"] == 0:
+                    break
+                threading.Event().wait(0.01)
+            for i in range(5):
+                handler.handle(_record("burst %d", i))
+
+            assert handler.stats() == {"queued": 2, "dropped": 3}
+
+            stream.release.set()
+            handler.flush()
+            entries = [json.loads(line) for line in stream.getvalue().splitlines()]
+            warning = entries[-1]
+            assert warning["severity"] == "WARNING"
+            assert warning["dropped_log_records"] == 3
+            assert [e["message"] for e in entries[:-1]] == [
+                "first",
+                "burst 0",
+                "burst 1",
+            ]
+        finally:
+            stream.release.set()
+            handler.close()
+
+    def test_close_flushes_pending_records(self):
+        """close() で残りのレコードを書き出してスレッドを止めること"""
+        stream = io.StringIO()
+        handler = BatchingStreamHandler(stream)
+        handler.handle(_record("last words"))
+
+        handler.close()
+
+        assert "last words" in stream.getvalue()
+        assert not handler._thread.is_alive()
@@ -0,0 +1,381 @@
+"""resilience.py（ヘッジリクエスト・サーキットブレーカー）のユニットテスト"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from google.api_core.exceptions import InvalidArgument, ServiceUnavailable
+from v2.adapters import resilience
+from v2.adapters.gemini import GeminiDocumentAnalyzer
+from v2.adapters.resilience import (
+    CircuitBreaker,
+    LatencyTracker,
+    call_with_hedge,
+    call_with_hedge_async,
+)
+from v2.domain.errors import AnalysisUnavailableError
+from v2.entrypoints.api.app import app
+from v2.entrypoints.api.worker_auth import verify_worker_token
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLatencyTracker:
+    def test_returns_none_until_min_samples(self):
+        tracker = LatencyTracker(window=10, min_samples=3)
+        tracker.record(1.0)
+        tracker.record(2.0)
+        assert tracker.percentile(95) is None
+
+    def test_nearest_rank_percentile(self):
+        tracker = LatencyTracker(window=100, min_samples=1)
+        for i in range(1, 101):
+            tracker.record(float(i))
+        assert tracker.percentile(95) == 95.0
+        assert tracker.percentile(50) == 50.0
+
+    def test_window_drops_old_samples(self):
+        tracker = LatencyTracker(window=3, min_samples=1)
+        for v in (100.0, 1.0, 2.0, 3.0):
+            tracker.record(v)
+        assert tracker.percentile(100) == 3.0
+
+
+class TestCallWithHedge:
+    def test_no_hedge_when_delay_is_none(self):
+        fn = MagicMock(return_value="ok")
+        assert call_with_hedge(fn, None) == "ok"
+        fn.assert_called_once()
+
+    def test_fast_call_is_not_hedged(self):
+        fn = MagicMock(return_value="ok")
+        assert call_with_hedge(fn, 1.0) == "ok"
+        fn.assert_called_once()
+
+    def test_slow_call_is_hedged_and_faster_result_wins(self):
+        """1本目が停滞した場合、ヘッジした2本目の結果を返す"""
+        release = threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(timeout=5)
+                return "slow"
+            return "hedged"
+
+        try:
+            assert call_with_hedge(fn, 0.05) == "hedged"
+        finally:
+            release.set()
+        assert len(calls) == 2
+
+    def test_raises_when_both_fail(self):
+        def fn():
+            time.sleep(0.1)
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            call_with_hedge(fn, 0.01)
+
+    def test_reuses_shared_executor(self):
+        """呼び出しごとにスレッドプールを作らず、共有プールで実行する"""
+        threads = set()
+
+        def fn():
+            threads.add(threading.current_thread().name)
+            return "ok"
+
+        for _ in range(3):
+            assert call_with_hedge(fn, 1.0) == "ok"
+
+        executor = resilience._get_hedge_executor()
+        assert executor is resilience._get_hedge_executor()
+        assert executor._max_workers == resilience._HEDGE_MAX_WORKERS
+        assert all(name.startswith("hedge") for name in threads)
+
+
+class TestCircuitBreaker:
+    def _breaker(self, clock: _FakeClock) -> CircuitBreaker:
+        return CircuitBreaker(
+            failure_rate_threshold=0.5,
+            window_seconds=60,
+            min_calls=4,
+            open_seconds=30,
+            clock=clock,
+        )
+
+    def test_opens_when_failure_rate_exceeds_threshold(self):
+        clock = _FakeClock()
+        breaker = self._breaker(clock)
+        breaker.record_success()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(AnalysisUnavailableError):
+            breaker.before_call()
+
+    def test_stays_closed_below_min_calls(self):
+        breaker = self._breaker(_FakeClock())
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_old_outcomes_fall_out_of_window(self):
+        clock = _FakeClock()
+        breaker = self._breaker(clock)
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now += 120
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_probe_success_closes(self):
+        clock = _FakeClock()
+        breaker = self._breaker(clock)
+        for _ in range(4):
+            breaker.record_failure()
+        clock.now += 31
+
+        assert breaker.allows_call()
+        breaker.before_call()
+        # 試行中の2本目は通さない
+        with pytest.raises(AnalysisUnavailableError):
+            breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_probe_failure_reopens(self):
+        clock = _FakeClock()
+        breaker = self._breaker(clock)
+        for _ in range(4):
+            breaker.record_failure()
+        clock.now += 31
+        breaker.before_call()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allows_call()
+
+    def test_cancelled_probe_lets_next_call_probe(self):
+        clock = _FakeClock()
+        breaker = self._breaker(clock)
+        for _ in range(4):
+            breaker.record_failure()
+        clock.now += 31
+        breaker.before_call()
+        breaker.release_probe()
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        breaker.before_call()  # 次の呼び出しが試行として通る
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_release_probe_is_noop_when_closed(self):
+        breaker = self._breaker(_FakeClock())
+        breaker.release_probe()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+class TestGeminiAnalyzerResilience:
+    def _analyzer(self, model: MagicMock, breaker: CircuitBreaker):
+        return GeminiDocumentAnalyzer(model=model, circuit_breaker=breaker)
+
+    def test_transient_errors_open_breaker_and_fail_fast(self):
+        model = MagicMock()
+        model.generate_content.side_effect = ServiceUnavailable("down")
+        breaker = CircuitBreaker(min_calls=1, failure_rate_threshold=0.5)
+        analyzer = self._analyzer(model, breaker)
+
+        # tenacity のバックオフ待ちをスキップ
+        with (
+            patch.object(GeminiDocumentAnalyzer._call_gemini.retry, "sleep"),
+            pytest.raises(ServiceUnavailable),
+        ):
+            analyzer.analyze(b"x", "application/pdf", {})
+        calls_before = model.generate_content.call_count
+
+        with pytest.raises(AnalysisUnavailableError):
+            analyzer.analyze(b"x", "application/pdf", {})
+        assert model.generate_content.call_count == calls_before
+
+    def test_input_errors_do_not_count_as_failures(self):
+        model = MagicMock()
+        model.generate_content.side_effect = InvalidArgument("bad pdf")
+        breaker = CircuitBreaker(min_calls=1, failure_rate_threshold=0.5)
+        analyzer = self._analyzer(model, breaker)
+
+        with pytest.raises(InvalidArgument):
+            analyzer.analyze(b"x", "application/pdf", {})
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_hedge_applies_to_each_retry_attempt(self):
+        """ヘッジはリトライの内側（試行ごと）に掛かり、リトライ全体は重複させない"""
+        model = MagicMock()
+        model.generate_content.side_effect = [
+            ServiceUnavailable("down"),
+            ServiceUnavailable("down"),
+            MagicMock(),
+        ]
+        analyzer = GeminiDocumentAnalyzer(model=model)
+        with (
+            patch.object(GeminiDocumentAnalyzer._call_gemini.retry, "sleep"),
+            patch(
+                "v2.adapters.gemini.call_with_hedge",
+                side_effect=lambda fn, delay: fn(),
+            ) as hedge,
+        ):
+            analyzer._generate([], {}, {})
+
+        assert hedge.call_count == 3
+        assert model.generate_content.call_count == 3
+
+
+class TestWorkerDeferral:
+    def test_analyze_endpoint_returns_503_when_circuit_open(self):
+        """サーキットブレーカー open 中は 503 を返して Cloud Tasks に再試行させる"""
+        app.dependency_overrides[verify_worker_token] = lambda: None
+        try:
+            with (
+                patch(
+                    "v2.entrypoints.worker.run_analysis_async",
+                    side_effect=AnalysisUnavailableError("Circuit breaker is open"),
+                ),
+                TestClient(app) as client,
+            ):
+                response = client.post(
+                    "/worker/analyze",
+                    json={
+                        "uid": "u1",
+                        "family_id": "f1",
+                        "document_id": "d1",
+                        "storage_path": "uploads/f1/d1.pdf",
+                        "mime_type": "application/pdf",
+                    },
+                )
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
+
+    def test_run_analysis_leaves_document_pending_when_open(self):
+        """ブレーカー open 中は I/O を行わずに AnalysisUnavailableError を送出する"""
+        from v2.entrypoints import worker
+
+        breaker = MagicMock()
+        breaker.allows_call.return_value = False
+        with (
+            patch.object(worker, "_get_circuit_breaker", return_value=breaker),
+            patch.object(worker, "FirestoreDocumentRepository") as repo_cls,
+            pytest.raises(AnalysisUnavailableError),
+        ):
+            worker.run_analysis_sync("u1", "f1", "d1", "p", "application/pdf")
+        repo_cls.assert_not_called()
+
+
+class TestCallWithHedgeAsync:
+    def test_no_hedge_when_delay_is_none(self):
+        fn = AsyncMock(return_value="ok")
+        assert asyncio.run(call_with_hedge_async(fn, None)) == "ok"
+        fn.assert_awaited_once()
+
+    def test_slow_call_is_hedged_and_loser_cancelled(self):
+        """1本目が停滞した場合、2本目の結果を返し1本目はキャンセルする"""
+        calls = []
+        cancelled = []
+
+        async def fn():
+            calls.append(1)
+            if len(calls) == 1:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(1)
+                    raise
+                return "slow"
+            return "hedged"
+
+        async def main():
+            result = await call_with_hedge_async(fn, 0.05)
+            await asyncio.sleep(0)  # キャンセルを反映させる
+            return result
+
+        assert asyncio.run(main()) == "hedged"
+        assert len(calls) == 2
+        assert cancelled == [1]
+
+    def test_raises_when_both_fail(self):
+        async def fn():
+            await asyncio.sleep(0.1)
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            asyncio.run(call_with_hedge_async(fn, 0.01))
+
+
+class TestGeminiAnalyzerResilienceAsync:
+    def test_transient_errors_open_breaker_and_fail_fast(self):
+        model = MagicMock()
+        model.generate_content_async = AsyncMock(side_effect=ServiceUnavailable("down"))
+        breaker = CircuitBreaker(min_calls=1, failure_rate_threshold=0.5)
+        analyzer = GeminiDocumentAnalyzer(model=model, circuit_breaker=breaker)
+
+        # tenacity のバックオフ待ちをスキップ
+        with (
+            patch.object(
+                GeminiDocumentAnalyzer._call_gemini_async.retry, "sleep", AsyncMock()
+            ),
+            pytest.raises(ServiceUnavailable),
+        ):
+            asyncio.run(analyzer.analyze_async(b"x", "application/pdf", {}))
+        assert model.generate_content_async.await_count == 4
+
+        with pytest.raises(AnalysisUnavailableError):
+            asyncio.run(analyzer.analyze_async(b"x", "application/pdf", {}))
+        assert model.generate_content_async.await_count == 4
+
+    def test_cancelled_probe_is_released(self):
+        """half_open の試行がキャンセルされても、次の呼び出しが試行として通る"""
+        model = MagicMock()
+        started = asyncio.Event()
+
+        async def hang(*args, **kwargs):
+            started.set()
+            await asyncio.sleep(5)
+
+        model.generate_content_async = hang
+        clock = _FakeClock()
+        breaker = CircuitBreaker(min_calls=1, open_seconds=30, clock=clock)
+        breaker.record_failure()
+        clock.now += 31
+        analyzer = GeminiDocumentAnalyzer(model=model, circuit_breaker=breaker)
+
+        async def main():
+            task = asyncio.create_task(
+                analyzer.analyze_async(b"x", "application/pdf", {})
+            )
+            await started.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        breaker.before_call()
@@ -0,0 +1,80 @@
+"""ttl_cache.py（TTLCache / ProcessSingleton）のユニットテスト"""
+
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+import pytest
+from v2.adapters.ttl_cache import ProcessSingleton, TTLCache
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    def test_default_ttl(self):
+        clock = _FakeClock()
+        cache = TTLCache(10, ttl_seconds=30, clock=clock)
+        cache.put("a", 1)
+
+        assert cache.get("a") == 1
+        clock.now += 30
+        assert cache.get("a") is None
+        assert cache.stats() == {"hits": 1, "misses": 1, "entries": 0}
+
+    def test_per_entry_expiry(self):
+        clock = _FakeClock()
+        cache = TTLCache(10, ttl_seconds=30, clock=clock)
+        cache.put("short", 1, expires_at=clock.now + 5)
+        cache.put("long", 2)
+
+        clock.now += 10
+        assert cache.get("short") is None
+        assert cache.get("long") == 2
+
+    def test_expires_at_required_without_ttl(self):
+        cache = TTLCache(10)
+
+        with pytest.raises(ValueError):
+            cache.put("a", 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(2, ttl_seconds=30)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.keys() == ["a", "c"]
+
+    def test_invalidate_where(self):
+        cache = TTLCache(10, ttl_seconds=30)
+        cache.put(("f1", "list"), 1)
+        cache.put(("f1", "events"), 2)
+        cache.put(("f2", "list"), 3)
+
+        cache.invalidate_where(lambda k: k[0] == "f1")
+
+        assert cache.keys() == [("f2", "list")]
+
+
+class TestProcessSingleton:
+    def test_builds_once(self):
+        build = Mock(return_value=object())
+        shared = ProcessSingleton(build)
+
+        assert shared.get() is shared.get()
+        build.assert_called_once()
+
+    def test_disabled_result_is_kept(self):
+        build = Mock(return_value=None)
+        shared = ProcessSingleton(build)
+
+        assert shared.get() is None
+        assert shared.get() is None
+        build.assert_called_once()
@@ -0,0 +1,185 @@
+"""warmup.py（起動時ウォームアップ）と /health のレディネスのユニットテスト"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from unittest.mock import patch
+
+import firebase_admin
+import firebase_admin.auth as fb_auth
+import pytest
+from fastapi.testclient import TestClient
+from google.auth.credentials import AnonymousCredentials
+from google.auth.exceptions import TransportError
+from v2.entrypoints.api.app import create_app
+from v2.entrypoints.api.warmup import (
+    WarmupState,
+    _prime_firebase_auth,
+    _warmup_steps,
+    run_warmup,
+    warmup_enabled,
+)
+
+
+def _run(steps: dict, timeout: str = "20") -> WarmupState:
+    state = WarmupState()
+    with (
+        patch("v2.entrypoints.api.warmup._warmup_steps", return_value=steps),
+        patch.dict("os.environ", {"PREWARM_TIMEOUT_SECONDS": timeout}),
+    ):
+        asyncio.run(run_warmup("api", state))
+    return state
+
+
+class TestWarmupEnabled:
+    @pytest.mark.parametrize(
+        ("env", "expected"),
+        [
+            ({}, False),
+            ({"K_SERVICE": "clearbag-api"}, True),
+            ({"K_SERVICE": "clearbag-api", "LOCAL_MODE": "true"}, False),
+            ({"K_SERVICE": "clearbag-api", "PREWARM_ON_STARTUP": "false"}, False),
+            ({"PREWARM_ON_STARTUP": "true"}, True),
+        ],
+    )
+    def test_env(self, monkeypatch, env, expected):
+        for key in ("K_SERVICE", "LOCAL_MODE", "PREWARM_ON_STARTUP"):
+            monkeypatch.delenv(key, raising=False)
+        for key, value in env.items():
+            monkeypatch.setenv(key, value)
+
+        assert warmup_enabled() is expected
+
+
+class TestRunWarmup:
+    def test_runs_steps_concurrently(self):
+        """各ステップは並行に実行され、合計時間はステップの和より短い"""
+        steps = {name: lambda: time.sleep(0.2) for name in ("a", "b", "c")}
+
+        state = _run(steps)
+
+        assert state.ready
+        assert set(state.step_ms) == {"a", "b", "c"}
+        assert state.duration_ms < 500
+        assert state.failed == []
+
+    def test_failed_step_does_not_block_readiness(self):
+        def fail():
+            raise RuntimeError("no credentials")
+
+        state = _run({"ok": lambda: None, "broken": fail})
+
+        assert state.ready
+        assert state.failed == ["broken"]
+
+    def test_timeout_marks_pending_steps(self):
+        state = _run({"fast": lambda: None, "slow": lambda: time.sleep(1)}, "0.2")
+
+        assert state.ready
+        assert state.failed == ["slow"]
+        assert "slow" not in state.step_ms
+
+    def test_duration_is_logged(self, caplog):
+        with caplog.at_level(logging.INFO, logger="v2.analytics"):
+            _run({"a": lambda: None})
+
+        record = next(r for r in caplog.records if r.getMessage() == "startup_warmup")
+        fields = record.extra_fields
+        assert fields["role"] == "api"
+        assert isinstance(fields["duration_ms"], int)
+        assert set(fields["step_ms"]) == {"a"}
+
+
+class _AnonymousCredential(firebase_admin.credentials.Base):
+    def get_credential(self):
+        return AnonymousCredentials()
+
+
+class TestPrimeFirebaseAuth:
+    @pytest.fixture
+    def firebase_app(self):
+        app = firebase_admin.initialize_app(
+            _AnonymousCredential(), {"projectId": "p"}, name=f"warmup-{uuid.uuid4()}"
+        )
+        with patch("v2.entrypoints.api.deps._get_firebase_app", return_value=app):
+            yield app
+        firebase_admin.delete_app(app)
+
+    def test_dummy_token_reaches_signature_check(self, firebase_app):
+        """ダミートークンは事前チェックを通り、証明書取得つきの署名検証まで進む"""
+        with patch(
+            "google.oauth2.id_token.verify_token",
+            side_effect=ValueError("Could not verify token signature."),
+        ) as verify:
+            _prime_firebase_auth()
+
+        verify.assert_called_once()
+        assert verify.call_args.kwargs["audience"] == "p"
+
+    def test_certificate_fetch_error_propagates(self, firebase_app):
+        with (
+            patch(
+                "google.oauth2.id_token.verify_token",
+                side_effect=TransportError("unreachable"),
+            ),
+            pytest.raises(fb_auth.CertificateFetchError),
+        ):
+            _prime_firebase_auth()
+
+
+class TestWarmupSteps:
+    def test_worker_warms_firestore(self):
+        assert set(_warmup_steps("worker")) == {"gcs", "firestore"}
+
+    @pytest.mark.parametrize("role", ["all", "api"])
+    def test_api_warms_everything(self, role):
+        assert set(_warmup_steps(role)) == {
+            "gcs",
+            "firestore",
+            "firebase_auth",
+            "firestore_async",
+            "cloud_tasks",
+        }
+
+
+class TestHealthReadiness:
+    def test_not_ready_until_warmup_finishes(self, monkeypatch):
+        monkeypatch.setenv("PREWARM_ON_STARTUP", "true")
+        app = create_app("worker")
+        client = TestClient(app)
+
+        response = client.get("/health")
+        assert response.status_code == 503
+        assert response.json() == {"status": "warming_up"}
+
+        app.state.warmup.ready = True
+        assert client.get("/health").json() == {"status": "ok"}
+
+    def test_startup_runs_warmup(self, monkeypatch):
+        monkeypatch.setenv("PREWARM_ON_STARTUP", "true")
+        app = create_app("worker")
+
+        with (
+            patch(
+                "v2.entrypoints.api.warmup._warmup_steps",
+                return_value={"a": lambda: None},
+            ),
+            TestClient(app) as client,
+        ):
+            # ウォームアップはバックグラウンドで走るため、完了まで待つ
+            for _ in range(50):
+                if client.get("/health").status_code == 200:
+                    break
+                time.sleep(0.02)
+
+            assert app.state.warmup.ready
+            assert app.state.warmup.step_ms.keys() == {"a"}
+
+    def test_ready_immediately_when_disabled(self, monkeypatch):
+        monkeypatch.setenv("PREWARM_ON_STARTUP", "false")
+
+        with TestClient(create_app("worker")) as client:
+            assert client.get("/health").status_code == 200
@@ -7,7 +7,7 @@ google.oauth2.id_token.verify_oauth2_token をモックして、
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
@@ -107,14 +107,14 @@ def test_email_mismatch_returns_401():
 
 def test_valid_token_accepted():
     """正しいサービスアカウントの OIDC トークンはリクエストを通す"""
-    mock_run = MagicMock()
+    mock_run = AsyncMock()
 
     with (
         patch.dict("os.environ", {"WORKER_SERVICE_ACCOUNT_EMAIL": _VALID_EMAIL}),
         patch(
             "v2.entrypoints.api.worker_auth.id_token.verify_oauth2_token", _mock_verify
         ),
-        patch("v2.entrypoints.worker.run_analysis_sync", mock_run),
+        patch("v2.entrypoints.worker.run_analysis_async", mock_run),
     ):
         client = TestClient(app, raise_server_exceptions=False)
         response = client.post(
@@ -133,14 +133,14 @@ def test_valid_token_accepted():
 
 def test_local_mode_skips_verification():
     """LOCAL_MODE=true のときはトークンなしでもリクエストを通す"""
-    mock_run = MagicMock()
+    mock_run = AsyncMock()
 
     with (
         patch.dict(
             "os.environ",
             {"LOCAL_MODE": "true", "WORKER_SERVICE_ACCOUNT_EMAIL": _VALID_EMAIL},
         ),
-        patch("v2.entrypoints.worker.run_analysis_sync", mock_run),
+        patch("v2.entrypoints.worker.run_analysis_async", mock_run),
     ):
         client = TestClient(app, raise_server_exceptions=False)
         response = client.post(
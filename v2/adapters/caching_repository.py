@@ -0,0 +1,385 @@
+"""DocumentRepository のリードスルーキャッシュ
+
+ダッシュボード・カレンダー・タスク画面を家族が繰り返し開くと、そのたびに同じ
+Firestore クエリが走る。一覧系の読み取り（list / list_events / list_tasks）の結果を
+ファミリー単位で TTL + LRU でプロセス内に保持し、同じプロセスでの書き込み
+（create / save_analysis / delete / update_status / update_task_completed）で
+そのファミリーのエントリを破棄する。
+
+- DocumentReadCache: TTLCache にファミリー単位の無効化を加えたもの
+- CachingDocumentRepository: 任意の DocumentRepository をラップするデコレーター
+- AsyncCachingDocumentRepository: AsyncDocumentRepository 版（同じキャッシュを共有できる）
+
+無効化はプロセス内に閉じる。解析結果の保存は別インスタンスのワーカー（APP_ROLE=worker）で
+行われることが多く、その書き込みは検知できないため、TTL を短く保つこと。
+DOCUMENT_CACHE_TTL_SECONDS が 0（デフォルト）の場合はキャッシュしない。
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from v2.adapters.ttl_cache import ProcessSingleton, TTLCache
+from v2.domain.models import (
+    DocumentAnalysis,
+    DocumentDetail,
+    DocumentRecord,
+    EventData,
+    StoredTaskData,
+)
+from v2.domain.ports import AsyncDocumentRepository, DocumentRepository
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class DocumentReadCache:
+    """
+    ファミリー単位で無効化できる TTL + LRU キャッシュ（TTLCache のラッパー）。
+
+    キーの先頭要素を family_id とし、invalidate_family() でまとめて破棄する。
+    読み込み中に無効化された場合に古い結果を書き戻さないよう、ファミリーごとの世代番号を
+    読み込み前に取得して put() に渡す。
+    世代番号もエントリと同じ上限で古いものから捨てる。捨てた世代番号の最大値を下限とし、
+    記録のないファミリーの世代番号はその下限を返すため、捨てたあとも古い結果は書き戻されない。
+    世代番号の確認と保存を一体で行うため、世代番号は TTLCache とは別のロックで保護する。
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            ttl_seconds: エントリの有効期間（秒）
+            max_entries: 保持するエントリ数の上限（超えたら最も古く使われたものを捨てる）
+            clock: 現在時刻（秒）を返す関数（テスト用に差し替え可能）
+        """
+        self._max_entries = max_entries
+        self._entries: TTLCache = TTLCache(
+            max_entries, ttl_seconds=ttl_seconds, clock=clock
+        )
+        self._generations: OrderedDict[str, int] = OrderedDict()
+        self._generation_counter = 0
+        self._generation_floor = 0
+        self._lock = threading.Lock()
+
+    @property
+    def hits(self) -> int:
+        return self._entries.hits
+
+    @property
+    def misses(self) -> int:
+        return self._entries.misses
+
+    def get(self, key: tuple) -> Any:
+        """有効なエントリの値を返す。なければ _MISSING を返す"""
+        value = self._entries.get(key)
+        return _MISSING if value is None else value
+
+    def generation(self, family_id: str) -> int:
+        """family_id の現在の世代番号（無効化のたびに増える）を返す"""
+        with self._lock:
+            return self._generations.get(family_id, self._generation_floor)
+
+    def put(self, key: tuple, value: Any, generation: int) -> None:
+        """generation が読み込み前から変わっていなければエントリを保存する"""
+        with self._lock:
+            if self._generations.get(key[0], self._generation_floor) != generation:
+                return
+            self._entries.put(key, value)
+
+    def invalidate_family(self, family_id: str) -> None:
+        """family_id のエントリをすべて破棄する"""
+        with self._lock:
+            self._generation_counter += 1
+            self._generations[family_id] = self._generation_counter
+            self._generations.move_to_end(family_id)
+            while len(self._generations) > self._max_entries:
+                _, evicted = self._generations.popitem(last=False)
+                self._generation_floor = max(self._generation_floor, evicted)
+            self._entries.invalidate_where(lambda k: k[0] == family_id)
+
+    def stats(self) -> dict[str, int]:
+        """ヒット・ミス件数と現在のエントリ数を返す"""
+        with self._lock:
+            return {
+                **self._entries.stats(),
+                "generations": len(self._generations),
+            }
+
+
+def _build_document_cache() -> DocumentReadCache | None:
+    ttl = float(os.environ.get("DOCUMENT_CACHE_TTL_SECONDS", "0"))
+    if ttl <= 0:
+        return None
+    logger.info("Document read cache enabled: ttl=%.1fs", ttl)
+    return DocumentReadCache(
+        ttl_seconds=ttl,
+        max_entries=int(os.environ.get("DOCUMENT_CACHE_MAX_ENTRIES", "1024")),
+    )
+
+
+_document_cache: ProcessSingleton = ProcessSingleton(_build_document_cache)
+
+
+def get_document_cache() -> DocumentReadCache | None:
+    """
+    プロセス共有の DocumentReadCache を返す。
+
+    DOCUMENT_CACHE_TTL_SECONDS が 0 以下の場合は None（キャッシュ無効）。
+    """
+    return _document_cache.get()
+
+
+def _copy(value: Any) -> Any:
+    # 呼び出し側がリストを加工してもキャッシュに影響しないよう浅いコピーを返す
+    return list(value)
+
+
+class CachingDocumentRepository(DocumentRepository):
+    """一覧系の読み取りをキャッシュし、書き込みでファミリーごと無効化するデコレーター"""
+
+    def __init__(self, inner: DocumentRepository, cache: DocumentReadCache) -> None:
+        self._inner = inner
+        self._cache = cache
+
+    def _cached(self, key: tuple[Hashable, ...], load: Callable[[], Any]) -> Any:
+        value = self._cache.get(key)
+        if value is _MISSING:
+            generation = self._cache.generation(key[0])
+            value = load()
+            self._cache.put(key, value, generation)
+        return _copy(value)
+
+    # ── 読み取り（キャッシュ対象） ─────────────────────────────────────────────
+
+    def list(
+        self,
+        uid: str,
+        limit: int | None = None,
+        start_after: datetime.datetime | None = None,
+        start_after_id: str | None = None,
+    ) -> list[DocumentRecord]:
+        return self._cached(
+            (uid, "list", limit, start_after, start_after_id),
+            lambda: self._inner.list(
+                uid, limit=limit, start_after=start_after, start_after_id=start_after_id
+            ),
+        )
+
+    def list_events(
+        self,
+        uid: str,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        profile_id: str | None = None,
+    ) -> list[EventData]:
+        return self._cached(
+            (uid, "list_events", from_date, to_date, profile_id),
+            lambda: self._inner.list_events(
+                uid, from_date=from_date, to_date=to_date, profile_id=profile_id
+            ),
+        )
+
+    def list_tasks(
+        self, uid: str, completed: bool | None = None
+    ) -> list[StoredTaskData]:
+        return self._cached(
+            (uid, "list_tasks", completed),
+            lambda: self._inner.list_tasks(uid, completed=completed),
+        )
+
+    # ── 読み取り（委譲のみ） ───────────────────────────────────────────────────
+
+    def get(self, uid: str, document_id: str) -> DocumentRecord | None:
+        return self._inner.get(uid, document_id)
+
+    def find_by_content_hash(
+        self, uid: str, content_hash: str
+    ) -> DocumentRecord | None:
+        return self._inner.find_by_content_hash(uid, content_hash)
+
+    def list_events_by_document(self, uid: str, document_id: str) -> list[EventData]:
+        return self._inner.list_events_by_document(uid, document_id)
+
+    def list_tasks_by_document(
+        self, uid: str, document_id: str
+    ) -> list[StoredTaskData]:
+        return self._inner.list_tasks_by_document(uid, document_id)
+
+    def get_document_detail(self, uid: str, document_id: str) -> DocumentDetail | None:
+        return self._inner.get_document_detail(uid, document_id)
+
+    # ── 書き込み（ファミリーのエントリを無効化） ───────────────────────────────
+
+    def create(self, uid: str, record: DocumentRecord) -> str:
+        try:
+            return self._inner.create(uid, record)
+        finally:
+            self._cache.invalidate_family(uid)
+
+    def update_status(
+        self,
+        uid: str,
+        document_id: str,
+        status: str,
+        error_message: str | None = None,
+    ) -> None:
+        try:
+            self._inner.update_status(uid, document_id, status, error_message)
+        finally:
+            self._cache.invalidate_family(uid)
+
+    def save_analysis(
+        self, uid: str, document_id: str, analysis: DocumentAnalysis
+    ) -> None:
+        try:
+            self._inner.save_analysis(uid, document_id, analysis)
+        finally:
+            self._cache.invalidate_family(uid)
+
+    def delete(self, uid: str, document_id: str) -> None:
+        try:
+            self._inner.delete(uid, document_id)
+        finally:
+            self._cache.invalidate_family(uid)
+
+    def update_task_completed(self, uid: str, task_id: str, completed: bool) -> bool:
+        try:
+            return self._inner.update_task_completed(uid, task_id, completed)
+        finally:
+            self._cache.invalidate_family(uid)
+
+
+class AsyncCachingDocumentRepository(AsyncDocumentRepository):
+    """CachingDocumentRepository の AsyncDocumentRepository 版"""
+
+    def __init__(
+        self, inner: AsyncDocumentRepository, cache: DocumentReadCache
+    ) -> None:
+        self._inner = inner
+        self._cache = cache
+
+    async def _cached(self, key: tuple[Hashable, ...], load) -> Any:
+        value = self._cache.get(key)
+        if value is _MISSING:
+            generation = self._cache.generation(key[0])
+            value = await load()
+            self._cache.put(key, value, generation)
+        return _copy(value)
+
+    # ── 読み取り（キャッシュ対象） ─────────────────────────────────────────────
+
+    async def list(
+        self,
+        uid: str,
+        limit: int | None = None,
+        start_after: datetime.datetime | None = None,
+        start_after_id: str | None = None,
+    ) -> list[DocumentRecord]:
+        return await self._cached(
+            (uid, "list", limit, start_after, start_after_id),
+            lambda: self._inner.list(
+                uid, limit=limit, start_after=start_after, start_after_id=start_after_id
+            ),
+        )
+
+    async def list_events(
+        self,
+        uid: str,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        profile_id: str | None = None,
+    ) -> list[EventData]:
+        return await self._cached(
+            (uid, "list_events", from_date, to_date, profile_id),
+            lambda: self._inner.list_events(
+                uid, from_date=from_date, to_date=to_date, profile_id=profile_id
+            ),
+        )
+
+    async def list_tasks(
+        self, uid: str, completed: bool | None = None
+    ) -> list[StoredTaskData]:
+        return await self._cached(
+            (uid, "list_tasks", completed),
+            lambda: self._inner.list_tasks(uid, completed=completed),
+        )
+
+    # ── 読み取り（委譲のみ） ───────────────────────────────────────────────────
+
+    async def get(self, uid: str, document_id: str) -> DocumentRecord | None:
+        return await self._inner.get(uid, document_id)
+
+    async def find_by_content_hash(
+        self, uid: str, content_hash: str
+    ) -> DocumentRecord | None:
+        return await self._inner.find_by_content_hash(uid, content_hash)
+
+    async def list_events_by_document(
+        self, uid: str, document_id: str
+    ) -> list[EventData]:
+        return await self._inner.list_events_by_document(uid, document_id)
+
+    async def list_tasks_by_document(
+        self, uid: str, document_id: str
+    ) -> list[StoredTaskData]:
+        return await self._inner.list_tasks_by_document(uid, document_id)
+
+    async def get_document_detail(
+        self, uid: str, document_id: str
+    ) -> DocumentDetail | None:
+        return await self._inner.get_document_detail(uid, document_id)
+
+    # ── 書き込み（ファミリーのエントリを無効化） ───────────────────────────────
+
+    async def create(self, uid: str, record: DocumentRecord) -> str:
+        try:
+            return await self._inner.create(uid, record)
+        finally:
+            self._cache.invalidate_family(uid)
+
+    async def update_status(
+        self,
+        uid: str,
+        document_id: str,
+        status: str,
+        error_message: str | None = None,
+    ) -> None:
+        try:
+            await self._inner.update_status(uid, document_id, status, error_message)
+        finally:
+            self._cache.invalidate_family(uid)
+
+    async def save_analysis(
+        self, uid: str, document_id: str, analysis: DocumentAnalysis
+    ) -> None:
+        try:
+            await self._inner.save_analysis(uid, document_id, analysis)
+        finally:
+            self._cache.invalidate_family(uid)
+
+    async def delete(self, uid: str, document_id: str) -> None:
+        try:
+            await self._inner.delete(uid, document_id)
+        finally:
+            self._cache.invalidate_family(uid)
+
+    async def update_task_completed(
+        self, uid: str, task_id: str, completed: bool
+    ) -> bool:
+        try:
+            return await self._inner.update_task_completed(uid, task_id, completed)
+        finally:
+            self._cache.invalidate_family(uid)
@@ -9,6 +9,7 @@ from __future__ import annotations
 import datetime
 import logging
 import os
+import threading
 
 import google.auth
 from google.auth.transport import requests as auth_requests
@@ -25,6 +26,9 @@ class GCSBlobStorage(BlobStorage):
 
     全ファイルは単一バケット内の blob_path で管理する。
     パス規約: uploads/{uid}/{document_id}{ext}
+
+    storage.Client は HTTP セッション（コネクションプール）を持つため、
+    インスタンスはプロセスで共有する（deps.get_blob_storage）。
     """
 
     def __init__(self, bucket_name: str, client: storage.Client | None = None) -> None:
@@ -36,6 +40,10 @@ class GCSBlobStorage(BlobStorage):
         self._client = client or storage.Client()
         self._bucket = self._client.bucket(bucket_name)
         self._bucket_name = bucket_name
+        # 署名付き URL 用の ADC 認証情報（初回の署名時に取得し、期限切れ時のみ更新する）
+        # インスタンスはスレッドプールから共有されるため、取得・更新はロックで直列化する
+        self._signing_credentials = None
+        self._signing_lock = threading.Lock()
 
     def upload(self, blob_path: str, content: bytes, content_type: str) -> str:
         """
@@ -144,11 +152,8 @@ class GCSBlobStorage(BlobStorage):
         if sa_email:
             # Cloud Run: compute_engine.Credentials はローカル秘密鍵を持たないため
             # IAM signBlob API を使うよう service_account_email + access_token を渡す
-            credentials, _ = google.auth.default()
-            if not credentials.valid:
-                credentials.refresh(auth_requests.Request())
             signing_kwargs["service_account_email"] = sa_email
-            signing_kwargs["access_token"] = credentials.token
+            signing_kwargs["access_token"] = self._signing_token()
 
         url = blob.generate_signed_url(
             version="v4",
@@ -163,3 +168,18 @@ class GCSBlobStorage(BlobStorage):
             expiration_minutes,
         )
         return url
+
+    def _signing_token(self) -> str:
+        """
+        署名用のアクセストークンを返す（期限切れなら更新する）。
+
+        google.auth の Credentials.refresh() はスレッドセーフではないため、
+        同時に署名するリクエストが重複して更新しないようロック内で確認・更新する。
+        """
+        with self._signing_lock:
+            if self._signing_credentials is None:
+                self._signing_credentials, _ = google.auth.default()
+            credentials = self._signing_credentials
+            if not credentials.valid:
+                credentials.refresh(auth_requests.Request())
+            return credentials.token
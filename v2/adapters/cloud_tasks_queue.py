@@ -17,11 +17,13 @@ from __future__ import annotations
 import json
 import logging
 from base64 import b64encode
-
-from google.cloud import tasks_v2
+from typing import TYPE_CHECKING
 
 from v2.domain.ports import TaskQueue
 
+if TYPE_CHECKING:
+    from google.cloud import tasks_v2
+
 logger = logging.getLogger(__name__)
 
 
@@ -51,7 +53,11 @@ class CloudTasksQueue(TaskQueue):
             service_account_email: OIDC トークン発行に使う SA メール
             client: 初期化済みクライアント（省略時は ADC で自動初期化）
         """
+        # tasks_v2 の import は重いため、クライアントを作るときまで遅延させる
+        from google.cloud import tasks_v2
+
         self._client = client or tasks_v2.CloudTasksClient()
+        self._http_method = tasks_v2.HttpMethod.POST
         self._queue_path = self._client.queue_path(project_id, location, queue_name)
         self._worker_url = worker_url
         self._service_account_email = service_account_email
@@ -70,7 +76,7 @@ class CloudTasksQueue(TaskQueue):
 
         task = {
             "http_request": {
-                "http_method": tasks_v2.HttpMethod.POST,
+                "http_method": self._http_method,
                 "url": self._worker_url,
                 "headers": {"Content-Type": "application/json"},
                 "body": b64encode(body).decode("utf-8"),
@@ -0,0 +1,371 @@
+"""Firestore Async Repository Adapter
+
+AsyncDocumentRepository の Firestore 実装（google.cloud.firestore.AsyncClient を使用）。
+
+コレクション構造・保存形式・アジェンダの扱いは同期版（firestore_repository.py）と同一で、
+firestore_schema.py / firestore_codec.py のヘルパーを共有する。async ルートから使うことでスレッドプールを経由せずに
+I/O を待て、独立した読み取りは asyncio.gather で同時に発行できる。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+import uuid
+from typing import Any
+
+from google.api_core.exceptions import NotFound
+from google.cloud import firestore
+from google.cloud.firestore_v1.base_query import FieldFilter
+from google.cloud.firestore_v1.field_path import FieldPath
+
+from v2.adapters.firestore_bulk import delete_refs_async
+from v2.adapters.firestore_codec import (
+    decode_record,
+    event_from_snapshot,
+    snapshot_data,
+    task_from_snapshot,
+)
+from v2.adapters.firestore_schema import (
+    AGENDA,
+    AGENDA_EVENTS_PREFIX,
+    AGENDA_INDEX,
+    AGENDA_TASKS_PREFIX,
+    DOCUMENTS,
+    EVENTS,
+    FAMILIES,
+    LIST_FIELDS,
+    TASKS,
+    agenda_entry,
+    agenda_months,
+    agenda_task_buckets,
+    analysis_update,
+    event_month,
+    event_payload,
+    events_from_agenda,
+    list_cursor,
+    new_task_id,
+    parent_document_id,
+    record_to_dict,
+    stage_agenda_changes,
+    status_update,
+    task_payload,
+    tasks_from_agenda,
+)
+from v2.domain.models import (
+    DocumentAnalysis,
+    DocumentDetail,
+    DocumentRecord,
+    EventData,
+    StoredTaskData,
+)
+from v2.domain.ports import AsyncDocumentRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def _collect(stream) -> list:
+    """非同期ストリームをリストに集める（asyncio.gather で並べるため）"""
+    return [item async for item in stream]
+
+
+class AsyncFirestoreDocumentRepository(AsyncDocumentRepository):
+    """
+    AsyncClient を使った AsyncDocumentRepository 実装。
+
+    families/{familyId}/documents, events, tasks, agenda を同期版と同じ形式で管理する。
+    """
+
+    def __init__(self, db: firestore.AsyncClient) -> None:
+        self._db = db
+
+    def _document_ref(self, uid: str, document_id: str):
+        return (
+            self._db.collection(FAMILIES)
+            .document(uid)
+            .collection(DOCUMENTS)
+            .document(document_id)
+        )
+
+    def _agenda_col(self, uid: str):
+        return self._db.collection(FAMILIES).document(uid).collection(AGENDA)
+
+    # ── DocumentRecord CRUD ──────────────────────────────────────────────────
+
+    async def create(self, uid: str, record: DocumentRecord) -> str:
+        """ドキュメントレコードを Firestore に作成。IDを返す"""
+        doc_id = record.id or str(uuid.uuid4())
+        await self._document_ref(uid, doc_id).set(record_to_dict(record))
+        logger.info("Created document: family_id=%s, doc_id=%s", uid, doc_id)
+        return doc_id
+
+    async def get(self, uid: str, document_id: str) -> DocumentRecord | None:
+        """ドキュメントレコードを取得。存在しない場合は None を返す"""
+        snap = await self._document_ref(uid, document_id).get()
+        if not snap.exists:
+            return None
+        return decode_record(document_id, uid, snapshot_data(snap))
+
+    async def list(
+        self,
+        uid: str,
+        limit: int | None = None,
+        start_after: datetime.datetime | None = None,
+        start_after_id: str | None = None,
+    ) -> list[DocumentRecord]:
+        """ファミリーのドキュメント一覧を新しい順で取得（一覧用フィールドのみ）"""
+        query = (
+            self._db.collection(FAMILIES)
+            .document(uid)
+            .collection(DOCUMENTS)
+            .select(LIST_FIELDS)
+            .order_by("created_at", direction=firestore.Query.DESCENDING)
+            .order_by(FieldPath.document_id(), direction=firestore.Query.DESCENDING)
+        )
+        if start_after is not None:
+            query = query.start_after(list_cursor(start_after, start_after_id))
+        if limit is not None:
+            query = query.limit(limit)
+        return [
+            decode_record(snap.id, uid, snapshot_data(snap))
+            async for snap in query.stream()
+        ]
+
+    async def update_status(
+        self,
+        uid: str,
+        document_id: str,
+        status: str,
+        error_message: str | None = None,
+    ) -> None:
+        """ドキュメントのステータスを更新"""
+        await self._document_ref(uid, document_id).update(
+            status_update(status, error_message)
+        )
+        logger.info(
+            "Updated status: family_id=%s, doc_id=%s, status=%s",
+            uid,
+            document_id,
+            status,
+        )
+
+    async def save_analysis(
+        self, uid: str, document_id: str, analysis: DocumentAnalysis
+    ) -> None:
+        """解析結果（ドキュメント本体・events・tasks・アジェンダ）を1バッチで保存"""
+        doc_ref = self._document_ref(uid, document_id)
+        batch = self._db.batch()
+        batch.update(doc_ref, analysis_update(analysis))
+
+        events_col = doc_ref.collection(EVENTS)
+        agenda_events: dict[str, dict[str, Any]] = {}
+        for event in analysis.events:
+            event_ref = events_col.document()
+            event_data = event_payload(uid, document_id, event)
+            batch.set(event_ref, event_data)
+            agenda_events.setdefault(event_month(event.start), {})[event_ref.id] = (
+                agenda_entry(event_data)
+            )
+
+        tasks_col = doc_ref.collection(TASKS)
+        agenda_tasks: dict[str, Any] = {}
+        for task in analysis.tasks:
+            task_id = new_task_id(document_id)
+            task_data = task_payload(uid, document_id, task)
+            batch.set(tasks_col.document(task_id), task_data)
+            agenda_tasks[task_id] = agenda_entry(task_data)
+
+        stage_agenda_changes(
+            batch,
+            self._agenda_col(uid),
+            agenda_events,
+            agenda_tasks,
+            register_keys=True,
+        )
+        await batch.commit()
+        logger.info(
+            "Saved analysis: family_id=%s, doc_id=%s, events=%d, tasks=%d",
+            uid,
+            document_id,
+            len(analysis.events),
+            len(analysis.tasks),
+        )
+
+    async def delete(self, uid: str, document_id: str) -> None:
+        """ドキュメントと関連する events/tasks を削除し、アジェンダからも取り除く"""
+        doc_ref = self._document_ref(uid, document_id)
+        task_ids_only = doc_ref.collection(TASKS).select([FieldPath.document_id()])
+        event_snaps, task_snaps = await asyncio.gather(
+            _collect(doc_ref.collection(EVENTS).select(["start"]).stream()),
+            _collect(task_ids_only.stream()),
+        )
+        agenda_events: dict[str, dict[str, Any]] = {}
+        for snap in event_snaps:
+            start = snapshot_data(snap).get("start") or ""
+            agenda_events.setdefault(event_month(start), {})[snap.id] = (
+                firestore.DELETE_FIELD
+            )
+        agenda_tasks = {snap.id: firestore.DELETE_FIELD for snap in task_snaps}
+
+        await delete_refs_async(
+            self._db,
+            [snap.reference for snap in event_snaps + task_snaps],
+            f"family_id={uid}, doc_id={document_id}",
+        )
+        if agenda_events or agenda_tasks:
+            batch = self._db.batch()
+            stage_agenda_changes(
+                batch, self._agenda_col(uid), agenda_events, agenda_tasks
+            )
+            await batch.commit()
+        await doc_ref.delete()
+        logger.info("Deleted document: family_id=%s, doc_id=%s", uid, document_id)
+
+    async def find_by_content_hash(
+        self, uid: str, content_hash: str
+    ) -> DocumentRecord | None:
+        """コンテンツハッシュで検索（冪等性チェック）"""
+        query = (
+            self._db.collection(FAMILIES)
+            .document(uid)
+            .collection(DOCUMENTS)
+            .where(filter=FieldFilter("content_hash", "==", content_hash))
+            .limit(1)
+        )
+        async for snap in query.stream():
+            return decode_record(snap.id, uid, snapshot_data(snap))
+        return None
+
+    # ── イベント・タスク クエリ ─────────────────────────────────────────────
+
+    async def list_events(
+        self,
+        uid: str,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        profile_id: str | None = None,
+    ) -> list[EventData]:
+        """日付範囲でイベントを取得（アジェンダ未構築ならコレクショングループクエリ）"""
+        agenda = self._agenda_col(uid)
+        index = await agenda.document(AGENDA_INDEX).get()
+        data = snapshot_data(index) if index.exists else {}
+        if data.get("complete"):
+            months = agenda_months(data, from_date, to_date)
+            if not months:
+                return []
+            refs = [agenda.document(AGENDA_EVENTS_PREFIX + m) for m in months]
+            return events_from_agenda(
+                await _collect(self._db.get_all(refs)), from_date, to_date
+            )
+
+        query = (
+            self._db.collection_group(EVENTS)
+            .where(filter=FieldFilter("family_id", "==", uid))
+            .order_by("start")
+        )
+        if from_date:
+            query = query.where(filter=FieldFilter("start", ">=", from_date))
+        if to_date:
+            query = query.where(
+                filter=FieldFilter("start", "<=", to_date + "T23:59:59")
+            )
+        return [event_from_snapshot(snap) async for snap in query.stream()]
+
+    async def list_tasks(
+        self, uid: str, completed: bool | None = None
+    ) -> list[StoredTaskData]:
+        """タスク一覧を取得（アジェンダ未構築ならコレクショングループクエリ）"""
+        agenda = self._agenda_col(uid)
+        index = await agenda.document(AGENDA_INDEX).get()
+        buckets = agenda_task_buckets(snapshot_data(index) if index.exists else {})
+        if buckets is not None:
+            if not buckets:
+                return []
+            refs = [agenda.document(AGENDA_TASKS_PREFIX + b) for b in buckets]
+            return tasks_from_agenda(await _collect(self._db.get_all(refs)), completed)
+
+        query = (
+            self._db.collection_group(TASKS)
+            .where(filter=FieldFilter("family_id", "==", uid))
+            .order_by("completed")
+        )
+        if completed is not None:
+            query = query.where(filter=FieldFilter("completed", "==", completed))
+        return [task_from_snapshot(snap) async for snap in query.stream()]
+
+    async def update_task_completed(
+        self, uid: str, task_id: str, completed: bool
+    ) -> bool:
+        """タスクの完了状態を更新（新形式の ID は親ドキュメントを直接参照する）"""
+        document_id = parent_document_id(task_id)
+        if document_id is None:
+            ref = None
+            query = (
+                self._db.collection_group(TASKS)
+                .where(filter=FieldFilter("family_id", "==", uid))
+                .order_by("completed")
+            )
+            async for snap in query.stream():
+                if snap.id == task_id:
+                    ref = snap.reference
+                    break
+            if ref is None:
+                logger.warning("Task not found: family_id=%s, task_id=%s", uid, task_id)
+                return False
+        else:
+            ref = (
+                self._document_ref(uid, document_id).collection(TASKS).document(task_id)
+            )
+
+        batch = self._db.batch()
+        batch.update(ref, {"completed": completed})
+        stage_agenda_changes(
+            batch, self._agenda_col(uid), {}, {task_id: {"completed": completed}}
+        )
+        try:
+            await batch.commit()
+        except NotFound:
+            logger.warning("Task not found: family_id=%s, task_id=%s", uid, task_id)
+            return False
+        logger.info(
+            "Updated task: family_id=%s, task_id=%s, completed=%s",
+            uid,
+            task_id,
+            completed,
+        )
+        return True
+
+    async def list_events_by_document(
+        self, uid: str, document_id: str
+    ) -> list[EventData]:
+        """指定ドキュメントのイベントサブコレクションを直接取得"""
+        col = self._document_ref(uid, document_id).collection(EVENTS)
+        return [event_from_snapshot(snap) async for snap in col.stream()]
+
+    async def list_tasks_by_document(
+        self, uid: str, document_id: str
+    ) -> list[StoredTaskData]:
+        """指定ドキュメントのタスクサブコレクションを直接取得"""
+        col = self._document_ref(uid, document_id).collection(TASKS)
+        return [task_from_snapshot(snap) async for snap in col.stream()]
+
+    async def get_document_detail(
+        self, uid: str, document_id: str
+    ) -> DocumentDetail | None:
+        """親ドキュメントの get と events / tasks の stream を同時に待って集約する"""
+        ref = self._document_ref(uid, document_id)
+        snap, events, tasks = await asyncio.gather(
+            ref.get(),
+            self.list_events_by_document(uid, document_id),
+            self.list_tasks_by_document(uid, document_id),
+        )
+        if not snap.exists:
+            return None
+        return DocumentDetail(
+            record=decode_record(document_id, uid, snapshot_data(snap)),
+            events=events,
+            tasks=tasks,
+            # extras は呼び出し側に渡すため、スナップショットの内部 dict ではなくコピーを返す
+            extras=(snap.to_dict() or {}).get("extras"),
+        )
@@ -0,0 +1,219 @@
+"""Firestore の一括削除
+
+ドキュメント削除（events/tasks サブコレクション）とファミリーの一括削除で使う。
+
+- BulkDeleter: 同期 Client 向け。BulkWriter に並列送信・流量制御・リトライを任せる
+- delete_refs_async: AsyncClient 向け。BulkWriter は close() がスレッドをブロックし、
+  AsyncClient（のサブクラス）を渡せないため、バッチのコミットを同じ方針で行う
+
+どちらも Firestore の 500/50/5 ルール（初期 500 ops/秒、5分ごとに 50% ずつ引き上げ）に従い、
+FIRESTORE_BULK_MAX_OPS_PER_SECOND を上限とする。失敗した削除は _BULK_MAX_ATTEMPTS 回まで
+再送し、それでも失敗した件数があれば RuntimeError を送出する。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+
+from google.api_core.exceptions import (
+    Aborted,
+    DeadlineExceeded,
+    InternalServerError,
+    ResourceExhausted,
+    ServiceUnavailable,
+)
+from google.cloud import firestore
+from google.cloud.firestore_v1.bulk_writer import (
+    BulkWriteFailure,
+    BulkWriter,
+    BulkWriterOptions,
+)
+from google.cloud.firestore_v1.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+_BULK_INITIAL_OPS_PER_SECOND = 500  # Firestore の 500/50/5 ルールの初期値
+_BULK_MAX_ATTEMPTS = 5
+_BULK_PROGRESS_EVERY = 500
+
+# delete_refs_async: 1バッチの上限（Firestore の制限）と同時にコミットするバッチ数
+_DELETE_BATCH_SIZE = 500
+_DELETE_CONCURRENCY = 4
+_RETRY_BASE_SECONDS = 0.5
+_RATE_LIMIT_POLL_SECONDS = 0.05
+# 再送するエラー（競合・流量超過・一時的な障害）
+_RETRYABLE_ERRORS = (
+    Aborted,
+    DeadlineExceeded,
+    InternalServerError,
+    ResourceExhausted,
+    ServiceUnavailable,
+)
+
+
+def _max_ops_per_second() -> int:
+    return int(os.environ.get("FIRESTORE_BULK_MAX_OPS_PER_SECOND", "500"))
+
+
+def _report(label: str, deleted: int) -> None:
+    logger.info("Bulk delete progress: %s, deleted=%d", label, deleted)
+
+
+class BulkDeleter:
+    """
+    BulkWriter をラップし、削除の完了件数・失敗件数を数えて進捗をログに出す。
+
+    コールバックは BulkWriter の送信スレッドから呼ばれるためロックで保護する。
+    """
+
+    def __init__(
+        self,
+        db: firestore.Client,
+        label: str,
+    ) -> None:
+        """
+        Args:
+            db: Firestore クライアント
+            label: ログに出す削除対象（例: "family_id=xxx"）
+        """
+        max_ops = _max_ops_per_second()
+        self.writer: BulkWriter = db.bulk_writer(
+            BulkWriterOptions(
+                initial_ops_per_second=min(_BULK_INITIAL_OPS_PER_SECOND, max_ops),
+                max_ops_per_second=max_ops,
+            )
+        )
+        self.writer.on_write_result(self._on_result)
+        self.writer.on_write_error(self._on_error)
+        self._label = label
+        self._lock = threading.Lock()
+        self.deleted = 0
+        self.failed = 0
+
+    def delete(self, reference) -> None:
+        self.writer.delete(reference)
+
+    def close(self) -> int:
+        """
+        未送信の削除を全て送信して完了を待つ。
+
+        Returns:
+            削除件数
+
+        Raises:
+            RuntimeError: リトライ上限を超えて失敗した削除がある場合
+        """
+        self.writer.close()
+        _report(self._label, self.deleted)
+        if self.failed:
+            raise RuntimeError(
+                f"Bulk delete failed for {self.failed} documents ({self._label})"
+            )
+        return self.deleted
+
+    def _on_result(self, reference, result, writer) -> None:
+        with self._lock:
+            self.deleted += 1
+            deleted = self.deleted
+        if deleted % _BULK_PROGRESS_EVERY == 0:
+            _report(self._label, deleted)
+
+    def _on_error(self, failure: BulkWriteFailure, writer) -> bool:
+        if failure.attempts < _BULK_MAX_ATTEMPTS:
+            return True  # BulkWriter が線形バックオフで再送する
+        logger.error(
+            "Bulk delete failed: %s, path=%s, code=%s, message=%s",
+            self._label,
+            failure.operation.reference.path,
+            failure.code,
+            failure.message,
+        )
+        with self._lock:
+            self.failed += 1
+        return False
+
+
+async def delete_refs_async(
+    db: firestore.AsyncClient,
+    refs: list,
+    label: str,
+) -> int:
+    """
+    参照をバッチに分け、同時に _DELETE_CONCURRENCY 本までコミットして削除する。
+
+    送信量は RateLimiter（BulkWriter と同じ 500/50/5 ルール）で抑え、
+    一時的なエラーで失敗したバッチは指数バックオフで再送する（削除は冪等）。
+
+    Args:
+        db: Firestore AsyncClient
+        refs: 削除する DocumentReference のリスト
+        label: ログに出す削除対象（例: "family_id=xxx"）
+
+    Returns:
+        削除件数
+
+    Raises:
+        RuntimeError: リトライ上限を超えて失敗したバッチがある場合
+    """
+    max_ops = _max_ops_per_second()
+    limiter = RateLimiter(
+        initial_tokens=min(_BULK_INITIAL_OPS_PER_SECOND, max_ops),
+        global_max_tokens=max_ops,
+    )
+    # 1バッチの件数がトークンの上限を超えると取得できないため、上限に合わせる
+    batch_size = max(1, min(_DELETE_BATCH_SIZE, max_ops))
+    semaphore = asyncio.Semaphore(_DELETE_CONCURRENCY)
+    deleted = 0
+    failed = 0
+    next_report = _BULK_PROGRESS_EVERY
+
+    async def commit(chunk: list) -> None:
+        for attempt in range(1, _BULK_MAX_ATTEMPTS + 1):
+            while not limiter.take_tokens(len(chunk)):
+                await asyncio.sleep(_RATE_LIMIT_POLL_SECONDS)
+            batch = db.batch()
+            for ref in chunk:
+                batch.delete(ref)
+            try:
+                await batch.commit()
+                return
+            except _RETRYABLE_ERRORS as e:
+                if attempt == _BULK_MAX_ATTEMPTS:
+                    raise
+                logger.warning(
+                    "Bulk delete retry: %s, attempt=%d, error=%s", label, attempt, e
+                )
+                await asyncio.sleep(_RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+
+    async def delete_chunk(chunk: list) -> None:
+        nonlocal deleted, failed, next_report
+        async with semaphore:
+            try:
+                await commit(chunk)
+            except _RETRYABLE_ERRORS as e:
+                logger.error(
+                    "Bulk delete failed: %s, documents=%d, error=%s",
+                    label,
+                    len(chunk),
+                    e,
+                )
+                failed += len(chunk)
+                return
+        deleted += len(chunk)
+        if deleted >= next_report:
+            next_report += _BULK_PROGRESS_EVERY
+            _report(label, deleted)
+
+    await asyncio.gather(
+        *(
+            delete_chunk(refs[i : i + batch_size])
+            for i in range(0, len(refs), batch_size)
+        )
+    )
+    _report(label, deleted)
+    if failed:
+        raise RuntimeError(f"Bulk delete failed for {failed} documents ({label})")
+    return deleted
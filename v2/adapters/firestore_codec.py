@@ -0,0 +1,86 @@
+"""Firestore スナップショット → ドメインモデルの変換
+
+DocumentSnapshot.to_dict() はスナップショットが保持するデータを毎回 deepcopy する。
+アジェンダの月別バケット（数千件のイベントを持つ1ドキュメント）や iCal・ダイジェストの
+全件走査ではこのコピーが CPU とメモリの大半を占めるため、読み取り専用で使う箇所は
+snapshot_data() でコピーせずに参照し、slots 付きの不変モデルへ直接変換する。
+
+snapshot_data() はライブラリ非公開の DocumentSnapshot._data を読み、スナップショットを
+書き換えられないよう読み取り専用の MappingProxyType で返す（入れ子の dict は変更しないこと。
+呼び出し側に渡す dict は to_dict() を使う）。_data がなくなった場合は to_dict() に
+フォールバックするため動作は変わらず、コピー削減だけが失われる
+（tests/unit/test_firestore_codec.py がこれを検知する）。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any
+
+from v2.domain.models import DocumentRecord, EventData, StoredTaskData
+
+
+def snapshot_data(snap) -> Mapping[str, Any]:
+    """
+    スナップショットのデータをコピーせずに読み取り専用で返す。
+
+    存在しないドキュメントは空 dict。_data を持たないオブジェクト（テスト用のモック等）は
+    to_dict() にフォールバックする。
+    """
+    data = getattr(snap, "_data", None)
+    if isinstance(data, dict):
+        return MappingProxyType(data)
+    return snap.to_dict() or {}
+
+
+def decode_event(data: Mapping[str, Any]) -> EventData:
+    # 欠損・null・空文字はモデルのデフォルト値に揃える
+    get = data.get
+    return EventData(
+        summary=get("summary") or "",
+        start=get("start") or "",
+        end=get("end") or "",
+        location=get("location") or "",
+        description=get("description") or "",
+        confidence=get("confidence") or "HIGH",
+    )
+
+
+def decode_task(task_id: str, data: Mapping[str, Any]) -> StoredTaskData:
+    get = data.get
+    return StoredTaskData(
+        id=task_id,
+        title=get("title") or "",
+        due_date=get("due_date") or "",
+        assignee=get("assignee") or "PARENT",
+        note=get("note") or "",
+        completed=bool(get("completed", False)),
+    )
+
+
+def decode_record(doc_id: str, uid: str, data: Mapping[str, Any]) -> DocumentRecord:
+    get = data.get
+    return DocumentRecord(
+        id=doc_id,
+        uid=uid,
+        status=get("status", "pending"),
+        content_hash=get("content_hash", ""),
+        storage_path=get("storage_path", ""),
+        original_filename=get("original_filename", ""),
+        mime_type=get("mime_type", "application/octet-stream"),
+        summary=get("summary", ""),
+        category=get("category", ""),
+        archive_filename=get("archive_filename") or "",
+        error_message=get("error_message"),
+        # Firestore DatetimeWithNanoseconds は datetime のサブクラス
+        created_at=get("created_at"),
+    )
+
+
+def event_from_snapshot(snap) -> EventData:
+    return decode_event(snapshot_data(snap))
+
+
+def task_from_snapshot(snap) -> StoredTaskData:
+    return decode_task(snap.id, snapshot_data(snap))
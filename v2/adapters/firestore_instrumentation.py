@@ -0,0 +1,291 @@
+"""Firestore 呼び出しのリクエスト単位の計測
+
+Firestore の課金とレイテンシはドキュメントの読み取り件数に比例するが、
+どのルートがどれだけ読んでいるかはこれまで見えていなかった。
+
+- FirestoreStats: 読み取り・書き込み件数、クエリ数、RPC 回数と所要時間を保持
+- firestore_request_stats(): 1リクエストの間 FirestoreStats をコンテキスト変数に設定する
+- InstrumentedFirestoreClient / InstrumentedAsyncFirestoreClient:
+  GAPIC 層（_firestore_api）の呼び出しを数える firestore.Client / AsyncClient
+- new_firestore_client() / new_async_firestore_client(): 上記を生成する。
+  ライブラリ非公開の Client._firestore_api がない場合は計測なしのクライアントを返す
+
+応答の読み取り件数は proto-plus の Message.pb() で protobuf を取り出して判定する。
+取り出せない応答があれば警告を出し、そのプロセスでは読み取り件数を数えない。
+google-cloud-firestore の更新で非公開 API が変わっても、計測が止まるだけで呼び出しは失敗しない。
+
+集計はコンテキスト変数経由のため、asyncio のタスクや asyncio.to_thread、
+Starlette のスレッドプールには自動で引き継がれる。独自の ThreadPoolExecutor に
+投げる処理は contextvars.copy_context().run で包むこと。
+BulkWriter の送信スレッドはコンテキストを引き継がないため、一括削除の書き込みは数えない。
+
+読み取り件数は返ってきたドキュメント数（存在しないドキュメントの get も1件、
+結果0件のクエリも1件として数える。Firestore の課金と同じ扱い）。
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import inspect
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from google.cloud import firestore
+
+logger = logging.getLogger(__name__)
+
+# 計測対象の GAPIC メソッド
+_READ_METHODS = frozenset({"batch_get_documents"})
+_QUERY_METHODS = frozenset({"run_query", "run_aggregation_query"})
+_WRITE_METHODS = frozenset({"commit", "batch_write"})
+_STREAMING_METHODS = frozenset(
+    {"batch_get_documents", "run_query", "run_aggregation_query"}
+)
+
+
+class FirestoreStats:
+    """1リクエスト分の Firestore 呼び出し統計（スレッドセーフ）"""
+
+    def __init__(self) -> None:
+        self.reads = 0
+        self.writes = 0
+        self.queries = 0
+        self.rpcs = 0
+        self.rpc_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        reads: int = 0,
+        writes: int = 0,
+        queries: int = 0,
+        rpcs: int = 0,
+        seconds: float = 0.0,
+    ) -> None:
+        with self._lock:
+            self.reads += reads
+            self.writes += writes
+            self.queries += queries
+            self.rpcs += rpcs
+            self.rpc_seconds += seconds
+
+    def as_log_fields(self) -> dict[str, int]:
+        """access_log に追加するフィールドを返す"""
+        with self._lock:
+            return {
+                "firestore_reads": self.reads,
+                "firestore_writes": self.writes,
+                "firestore_queries": self.queries,
+                "firestore_rpcs": self.rpcs,
+                "firestore_rpc_ms": round(self.rpc_seconds * 1000),
+            }
+
+
+_current_stats: contextvars.ContextVar[FirestoreStats | None] = contextvars.ContextVar(
+    "firestore_stats", default=None
+)
+
+
+@contextlib.contextmanager
+def firestore_request_stats() -> Iterator[FirestoreStats]:
+    """with ブロックの間の Firestore 呼び出しを新しい FirestoreStats に集計する"""
+    stats = FirestoreStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def current_firestore_stats() -> FirestoreStats | None:
+    """現在のコンテキストの FirestoreStats を返す（計測外なら None）"""
+    return _current_stats.get()
+
+
+def _count_writes(kwargs: dict) -> int:
+    request = kwargs.get("request")
+    if request is None:
+        return 0
+    writes = request.get("writes") if isinstance(request, dict) else request.writes
+    return len(writes or [])
+
+
+_read_counting_enabled = True
+
+
+def _disable_read_counting(method: str, error: Exception) -> None:
+    global _read_counting_enabled
+    if _read_counting_enabled:
+        _read_counting_enabled = False
+        logger.warning(
+            "Firestore read counting disabled: method=%s, error=%r", method, error
+        )
+
+
+def _response_reads(method: str, response) -> int:
+    """ストリーミング応答1件に含まれるドキュメント数（判定できなければ計測を止めて 0）"""
+    if not _read_counting_enabled or method not in ("run_query", "batch_get_documents"):
+        return 0
+    try:
+        pb = type(response).pb(response)
+        if method == "run_query":
+            return 1 if pb.HasField("document") else 0
+        return 1 if pb.WhichOneof("result") else 0
+    except (AttributeError, TypeError, ValueError) as e:
+        _disable_read_counting(method, e)
+        return 0
+
+
+class _CountingIterator:
+    """ストリーミング応答を読み進めながら読み取り件数と待ち時間を加算する"""
+
+    def __init__(self, method: str, inner, stats: FirestoreStats) -> None:
+        self._method = method
+        self._inner = inner
+        self._stats = stats
+        self._reads = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            response = next(self._inner)
+        except StopIteration:
+            self._finish(time.perf_counter() - start)
+            raise
+        reads = _response_reads(self._method, response)
+        self._reads += reads
+        self._stats.add(reads=reads, seconds=time.perf_counter() - start)
+        return response
+
+    def _finish(self, seconds: float) -> None:
+        # 結果0件のクエリも1件の読み取りとして課金される
+        empty_query = (
+            self._method == "run_query" and self._reads == 0 and _read_counting_enabled
+        )
+        self._stats.add(reads=1 if empty_query else 0, seconds=seconds)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+
+class _AsyncCountingIterator(_CountingIterator):
+    """_CountingIterator の非同期イテレータ版"""
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        start = time.perf_counter()
+        try:
+            response = await self._inner.__anext__()
+        except StopAsyncIteration:
+            self._finish(time.perf_counter() - start)
+            raise
+        reads = _response_reads(self._method, response)
+        self._reads += reads
+        self._stats.add(reads=reads, seconds=time.perf_counter() - start)
+        return response
+
+
+class _InstrumentedApi:
+    """GAPIC FirestoreClient の呼び出しを現在の FirestoreStats に数えるプロキシ"""
+
+    def __init__(self, api) -> None:
+        self._api = api
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._api, name)
+        if name not in _READ_METHODS | _QUERY_METHODS | _WRITE_METHODS:
+            return attr
+
+        def call(*args, **kwargs):
+            stats = _current_stats.get()
+            if stats is None:
+                return attr(*args, **kwargs)
+            start = time.perf_counter()
+            result = attr(*args, **kwargs)
+            _record_call(name, kwargs, stats, time.perf_counter() - start)
+            if name in _STREAMING_METHODS:
+                return _CountingIterator(name, iter(result), stats)
+            return result
+
+        return call
+
+
+class _AsyncInstrumentedApi(_InstrumentedApi):
+    """GAPIC FirestoreAsyncClient 用のプロキシ（メソッドはコルーチン）"""
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._api, name)
+        if name not in _READ_METHODS | _QUERY_METHODS | _WRITE_METHODS:
+            return attr
+
+        async def call(*args, **kwargs):
+            stats = _current_stats.get()
+            if stats is None:
+                return await attr(*args, **kwargs)
+            start = time.perf_counter()
+            result = await attr(*args, **kwargs)
+            _record_call(name, kwargs, stats, time.perf_counter() - start)
+            if name in _STREAMING_METHODS:
+                return _AsyncCountingIterator(name, result.__aiter__(), stats)
+            return result
+
+        return call
+
+
+def _record_call(
+    name: str, kwargs: dict, stats: FirestoreStats, seconds: float
+) -> None:
+    stats.add(
+        writes=_count_writes(kwargs) if name in _WRITE_METHODS else 0,
+        queries=1 if name in _QUERY_METHODS else 0,
+        rpcs=1,
+        seconds=seconds,
+    )
+
+
+class InstrumentedFirestoreClient(firestore.Client):
+    """GAPIC 呼び出しを FirestoreStats に数える firestore.Client"""
+
+    @property
+    def _firestore_api(self):
+        return _InstrumentedApi(super()._firestore_api)
+
+
+class InstrumentedAsyncFirestoreClient(firestore.AsyncClient):
+    """GAPIC 呼び出しを FirestoreStats に数える firestore.AsyncClient"""
+
+    @property
+    def _firestore_api(self):
+        return _AsyncInstrumentedApi(super()._firestore_api)
+
+
+def _supports_api_override(client_cls: type) -> bool:
+    """client_cls が GAPIC クライアントを非公開の property _firestore_api で返すか"""
+    return isinstance(
+        inspect.getattr_static(client_cls, "_firestore_api", None), property
+    )
+
+
+def new_firestore_client(**kwargs) -> firestore.Client:
+    """計測付きの firestore.Client を返す（計測できないライブラリでは素の Client）"""
+    if not _supports_api_override(firestore.Client):
+        logger.warning("Firestore instrumentation disabled: Client._firestore_api")
+        return firestore.Client(**kwargs)
+    return InstrumentedFirestoreClient(**kwargs)
+
+
+def new_async_firestore_client(**kwargs) -> firestore.AsyncClient:
+    """計測付きの firestore.AsyncClient を返す（計測できないライブラリでは素の AsyncClient）"""
+    if not _supports_api_override(firestore.AsyncClient):
+        logger.warning("Firestore instrumentation disabled: AsyncClient._firestore_api")
+        return firestore.AsyncClient(**kwargs)
+    return InstrumentedAsyncFirestoreClient(**kwargs)
@@ -10,51 +10,106 @@ Firestore コレクション構造:
   families/{familyId}/documents/{documentId}       ← ドキュメントレコード
   families/{familyId}/documents/{docId}/events/    ← 非正規化イベント（日付範囲クエリ用）
   families/{familyId}/documents/{docId}/tasks/     ← 非正規化タスク
+  families/{familyId}/agenda/index                 ← アジェンダ（events/tasks のマテリアライズドビュー）
+  families/{familyId}/agenda/tasks_{NN}            ←   タスクのハッシュバケット（{taskId: {...}}）
+  families/{familyId}/agenda/events_{YYYY-MM}      ←   月別イベントバケット（{eventId: {...}}）
 
   users/{uid}                                      ← ユーザー個人設定
 """
 
 from __future__ import annotations
 
+import contextvars
 import logging
+import threading
 import uuid
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Any
 
+from google.api_core.exceptions import NotFound
 from google.cloud import firestore
 from google.cloud.firestore_v1.base_query import FieldFilter
-
+from google.cloud.firestore_v1.field_path import FieldPath
+
+from v2.adapters.firestore_bulk import BulkDeleter
+from v2.adapters.firestore_codec import (
+    decode_record,
+    event_from_snapshot,
+    snapshot_data,
+    task_from_snapshot,
+)
+from v2.adapters.firestore_schema import (
+    AGENDA,
+    AGENDA_EVENTS_PREFIX,
+    AGENDA_INDEX,
+    AGENDA_TASKS_BUCKETED,
+    AGENDA_TASKS_PREFIX,
+    DOCUMENTS,
+    EVENTS,
+    FAMILIES,
+    INVITATIONS,
+    LIST_FIELDS,
+    MEMBERS,
+    PROFILES,
+    TASKS,
+    USERS,
+    agenda_entry,
+    agenda_months,
+    agenda_task_buckets,
+    analysis_update,
+    event_month,
+    event_payload,
+    events_from_agenda,
+    list_cursor,
+    new_task_id,
+    parent_document_id,
+    record_to_dict,
+    stage_agenda_changes,
+    status_update,
+    task_bucket,
+    task_payload,
+    tasks_from_agenda,
+)
 from v2.domain.models import (
     DocumentAnalysis,
+    DocumentDetail,
     DocumentRecord,
     EventData,
+    StoredTaskData,
     UserProfile,
 )
 from v2.domain.ports import DocumentRepository, FamilyRepository, UserConfigRepository
 
+logger = logging.getLogger(__name__)
 
-@dataclass
-class StoredTaskData:
-    """Firestore に永続化されたタスク（id と completed を含む）"""
-
-    id: str
-    title: str
-    due_date: str
-    assignee: str
-    note: str
-    completed: bool
-
+# get_document_detail() の並列読み取り用（プロセス内で共有）
+_DETAIL_MAX_WORKERS = 8
+_detail_executor: ThreadPoolExecutor | None = None
+_detail_executor_lock = threading.Lock()
+
+
+def _get_detail_executor() -> ThreadPoolExecutor:
+    """並列読み取り用 ThreadPoolExecutor のシングルトンを返す"""
+    global _detail_executor
+    if _detail_executor is None:
+        with _detail_executor_lock:
+            if _detail_executor is None:
+                _detail_executor = ThreadPoolExecutor(
+                    max_workers=_DETAIL_MAX_WORKERS,
+                    thread_name_prefix="firestore-detail",
+                )
+    return _detail_executor
 
-logger = logging.getLogger(__name__)
 
-_FAMILIES = "families"
-_MEMBERS = "members"
-_INVITATIONS = "invitations"
-_PROFILES = "profiles"
-_DOCUMENTS = "documents"
-_EVENTS = "events"
-_TASKS = "tasks"
-_USERS = "users"
+def _snap_to_profile(snap) -> UserProfile:
+    d = snap.to_dict() or {}
+    return UserProfile(
+        id=snap.id,
+        name=d.get("name", ""),
+        grade=d.get("grade", ""),
+        keywords=d.get("keywords", ""),
+    )
 
 
 class FirestoreDocumentRepository(DocumentRepository):
@@ -73,38 +128,62 @@ class FirestoreDocumentRepository(DocumentRepository):
         """ドキュメントレコードを Firestore に作成。IDを返す"""
         doc_id = record.id or str(uuid.uuid4())
         ref = (
-            self._db.collection(_FAMILIES)
+            self._db.collection(FAMILIES)
             .document(uid)
-            .collection(_DOCUMENTS)
+            .collection(DOCUMENTS)
             .document(doc_id)
         )
-        ref.set(self._record_to_dict(record))
+        ref.set(record_to_dict(record))
         logger.info("Created document: family_id=%s, doc_id=%s", uid, doc_id)
         return doc_id
 
     def get(self, uid: str, document_id: str) -> DocumentRecord | None:
         """ドキュメントレコードを取得。存在しない場合は None を返す"""
         snap = (
-            self._db.collection(_FAMILIES)
+            self._db.collection(FAMILIES)
             .document(uid)
-            .collection(_DOCUMENTS)
+            .collection(DOCUMENTS)
             .document(document_id)
             .get()
         )
         if not snap.exists:
             return None
-        return self._dict_to_record(document_id, uid, snap.to_dict())
+        return decode_record(document_id, uid, snapshot_data(snap))
 
-    def list(self, uid: str) -> list[DocumentRecord]:
-        """ファミリーのドキュメント一覧を新しい順で取得"""
-        snaps = (
-            self._db.collection(_FAMILIES)
+    def list(
+        self,
+        uid: str,
+        limit: int | None = None,
+        start_after: datetime | None = None,
+        start_after_id: str | None = None,
+    ) -> list[DocumentRecord]:
+        """ファミリーのドキュメント一覧を新しい順で取得
+
+        一覧表示に必要なフィールドのみを select で読み込み、
+        extras 等の大きなフィールドは転送しない（content_hash / storage_path は空になる）。
+
+        Args:
+            uid: ファミリー ID
+            limit: 最大件数（None で全件）
+            start_after: この created_at より古いドキュメントから取得する（カーソル）
+            start_after_id: created_at が start_after と同じドキュメントのうち、
+                この ID より後ろ（降順）から取得する
+        """
+        query = (
+            self._db.collection(FAMILIES)
             .document(uid)
-            .collection(_DOCUMENTS)
+            .collection(DOCUMENTS)
+            .select(LIST_FIELDS)
             .order_by("created_at", direction=firestore.Query.DESCENDING)
-            .stream()
+            .order_by(FieldPath.document_id(), direction=firestore.Query.DESCENDING)
         )
-        return [self._dict_to_record(snap.id, uid, snap.to_dict()) for snap in snaps]
+        if start_after is not None:
+            query = query.start_after(list_cursor(start_after, start_after_id))
+        if limit is not None:
+            query = query.limit(limit)
+        return [
+            decode_record(snap.id, uid, snapshot_data(snap)) for snap in query.stream()
+        ]
 
     def update_status(
         self,
@@ -115,18 +194,12 @@ class FirestoreDocumentRepository(DocumentRepository):
     ) -> None:
         """ドキュメントのステータスを更新"""
         ref = (
-            self._db.collection(_FAMILIES)
+            self._db.collection(FAMILIES)
             .document(uid)
-            .collection(_DOCUMENTS)
+            .collection(DOCUMENTS)
             .document(document_id)
         )
-        update: dict[str, Any] = {
-            "status": status,
-            "updated_at": firestore.SERVER_TIMESTAMP,
-        }
-        if error_message is not None:
-            update["error_message"] = error_message
-        ref.update(update)
+        ref.update(status_update(status, error_message))
         logger.info(
             "Updated status: family_id=%s, doc_id=%s, status=%s",
             uid,
@@ -145,92 +218,49 @@ class FirestoreDocumentRepository(DocumentRepository):
         - tasks サブコレクションに TaskData を書き込み
         """
         doc_ref = (
-            self._db.collection(_FAMILIES)
+            self._db.collection(FAMILIES)
             .document(uid)
-            .collection(_DOCUMENTS)
+            .collection(DOCUMENTS)
             .document(document_id)
         )
 
         # バッチ書き込み
         batch = self._db.batch()
 
-        # extras mapを構築（Noneの場合は保存しない）
-        extras_dict: dict | None = None
-        if analysis.extras is not None:
-            extras = analysis.extras
-            extras_dict = {
-                "items_to_bring": [
-                    {
-                        "item": it.item,
-                        "event_index": it.event_index,
-                        "source_text": it.source_text,
-                    }
-                    for it in extras.items_to_bring
-                ],
-                "dress_code": list(extras.dress_code),
-                "costs": [
-                    {
-                        "description": c.description,
-                        "amount": c.amount,
-                        "due_date": c.due_date,
-                        "source_text": c.source_text,
-                    }
-                    for c in extras.costs
-                ],
-                "notes": list(extras.notes),
-                "source_texts": list(extras.source_texts),
-            }
-
         # ドキュメント本体を更新
-        doc_update: dict = {
-            "status": "completed",
-            "summary": analysis.summary,
-            "category": analysis.category.value,
-            "archive_filename": analysis.archive_filename,
-            "updated_at": firestore.SERVER_TIMESTAMP,
-        }
-        if extras_dict is not None:
-            doc_update["extras"] = extras_dict
-
+        doc_update = analysis_update(analysis)
         batch.update(doc_ref, doc_update)
 
         # events サブコレクションに保存
         # family_id は collection_group クエリのフィルター用（必須）
-        events_col = doc_ref.collection(_EVENTS)
+        events_col = doc_ref.collection(EVENTS)
+        agenda_events: dict[str, dict[str, Any]] = {}
         for event in analysis.events:
             event_ref = events_col.document()
-            batch.set(
-                event_ref,
-                {
-                    "family_id": uid,
-                    "document_id": document_id,
-                    "summary": event.summary,
-                    "start": event.start,
-                    "end": event.end,
-                    "location": event.location,
-                    "description": event.description,
-                    "confidence": event.confidence,
-                },
+            event_data = event_payload(uid, document_id, event)
+            batch.set(event_ref, event_data)
+            agenda_events.setdefault(event_month(event.start), {})[event_ref.id] = (
+                agenda_entry(event_data)
             )
 
         # tasks サブコレクションに保存
         # family_id は collection_group クエリのフィルター用（必須）
-        tasks_col = doc_ref.collection(_TASKS)
+        # タスク ID は親ドキュメント ID を含め、update_task_completed で直接参照できるようにする
+        tasks_col = doc_ref.collection(TASKS)
+        agenda_tasks: dict[str, Any] = {}
         for task in analysis.tasks:
-            task_ref = tasks_col.document()
-            batch.set(
-                task_ref,
-                {
-                    "family_id": uid,
-                    "document_id": document_id,
-                    "title": task.title,
-                    "due_date": task.due_date,
-                    "assignee": task.assignee,
-                    "note": task.note,
-                    "completed": False,
-                },
-            )
-
+            task_id = new_task_id(document_id)
+            task_data = task_payload(uid, document_id, task)
+            batch.set(tasks_col.document(task_id), task_data)
+            agenda_tasks[task_id] = agenda_entry(task_data)
+
+        stage_agenda_changes(
+            batch,
+            self._agenda_col(uid),
+            agenda_events,
+            agenda_tasks,
+            register_keys=True,
+        )
         batch.commit()
         logger.info(
             "Saved analysis: family_id=%s, doc_id=%s, events=%d, tasks=%d",
@@ -243,15 +273,32 @@ class FirestoreDocumentRepository(DocumentRepository):
     def delete(self, uid: str, document_id: str) -> None:
         """ドキュメントと関連する events/tasks を削除"""
         doc_ref = (
-            self._db.collection(_FAMILIES)
+            self._db.collection(FAMILIES)
             .document(uid)
-            .collection(_DOCUMENTS)
+            .collection(DOCUMENTS)
             .document(document_id)
         )
-        # サブコレクションを先に削除
-        for sub in (doc_ref.collection(_EVENTS), doc_ref.collection(_TASKS)):
-            for snap in sub.stream():
-                snap.reference.delete()
+        # サブコレクションを先に（BulkWriter で並列に）削除し、アジェンダからも取り除く
+        deleter = BulkDeleter(self._db, f"family_id={uid}, doc_id={document_id}")
+        agenda_events: dict[str, dict[str, Any]] = {}
+        agenda_tasks: dict[str, Any] = {}
+        for snap in doc_ref.collection(EVENTS).select(["start"]).stream():
+            start = snapshot_data(snap).get("start") or ""
+            agenda_events.setdefault(event_month(start), {})[snap.id] = (
+                firestore.DELETE_FIELD
+            )
+            deleter.delete(snap.reference)
+        task_ids_only = doc_ref.collection(TASKS).select([FieldPath.document_id()])
+        for snap in task_ids_only.stream():
+            agenda_tasks[snap.id] = firestore.DELETE_FIELD
+            deleter.delete(snap.reference)
+        deleter.close()
+        if agenda_events or agenda_tasks:
+            batch = self._db.batch()
+            stage_agenda_changes(
+                batch, self._agenda_col(uid), agenda_events, agenda_tasks
+            )
+            batch.commit()
         doc_ref.delete()
         logger.info("Deleted document: family_id=%s, doc_id=%s", uid, document_id)
 
@@ -260,15 +307,15 @@ class FirestoreDocumentRepository(DocumentRepository):
     ) -> DocumentRecord | None:
         """コンテンツハッシュで検索（冪等性チェック）"""
         snaps = (
-            self._db.collection(_FAMILIES)
+            self._db.collection(FAMILIES)
             .document(uid)
-            .collection(_DOCUMENTS)
+            .collection(DOCUMENTS)
             .where(filter=FieldFilter("content_hash", "==", content_hash))
             .limit(1)
             .stream()
         )
         for snap in snaps:
-            return self._dict_to_record(snap.id, uid, snap.to_dict())
+            return decode_record(snap.id, uid, snapshot_data(snap))
         return None
 
     # ── イベント・タスク クエリ ─────────────────────────────────────────────
@@ -281,10 +328,14 @@ class FirestoreDocumentRepository(DocumentRepository):
         profile_id: str | None = None,
     ) -> list[EventData]:
         """日付範囲でイベントを取得（全ドキュメントをまたいだビュー）"""
-        # documents/{id}/events をコレクショングループクエリで横断検索
+        events = self._list_agenda_events(uid, from_date, to_date)
+        if events is not None:
+            return events
+
+        # アジェンダ未構築: documents/{id}/events をコレクショングループクエリで横断検索
         # order_by("start") により複合 COLLECTION_GROUP インデックス (family_id, start) を使用
         query = (
-            self._db.collection_group(_EVENTS)
+            self._db.collection_group(EVENTS)
             .where(filter=FieldFilter("family_id", "==", uid))
             .order_by("start")
         )
@@ -295,56 +346,87 @@ class FirestoreDocumentRepository(DocumentRepository):
                 filter=FieldFilter("start", "<=", to_date + "T23:59:59")
             )
 
-        return [
-            EventData(
-                summary=d.get("summary") or "",
-                start=d.get("start") or "",
-                end=d.get("end") or "",
-                location=d.get("location") or "",
-                description=d.get("description") or "",
-                confidence=d.get("confidence") or "HIGH",
-            )
-            for snap in query.stream()
-            for d in (snap.to_dict() or {},)
-        ]
+        return [event_from_snapshot(snap) for snap in query.stream()]
 
     def list_tasks(
         self, uid: str, completed: bool | None = None
     ) -> list[StoredTaskData]:
         """タスク一覧を取得（id・completed を含む）"""
+        tasks = self._list_agenda_tasks(uid, completed)
+        if tasks is not None:
+            return tasks
+
+        # アジェンダ未構築: コレクショングループクエリで横断検索
         # order_by("completed") により複合 COLLECTION_GROUP インデックス (family_id, completed) を使用
         query = (
-            self._db.collection_group(_TASKS)
+            self._db.collection_group(TASKS)
             .where(filter=FieldFilter("family_id", "==", uid))
             .order_by("completed")
         )
         if completed is not None:
             query = query.where(filter=FieldFilter("completed", "==", completed))
 
-        return [
-            StoredTaskData(
-                id=snap.id,
-                title=d.get("title") or "",
-                due_date=d.get("due_date") or "",
-                assignee=d.get("assignee") or "PARENT",
-                note=d.get("note") or "",
-                completed=bool(d.get("completed", False)),
-            )
-            for snap in query.stream()
-            for d in (snap.to_dict() or {},)
-        ]
+        return [task_from_snapshot(snap) for snap in query.stream()]
 
     def update_task_completed(self, uid: str, task_id: str, completed: bool) -> bool:
-        """タスクの完了状態を更新"""
+        """タスクの完了状態を更新
+
+        "{document_id}_{suffix}" 形式の ID は親ドキュメントを特定できるため、
+        タスクを直接更新する（ファミリーの規模によらず書き込み1回）。
+        自動採番 ID の旧タスクのみコレクショングループを走査して探す。
+        """
+        document_id = parent_document_id(task_id)
+        if document_id is None:
+            return self._update_legacy_task_completed(uid, task_id, completed)
+
+        ref = (
+            self._db.collection(FAMILIES)
+            .document(uid)
+            .collection(DOCUMENTS)
+            .document(document_id)
+            .collection(TASKS)
+            .document(task_id)
+        )
+        batch = self._db.batch()
+        # update() は対象が存在しない場合 NotFound（バッチ全体が失敗）になるため事前の読み取りは不要
+        batch.update(ref, {"completed": completed})
+        stage_agenda_changes(
+            batch, self._agenda_col(uid), {}, {task_id: {"completed": completed}}
+        )
+        try:
+            batch.commit()
+        except NotFound:
+            logger.warning("Task not found: family_id=%s, task_id=%s", uid, task_id)
+            return False
+        logger.info(
+            "Updated task: family_id=%s, task_id=%s, completed=%s",
+            uid,
+            task_id,
+            completed,
+        )
+        return True
+
+    def _update_legacy_task_completed(
+        self, uid: str, task_id: str, completed: bool
+    ) -> bool:
+        """自動採番 ID の旧タスクをコレクショングループから探して更新する"""
         snaps = (
-            self._db.collection_group(_TASKS)
+            self._db.collection_group(TASKS)
             .where(filter=FieldFilter("family_id", "==", uid))
             .order_by("completed")
             .stream()
         )
         for snap in snaps:
             if snap.id == task_id:
-                snap.reference.update({"completed": completed})
+                batch = self._db.batch()
+                batch.update(snap.reference, {"completed": completed})
+                stage_agenda_changes(
+                    batch,
+                    self._agenda_col(uid),
+                    {},
+                    {task_id: {"completed": completed}},
+                )
+                batch.commit()
                 logger.info(
                     "Updated task: family_id=%s, task_id=%s, completed=%s",
                     uid,
@@ -357,102 +439,175 @@ class FirestoreDocumentRepository(DocumentRepository):
 
     def list_events_by_document(self, uid: str, document_id: str) -> list[EventData]:
         """指定ドキュメントのイベントサブコレクションを直接取得"""
-        snaps = (
-            self._db.collection(_FAMILIES)
-            .document(uid)
-            .collection(_DOCUMENTS)
-            .document(document_id)
-            .collection(_EVENTS)
-            .stream()
-        )
-        return [
-            EventData(
-                summary=d.get("summary") or "",
-                start=d.get("start") or "",
-                end=d.get("end") or "",
-                location=d.get("location") or "",
-                description=d.get("description") or "",
-                confidence=d.get("confidence") or "HIGH",
-            )
-            for snap in snaps
-            for d in (snap.to_dict() or {},)
-        ]
+        snaps = self._document_ref(uid, document_id).collection(EVENTS).stream()
+        return [event_from_snapshot(snap) for snap in snaps]
 
     def get_document_extras_raw(self, uid: str, document_id: str) -> dict | None:
         """ドキュメントの extras フィールドをそのままの dict で返す。なければ None。"""
-        snap = (
-            self._db.collection(_FAMILIES)
-            .document(uid)
-            .collection(_DOCUMENTS)
-            .document(document_id)
-            .get()
-        )
+        snap = self._document_ref(uid, document_id).get()
         if not snap.exists:
             return None
+        # 呼び出し側に渡すため、スナップショットの内部 dict ではなくコピーを返す
         return (snap.to_dict() or {}).get("extras")
 
     def list_tasks_by_document(
         self, uid: str, document_id: str
     ) -> list[StoredTaskData]:
         """指定ドキュメントのタスクサブコレクションを直接取得"""
-        snaps = (
-            self._db.collection(_FAMILIES)
+        snaps = self._document_ref(uid, document_id).collection(TASKS).stream()
+        return [task_from_snapshot(snap) for snap in snaps]
+
+    def get_document_detail(self, uid: str, document_id: str) -> DocumentDetail | None:
+        """
+        ドキュメント本体・イベント・タスク・extras を1回の並列読み取りで取得する。
+
+        親ドキュメントの get と events / tasks サブコレクションの stream を
+        共有スレッドプールで同時に発行する。extras は親ドキュメントの
+        スナップショットから取り出すため、同じドキュメントを二度読まない。
+
+        Returns:
+            DocumentDetail（ドキュメントが存在しない場合は None）
+        """
+        ref = self._document_ref(uid, document_id)
+        executor = _get_detail_executor()
+        # 呼び出し元のコンテキスト（リクエスト単位の Firestore 計測など）を引き継ぐ
+        snap_future = executor.submit(contextvars.copy_context().run, ref.get)
+        events_future = executor.submit(
+            contextvars.copy_context().run,
+            lambda: [event_from_snapshot(s) for s in ref.collection(EVENTS).stream()],
+        )
+        tasks_future = executor.submit(
+            contextvars.copy_context().run,
+            lambda: [task_from_snapshot(s) for s in ref.collection(TASKS).stream()],
+        )
+
+        snap = snap_future.result()
+        events = events_future.result()
+        tasks = tasks_future.result()
+        if not snap.exists:
+            return None
+        return DocumentDetail(
+            record=decode_record(document_id, uid, snapshot_data(snap)),
+            events=events,
+            tasks=tasks,
+            # extras は呼び出し側に渡すため、スナップショットの内部 dict ではなくコピーを返す
+            extras=(snap.to_dict() or {}).get("extras"),
+        )
+
+    def _document_ref(self, uid: str, document_id: str):
+        return (
+            self._db.collection(FAMILIES)
             .document(uid)
-            .collection(_DOCUMENTS)
+            .collection(DOCUMENTS)
             .document(document_id)
-            .collection(_TASKS)
+        )
+
+    # ── アジェンダ（マテリアライズドビュー） ────────────────────────────────
+
+    def rebuild_agenda(self, uid: str) -> tuple[int, int]:
+        """
+        サブコレクションを走査してアジェンダを作り直し、complete=True を立てる。
+
+        既存ファミリーのバックフィル（scripts/backfill_agenda.py）と、
+        アジェンダの不整合を修復する用途に使う。走査中に書き込まれた差分は
+        上書きで失われうるため、取りこぼしが疑われる場合は再実行する（冪等）。
+
+        Returns:
+            (イベント件数, タスク件数)
+        """
+        agenda_events: dict[str, dict[str, Any]] = {}
+        for snap in (
+            self._db.collection_group(EVENTS)
+            .where(filter=FieldFilter("family_id", "==", uid))
+            .order_by("start")
             .stream()
+        ):
+            d = snapshot_data(snap)
+            agenda_events.setdefault(event_month(d.get("start") or ""), {})[snap.id] = (
+                agenda_entry(d)
+            )
+        agenda_tasks: dict[str, dict[str, Any]] = {}
+        for snap in (
+            self._db.collection_group(TASKS)
+            .where(filter=FieldFilter("family_id", "==", uid))
+            .order_by("completed")
+            .stream()
+        ):
+            agenda_tasks.setdefault(task_bucket(snap.id), {})[snap.id] = agenda_entry(
+                snapshot_data(snap)
+            )
+
+        agenda = self._agenda_col(uid)
+        keep = (
+            {AGENDA_INDEX}
+            | {AGENDA_EVENTS_PREFIX + month for month in agenda_events}
+            | {AGENDA_TASKS_PREFIX + bucket for bucket in agenda_tasks}
         )
-        return [
-            StoredTaskData(
-                id=snap.id,
-                title=d.get("title") or "",
-                due_date=d.get("due_date") or "",
-                assignee=d.get("assignee") or "PARENT",
-                note=d.get("note") or "",
-                completed=bool(d.get("completed", False)),
+        batch = self._db.batch()
+        # 空になったバケットと旧形式の agenda/tasks は削除する（古いエントリが復活しないように）
+        for snap in agenda.stream():
+            if snap.id not in keep:
+                batch.delete(snap.reference)
+        for month, entries in agenda_events.items():
+            batch.set(
+                agenda.document(AGENDA_EVENTS_PREFIX + month), {"events": entries}
             )
-            for snap in snaps
-            for d in (snap.to_dict() or {},)
-        ]
+        for bucket, entries in agenda_tasks.items():
+            batch.set(agenda.document(AGENDA_TASKS_PREFIX + bucket), {"tasks": entries})
+        batch.set(
+            agenda.document(AGENDA_INDEX),
+            {
+                "complete": True,
+                AGENDA_TASKS_BUCKETED: True,
+                "event_months": sorted(agenda_events),
+                "task_buckets": sorted(agenda_tasks),
+                "updated_at": firestore.SERVER_TIMESTAMP,
+            },
+        )
+        batch.commit()
 
-    # ── 変換ヘルパー ──────────────────────────────────────────────────────────
-
-    @staticmethod
-    def _record_to_dict(record: DocumentRecord) -> dict:
-        return {
-            "uid": record.uid,
-            "status": record.status,
-            "content_hash": record.content_hash,
-            "storage_path": record.storage_path,
-            "original_filename": record.original_filename,
-            "mime_type": record.mime_type,
-            "summary": record.summary,
-            "category": record.category,
-            "archive_filename": record.archive_filename,
-            "error_message": record.error_message,
-            "created_at": firestore.SERVER_TIMESTAMP,
-            "updated_at": firestore.SERVER_TIMESTAMP,
-        }
-
-    @staticmethod
-    def _dict_to_record(doc_id: str, uid: str, data: dict) -> DocumentRecord:
-        return DocumentRecord(
-            id=doc_id,
-            uid=uid,
-            status=data.get("status", "pending"),
-            content_hash=data.get("content_hash", ""),
-            storage_path=data.get("storage_path", ""),
-            original_filename=data.get("original_filename", ""),
-            mime_type=data.get("mime_type", "application/octet-stream"),
-            summary=data.get("summary", ""),
-            category=data.get("category", ""),
-            archive_filename=data.get("archive_filename") or "",
-            error_message=data.get("error_message"),
-            created_at=data.get(
-                "created_at"
-            ),  # Firestore DatetimeWithNanoseconds は datetime のサブクラス
+        event_count = sum(len(entries) for entries in agenda_events.values())
+        task_count = sum(len(entries) for entries in agenda_tasks.values())
+        logger.info(
+            "Rebuilt agenda: family_id=%s, events=%d, tasks=%d",
+            uid,
+            event_count,
+            task_count,
         )
+        return event_count, task_count
+
+    def _agenda_col(self, uid: str):
+        return self._db.collection(FAMILIES).document(uid).collection(AGENDA)
+
+    def _list_agenda_events(
+        self, uid: str, from_date: str | None, to_date: str | None
+    ) -> list[EventData] | None:
+        """アジェンダからイベントを返す。アジェンダが未完了の場合は None"""
+        agenda = self._agenda_col(uid)
+        index = agenda.document(AGENDA_INDEX).get()
+        data = snapshot_data(index) if index.exists else {}
+        if not data.get("complete"):
+            return None
+
+        months = agenda_months(data, from_date, to_date)
+        if not months:
+            return []
+        refs = [agenda.document(AGENDA_EVENTS_PREFIX + m) for m in months]
+        return events_from_agenda(self._db.get_all(refs), from_date, to_date)
+
+    def _list_agenda_tasks(
+        self, uid: str, completed: bool | None
+    ) -> list[StoredTaskData] | None:
+        """アジェンダからタスクを返す。アジェンダが未完了の場合は None"""
+        agenda = self._agenda_col(uid)
+        index = agenda.document(AGENDA_INDEX).get()
+        buckets = agenda_task_buckets(snapshot_data(index) if index.exists else {})
+        if buckets is None:
+            return None
+        if not buckets:
+            return []
+        refs = [agenda.document(AGENDA_TASKS_PREFIX + b) for b in buckets]
+        return tasks_from_agenda(self._db.get_all(refs), completed)
 
 
 class FirestoreUserConfigRepository(UserConfigRepository):
@@ -468,7 +623,7 @@ class FirestoreUserConfigRepository(UserConfigRepository):
 
     def get_user(self, uid: str) -> dict:
         """ユーザー設定を取得。存在しない場合は空のデフォルト設定を返す"""
-        snap = self._db.collection(_USERS).document(uid).get()
+        snap = self._db.collection(USERS).document(uid).get()
         if not snap.exists:
             return {
                 "ical_token": str(uuid.uuid4()),
@@ -483,7 +638,7 @@ class FirestoreUserConfigRepository(UserConfigRepository):
         set(merge=True) は dot-notation を文字通りのフィールド名として扱うため不可。
         top-level キーのみの場合は set(merge=True) でドキュメント新規作成も兼ねる。
         """
-        doc_ref = self._db.collection(_USERS).document(uid)
+        doc_ref = self._db.collection(USERS).document(uid)
         if any("." in key for key in data):
             # update() はドキュメントが存在する前提だが、update_user の呼び出し元は
             # 常に get_family_context 経由でドキュメントが作成済みのフロー
@@ -494,7 +649,7 @@ class FirestoreUserConfigRepository(UserConfigRepository):
 
     def delete_user(self, uid: str) -> None:
         """users/{uid} ドキュメントを削除"""
-        self._db.collection(_USERS).document(uid).delete()
+        self._db.collection(USERS).document(uid).delete()
         logger.info("Deleted user: uid=%s", uid)
 
 
@@ -511,8 +666,11 @@ class FirestoreFamilyRepository(FamilyRepository):
     # ── ファミリー CRUD ────────────────────────────────────────────────────────
 
     def create_family(self, family_id: str, owner_uid: str, name: str) -> None:
-        """ファミリーを作成"""
-        self._db.collection(_FAMILIES).document(family_id).set(
+        """ファミリーを作成（空のアジェンダを完了済みとして同時に作成する）"""
+        family_ref = self._db.collection(FAMILIES).document(family_id)
+        batch = self._db.batch()
+        batch.set(
+            family_ref,
             {
                 "owner_uid": owner_uid,
                 "name": name,
@@ -521,13 +679,24 @@ class FirestoreFamilyRepository(FamilyRepository):
                 "last_reset_at": firestore.SERVER_TIMESTAMP,
                 "created_at": firestore.SERVER_TIMESTAMP,
                 "updated_at": firestore.SERVER_TIMESTAMP,
-            }
+            },
+        )
+        batch.set(
+            family_ref.collection(AGENDA).document(AGENDA_INDEX),
+            {
+                "complete": True,
+                AGENDA_TASKS_BUCKETED: True,
+                "event_months": [],
+                "task_buckets": [],
+                "updated_at": firestore.SERVER_TIMESTAMP,
+            },
         )
+        batch.commit()
         logger.info("Created family: family_id=%s, owner=%s", family_id, owner_uid)
 
     def get_family(self, family_id: str) -> dict | None:
         """ファミリー設定を取得"""
-        snap = self._db.collection(_FAMILIES).document(family_id).get()
+        snap = self._db.collection(FAMILIES).document(family_id).get()
         if not snap.exists:
             return None
         return snap.to_dict() or {}
@@ -535,7 +704,7 @@ class FirestoreFamilyRepository(FamilyRepository):
     def update_family(self, family_id: str, data: dict) -> None:
         """ファミリー設定を更新（部分更新）"""
         data["updated_at"] = firestore.SERVER_TIMESTAMP
-        self._db.collection(_FAMILIES).document(family_id).set(data, merge=True)
+        self._db.collection(FAMILIES).document(family_id).set(data, merge=True)
         logger.info("Updated family: family_id=%s", family_id)
 
     # ── メンバー管理 ──────────────────────────────────────────────────────────
@@ -544,9 +713,9 @@ class FirestoreFamilyRepository(FamilyRepository):
         self, family_id: str, uid: str, role: str, display_name: str, email: str
     ) -> None:
         """ファミリーにメンバーを追加"""
-        self._db.collection(_FAMILIES).document(family_id).collection(
-            _MEMBERS
-        ).document(uid).set(
+        self._db.collection(FAMILIES).document(family_id).collection(MEMBERS).document(
+            uid
+        ).set(
             {
                 "role": role,
                 "display_name": display_name,
@@ -558,23 +727,23 @@ class FirestoreFamilyRepository(FamilyRepository):
 
     def update_member(self, family_id: str, uid: str, updates: dict) -> None:
         """メンバーの属性を部分更新"""
-        self._db.collection(_FAMILIES).document(family_id).collection(
-            _MEMBERS
-        ).document(uid).update(updates)
+        self._db.collection(FAMILIES).document(family_id).collection(MEMBERS).document(
+            uid
+        ).update(updates)
 
     def remove_member(self, family_id: str, uid: str) -> None:
         """ファミリーからメンバーを削除"""
-        self._db.collection(_FAMILIES).document(family_id).collection(
-            _MEMBERS
-        ).document(uid).delete()
+        self._db.collection(FAMILIES).document(family_id).collection(MEMBERS).document(
+            uid
+        ).delete()
         logger.info("Removed member: family_id=%s, uid=%s", family_id, uid)
 
     def list_members(self, family_id: str) -> list[dict]:
         """メンバー一覧を取得"""
         snaps = (
-            self._db.collection(_FAMILIES)
+            self._db.collection(FAMILIES)
             .document(family_id)
-            .collection(_MEMBERS)
+            .collection(MEMBERS)
             .stream()
         )
         return [{"uid": snap.id, **(snap.to_dict() or {})} for snap in snaps]
@@ -582,9 +751,9 @@ class FirestoreFamilyRepository(FamilyRepository):
     def get_member(self, family_id: str, uid: str) -> dict | None:
         """メンバーの全データを取得。未参加の場合はNoneを返す"""
         snap = (
-            self._db.collection(_FAMILIES)
+            self._db.collection(FAMILIES)
             .document(family_id)
-            .collection(_MEMBERS)
+            .collection(MEMBERS)
             .document(uid)
             .get()
         )
@@ -608,9 +777,9 @@ class FirestoreFamilyRepository(FamilyRepository):
         import datetime
 
         ref = (
-            self._db.collection(_FAMILIES)
+            self._db.collection(FAMILIES)
             .document(family_id)
-            .collection(_INVITATIONS)
+            .collection(INVITATIONS)
             .document()
         )
         expires_at = datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=7)
@@ -631,7 +800,7 @@ class FirestoreFamilyRepository(FamilyRepository):
     def get_invitation_by_token(self, token: str) -> dict | None:
         """招待トークンで招待情報を取得"""
         snaps = (
-            self._db.collection_group(_INVITATIONS)
+            self._db.collection_group(INVITATIONS)
             .where(filter=FieldFilter("token", "==", token))
             .limit(1)
             .stream()
@@ -642,8 +811,8 @@ class FirestoreFamilyRepository(FamilyRepository):
 
     def accept_invitation(self, invitation_id: str, family_id: str) -> None:
         """招待ステータスを accepted に更新"""
-        self._db.collection(_FAMILIES).document(family_id).collection(
-            _INVITATIONS
+        self._db.collection(FAMILIES).document(family_id).collection(
+            INVITATIONS
         ).document(invitation_id).update({"status": "accepted"})
         logger.info(
             "Accepted invitation: family_id=%s, invitation_id=%s",
@@ -656,25 +825,16 @@ class FirestoreFamilyRepository(FamilyRepository):
     def list_profiles(self, family_id: str) -> list[UserProfile]:
         """プロファイル一覧を取得"""
         snaps = (
-            self._db.collection(_FAMILIES)
+            self._db.collection(FAMILIES)
             .document(family_id)
-            .collection(_PROFILES)
+            .collection(PROFILES)
             .stream()
         )
-        return [
-            UserProfile(
-                id=snap.id,
-                name=d.get("name", ""),
-                grade=d.get("grade", ""),
-                keywords=d.get("keywords", ""),
-            )
-            for snap in snaps
-            for d in (snap.to_dict() or {},)
-        ]
+        return [_snap_to_profile(snap) for snap in snaps]
 
     def create_profile(self, family_id: str, profile: UserProfile) -> str:
         """プロファイルを作成。生成されたIDを返す"""
-        col = self._db.collection(_FAMILIES).document(family_id).collection(_PROFILES)
+        col = self._db.collection(FAMILIES).document(family_id).collection(PROFILES)
         ref = col.add(
             {
                 "name": profile.name,
@@ -690,9 +850,9 @@ class FirestoreFamilyRepository(FamilyRepository):
         self, family_id: str, profile_id: str, profile: UserProfile
     ) -> None:
         """プロファイルを更新"""
-        self._db.collection(_FAMILIES).document(family_id).collection(
-            _PROFILES
-        ).document(profile_id).update(
+        self._db.collection(FAMILIES).document(family_id).collection(PROFILES).document(
+            profile_id
+        ).update(
             {
                 "name": profile.name,
                 "grade": profile.grade,
@@ -706,31 +866,27 @@ class FirestoreFamilyRepository(FamilyRepository):
 
     def delete_profile(self, family_id: str, profile_id: str) -> None:
         """プロファイルを削除"""
-        self._db.collection(_FAMILIES).document(family_id).collection(
-            _PROFILES
-        ).document(profile_id).delete()
+        self._db.collection(FAMILIES).document(family_id).collection(PROFILES).document(
+            profile_id
+        ).delete()
         logger.info(
             "Deleted profile: family_id=%s, profile_id=%s", family_id, profile_id
         )
 
     def delete_family_cascade(self, family_id: str) -> None:
-        """ファミリーと全サブコレクションを再帰的に削除"""
-        family_ref = self._db.collection(_FAMILIES).document(family_id)
-
-        # documents とそのサブコレクション (events, tasks) を削除
-        for doc_snap in family_ref.collection(_DOCUMENTS).stream():
-            doc_ref = doc_snap.reference
-            for event_snap in doc_ref.collection(_EVENTS).stream():
-                event_snap.reference.delete()
-            for task_snap in doc_ref.collection(_TASKS).stream():
-                task_snap.reference.delete()
-            doc_ref.delete()
-
-        # profiles, invitations, members を削除
-        for sub in (_PROFILES, _INVITATIONS, _MEMBERS):
-            for snap in family_ref.collection(sub).stream():
-                snap.reference.delete()
-
-        # ファミリー本体を削除
-        family_ref.delete()
-        logger.info("Deleted family cascade: family_id=%s", family_id)
+        """
+        ファミリーと全サブコレクションを再帰的に削除。
+
+        documents（events/tasks を含む）・agenda・profiles・invitations・members を
+        recursive_delete で列挙し、BulkWriter で並列・流量制御付きで削除する。
+
+        Args:
+            family_id: 削除するファミリー ID
+        """
+        family_ref = self._db.collection(FAMILIES).document(family_id)
+        deleter = BulkDeleter(self._db, f"family_id={family_id}")
+        self._db.recursive_delete(family_ref, bulk_writer=deleter.writer)
+        deleted = deleter.close()
+        logger.info(
+            "Deleted family cascade: family_id=%s, deleted=%d", family_id, deleted
+        )
@@ -0,0 +1,312 @@
+"""Firestore の保存形式（同期・非同期リポジトリで共有）
+
+FirestoreDocumentRepository（firestore_repository.py）と
+AsyncFirestoreDocumentRepository（firestore_async_repository.py）は同じコレクション構造・
+保存形式で読み書きする。コレクション名・キーの組み立て・書き込むフィールド・
+アジェンダ（events/tasks のマテリアライズドビュー）の読み書きをここにまとめる。
+
+読み取り結果のドメインモデルへの変換は firestore_codec.py を使う。
+"""
+
+from __future__ import annotations
+
+import uuid
+import zlib
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any
+
+from google.cloud import firestore
+from google.cloud.firestore_v1.field_path import FieldPath
+
+from v2.adapters.firestore_codec import decode_event, decode_task, snapshot_data
+from v2.domain.models import (
+    DocumentAnalysis,
+    DocumentRecord,
+    EventData,
+    StoredTaskData,
+    TaskData,
+)
+
+# ── コレクション・キー ───────────────────────────────────────────────────────
+
+FAMILIES = "families"
+MEMBERS = "members"
+INVITATIONS = "invitations"
+PROFILES = "profiles"
+DOCUMENTS = "documents"
+EVENTS = "events"
+TASKS = "tasks"
+USERS = "users"
+
+# ドキュメント一覧（DocumentResponse）で使うフィールド
+LIST_FIELDS = [
+    "status",
+    "original_filename",
+    "mime_type",
+    "summary",
+    "category",
+    "archive_filename",
+    "error_message",
+    "created_at",
+]
+
+# タスク ID の区切り文字（"{document_id}_{suffix}"）。
+# Firestore の自動採番 ID（英数字のみ）と区別でき、suffix（uuid の hex）にも含まれない
+_TASK_ID_SEP = "_"
+
+
+# アジェンダ: ファミリー単位のマテリアライズドビュー。
+# save_analysis / delete / update_task_completed が同じバッチで差分更新し、
+# list_events / list_tasks はコレクショングループクエリの代わりに数件のドキュメント読み取りで済ませる。
+# index の complete=True は「全件が反映済み」を表し、create_family または
+# rebuild_agenda()（バックフィル）でのみ立てる。未完了のファミリーは従来のクエリにフォールバックする。
+AGENDA = "agenda"
+AGENDA_INDEX = "index"
+AGENDA_EVENTS_PREFIX = "events_"
+UNDATED_BUCKET = "undated"  # start が YYYY-MM で始まらないイベントの格納先
+# タスクは taskId のハッシュで固定数のバケットに分ける（1ドキュメント 1 MiB の上限対策）。
+# 完了の更新は taskId だけでバケットが決まるため、事前の読み取りは不要。
+# 1エントリ数百バイトとして、1バケットあたり約 3,000 件・全体で約 10 万件まで収まる。
+AGENDA_TASKS_PREFIX = "tasks_"
+TASK_BUCKETS = 32
+# index の tasks_bucketed=True はタスクがバケット形式で揃っていることを表す。
+# 単一の agenda/tasks だった旧形式のファミリーは rebuild_agenda() まではクエリにフォールバックする。
+AGENDA_TASKS_BUCKETED = "tasks_bucketed"
+
+
+def event_month(start: str) -> str:
+    """イベント開始日時から月別バケットのキー（YYYY-MM）を返す"""
+    month = start[:7]
+    if len(month) == 7 and month[4] == "-" and (month[:4] + month[5:]).isdigit():
+        return month
+    return UNDATED_BUCKET
+
+
+def task_bucket(task_id: str) -> str:
+    """タスクのバケットのキー（00〜31）を返す（プロセスをまたいで安定な crc32 を使う）"""
+    return f"{zlib.crc32(task_id.encode()) % TASK_BUCKETS:02d}"
+
+
+def agenda_entry(data: Mapping[str, Any]) -> dict:
+    """サブコレクションのドキュメントからアジェンダに載せるフィールドを取り出す"""
+    return {k: v for k, v in data.items() if k != "family_id"}
+
+
+def new_task_id(document_id: str) -> str:
+    """親ドキュメント ID を埋め込んだタスク ID を生成する"""
+    return f"{document_id}{_TASK_ID_SEP}{uuid.uuid4().hex}"
+
+
+def parent_document_id(task_id: str) -> str | None:
+    """タスク ID から親ドキュメント ID を取り出す（旧形式の自動採番 ID は None）"""
+    document_id, sep, suffix = task_id.rpartition(_TASK_ID_SEP)
+    if not sep or not document_id or not suffix:
+        return None
+    return document_id
+
+
+def list_cursor(start_after: datetime, start_after_id: str | None) -> dict:
+    """list() の start_after に渡すカーソル（order_by の created_at, __name__ に対応）"""
+    if start_after_id is None:
+        return {"created_at": start_after}
+    return {"created_at": start_after, FieldPath.document_id(): start_after_id}
+
+
+# ── 書き込みフィールド ─────────────────────────────────────────────────────────
+
+
+def record_to_dict(record: DocumentRecord) -> dict:
+    return {
+        "uid": record.uid,
+        "status": record.status,
+        "content_hash": record.content_hash,
+        "storage_path": record.storage_path,
+        "original_filename": record.original_filename,
+        "mime_type": record.mime_type,
+        "summary": record.summary,
+        "category": record.category,
+        "archive_filename": record.archive_filename,
+        "error_message": record.error_message,
+        "created_at": firestore.SERVER_TIMESTAMP,
+        "updated_at": firestore.SERVER_TIMESTAMP,
+    }
+
+
+def status_update(status: str, error_message: str | None) -> dict[str, Any]:
+    update: dict[str, Any] = {
+        "status": status,
+        "updated_at": firestore.SERVER_TIMESTAMP,
+    }
+    if error_message is not None:
+        update["error_message"] = error_message
+    return update
+
+
+def analysis_update(analysis: DocumentAnalysis) -> dict[str, Any]:
+    """解析結果でドキュメント本体を更新するフィールド（extras は None なら保存しない）"""
+    update: dict[str, Any] = {
+        "status": "completed",
+        "summary": analysis.summary,
+        "category": analysis.category.value,
+        "archive_filename": analysis.archive_filename,
+        "updated_at": firestore.SERVER_TIMESTAMP,
+    }
+    extras = analysis.extras
+    if extras is not None:
+        update["extras"] = {
+            "items_to_bring": [
+                {
+                    "item": it.item,
+                    "event_index": it.event_index,
+                    "source_text": it.source_text,
+                }
+                for it in extras.items_to_bring
+            ],
+            "dress_code": list(extras.dress_code),
+            "costs": [
+                {
+                    "description": c.description,
+                    "amount": c.amount,
+                    "due_date": c.due_date,
+                    "source_text": c.source_text,
+                }
+                for c in extras.costs
+            ],
+            "notes": list(extras.notes),
+            "source_texts": list(extras.source_texts),
+        }
+    return update
+
+
+def event_payload(uid: str, document_id: str, event: EventData) -> dict[str, Any]:
+    # family_id は collection_group クエリのフィルター用（必須）
+    return {
+        "family_id": uid,
+        "document_id": document_id,
+        "summary": event.summary,
+        "start": event.start,
+        "end": event.end,
+        "location": event.location,
+        "description": event.description,
+        "confidence": event.confidence,
+    }
+
+
+def task_payload(uid: str, document_id: str, task: TaskData) -> dict[str, Any]:
+    # family_id は collection_group クエリのフィルター用（必須）
+    return {
+        "family_id": uid,
+        "document_id": document_id,
+        "title": task.title,
+        "due_date": task.due_date,
+        "assignee": task.assignee,
+        "note": task.note,
+        "completed": False,
+    }
+
+
+# ── アジェンダの読み書き ─────────────────────────────────────────────────────
+
+
+def agenda_months(
+    index_data: Mapping[str, Any], from_date: str | None, to_date: str | None
+) -> list[str]:
+    """日付範囲にかかる月別バケットのキーを返す（undated は常に含める）"""
+    return [
+        m
+        for m in index_data.get("event_months") or []
+        if m == UNDATED_BUCKET
+        or ((not from_date or m >= from_date[:7]) and (not to_date or m <= to_date[:7]))
+    ]
+
+
+def events_from_agenda(
+    bucket_snaps, from_date: str | None, to_date: str | None
+) -> list[EventData]:
+    """月別バケットのスナップショットからイベントを絞り込み、開始日時順に返す"""
+    entries = [
+        entry
+        for snap in bucket_snaps
+        if snap.exists
+        for entry in (snapshot_data(snap).get("events") or {}).values()
+    ]
+    # コレクショングループクエリと同じ文字列比較で絞り込む
+    if from_date:
+        entries = [e for e in entries if (e.get("start") or "") >= from_date]
+    if to_date:
+        to_bound = to_date + "T23:59:59"
+        entries = [e for e in entries if (e.get("start") or "") <= to_bound]
+    entries.sort(key=lambda e: e.get("start") or "")
+    return [decode_event(e) for e in entries]
+
+
+def agenda_task_buckets(index_data: Mapping[str, Any]) -> list[str] | None:
+    """index からタスクのバケットのキーを返す。タスクがバケット形式で揃っていなければ None"""
+    if not index_data.get("complete") or not index_data.get(AGENDA_TASKS_BUCKETED):
+        return None
+    return list(index_data.get("task_buckets") or [])
+
+
+def tasks_from_agenda(bucket_snaps, completed: bool | None) -> list[StoredTaskData]:
+    """タスクのバケットのスナップショットからタスクを返す（未完了が先）"""
+    tasks = [
+        decode_task(task_id, d)
+        for snap in bucket_snaps
+        if snap.exists
+        for task_id, d in (snapshot_data(snap).get("tasks") or {}).items()
+    ]
+    if completed is not None:
+        tasks = [t for t in tasks if t.completed == completed]
+    return sorted(tasks, key=lambda t: (t.completed, t.id))
+
+
+def stage_agenda_changes(
+    batch,
+    agenda,
+    events_by_month: dict[str, dict[str, Any]],
+    tasks: dict[str, Any],
+    register_keys: bool = False,
+) -> None:
+    """
+    アジェンダの差分更新をバッチに積む（同期・非同期のバッチで共通）。
+
+    値が firestore.DELETE_FIELD のエントリは削除される。
+    set(merge=True) のため、アジェンダ未構築のファミリーでも書き込みは失敗しない
+    （index の complete が立つまで読み取り側では使われない）。
+
+    agenda/index は全更新が集まる1ドキュメントのため、新しい月・バケットが増えうる
+    エントリの追加（register_keys=True）でのみ書き込む。削除や既存エントリの更新では
+    月・バケットは既に index にあり、空になった月・バケットが残っても読み取り結果は変わらない。
+
+    Args:
+        batch: WriteBatch / AsyncWriteBatch
+        agenda: families/{familyId}/agenda の CollectionReference
+        events_by_month: {YYYY-MM: {eventId: エントリ or DELETE_FIELD}}
+        tasks: {taskId: エントリ or DELETE_FIELD}（バケットへの振り分けはここで行う）
+        register_keys: エントリを追加する場合 True（月・バケットを index に登録する）
+    """
+    for month, entries in events_by_month.items():
+        batch.set(
+            agenda.document(AGENDA_EVENTS_PREFIX + month),
+            {"events": entries},
+            merge=True,
+        )
+    tasks_by_bucket: dict[str, dict[str, Any]] = {}
+    for task_id, entry in tasks.items():
+        tasks_by_bucket.setdefault(task_bucket(task_id), {})[task_id] = entry
+    for bucket, entries in tasks_by_bucket.items():
+        batch.set(
+            agenda.document(AGENDA_TASKS_PREFIX + bucket),
+            {"tasks": entries},
+            merge=True,
+        )
+    if not register_keys:
+        return
+    index_update: dict[str, Any] = {}
+    if events_by_month:
+        index_update["event_months"] = firestore.ArrayUnion(sorted(events_by_month))
+    if tasks_by_bucket:
+        index_update["task_buckets"] = firestore.ArrayUnion(sorted(tasks_by_bucket))
+    if index_update:
+        batch.set(agenda.document(AGENDA_INDEX), index_update, merge=True)
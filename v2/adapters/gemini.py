@@ -7,11 +7,14 @@ vertexai.init() はコンストラクタから分離されており、
 呼び出し側（factory等）が事前に初期化した GenerativeModel を渡す。
 """
 
+import functools
 import json
 import logging
+import time
 
 import vertexai.preview.generative_models as generative_models
 from google.api_core.exceptions import (
+    DeadlineExceeded,
     InternalServerError,
     ResourceExhausted,
     ServiceUnavailable,
@@ -24,12 +27,20 @@ from tenacity import (
 )
 from vertexai.generative_models import GenerativeModel, Part
 
+from v2.adapters.resilience import (
+    CircuitBreaker,
+    LatencyTracker,
+    call_with_hedge,
+    call_with_hedge_async,
+)
+from v2.domain.errors import AnalysisUnavailableError
 from v2.domain.models import (
     AnalysisResult,
     Category,
     CostInfo,
     DocumentAnalysis,
     DocumentExtras,
+    DocumentInput,
     EventData,
     PrepItem,
     TaskData,
@@ -40,6 +51,30 @@ from v2.domain.ports import DocumentAnalyzer
 
 logger = logging.getLogger(__name__)
 
+# リトライ・サーキットブレーカーの対象となる一時的な API エラー
+_TRANSIENT_ERRORS = (
+    ResourceExhausted,
+    ServiceUnavailable,
+    InternalServerError,
+    DeadlineExceeded,
+)
+
+# 1文書あたりの出力トークン上限と、パック解析時の上限（モデルの最大出力）
+_MAX_OUTPUT_TOKENS = 8192
+_MAX_PACKED_OUTPUT_TOKENS = 65535
+
+
+def _split_token_usage(usage: TokenUsage | None, count: int) -> TokenUsage | None:
+    """パック全体のトークン使用量を文書数で按分する"""
+    if usage is None or count <= 0:
+        return None
+    return TokenUsage(
+        prompt_tokens=usage.prompt_tokens // count,
+        candidates_tokens=usage.candidates_tokens // count,
+        total_tokens=usage.total_tokens // count,
+        input_mode=usage.input_mode,
+    )
+
 
 class GeminiDocumentAnalyzer(DocumentAnalyzer):
     """
@@ -52,16 +87,32 @@ class GeminiDocumentAnalyzer(DocumentAnalyzer):
     これにより、テスト時のモック差し替えとマルチテナント化が容易になる。
     """
 
-    def __init__(self, model: GenerativeModel) -> None:
+    def __init__(
+        self,
+        model: GenerativeModel,
+        hedge_percentile: float | None = None,
+        latency_tracker: LatencyTracker | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+    ) -> None:
         """
         Args:
             model: 初期化済みの GenerativeModel インスタンス。
                    呼び出し側で vertexai.init() を実行してから渡すこと。
+            hedge_percentile: 直近レイテンシのこのパーセンタイル（例: 95）を超えても
+                   応答がない場合にヘッジリクエストを送る。None でヘッジ無効
+            latency_tracker: レイテンシ記録先（プロセス内で共有するもの）。
+                   hedge_percentile 指定時に省略すると新規に作成する
+            circuit_breaker: エラー率急増時に即時失敗させるブレーカー（省略時は無効）
         """
         if model is None:
             raise ValueError("model is required")
 
         self._model = model
+        self._hedge_percentile = hedge_percentile
+        self._latency_tracker = latency_tracker
+        if hedge_percentile is not None and latency_tracker is None:
+            self._latency_tracker = LatencyTracker()
+        self._circuit_breaker = circuit_breaker
 
         logger.info("GeminiDocumentAnalyzer initialized")
 
@@ -76,8 +127,8 @@ class GeminiDocumentAnalyzer(DocumentAnalyzer):
         文書を解析して構造化データを抽出。
 
         Args:
-            content: ファイルの内容（バイナリ）
-            mime_type: MIMEタイプ（例: application/pdf, image/jpeg）
+            content: ファイルの内容（バイナリ。text/plain の場合は UTF-8 テキスト）
+            mime_type: MIMEタイプ（例: application/pdf, image/jpeg, text/plain）
             profiles: プロファイル辞書
             rules: ルールリスト
 
@@ -93,88 +144,357 @@ class GeminiDocumentAnalyzer(DocumentAnalyzer):
             user_prompt = self._build_user_prompt(profiles, rules or [])
 
             # Gemini API呼び出し
-            document_part = Part.from_data(data=content, mime_type=mime_type)
+            responses = self._generate(
+                [self._document_part(content, mime_type), user_prompt],
+                self._generation_config(_MAX_OUTPUT_TOKENS),
+                self._safety_settings(),
+            )
 
-            generation_config = {
-                "max_output_tokens": 8192,
-                "temperature": 0.2,
-                "top_p": 0.95,
-                "response_mime_type": "application/json",
-            }
+            return self._to_result(responses)
 
-            HarmCategory = generative_models.HarmCategory
-            HarmBlock = generative_models.HarmBlockThreshold
-            safety_settings = {
-                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlock.BLOCK_MEDIUM_AND_ABOVE,
-                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlock.BLOCK_MEDIUM_AND_ABOVE,
-                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlock.BLOCK_MEDIUM_AND_ABOVE,
-                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlock.BLOCK_MEDIUM_AND_ABOVE,
-            }
+        except Exception:
+            logger.exception("Failed to analyze document")
+            raise
 
-            responses = self._call_gemini(
-                document_part, user_prompt, generation_config, safety_settings
+    async def analyze_async(
+        self,
+        content: bytes,
+        mime_type: str,
+        profiles: dict[str, UserProfile],
+        rules: list | None = None,
+    ) -> AnalysisResult:
+        """
+        analyze() の非同期版。
+
+        SDK の generate_content_async を使うため、Gemini の応答待ちの間スレッドを占有しない。
+        リトライ・ヘッジ・サーキットブレーカーの挙動は analyze() と同じ。
+        """
+        try:
+            user_prompt = self._build_user_prompt(profiles, rules or [])
+            responses = await self._generate_async(
+                [self._document_part(content, mime_type), user_prompt],
+                self._generation_config(_MAX_OUTPUT_TOKENS),
+                self._safety_settings(),
             )
+            return self._to_result(responses)
 
-            # トークン使用量を取得
-            token_usage: TokenUsage | None = None
-            usage = getattr(responses, "usage_metadata", None)
-            if usage:
-                token_usage = TokenUsage(
-                    prompt_tokens=usage.prompt_token_count,
-                    candidates_tokens=usage.candidates_token_count,
-                    total_tokens=usage.total_token_count,
-                )
-                logger.info(
-                    "Gemini token usage: input=%d, output=%d, total=%d",
-                    token_usage.prompt_tokens,
-                    token_usage.candidates_tokens,
-                    token_usage.total_tokens,
-                )
+        except Exception:
+            logger.exception("Failed to analyze document (async)")
+            raise
 
-            # JSONレスポンスをパース
-            raw_json = self._parse_response(responses.text)
-            analysis = self._convert_to_domain_model(raw_json)
+    def _to_result(self, responses) -> AnalysisResult:
+        """Gemini の応答を AnalysisResult に変換する"""
+        # トークン使用量を取得
+        token_usage = self._token_usage(responses)
 
-            logger.info(
-                "Document analysis complete: category=%s, events=%d, tasks=%d",
-                analysis.category,
-                len(analysis.events),
-                len(analysis.tasks),
-            )
+        # JSONレスポンスをパース
+        raw_json = self._parse_response(responses.text)
+        analysis = self._convert_to_domain_model(raw_json)
+
+        logger.info(
+            "Document analysis complete: category=%s, events=%d, tasks=%d",
+            analysis.category,
+            len(analysis.events),
+            len(analysis.tasks),
+        )
+
+        return AnalysisResult(analysis=analysis, token_usage=token_usage)
 
-            return AnalysisResult(analysis=analysis, token_usage=token_usage)
+    def analyze_packed(
+        self,
+        documents: list[DocumentInput],
+        profiles: dict[str, UserProfile],
+        rules: list | None = None,
+    ) -> list[AnalysisResult]:
+        """
+        複数の文書を1リクエストに詰め込んで解析する。
+
+        各文書の前に "[document N]" の区切りを入れ、index をキーにした結果配列を
+        JSON で返させる。共通のプロンプト（Profiles / Rules / スキーマ）は1回分で済むため、
+        小さな画像を大量に処理するバックフィル等でリクエスト数とトークン数を削減できる。
+
+        パック呼び出しが失敗した場合、または結果が欠落・不正だった文書は
+        analyze() による単発呼び出しにフォールバックする。
+        トークン使用量はパック全体の値を文書数で按分した近似値となる。
+
+        Raises:
+            AnalysisUnavailableError: サーキットブレーカーが open の場合
+                （フォールバックせずに即時失敗させる）
+        """
+        if len(documents) <= 1:
+            return super().analyze_packed(documents, profiles, rules)
 
+        rules = rules or []
+        packed: dict[int, DocumentAnalysis] = {}
+        token_usage: TokenUsage | None = None
+        try:
+            contents: list = []
+            for i, doc in enumerate(documents):
+                contents.append(Part.from_text(f"[document {i}]"))
+                contents.append(self._document_part(doc.content, doc.mime_type))
+            contents.append(self._build_packed_user_prompt(profiles, rules))
+
+            responses = self._generate(
+                contents,
+                self._generation_config(
+                    min(_MAX_OUTPUT_TOKENS * len(documents), _MAX_PACKED_OUTPUT_TOKENS)
+                ),
+                self._safety_settings(),
+            )
+            packed = self._split_packed_response(
+                self._parse_response(responses.text), len(documents)
+            )
+            token_usage = self._token_usage(responses)
+        except AnalysisUnavailableError:
+            raise
         except Exception:
-            logger.exception("Failed to analyze document")
+            logger.exception(
+                "Packed analysis failed, falling back to single calls: documents=%d",
+                len(documents),
+            )
+
+        share = _split_token_usage(token_usage, len(packed)) if packed else None
+        results: list[AnalysisResult] = []
+        for i, doc in enumerate(documents):
+            if i in packed:
+                results.append(AnalysisResult(analysis=packed[i], token_usage=share))
+            else:
+                results.append(
+                    self.analyze(doc.content, doc.mime_type, profiles, rules)
+                )
+
+        logger.info(
+            "Packed analysis complete: documents=%d, packed=%d, fallback=%d",
+            len(documents),
+            len(packed),
+            len(documents) - len(packed),
+        )
+        return results
+
+    def _split_packed_response(
+        self, raw_json: dict | list, count: int
+    ) -> dict[int, DocumentAnalysis]:
+        """パック解析の結果配列を index ごとの DocumentAnalysis に分割する。
+
+        範囲外・重複・変換できない要素は捨てる（呼び出し側で単発解析にフォールバック）。
+        """
+        items = raw_json.get("results", []) if isinstance(raw_json, dict) else raw_json
+        if not isinstance(items, list):
+            return {}
+
+        analyses: dict[int, DocumentAnalysis] = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            index = item.get("index")
+            if not isinstance(index, int) or not 0 <= index < count:
+                logger.warning("Packed result has invalid index: %r", index)
+                continue
+            if index in analyses:
+                logger.warning("Packed result has duplicate index: %d", index)
+                continue
+            try:
+                analyses[index] = self._convert_to_domain_model(item)
+            except Exception:
+                logger.warning("Failed to convert packed result: index=%d", index)
+        return analyses
+
+    @staticmethod
+    def _document_part(content: bytes, mime_type: str) -> Part:
+        """文書をリクエスト用の Part に変換する"""
+        # text/plain はテキストレイヤー抽出済みの文書（DocumentProcessor 参照）
+        if mime_type == "text/plain":
+            return Part.from_text(content.decode("utf-8"))
+        return Part.from_data(data=content, mime_type=mime_type)
+
+    @staticmethod
+    def _generation_config(max_output_tokens: int) -> dict:
+        return {
+            "max_output_tokens": max_output_tokens,
+            "temperature": 0.2,
+            "top_p": 0.95,
+            "response_mime_type": "application/json",
+        }
+
+    @staticmethod
+    def _safety_settings() -> dict:
+        HarmCategory = generative_models.HarmCategory
+        HarmBlock = generative_models.HarmBlockThreshold
+        return {
+            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlock.BLOCK_MEDIUM_AND_ABOVE,
+            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlock.BLOCK_MEDIUM_AND_ABOVE,
+            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlock.BLOCK_MEDIUM_AND_ABOVE,
+            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlock.BLOCK_MEDIUM_AND_ABOVE,
+        }
+
+    @staticmethod
+    def _token_usage(responses) -> TokenUsage | None:
+        """レスポンスからトークン使用量を取得する（取得できない場合は None）"""
+        usage = getattr(responses, "usage_metadata", None)
+        if not usage:
+            return None
+        token_usage = TokenUsage(
+            prompt_tokens=usage.prompt_token_count,
+            candidates_tokens=usage.candidates_token_count,
+            total_tokens=usage.total_token_count,
+        )
+        logger.info(
+            "Gemini token usage: input=%d, output=%d, total=%d",
+            token_usage.prompt_tokens,
+            token_usage.candidates_tokens,
+            token_usage.total_tokens,
+        )
+        return token_usage
+
+    def _generate(
+        self,
+        contents: list,
+        generation_config: dict,
+        safety_settings: dict,
+    ):
+        """サーキットブレーカーとヘッジリクエストを適用して Gemini を呼び出す。
+
+        Raises:
+            AnalysisUnavailableError: サーキットブレーカーが open の場合
+        """
+        if self._circuit_breaker is not None:
+            self._circuit_breaker.before_call()
+        try:
+            responses = self._call_gemini(contents, generation_config, safety_settings)
+        except BaseException as e:
+            self._record_outcome(e)
             raise
+        self._record_outcome(None)
+        return responses
+
+    async def _generate_async(
+        self,
+        contents: list,
+        generation_config: dict,
+        safety_settings: dict,
+    ):
+        """_generate() の非同期版。
+
+        Raises:
+            AnalysisUnavailableError: サーキットブレーカーが open の場合
+        """
+        if self._circuit_breaker is not None:
+            self._circuit_breaker.before_call()
+        try:
+            responses = await self._call_gemini_async(
+                contents, generation_config, safety_settings
+            )
+        except BaseException as e:
+            self._record_outcome(e)
+            raise
+        self._record_outcome(None)
+        return responses
+
+    def _hedge_delay(self) -> float | None:
+        """ヘッジリクエストを送るまでの待ち時間（ヘッジしない場合は None）"""
+        if self._hedge_percentile is None or self._latency_tracker is None:
+            return None
+        return self._latency_tracker.percentile(self._hedge_percentile)
+
+    def _record_outcome(self, error: BaseException | None) -> None:
+        """呼び出し結果をサーキットブレーカーに記録する"""
+        breaker = self._circuit_breaker
+        if breaker is None:
+            return
+        if error is not None and not isinstance(error, Exception):
+            # キャンセル等で結果が出ていない呼び出しは記録せず、half_open の試行枠だけ返す
+            breaker.release_probe()
+        elif isinstance(error, _TRANSIENT_ERRORS):
+            breaker.record_failure()
+        else:
+            # 入力起因のエラー（InvalidArgument 等）は API 自体は応答しているため成功扱い
+            breaker.record_success()
 
     @retry(
-        retry=retry_if_exception_type(
-            (ResourceExhausted, ServiceUnavailable, InternalServerError)
-        ),
+        retry=retry_if_exception_type(_TRANSIENT_ERRORS),
         wait=wait_exponential(multiplier=1, min=4, max=60),
         stop=stop_after_attempt(4),
         reraise=True,
     )
     def _call_gemini(
         self,
-        document_part: Part,
-        user_prompt: str,
+        contents: list,
         generation_config: dict,
         safety_settings: dict,
     ):
         """Gemini API 呼び出し（自動リトライ付き）。
 
-        Rate Limit (429) / ServiceUnavailable (503) / InternalServerError (500) の場合に
-        指数バックオフで最大4回リトライする。
+        Rate Limit (429) / ServiceUnavailable (503) / InternalServerError (500) /
+        DeadlineExceeded (504) の場合に指数バックオフで最大4回リトライする。
+        ヘッジは各試行の内側で行う（停滞した試行だけを重複させ、リトライ全体は重複させない）。
         """
         logger.debug("Calling Gemini API (with retry)")
-        return self._model.generate_content(
-            [document_part, user_prompt],
+        return call_with_hedge(
+            functools.partial(
+                self._generate_content, contents, generation_config, safety_settings
+            ),
+            self._hedge_delay(),
+        )
+
+    def _generate_content(
+        self,
+        contents: list,
+        generation_config: dict,
+        safety_settings: dict,
+    ):
+        """Gemini API を1回呼び出す。成功した呼び出しのレイテンシはヘッジ判定用に記録する"""
+        start = time.monotonic()
+        responses = self._model.generate_content(
+            contents,
+            generation_config=generation_config,
+            safety_settings=safety_settings,
+            stream=False,
+        )
+        if self._latency_tracker is not None:
+            self._latency_tracker.record(time.monotonic() - start)
+        return responses
+
+    @retry(
+        retry=retry_if_exception_type(_TRANSIENT_ERRORS),
+        wait=wait_exponential(multiplier=1, min=4, max=60),
+        stop=stop_after_attempt(4),
+        reraise=True,
+    )
+    async def _call_gemini_async(
+        self,
+        contents: list,
+        generation_config: dict,
+        safety_settings: dict,
+    ):
+        """_call_gemini() の非同期版（リトライ条件・試行ごとのヘッジは同じ）"""
+        logger.debug("Calling Gemini API async (with retry)")
+        return await call_with_hedge_async(
+            functools.partial(
+                self._generate_content_async,
+                contents,
+                generation_config,
+                safety_settings,
+            ),
+            self._hedge_delay(),
+        )
+
+    async def _generate_content_async(
+        self,
+        contents: list,
+        generation_config: dict,
+        safety_settings: dict,
+    ):
+        """_generate_content() の非同期版"""
+        start = time.monotonic()
+        responses = await self._model.generate_content_async(
+            contents,
             generation_config=generation_config,
             safety_settings=safety_settings,
             stream=False,
         )
+        if self._latency_tracker is not None:
+            self._latency_tracker.record(time.monotonic() - start)
+        return responses
 
     def _build_system_prompt(self) -> str:
         """システムプロンプトを構築"""
@@ -269,6 +589,27 @@ class GeminiDocumentAnalyzer(DocumentAnalyzer):
 4. extrasには持ち物・服装・費用・注意事項を抽出してください。event_indexはeventsリストの0始まりインデックスを指定し、ドキュメント全体に関係する場合は-1としてください。amount は数値（整数）で、不明な場合はnullとしてください。
 """
 
+    def _build_packed_user_prompt(
+        self, profiles: dict[str, UserProfile], rules: list
+    ) -> str:
+        """パック解析用のユーザープロンプトを構築（単発用プロンプト + 出力形式の指示）"""
+        return (
+            self._build_user_prompt(profiles, rules)
+            + """
+## Multiple Documents
+
+このリクエストには複数の文書が含まれています。各文書の直前に `[document N]`（N は0始まりの番号）の区切りがあります。
+文書ごとに独立して上記の Output Schema に従って解析し、以下の形式でまとめて出力してください。
+異なる文書の内容を混ぜないでください。すべての文書について結果を1件ずつ出力してください。
+{
+  "results": [
+    { "index": 0, "summary": "...", "category": "...", ... },
+    { "index": 1, "summary": "...", "category": "...", ... }
+  ]
+}
+"""
+        )
+
     def _parse_response(self, response_text: str) -> dict:
         """
         Geminiのレスポンスをパース。
@@ -0,0 +1,238 @@
+"""Gemini Record / Replay
+
+GenerativeModel の応答を録画・再生するためのラッパー。
+
+- RecordingGenerativeModel: 実モデルへの呼び出しを透過的に中継し、
+  応答テキスト・usage_metadata・レイテンシを JSON に保存する
+- ReplayGenerativeModel: 保存済みの録画を、録画時のレイテンシだけ待ってから返す
+
+どちらも GenerativeModel と同じ generate_content() / generate_content_async() を持つため、
+GeminiDocumentAnalyzer(model=...) にそのまま渡せる。
+プロンプト構築・パース・ドメイン変換を含むアナライザー全体を API なしで計測できる。
+
+録画ファイル（tests/fixtures/gemini_recordings/{name}.json）:
+  {
+    "model": "gemini-2.5-pro",
+    "recorded_at": "2026-01-01T00:00:00+00:00",
+    "latency_seconds": 12.3,
+    "text": "{...Gemini の生レスポンス...}",
+    "usage_metadata": {"prompt_token_count": 1234, ...}
+  }
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_USAGE_FIELDS = ("prompt_token_count", "candidates_token_count", "total_token_count")
+
+
+@dataclass(frozen=True)
+class GeminiRecording:
+    """録画された Gemini 応答1件"""
+
+    text: str
+    latency_seconds: float = 0.0
+    usage_metadata: dict | None = None
+    model: str = ""
+    recorded_at: str = ""
+
+    @classmethod
+    def load(cls, path: Path) -> GeminiRecording:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(
+            text=data["text"],
+            latency_seconds=float(data.get("latency_seconds") or 0.0),
+            usage_metadata=data.get("usage_metadata"),
+            model=data.get("model", ""),
+            recorded_at=data.get("recorded_at", ""),
+        )
+
+    @classmethod
+    def from_response_json(cls, path: Path) -> GeminiRecording:
+        """
+        gemini_responses/ のパース済み JSON から録画を作る。
+
+        レイテンシ・usage_metadata は保存されていないため 0 / None となる。
+        """
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        return cls(text=json.dumps(raw, ensure_ascii=False))
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(
+                {
+                    "model": self.model,
+                    "recorded_at": self.recorded_at,
+                    "latency_seconds": round(self.latency_seconds, 3),
+                    "text": self.text,
+                    "usage_metadata": self.usage_metadata,
+                },
+                ensure_ascii=False,
+                indent=2,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+
+
+@dataclass(frozen=True)
+class _UsageMetadata:
+    prompt_token_count: int = 0
+    candidates_token_count: int = 0
+    total_token_count: int = 0
+
+
+@dataclass(frozen=True)
+class ReplayResponse:
+    """generate_content() の応答のうちアナライザーが参照する属性のみを持つ"""
+
+    text: str
+    usage_metadata: _UsageMetadata | None = None
+
+
+class RecordingGenerativeModel:
+    """
+    GenerativeModel をラップし、generate_content() の応答を録画する。
+
+    呼び出しごとに on_record に GeminiRecording を渡す（保存先の決定は呼び出し側）。
+    """
+
+    def __init__(
+        self,
+        model,
+        on_record: Callable[[GeminiRecording], None],
+        model_name: str = "",
+    ) -> None:
+        """
+        Args:
+            model: 初期化済みの GenerativeModel
+            on_record: 録画を受け取るコールバック
+            model_name: 録画に記録するモデル名
+        """
+        self._model = model
+        self._on_record = on_record
+        self._model_name = model_name
+
+    def generate_content(self, *args, **kwargs):
+        start = time.monotonic()
+        response = self._model.generate_content(*args, **kwargs)
+        self._on_record(self._to_recording(response, time.monotonic() - start))
+        return response
+
+    async def generate_content_async(self, *args, **kwargs):
+        start = time.monotonic()
+        response = await self._model.generate_content_async(*args, **kwargs)
+        self._on_record(self._to_recording(response, time.monotonic() - start))
+        return response
+
+    def _to_recording(self, response, latency: float) -> GeminiRecording:
+        usage = getattr(response, "usage_metadata", None)
+        return GeminiRecording(
+            text=response.text,
+            latency_seconds=latency,
+            usage_metadata=(
+                {f: int(getattr(usage, f, 0) or 0) for f in _USAGE_FIELDS}
+                if usage
+                else None
+            ),
+            model=self._model_name,
+            recorded_at=datetime.now(UTC).isoformat(timespec="seconds"),
+        )
+
+
+class ReplayGenerativeModel:
+    """
+    録画済みの応答を返す GenerativeModel 互換クラス。
+
+    複数の録画を渡した場合は呼び出しごとに順番に（末尾の次は先頭から）返す。
+    """
+
+    def __init__(
+        self,
+        recordings: list[GeminiRecording],
+        latency_scale: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Args:
+            recordings: 再生する録画（1件以上）
+            latency_scale: 録画レイテンシに掛ける倍率（0 で待たない）
+            sleep: 待機関数（テスト用に差し替え可能）
+        """
+        if not recordings:
+            raise ValueError("recordings must not be empty")
+        self._cycle = itertools.cycle(recordings)
+        self._lock = threading.Lock()
+        self._latency_scale = latency_scale
+        self._sleep = sleep
+        self.call_count = 0
+
+    @classmethod
+    def from_fixtures(
+        cls,
+        names: list[str],
+        recordings_dir: Path,
+        responses_dir: Path | None = None,
+        **kwargs,
+    ) -> ReplayGenerativeModel:
+        """
+        フィクスチャ名から録画を読み込む。
+
+        recordings_dir/{name}.json がなければ responses_dir/{name}.json
+        （レイテンシなしのパース済み JSON）にフォールバックする。
+        """
+        recordings = []
+        for name in names:
+            path = recordings_dir / f"{name}.json"
+            if path.exists():
+                recordings.append(GeminiRecording.load(path))
+            elif responses_dir is not None:
+                logger.info("No recording for %s, replaying without latency", name)
+                recordings.append(
+                    GeminiRecording.from_response_json(responses_dir / f"{name}.json")
+                )
+            else:
+                raise FileNotFoundError(path)
+        return cls(recordings, **kwargs)
+
+    def generate_content(self, *args, **kwargs) -> ReplayResponse:
+        recording = self._next()
+        if self._latency_scale > 0 and recording.latency_seconds > 0:
+            self._sleep(recording.latency_seconds * self._latency_scale)
+        return self._to_response(recording)
+
+    async def generate_content_async(self, *args, **kwargs) -> ReplayResponse:
+        """録画レイテンシの間はイベントループに制御を返す（asyncio.sleep）"""
+        recording = self._next()
+        if self._latency_scale > 0 and recording.latency_seconds > 0:
+            await asyncio.sleep(recording.latency_seconds * self._latency_scale)
+        return self._to_response(recording)
+
+    def _next(self) -> GeminiRecording:
+        with self._lock:
+            self.call_count += 1
+            return next(self._cycle)
+
+    @staticmethod
+    def _to_response(recording: GeminiRecording) -> ReplayResponse:
+        usage = (
+            _UsageMetadata(
+                **{f: int(recording.usage_metadata.get(f) or 0) for f in _USAGE_FIELDS}
+            )
+            if recording.usage_metadata
+            else None
+        )
+        return ReplayResponse(text=recording.text, usage_metadata=usage)
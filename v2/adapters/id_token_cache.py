@@ -0,0 +1,81 @@
+"""検証済み Firebase ID トークンのキャッシュ
+
+firebase_admin.auth.verify_id_token() は RSA 署名の検証とクレームの解析を行うため、
+PWA が最大1時間同じトークンを送り続けてもリクエストごとに同じ検証が走っていた。
+検証済みのクレームをトークンのダイジェスト（SHA-256）をキーとして exp まで保持し、
+検証をトークンごとに1回にする。
+
+- VerifiedTokenCache: exp 付きのクレームを LRU で保持（トークン本体は保持しない）
+- get_id_token_cache(): プロセス共有のインスタンス（ID_TOKEN_CACHE_MAX_ENTRIES=0 で無効）
+
+verify_id_token() は check_revoked=False で呼んでいるため、キャッシュしても
+失効済みトークンの扱いは変わらない（どちらも exp まで有効）。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import time
+from collections.abc import Callable
+from typing import Any
+
+from v2.adapters.ttl_cache import ProcessSingleton, TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+class VerifiedTokenCache:
+    """検証済みクレームを exp まで保持する LRU キャッシュ（キーはトークンのダイジェスト）"""
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            max_entries: 保持するトークン数の上限（超えたら最も古く使われたものを捨てる）
+            clock: 現在の UNIX 時刻（秒）を返す関数（テスト用に差し替え可能）
+        """
+        self._entries: TTLCache = TTLCache(max_entries, clock=clock)
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        """有効期限内の検証済みクレームを返す。なければ None"""
+        return self._entries.get(_digest(token))
+
+    def put(self, token: str, claims: dict[str, Any]) -> None:
+        """verify_id_token() の結果を exp まで保存する（exp のないクレームは保存しない）"""
+        exp = claims.get("exp")
+        if not isinstance(exp, int | float):
+            return
+        self._entries.put(_digest(token), claims, expires_at=exp)
+
+    def stats(self) -> dict[str, int]:
+        """ヒット・ミス件数と現在のエントリ数を返す"""
+        return self._entries.stats()
+
+
+def _build_id_token_cache() -> VerifiedTokenCache | None:
+    max_entries = int(os.environ.get("ID_TOKEN_CACHE_MAX_ENTRIES", "4096"))
+    if max_entries <= 0:
+        return None
+    logger.info("ID token cache enabled: max_entries=%d", max_entries)
+    return VerifiedTokenCache(max_entries=max_entries)
+
+
+_id_token_cache: ProcessSingleton = ProcessSingleton(_build_id_token_cache)
+
+
+def get_id_token_cache() -> VerifiedTokenCache | None:
+    """
+    プロセス共有の VerifiedTokenCache を返す。
+
+    ID_TOKEN_CACHE_MAX_ENTRIES が 0 以下の場合は None（キャッシュ無効）。
+    """
+    return _id_token_cache.get()
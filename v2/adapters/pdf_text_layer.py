@@ -0,0 +1,45 @@
+"""PDF Text Layer Extractor Adapter
+
+TextLayerExtractor ABC の pypdf 実装。
+デジタル生成された PDF に埋め込まれたテキストレイヤーをページ単位で取り出す。
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+
+from pypdf import PdfReader
+
+from v2.domain.ports import TextLayerExtractor
+
+logger = logging.getLogger(__name__)
+
+
+class PypdfTextLayerExtractor(TextLayerExtractor):
+    """
+    pypdf を使った TextLayerExtractor 実装。
+
+    PDF 以外の MIME タイプ（画像等）はテキストレイヤーを持たないため None を返す。
+    スキャン PDF のページは空文字列として返し、品質判定は呼び出し側に任せる。
+    """
+
+    def extract_pages(self, content: bytes, mime_type: str) -> list[str] | None:
+        """
+        PDF のページごとのテキストを抽出する。
+
+        Args:
+            content: ファイルのバイナリ内容
+            mime_type: MIMEタイプ
+
+        Returns:
+            ページごとのテキスト（PDF 以外・読み取り失敗時は None）
+        """
+        if mime_type != "application/pdf":
+            return None
+        try:
+            reader = PdfReader(io.BytesIO(content))
+            return [(page.extract_text() or "").strip() for page in reader.pages]
+        except Exception as e:
+            logger.info("Text layer extraction failed, using binary: %s", e)
+            return None
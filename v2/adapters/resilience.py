@@ -0,0 +1,290 @@
+"""外部 API 呼び出しの耐障害性ユーティリティ
+
+Gemini 呼び出しのテールレイテンシ対策と障害時のフェイルファストを提供する。
+
+- LatencyTracker: 直近の呼び出しレイテンシからパーセンタイルを算出
+- call_with_hedge: 一定時間応答がなければ同じ呼び出しをもう1本投げ、先に完了した方を採用
+- call_with_hedge_async: call_with_hedge の asyncio 版（負けた方はキャンセルする）
+- CircuitBreaker: エラー率が閾値を超えたら一定時間呼び出しを即時失敗させる
+
+いずれもプロセス内の状態のみを持つ（インスタンス間では共有しない）。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any
+
+from v2.domain.errors import AnalysisUnavailableError
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """直近 N 件の成功レイテンシ（秒）を保持し、パーセンタイルを返す。"""
+
+    def __init__(self, window: int = 100, min_samples: int = 20) -> None:
+        """
+        Args:
+            window: 保持するサンプル数の上限
+            min_samples: パーセンタイルを返すのに必要な最小サンプル数
+        """
+        self._samples: deque[float] = deque(maxlen=window)
+        self._min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """レイテンシを1件記録する"""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> float | None:
+        """
+        直近サンプルの pct パーセンタイル（nearest-rank 法）を返す。
+
+        サンプル数が min_samples に満たない場合は None を返す
+        （ウォームアップ中はヘッジしない）。
+        """
+        with self._lock:
+            if len(self._samples) < self._min_samples:
+                return None
+            ordered = sorted(self._samples)
+        rank = max(1, math.ceil(pct / 100 * len(ordered)))
+        return ordered[min(rank, len(ordered)) - 1]
+
+
+# call_with_hedge の実行スレッド（プロセス内で共有する）。
+# 負けた方の呼び出しは中断できず完了までスレッドを占有するため、上限を設けて溜まり続けないようにする。
+_HEDGE_MAX_WORKERS = 16
+_hedge_executor: ThreadPoolExecutor | None = None
+_hedge_executor_lock = threading.Lock()
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    """ヘッジ用の共有スレッドプールを返す（初回呼び出し時に作成）"""
+    global _hedge_executor
+    if _hedge_executor is None:
+        with _hedge_executor_lock:
+            if _hedge_executor is None:
+                _hedge_executor = ThreadPoolExecutor(
+                    max_workers=_HEDGE_MAX_WORKERS, thread_name_prefix="hedge"
+                )
+    return _hedge_executor
+
+
+def call_with_hedge(fn: Callable[[], Any], hedge_delay: float | None) -> Any:
+    """
+    fn を実行し、hedge_delay 秒以内に完了しなければ fn をもう1本並行実行する。
+
+    先に成功した方の結果を返す。両方失敗した場合は最後の例外を送出する。
+    hedge_delay が None の場合はヘッジせずに fn をそのまま呼び出す。
+
+    Note:
+        同期 HTTP 呼び出しは中断できないため、負けた方は共有スレッドプール上で
+        完了まで走り続け、結果は破棄される（まだ開始していなければ取り消す）。
+    """
+    if hedge_delay is None:
+        return fn()
+
+    executor = _get_hedge_executor()
+    primary = executor.submit(fn)
+    done, _ = wait([primary], timeout=hedge_delay)
+    if done:
+        return primary.result()
+
+    logger.info("Hedging request: no response after %.1fs", hedge_delay)
+    pending = {primary, executor.submit(fn)}
+    try:
+        last_exc: BaseException | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                exc = future.exception()
+                if exc is None:
+                    return future.result()
+                last_exc = exc
+        assert last_exc is not None
+        raise last_exc
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def call_with_hedge_async(
+    fn: Callable[[], Awaitable[Any]], hedge_delay: float | None
+) -> Any:
+    """
+    call_with_hedge() の asyncio 版。
+
+    hedge_delay 秒以内に完了しなければ fn() をもう1本並行に待ち、先に成功した方を返す。
+    スレッド版と異なり、負けた方（および呼び出し元がキャンセルされた場合は両方）を
+    キャンセルするため、不要な応答待ちは残らない。
+    """
+    if hedge_delay is None:
+        return await fn()
+
+    primary = asyncio.ensure_future(fn())
+    tasks = {primary}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        logger.info("Hedging request: no response after %.1fs", hedge_delay)
+        tasks.add(asyncio.ensure_future(fn()))
+        pending = set(tasks)
+        last_exc: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                exc = task.exception()
+                if exc is None:
+                    return task.result()
+                last_exc = exc
+        assert last_exc is not None
+        raise last_exc
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+class CircuitBreaker:
+    """
+    エラー率ベースのサーキットブレーカー。
+
+    - closed: 通常状態。直近 window_seconds の結果を記録し、
+      min_calls 件以上かつエラー率が failure_rate_threshold 以上になったら open へ
+    - open: open_seconds の間は before_call() が AnalysisUnavailableError を送出する
+    - half_open: open_seconds 経過後、試行呼び出しを1本だけ通す。
+      成功すれば closed、失敗すれば再び open へ。
+      試行がキャンセルされた場合（release_probe）は次の呼び出しを試行として通す
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        window_seconds: float = 120.0,
+        min_calls: int = 5,
+        open_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            failure_rate_threshold: open に遷移するエラー率（0.0〜1.0）
+            window_seconds: エラー率を計算する時間窓（秒）
+            min_calls: エラー率を評価する最小呼び出し数
+            open_seconds: open 状態を維持する秒数
+            clock: 単調増加する時刻関数（テスト用に差し替え可能）
+        """
+        self._threshold = failure_rate_threshold
+        self._window = window_seconds
+        self._min_calls = min_calls
+        self._open_seconds = open_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """現在の状態（cooldown 経過後の open は half_open として返す）"""
+        with self._lock:
+            if self._state == self.OPEN and self._cooldown_elapsed():
+                return self.HALF_OPEN
+            return self._state
+
+    def allows_call(self) -> bool:
+        """呼び出しが通るかを状態を変えずに判定する（事前チェック用）"""
+        return self.state != self.OPEN
+
+    def before_call(self) -> None:
+        """
+        呼び出し前に実行する。通せない場合は AnalysisUnavailableError を送出する。
+
+        Raises:
+            AnalysisUnavailableError: open 中、または half_open の試行呼び出しが実行中
+        """
+        with self._lock:
+            if self._state == self.OPEN:
+                if not self._cooldown_elapsed():
+                    raise AnalysisUnavailableError("Circuit breaker is open")
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    raise AnalysisUnavailableError("Circuit breaker probe in flight")
+                self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        """呼び出し成功を記録する"""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                logger.info("Circuit breaker closed")
+                self._state = self.CLOSED
+                self._outcomes.clear()
+                self._probe_in_flight = False
+                return
+            self._append(True)
+
+    def record_failure(self) -> None:
+        """呼び出し失敗を記録する"""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+            self._append(False)
+            if len(self._outcomes) < self._min_calls:
+                return
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if failures / len(self._outcomes) >= self._threshold:
+                self._open()
+
+    def release_probe(self) -> None:
+        """
+        結果の出なかった呼び出し（キャンセル等）の後に実行する。
+
+        half_open の試行中なら open に戻す（cooldown は経過済みのため、次の呼び出しが
+        新しい試行として通る）。closed では何も記録しない。
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._state = self.OPEN
+                self._probe_in_flight = False
+
+    # ── 内部ヘルパー（ロック取得済みで呼ぶこと） ─────────────────────────────
+
+    def _append(self, ok: bool) -> None:
+        now = self._clock()
+        self._outcomes.append((now, ok))
+        while self._outcomes and self._outcomes[0][0] < now - self._window:
+            self._outcomes.popleft()
+
+    def _open(self) -> None:
+        logger.warning(
+            "Circuit breaker opened: recent_calls=%d, open_seconds=%.0f",
+            len(self._outcomes),
+            self._open_seconds,
+        )
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+        self._probe_in_flight = False
+
+    def _cooldown_elapsed(self) -> bool:
+        return self._clock() - self._opened_at >= self._open_seconds
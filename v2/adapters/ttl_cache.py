@@ -0,0 +1,123 @@
+"""プロセス内 TTL + LRU キャッシュの共通実装
+
+DocumentReadCache（一覧の読み取り）・VerifiedTokenCache（検証済み ID トークン）・
+FamilyContextCache（FamilyContext の解決結果）が共通で使う。
+
+- TTLCache: エントリごとの有効期限を持つ LRU キャッシュとヒット・ミス件数
+- ProcessSingleton: 環境変数で有効・無効を切り替えるプロセス共有インスタンスの遅延生成
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+_UNSET = object()
+
+
+class TTLCache:
+    """
+    エントリごとに有効期限を持つ LRU キャッシュ。
+
+    有効期限は put() の expires_at（clock と同じ時間軸の時刻）で指定する。
+    省略時は ttl_seconds 後に期限切れとなる。
+    Starlette のスレッドプールや同期・非同期のリポジトリから並行に呼ばれるためロックで保護する。
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            max_entries: 保持するエントリ数の上限（超えたら最も古く使われたものを捨てる）
+            ttl_seconds: put() で expires_at を省略したときの有効期間（秒）
+            clock: 現在時刻（秒）を返す関数（テスト用に差し替え可能）
+        """
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        """有効期限内のエントリの値を返す。なければ None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any, expires_at: float | None = None) -> None:
+        """
+        エントリを保存する。
+
+        Raises:
+            ValueError: expires_at も ttl_seconds も指定されていない場合
+        """
+        if expires_at is None:
+            if self._ttl is None:
+                raise ValueError("expires_at is required when ttl_seconds is not set")
+            expires_at = self._clock() + self._ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """key のエントリを破棄する"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Any], bool]) -> None:
+        """predicate が真になるキーのエントリをすべて破棄する"""
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                del self._entries[key]
+
+    def keys(self) -> list[Hashable]:
+        """保持しているキーの一覧（期限切れを含む）を返す"""
+        with self._lock:
+            return list(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        """ヒット・ミス件数と現在のエントリ数を返す"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+            }
+
+
+class ProcessSingleton:
+    """
+    プロセス共有インスタンスを初回の get() で1回だけ生成する（ダブルチェックロック）。
+
+    build は環境変数を読んでインスタンスを返す。無効の場合は None を返し、その結果も保持する。
+    """
+
+    def __init__(self, build: Callable[[], Any]) -> None:
+        self._build = build
+        self._instance: object = _UNSET
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        if self._instance is _UNSET:
+            with self._lock:
+                if self._instance is _UNSET:
+                    self._instance = self._build()
+        return self._instance
@@ -29,3 +29,12 @@ class ActionError(SchoolAgentError):
     """アクション実行エラー（Calendar/Todoist/Slack等）"""
 
     pass
+
+
+class AnalysisUnavailableError(AnalysisError):
+    """文書解析が一時的に利用できない（サーキットブレーカー開放中等）
+
+    ドキュメントはエラーにせず pending のまま残し、後で再試行する。
+    """
+
+    pass
@@ -16,7 +16,7 @@ class Category(Enum):
     IGNORE = "IGNORE"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EventData:
     """カレンダーイベントデータ"""
 
@@ -28,7 +28,7 @@ class EventData:
     confidence: str = "HIGH"  # "HIGH" | "MEDIUM" | "LOW"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TaskData:
     """タスクデータ"""
 
@@ -81,7 +81,7 @@ class DocumentAnalysis:
     extras: DocumentExtras | None = None  # 付加情報（持ち物・費用・服装・注意事項）
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DocumentRecord:
     """B2C用ドキュメントレコード（Firestoreに永続化）"""
 
@@ -99,6 +99,31 @@ class DocumentRecord:
     created_at: datetime | None = None  # アップロード日時（後方互換のためオプショナル）
 
 
+@dataclass(frozen=True, slots=True)
+class StoredTaskData:
+    """永続化されたタスク（id と completed を含む）"""
+
+    id: str
+    title: str
+    due_date: str
+    assignee: str
+    note: str
+    completed: bool
+
+
+@dataclass(frozen=True)
+class DocumentDetail:
+    """ドキュメント詳細（アコーディオン展開用）の集約。
+
+    親ドキュメントと、そのサブコレクションのイベント・タスクをまとめて保持する。
+    """
+
+    record: DocumentRecord
+    events: list[EventData] = field(default_factory=list)
+    tasks: list[StoredTaskData] = field(default_factory=list)
+    extras: dict | None = None  # 親ドキュメントの extras フィールド（未加工）
+
+
 @dataclass(frozen=True)
 class UserProfile:
     """B2C用ユーザープロファイル（calendar_id不要）"""
@@ -137,6 +162,15 @@ class TokenUsage:
     prompt_tokens: int = 0
     candidates_tokens: int = 0
     total_tokens: int = 0
+    input_mode: str = "binary"  # "binary"（PDF/画像をそのまま送信）| "text_layer"
+
+
+@dataclass(frozen=True)
+class DocumentInput:
+    """パック解析（複数文書を1リクエストで解析）の入力1件分"""
+
+    content: bytes  # ファイルのバイナリ内容（text/plain の場合は UTF-8 テキスト）
+    mime_type: str  # 例: "application/pdf", "image/jpeg", "text/plain"
 
 
 @dataclass(frozen=True)
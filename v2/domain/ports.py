@@ -12,11 +12,15 @@ ClearBagでは全て新規実装のアダプタなので、ABCの方が適切。
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
+from datetime import datetime
 
 from v2.domain.models import (
     AnalysisResult,
     DocumentAnalysis,
+    DocumentDetail,
+    DocumentInput,
     DocumentRecord,
     EventData,
     TaskData,
@@ -38,6 +42,49 @@ class DocumentAnalyzer(ABC):
         """文書を解析して構造化データを抽出（トークン使用量含む）"""
         pass
 
+    async def analyze_async(
+        self,
+        content: bytes,
+        mime_type: str,
+        profiles: dict[str, UserProfile],
+        rules: list | None = None,
+    ) -> AnalysisResult:
+        """
+        analyze() の非同期版。
+
+        デフォルト実装は analyze() をスレッドプールで実行する。
+        ネイティブな非同期 API を持つ実装はオーバーライドすること。
+        """
+        return await asyncio.to_thread(
+            self.analyze, content, mime_type, profiles, rules
+        )
+
+    def analyze_packed(
+        self,
+        documents: list[DocumentInput],
+        profiles: dict[str, UserProfile],
+        rules: list | None = None,
+    ) -> list[AnalysisResult]:
+        """
+        複数の文書をまとめて解析する（結果は documents と同じ順序）。
+
+        デフォルト実装は analyze() を1件ずつ呼び出す。
+        1リクエストに複数文書を詰め込める実装はオーバーライドすること。
+        """
+        return [
+            self.analyze(doc.content, doc.mime_type, profiles, rules)
+            for doc in documents
+        ]
+
+
+class TextLayerExtractor(ABC):
+    """文書のテキストレイヤー抽出（pypdf 等）"""
+
+    @abstractmethod
+    def extract_pages(self, content: bytes, mime_type: str) -> list[str] | None:
+        """ページごとのテキストを返す。テキストレイヤーを持たない形式・読み取り失敗時はNone"""
+        pass
+
 
 # ─── B2C 用ポート群 ────────────────────────────────────────────────────────────
 
@@ -56,8 +103,19 @@ class DocumentRepository(ABC):
         pass
 
     @abstractmethod
-    def list(self, uid: str) -> list[DocumentRecord]:
-        """ユーザーのドキュメント一覧を取得"""
+    def list(
+        self,
+        uid: str,
+        limit: int | None = None,
+        start_after: datetime | None = None,
+        start_after_id: str | None = None,
+    ) -> list[DocumentRecord]:
+        """ユーザーのドキュメント一覧を新しい順（created_at, ドキュメント ID の降順）に取得
+
+        limit 件まで、(start_after, start_after_id) より後ろのものを返す（カーソルページング）。
+        start_after_id は created_at が同じドキュメントのタイブレーク（省略時は created_at のみ）。
+        一覧表示用のフィールドのみを読み込む実装では content_hash / storage_path は空になる。
+        """
         pass
 
     @abstractmethod
@@ -121,6 +179,25 @@ class DocumentRepository(ABC):
         """指定ドキュメントのタスク一覧を取得（サブコレクション直接アクセス）"""
         pass
 
+    def get_document_detail(self, uid: str, document_id: str) -> DocumentDetail | None:
+        """
+        ドキュメント本体・イベント・タスクをまとめて取得する。
+
+        デフォルト実装は get / list_events_by_document / list_tasks_by_document を
+        順に呼び出す。読み取りを並列化できるアダプターはオーバーライドする。
+
+        Returns:
+            DocumentDetail（ドキュメントが存在しない場合は None）
+        """
+        record = self.get(uid, document_id)
+        if record is None:
+            return None
+        return DocumentDetail(
+            record=record,
+            events=self.list_events_by_document(uid, document_id),
+            tasks=self.list_tasks_by_document(uid, document_id),
+        )
+
 
 class UserConfigRepository(ABC):
     """ユーザー個人設定の永続化（Firestore等）"""
@@ -222,9 +299,132 @@ class FamilyRepository(ABC):
 
     @abstractmethod
     def delete_family_cascade(self, family_id: str) -> None:
-        """ファミリーと全サブコレクション（members, invitations, profiles, documents（events/tasks含む））を削除"""
+        """
+        ファミリーと全サブコレクション（members, invitations, profiles, documents（events/tasks含む））を削除
+
+        Args:
+            family_id: 削除するファミリー ID
+        """
+        pass
+
+
+class AsyncDocumentRepository(ABC):
+    """DocumentRepository の非同期版（asyncio ネイティブなクライアント向け）"""
+
+    @abstractmethod
+    async def create(self, uid: str, record: DocumentRecord) -> str:
+        """ドキュメントレコードを作成。生成されたIDを返す"""
+        pass
+
+    @abstractmethod
+    async def get(self, uid: str, document_id: str) -> DocumentRecord | None:
+        """ドキュメントレコードを取得。存在しない場合はNoneを返す"""
+        pass
+
+    @abstractmethod
+    async def list(
+        self,
+        uid: str,
+        limit: int | None = None,
+        start_after: datetime | None = None,
+        start_after_id: str | None = None,
+    ) -> list[DocumentRecord]:
+        """ユーザーのドキュメント一覧を新しい順（created_at, ドキュメント ID の降順）に取得
+
+        limit 件まで、(start_after, start_after_id) より後ろのものを返す（カーソルページング）。
+        start_after_id は created_at が同じドキュメントのタイブレーク（省略時は created_at のみ）。
+        一覧表示用のフィールドのみを読み込む実装では content_hash / storage_path は空になる。
+        """
         pass
 
+    @abstractmethod
+    async def update_status(
+        self,
+        uid: str,
+        document_id: str,
+        status: str,
+        error_message: str | None = None,
+    ) -> None:
+        """ドキュメントのステータスを更新"""
+        pass
+
+    @abstractmethod
+    async def save_analysis(
+        self, uid: str, document_id: str, analysis: DocumentAnalysis
+    ) -> None:
+        """解析結果（events/tasks）をサブコレクションに保存し、documentのsummary/categoryを更新"""
+        pass
+
+    @abstractmethod
+    async def delete(self, uid: str, document_id: str) -> None:
+        """ドキュメントレコードと関連するevents/tasksを削除"""
+        pass
+
+    @abstractmethod
+    async def find_by_content_hash(
+        self, uid: str, content_hash: str
+    ) -> DocumentRecord | None:
+        """コンテンツハッシュで既存レコードを検索（冪等性チェック用）"""
+        pass
+
+    @abstractmethod
+    async def list_events(
+        self,
+        uid: str,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        profile_id: str | None = None,
+    ) -> list[EventData]:
+        """日付範囲でイベントを取得"""
+        pass
+
+    @abstractmethod
+    async def list_tasks(
+        self, uid: str, completed: bool | None = None
+    ) -> list[TaskData]:
+        """タスク一覧を取得。completedフィルターはオプション"""
+        pass
+
+    @abstractmethod
+    async def update_task_completed(
+        self, uid: str, task_id: str, completed: bool
+    ) -> bool:
+        """タスクの完了状態を更新"""
+        pass
+
+    @abstractmethod
+    async def list_events_by_document(
+        self, uid: str, document_id: str
+    ) -> list[EventData]:
+        """指定ドキュメントのイベント一覧を取得（サブコレクション直接アクセス）"""
+        pass
+
+    @abstractmethod
+    async def list_tasks_by_document(self, uid: str, document_id: str) -> list:
+        """指定ドキュメントのタスク一覧を取得（サブコレクション直接アクセス）"""
+        pass
+
+    async def get_document_detail(
+        self, uid: str, document_id: str
+    ) -> DocumentDetail | None:
+        """
+        ドキュメント本体・イベント・タスクをまとめて取得する。
+
+        デフォルト実装は get / list_events_by_document / list_tasks_by_document を
+        asyncio.gather で同時に待つ。
+
+        Returns:
+            DocumentDetail（ドキュメントが存在しない場合は None）
+        """
+        record, events, tasks = await asyncio.gather(
+            self.get(uid, document_id),
+            self.list_events_by_document(uid, document_id),
+            self.list_tasks_by_document(uid, document_id),
+        )
+        if record is None:
+            return None
+        return DocumentDetail(record=record, events=events, tasks=tasks)
+
 
 class BlobStorage(ABC):
     """バイナリファイルのアップロード・ダウンロード（GCS等）"""
@@ -21,165 +21,52 @@ Cloud Run Service として動作し、Firebase Auth で認証する。
   POST   /api/push-subscriptions
   POST   /api/push-subscriptions/unsubscribe
   DELETE /api/account
+  POST   /worker/*             ← Cloud Tasks / Cloud Scheduler（OIDC 検証）
+
+create_app() がアプリを組み立てる。APP_ROLE でプロセスの役割を選べる:
+  all（デフォルト）: API + ワーカールート（現在の単一 Cloud Run サービス）
+  api             : API のみ（ワーカーモジュールを import しない）
+  worker          : ワーカールートと /health のみ
+Vertex AI SDK など重い依存はワーカー内で初回の解析時に遅延 import するため、
+all でも API のコールドスタートでは読み込まれない。
 """
 
 from __future__ import annotations
 
-import base64
-import json
 import logging
 import os
-import time
-from collections.abc import Callable
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from starlette.responses import Response
 
-from v2.analytics import log_event
-from v2.entrypoints import worker
-from v2.entrypoints.api.routes import (
-    account,
-    auth,
-    documents,
-    events,
-    families,
-    ical,
-    profiles,
-    push_subscriptions,
-    settings,
-    tasks,
+from v2.entrypoints.api.middleware import (
+    AccessLogMiddleware,
+    UnhandledExceptionMiddleware,
 )
+from v2.entrypoints.api.warmup import install_warmup
 from v2.logging_config import setup_logging
 
 # ── ロギング初期化 ───────────────────────────────────────────────────────────
 setup_logging()
 logger = logging.getLogger(__name__)
 
-# ── FastAPI アプリ ───────────────────────────────────────────────────────────
-app = FastAPI(
-    title="ClearBag API",
-    description="学校配布物AIアシスタント ClearBag のバックエンド API",
-    version="1.0.0",
-)
-
 # ── ミドルウェア登録順の注意 ────────────────────────────────────────────────────
 # add_middleware は後から登録したものが外側になる（insert(0, ...) のため）。
-# @app.middleware デコレータは定義順に登録されるため、後に定義されたものが外側になる。
+# create_app() で AccessLogMiddleware → UnhandledExceptionMiddleware の順に登録し、
+# CORSMiddleware は _include_api_routes() で最後に登録する。
 #
 # スタック:
 #   ServerErrorMiddleware
-#     → CORSMiddleware          (後から add_middleware で最外側に配置)
-#       → _catch_unhandled_exceptions  (後定義 = 外側)
-#         → _log_access               (先定義 = 内側: HTTPException は正常レスポンスとして記録)
+#     → CORSMiddleware                  (最後に登録 = 最外側)
+#       → UnhandledExceptionMiddleware  (後登録 = 外側)
+#         → AccessLogMiddleware         (先登録 = 内側: HTTPException は正常レスポンスとして記録)
 #           → ExceptionMiddleware → Routes
 
+APP_ROLES = ("all", "api", "worker")
 
-def _extract_uid_from_bearer(request: Request) -> str | None:
-    """Authorization: Bearer <JWT> から UID を取得する（署名検証なし・ログ用途のみ）。
-
-    JWT payload を Base64url デコードするだけで、署名検証は行わない。
-    ルートの get_auth_info による full verify とは独立している。
-    """
-    auth_header = request.headers.get("Authorization", "")
-    if not auth_header.startswith("Bearer "):
-        return None
-    parts = auth_header[7:].split(".")
-    if len(parts) != 3:
-        return None
-    try:
-        payload_b64 = parts[1]
-        # Base64url のパディング補完
-        padding = 4 - len(payload_b64) % 4
-        if padding != 4:
-            payload_b64 += "=" * padding
-        payload = json.loads(base64.urlsafe_b64decode(payload_b64))
-        # Firebase JWT は "user_id" (Firebase) または "sub" (標準) に UID を格納する
-        return payload.get("user_id") or payload.get("sub")
-    except Exception:
-        return None
-
-
-@app.middleware("http")
-async def _log_access(
-    request: Request, call_next: Callable[[Request], Response]
-) -> Response:
-    """アクセスログミドルウェア（内側配置: ExceptionMiddleware より外、例外キャッチMWより内）。
-
-    /health と /worker/* は除外する。
-    """
-    start = time.monotonic()
-    response = await call_next(request)
-    path = request.url.path
-    if path == "/health" or path.startswith("/worker/"):
-        return response
-    uid = _extract_uid_from_bearer(request)
-    log_event(
-        "access_log",
-        uid=uid,
-        method=request.method,
-        path=path,
-        status_code=response.status_code,
-        response_time_ms=round((time.monotonic() - start) * 1000),
-    )
-    return response
-
-
-@app.middleware("http")
-async def _catch_unhandled_exceptions(
-    request: Request, call_next: Callable[[Request], Response]
-) -> Response:
-    try:
-        return await call_next(request)
-    except Exception as exc:
-        logger.error(
-            "Unhandled exception: %s %s - %s",
-            request.method,
-            request.url.path,
-            exc,
-            exc_info=True,
-        )
-        return JSONResponse(
-            status_code=500,
-            content={"detail": "Internal server error"},
-        )
-
-
-# ── CORS（PWA フロントエンドからのリクエストを許可） ─────────────────────────
-# CORS_ORIGINS 環境変数でカンマ区切りの追加オリジンを指定可能
-# 【後から登録 = 外側】例外ミドルウェアを内包し、全レスポンスに CORS ヘッダーを付与する
-_extra_origins = [
-    o.strip() for o in os.environ.get("CORS_ORIGINS", "").split(",") if o.strip()
-]
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=_extra_origins if _extra_origins else ["http://localhost:3000"],
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type"],
-)
-
-# ── ルーター登録 ─────────────────────────────────────────────────────────────
-_PREFIX = "/api"
-
-app.include_router(auth.router, prefix=_PREFIX)
-app.include_router(documents.router, prefix=_PREFIX)
-app.include_router(events.router, prefix=_PREFIX)
-app.include_router(tasks.router, prefix=_PREFIX)
-app.include_router(profiles.router, prefix=_PREFIX)
-app.include_router(families.router, prefix=_PREFIX)
-app.include_router(ical.router, prefix=_PREFIX)
-app.include_router(settings.router, prefix=_PREFIX)
-app.include_router(push_subscriptions.router, prefix=_PREFIX)
-app.include_router(account.router, prefix=_PREFIX)
-
-# ── Cloud Tasks ワーカールート（/worker/*）────────────────────────────────────
-# Firebase Auth なし。アプリレベルの OIDC トークン検証（verify_worker_token）で保護される。
-app.include_router(worker.router, prefix="/worker")
 
-
-@app.on_event("startup")
 async def _on_startup() -> None:
     """LOCAL_MODE 時にエミュレーター上の GCS バケットを自動作成する"""
     if os.environ.get("LOCAL_MODE"):
@@ -197,10 +84,104 @@ async def _on_startup() -> None:
             )
 
 
-@app.get("/health")
-async def health() -> dict:
-    """ヘルスチェックエンドポイント（Cloud Run の起動確認用）"""
-    return {"status": "ok"}
+async def health(request: Request) -> Response:
+    """ヘルスチェックエンドポイント（Cloud Run の起動確認用）
+
+    起動時ウォームアップ（warmup.py）が終わるまでは 503 を返す。
+    """
+    state = getattr(request.app.state, "warmup", None)
+    if state is not None and not state.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return JSONResponse(content={"status": "ok"})
+
+
+def _include_api_routes(app: FastAPI) -> None:
+    """/api/* のルーターと CORS を登録する"""
+    from v2.entrypoints.api.routes import (
+        account,
+        auth,
+        documents,
+        events,
+        families,
+        ical,
+        profiles,
+        push_subscriptions,
+        settings,
+        tasks,
+    )
+
+    # ── CORS（PWA フロントエンドからのリクエストを許可） ──────────────────────
+    # CORS_ORIGINS 環境変数でカンマ区切りの追加オリジンを指定可能
+    # 【後から登録 = 外側】例外ミドルウェアを内包し、全レスポンスに CORS ヘッダーを付与する
+    extra_origins = [
+        o.strip() for o in os.environ.get("CORS_ORIGINS", "").split(",") if o.strip()
+    ]
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=extra_origins if extra_origins else ["http://localhost:3000"],
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+        allow_headers=["Authorization", "Content-Type"],
+        expose_headers=[documents.NEXT_CURSOR_HEADER],
+    )
+
+    prefix = "/api"
+    app.include_router(auth.router, prefix=prefix)
+    app.include_router(documents.router, prefix=prefix)
+    app.include_router(events.router, prefix=prefix)
+    app.include_router(tasks.router, prefix=prefix)
+    app.include_router(profiles.router, prefix=prefix)
+    app.include_router(families.router, prefix=prefix)
+    app.include_router(ical.router, prefix=prefix)
+    app.include_router(settings.router, prefix=prefix)
+    app.include_router(push_subscriptions.router, prefix=prefix)
+    app.include_router(account.router, prefix=prefix)
+
+
+def _include_worker_routes(app: FastAPI) -> None:
+    """Cloud Tasks / Cloud Scheduler 向けのワーカールート（/worker/*）を登録する
+
+    Firebase Auth なし。アプリレベルの OIDC トークン検証（verify_worker_token）で保護される。
+    """
+    from v2.entrypoints import worker
+
+    app.include_router(worker.router, prefix="/worker")
+
+
+def create_app(role: str | None = None) -> FastAPI:
+    """
+    FastAPI アプリを組み立てる。
+
+    Args:
+        role: "all" | "api" | "worker"（省略時は APP_ROLE 環境変数、未設定なら "all"）
+
+    Raises:
+        ValueError: 未知のロールの場合
+    """
+    role = role or os.environ.get("APP_ROLE", "all")
+    if role not in APP_ROLES:
+        raise ValueError(f"Unknown APP_ROLE: {role!r} (expected one of {APP_ROLES})")
+
+    app = FastAPI(
+        title="ClearBag API",
+        description="学校配布物AIアシスタント ClearBag のバックエンド API",
+        version="1.0.0",
+    )
+    app.add_middleware(AccessLogMiddleware)
+    app.add_middleware(UnhandledExceptionMiddleware)
+
+    if role in ("all", "api"):
+        _include_api_routes(app)
+    if role in ("all", "worker"):
+        _include_worker_routes(app)
+
+    app.on_event("startup")(_on_startup)
+    install_warmup(app, role)
+    app.add_api_route("/health", health, methods=["GET"])
+
+    logger.info("ClearBag API started: role=%s", role)
+    return app
 
 
-logger.info("ClearBag API started")
+# uvicorn v2.entrypoints.api.app:app で起動されるアプリ
+app = create_app()
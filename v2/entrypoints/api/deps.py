@@ -9,24 +9,42 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass
 
 import firebase_admin
 import firebase_admin.auth as fb_auth
-from fastapi import Depends, HTTPException, status
+from fastapi import BackgroundTasks, Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from firebase_admin import credentials as fb_creds
 from google.cloud import firestore
 
+from v2.adapters.caching_repository import (
+    AsyncCachingDocumentRepository,
+    CachingDocumentRepository,
+    get_document_cache,
+)
 from v2.adapters.cloud_storage import GCSBlobStorage
 from v2.adapters.cloud_tasks_queue import CloudTasksQueue
+from v2.adapters.firestore_async_repository import AsyncFirestoreDocumentRepository
+from v2.adapters.firestore_instrumentation import (
+    new_async_firestore_client,
+    new_firestore_client,
+)
 from v2.adapters.firestore_repository import (
     FirestoreDocumentRepository,
     FirestoreFamilyRepository,
     FirestoreUserConfigRepository,
 )
 from v2.adapters.ical_renderer import ICalRenderer
+from v2.adapters.id_token_cache import get_id_token_cache
+from v2.domain.ports import AsyncDocumentRepository, DocumentRepository
+from v2.entrypoints.api.family_context_cache import (
+    get_family_context_cache,
+    invalidate_family_context,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -69,20 +87,42 @@ _bearer = HTTPBearer()
 
 
 def get_auth_info(
+    request: Request,
     creds: HTTPAuthorizationCredentials = Depends(_bearer),
 ) -> AuthInfo:
     """
     Authorization: Bearer <id_token> ヘッダーを検証して AuthInfo を返す。
 
+    検証済みのトークンは exp まで VerifiedTokenCache に保持し、再検証しない。
+    検証した uid は request.state.uid に入れ、AccessLogMiddleware が access_log に使う。
+
     Returns:
         AuthInfo（uid, email, display_name）
 
     Raises:
         HTTPException(401): トークンが無効な場合
     """
+    token = creds.credentials
+    cache = get_id_token_cache()
+    decoded = cache.get(token) if cache is not None else None
+    if decoded is None:
+        decoded = _verify_id_token(token)
+        if cache is not None:
+            cache.put(token, decoded)
+
+    request.state.uid = decoded["uid"]
+    return AuthInfo(
+        uid=decoded["uid"],
+        email=decoded.get("email", ""),
+        display_name=decoded.get("name", ""),
+    )
+
+
+def _verify_id_token(token: str) -> dict:
+    """ID トークンの署名とクレームを検証する。無効なら HTTPException(401)"""
     _get_firebase_app()
     try:
-        decoded = fb_auth.verify_id_token(creds.credentials)
+        return fb_auth.verify_id_token(token)
     except Exception as e:
         logger.warning("Invalid Firebase ID token: %s", e)
         raise HTTPException(
@@ -90,12 +130,6 @@ def get_auth_info(
             detail="Invalid or expired Firebase ID token",
         ) from e
 
-    return AuthInfo(
-        uid=decoded["uid"],
-        email=decoded.get("email", ""),
-        display_name=decoded.get("name", ""),
-    )
-
 
 def get_current_uid(
     auth_info: AuthInfo = Depends(get_auth_info),
@@ -120,6 +154,7 @@ class FamilyContext:
 
 
 def get_family_context(
+    background_tasks: BackgroundTasks,
     auth_info: AuthInfo = Depends(get_auth_info),
 ) -> FamilyContext:
     """
@@ -127,10 +162,34 @@ def get_family_context(
 
     users/{uid} に family_id が未設定の場合、自動的に1人ファミリーを作成する。
     また users/{uid} に email/display_name が未設定の場合、JWT claims から同期する。
+    この同期とメンバースナップショットの書き戻しはレスポンス後の BackgroundTasks で行い、
+    読み取りだけのリクエストが書き込みを待たないようにする。
+
+    ロールは users/{uid}.member（メンバードキュメントの非正規化スナップショット）から
+    読むため、通常は users/{uid} の1回の読み取りで解決する。スナップショットがない・
+    別ファミリーのものの場合のみメンバードキュメントを読み、スナップショットを書き戻す。
+
+    解決結果は FamilyContextCache に TTL の間保持し、その間は Firestore を読まない
+    （未アクティベートの 403 はキャッシュしない）。
 
     Returns:
         FamilyContext（uid, family_id, role）
     """
+    cache = get_family_context_cache()
+    if cache is not None:
+        ctx = cache.get(auth_info.uid)
+        if ctx is not None:
+            return ctx
+    ctx = _resolve_family_context(auth_info, background_tasks)
+    if cache is not None:
+        cache.put(auth_info.uid, ctx)
+    return ctx
+
+
+def _resolve_family_context(
+    auth_info: AuthInfo, background_tasks: BackgroundTasks
+) -> FamilyContext:
+    """Firestore から FamilyContext を解決する（get_family_context の本体）"""
     uid = auth_info.uid
     db = _get_firestore_client()
     user_repo = FirestoreUserConfigRepository(db)
@@ -153,14 +212,13 @@ def get_family_context(
     family_id = user_data.get("family_id")
 
     # JWT から display_name/email を同期（空の場合のみ）
-    updates: dict = {}
+    # users/{uid} への書き込みは最後に1回にまとめる（ファミリー自動作成時以外はバックグラウンド）
+    user_updates: dict = {}
     if not user_data.get("email") and auth_info.email:
-        updates["email"] = auth_info.email
+        user_updates["email"] = auth_info.email
     if not user_data.get("display_name") and auth_info.display_name:
-        updates["display_name"] = auth_info.display_name
-    if updates:
-        user_repo.update_user(uid, updates)
-        user_data = {**user_data, **updates}
+        user_updates["display_name"] = auth_info.display_name
+    user_data = {**user_data, **user_updates}
 
     if not family_id:
         # 初回アクセス時: 1人ファミリーを自動作成
@@ -182,43 +240,133 @@ def get_family_context(
             display_name=display_name,
             email=email,
         )
-        user_repo.update_user(uid, {"family_id": family_id})
+        user_updates["family_id"] = family_id
+        user_updates[_MEMBER_SNAPSHOT] = _member_snapshot(
+            family_id, {"role": "owner", "email": email, "display_name": display_name}
+        )
+        user_repo.update_user(uid, user_updates)
         logger.info("Auto-created family: uid=%s, family_id=%s", uid, family_id)
-
-    member_data = family_repo.get_member(family_id, uid)
-    role = (member_data or {}).get("role") or "member"
+        return FamilyContext(uid=uid, family_id=family_id, role="owner")
+
+    # users/{uid} のメンバースナップショットがこのファミリーのものなら
+    # メンバードキュメントを読まずにロールを決める（1往復で解決）
+    member = user_data.get(_MEMBER_SNAPSHOT) or {}
+    if member.get("family_id") != family_id:
+        # スナップショット導入前のユーザー・ファミリー移動直後: メンバードキュメントから補完
+        member_data = family_repo.get_member(family_id, uid)
+        if member_data is None:
+            _schedule_profile_sync(
+                background_tasks, user_repo, family_repo, uid, family_id, user_updates
+            )
+            return FamilyContext(uid=uid, family_id=family_id, role="member")
+        member = _member_snapshot(family_id, member_data)
+        user_updates[_MEMBER_SNAPSHOT] = member
+    role = member.get("role") or "member"
 
     # member エントリの email/display_name が空なら user_data の値で補完
     # users/{uid} が先に同期済みでも member エントリが空のケースをカバー
-    if member_data:
-        email = user_data.get("email", "")
-        display_name = user_data.get("display_name", "")
-        member_updates: dict = {}
-        if not member_data.get("email") and email:
-            member_updates["email"] = email
-        if not member_data.get("display_name") and display_name:
-            member_updates["display_name"] = display_name
-        if member_updates:
-            family_repo.update_member(family_id, uid, member_updates)
-
+    email = user_data.get("email", "")
+    display_name = user_data.get("display_name", "")
+    member_updates: dict = {}
+    if not member.get("email") and email:
+        member_updates["email"] = email
+    if not member.get("display_name") and display_name:
+        member_updates["display_name"] = display_name
+    if member_updates:
+        user_updates[_MEMBER_SNAPSHOT] = {**member, **member_updates}
+
+    _schedule_profile_sync(
+        background_tasks,
+        user_repo,
+        family_repo,
+        uid,
+        family_id,
+        user_updates,
+        member_updates,
+    )
     return FamilyContext(uid=uid, family_id=family_id, role=role)
 
 
-def require_owner(
-    ctx: FamilyContext = Depends(get_family_context),
-) -> FamilyContext:
+# users/{uid} に非正規化するメンバー情報のフィールド名
+_MEMBER_SNAPSHOT = "member"
+
+# プロフィール同期を実行待ち・実行中の uid（LRU）。書き込みが反映される前の
+# 後続リクエストが同じ同期を重ねてスケジュールしないためのマーカー
+_PROFILE_SYNC_MARKER_MAX = 4096
+_profile_sync_scheduled: OrderedDict[str, None] = OrderedDict()
+_profile_sync_lock = threading.Lock()
+
+
+def _schedule_profile_sync(
+    background_tasks: BackgroundTasks,
+    user_repo: FirestoreUserConfigRepository,
+    family_repo: FirestoreFamilyRepository,
+    uid: str,
+    family_id: str,
+    user_updates: dict,
+    member_updates: dict | None = None,
+) -> None:
+    """users/{uid} とメンバーへの同期書き込みをレスポンス後に実行するよう登録する"""
+    if not user_updates and not member_updates:
+        return
+    with _profile_sync_lock:
+        if uid in _profile_sync_scheduled:
+            return
+        _profile_sync_scheduled[uid] = None
+        while len(_profile_sync_scheduled) > _PROFILE_SYNC_MARKER_MAX:
+            _profile_sync_scheduled.popitem(last=False)
+    background_tasks.add_task(
+        _sync_profile,
+        user_repo,
+        family_repo,
+        uid,
+        family_id,
+        user_updates,
+        member_updates or {},
+    )
+
+
+def _sync_profile(
+    user_repo: FirestoreUserConfigRepository,
+    family_repo: FirestoreFamilyRepository,
+    uid: str,
+    family_id: str,
+    user_updates: dict,
+    member_updates: dict,
+) -> None:
+    """JWT claims 由来のプロフィールとメンバースナップショットを書き込む（BackgroundTasks）"""
+    try:
+        if member_updates:
+            family_repo.update_member(family_id, uid, member_updates)
+        if user_updates:
+            user_repo.update_user(uid, user_updates)
+    except Exception:
+        # 失敗しても次のキャッシュミスで再試行される
+        logger.warning("Profile sync failed: uid=%s", uid, exc_info=True)
+    finally:
+        with _profile_sync_lock:
+            _profile_sync_scheduled.pop(uid, None)
+
+
+def _member_snapshot(family_id: str, member_data: dict) -> dict:
+    """families/{family_id}/members/{uid} のうち FamilyContext の解決に使う項目"""
+    return {
+        "family_id": family_id,
+        "role": member_data.get("role") or "member",
+        "email": member_data.get("email") or "",
+        "display_name": member_data.get("display_name") or "",
+    }
+
+
+def member_snapshot_update(family_id: str, member_data: dict) -> dict:
     """
-    オーナー権限を要求する依存関数。
+    users/{uid} に書くメンバースナップショットの更新内容を返す。
 
-    Raises:
-        HTTPException(403): ロールが "owner" でない場合
+    メンバーの追加・ロール変更で users/{uid} を更新する箇所は、これを同じ update_user に
+    含めてスナップショットを書き直すこと（同じファミリー内のロール変更は
+    get_family_context() では検知できない）。
     """
-    if ctx.role != "owner":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="この操作にはオーナー権限が必要です。",
-        )
-    return ctx
+    return {_MEMBER_SNAPSHOT: _member_snapshot(family_id, member_data)}
 
 
 # ── Firestore クライアント（シングルトン） ──────────────────────────────────────
@@ -229,17 +377,36 @@ _firestore_client: firestore.Client | None = None
 def _get_firestore_client() -> firestore.Client:
     global _firestore_client
     if _firestore_client is None:
-        _firestore_client = firestore.Client()
+        # リクエストごとの読み取り・書き込み件数を access_log に載せるため計測付きで作る
+        _firestore_client = new_firestore_client()
         logger.info("Firestore client initialized")
     return _firestore_client
 
 
+_async_firestore_client: firestore.AsyncClient | None = None
+
+
+def _get_async_firestore_client() -> firestore.AsyncClient:
+    """
+    読み取り系の async ルート用 AsyncClient を返す。
+
+    get_family_context などの同期依存は引き続き同期 Client を使う。
+    """
+    global _async_firestore_client
+    if _async_firestore_client is None:
+        _async_firestore_client = new_async_firestore_client()
+        logger.info("Firestore async client initialized")
+    return _async_firestore_client
+
+
 # ── リポジトリ依存 ─────────────────────────────────────────────────────────────
 
 
-def get_document_repo() -> FirestoreDocumentRepository:
-    """DocumentRepository を返す依存関数"""
-    return FirestoreDocumentRepository(_get_firestore_client())
+def get_document_repo() -> DocumentRepository:
+    """DocumentRepository を返す依存関数（DOCUMENT_CACHE_TTL_SECONDS > 0 ならキャッシュ付き）"""
+    repo = FirestoreDocumentRepository(_get_firestore_client())
+    cache = get_document_cache()
+    return CachingDocumentRepository(repo, cache) if cache is not None else repo
 
 
 def get_user_config_repo() -> FirestoreUserConfigRepository:
@@ -252,27 +419,142 @@ def get_family_repo() -> FirestoreFamilyRepository:
     return FirestoreFamilyRepository(_get_firestore_client())
 
 
+def get_async_document_repo() -> AsyncDocumentRepository:
+    """AsyncDocumentRepository を返す依存関数（同期版とキャッシュを共有する）"""
+    repo = AsyncFirestoreDocumentRepository(_get_async_firestore_client())
+    cache = get_document_cache()
+    return AsyncCachingDocumentRepository(repo, cache) if cache is not None else repo
+
+
+# ── 権限チェック ──────────────────────────────────────────────────────────────
+
+
+def _verify_membership(
+    ctx: FamilyContext,
+    family_repo: FirestoreFamilyRepository,
+    user_repo: FirestoreUserConfigRepository,
+) -> FamilyContext:
+    """
+    メンバードキュメントを読み直し、所属とロールを確認した FamilyContext を返す。
+
+    ctx はスナップショット・キャッシュ由来で、別インスタンスでの削除・ロール変更を
+    最大 FAMILY_CONTEXT_CACHE_TTL_SECONDS 秒反映しない。食い違っていればスナップショットを
+    書き直し、キャッシュを破棄する。
+
+    Raises:
+        HTTPException(403): メンバードキュメントがない（ファミリーから削除された）場合
+    """
+    member_data = family_repo.get_member(ctx.family_id, ctx.uid)
+    if member_data is None:
+        logger.info(
+            "Stale family context: uid=%s, family_id=%s, member not found",
+            ctx.uid,
+            ctx.family_id,
+        )
+        invalidate_family_context(ctx.uid)
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="ファミリーのメンバーではありません。",
+        )
+    role = member_data.get("role") or "member"
+    if role != ctx.role:
+        logger.info(
+            "Stale member snapshot: uid=%s, family_id=%s, cached=%s, actual=%s",
+            ctx.uid,
+            ctx.family_id,
+            ctx.role,
+            role,
+        )
+        user_repo.update_user(
+            ctx.uid, member_snapshot_update(ctx.family_id, member_data)
+        )
+        invalidate_family_context(ctx.uid)
+    return FamilyContext(uid=ctx.uid, family_id=ctx.family_id, role=role)
+
+
+def require_member(
+    ctx: FamilyContext = Depends(get_family_context),
+    family_repo: FirestoreFamilyRepository = Depends(get_family_repo),
+    user_repo: FirestoreUserConfigRepository = Depends(get_user_config_repo),
+) -> FamilyContext:
+    """
+    ファミリーへの所属をメンバードキュメントで確認する依存関数。
+
+    メンバー管理の操作（一覧など）で、別インスタンスで削除されたメンバーを
+    キャッシュの TTL を待たずに拒否する。
+
+    Raises:
+        HTTPException(403): ファミリーから削除されている場合
+    """
+    return _verify_membership(ctx, family_repo, user_repo)
+
+
+def require_owner(
+    ctx: FamilyContext = Depends(get_family_context),
+    family_repo: FirestoreFamilyRepository = Depends(get_family_repo),
+    user_repo: FirestoreUserConfigRepository = Depends(get_user_config_repo),
+) -> FamilyContext:
+    """
+    オーナー権限を要求する依存関数。
+
+    ctx.role はスナップショット・キャッシュ由来で古い可能性があるため、
+    オーナー限定の操作ではメンバードキュメントのロールで判定する。
+
+    Raises:
+        HTTPException(403): ファミリーから削除されている、またはロールが "owner" でない場合
+    """
+    ctx = _verify_membership(ctx, family_repo, user_repo)
+    if ctx.role != "owner":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="この操作にはオーナー権限が必要です。",
+        )
+    return ctx
+
+
+# ── GCS / Cloud Tasks クライアント（シングルトン） ──────────────────────────────
+# storage.Client は HTTP コネクションプール、CloudTasksClient は gRPC チャネルを持つため、
+# リクエストごとに作ると接続と TLS ハンドシェイクをやり直すことになる。
+# 環境変数の読み込みも初回の1回だけ行う。
+
+_blob_storage: GCSBlobStorage | None = None
+_task_queue: CloudTasksQueue | None = None
+_clients_lock = threading.Lock()
+
+
 def get_blob_storage() -> GCSBlobStorage:
-    """BlobStorage を返す依存関数"""
-    bucket = os.environ["GCS_BUCKET_NAME"]
-    return GCSBlobStorage(bucket_name=bucket)
+    """BlobStorage を返す依存関数（プロセスで1つのインスタンスを共有する）"""
+    global _blob_storage
+    if _blob_storage is None:
+        with _clients_lock:
+            if _blob_storage is None:
+                bucket = os.environ["GCS_BUCKET_NAME"]
+                _blob_storage = GCSBlobStorage(bucket_name=bucket)
+                logger.info("GCS client initialized: bucket=%s", bucket)
+    return _blob_storage
 
 
 def get_task_queue() -> CloudTasksQueue | None:
     """
-    TaskQueue を返す依存関数。
+    TaskQueue を返す依存関数（プロセスで1つのインスタンスを共有する）。
 
     LOCAL_MODE=true の場合は None を返す（BackgroundTasks で代替）。
     """
+    global _task_queue
     if os.environ.get("LOCAL_MODE"):
         return None  # type: ignore[return-value]
-    return CloudTasksQueue(
-        project_id=os.environ["PROJECT_ID"],
-        location=os.environ.get("CLOUD_TASKS_LOCATION", "asia-northeast1"),
-        queue_name=os.environ["CLOUD_TASKS_QUEUE"],
-        worker_url=os.environ["WORKER_URL"],
-        service_account_email=os.environ["SERVICE_ACCOUNT_EMAIL"],
-    )
+    if _task_queue is None:
+        with _clients_lock:
+            if _task_queue is None:
+                _task_queue = CloudTasksQueue(
+                    project_id=os.environ["PROJECT_ID"],
+                    location=os.environ.get("CLOUD_TASKS_LOCATION", "asia-northeast1"),
+                    queue_name=os.environ["CLOUD_TASKS_QUEUE"],
+                    worker_url=os.environ["WORKER_URL"],
+                    service_account_email=os.environ["SERVICE_ACCOUNT_EMAIL"],
+                )
+                logger.info("Cloud Tasks client initialized")
+    return _task_queue
 
 
 def get_ical_renderer() -> ICalRenderer:
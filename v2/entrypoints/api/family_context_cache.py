@@ -0,0 +1,94 @@
+"""FamilyContext の解決結果のプロセス内キャッシュ
+
+get_family_context() は認証付きの全 API 呼び出しで users/{uid} とメンバー
+ドキュメントを読む（ルート処理の前に最低2往復）。解決済みの FamilyContext を
+uid ごとに TTL + LRU で保持し、定常状態のリクエストではこれらの読み取りを省く。
+
+ファミリー所属・ロール・アクティベーションを変える処理
+（join_family / remove_member / アカウント削除 / 招待コード登録）は
+invalidate_family_context() で該当 uid のエントリを破棄する。
+別インスタンスや scripts/ による変更は検知できないため、反映は最大 TTL 秒遅れる
+（その間は削除されたメンバーも元のロールで通る）。そのため TTL は短く（デフォルト 5 秒）保ち、
+メンバー管理とオーナー限定の操作は require_member / require_owner でメンバードキュメントを読み直す。
+FAMILY_CONTEXT_CACHE_TTL_SECONDS が 0 の場合はキャッシュしない。
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from v2.adapters.ttl_cache import ProcessSingleton, TTLCache
+
+if TYPE_CHECKING:
+    from v2.entrypoints.api.deps import FamilyContext
+
+logger = logging.getLogger(__name__)
+
+
+class FamilyContextCache:
+    """uid → FamilyContext の TTL + LRU キャッシュ（スレッドセーフ）"""
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int = 4096,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            ttl_seconds: エントリの有効期間（秒）
+            max_entries: 保持する uid 数の上限（超えたら最も古く使われたものを捨てる）
+            clock: 現在時刻（秒）を返す関数（テスト用に差し替え可能）
+        """
+        self._entries: TTLCache = TTLCache(
+            max_entries, ttl_seconds=ttl_seconds, clock=clock
+        )
+
+    def get(self, uid: str) -> FamilyContext | None:
+        """有効なエントリの FamilyContext を返す。なければ None"""
+        return self._entries.get(uid)
+
+    def put(self, uid: str, ctx: FamilyContext) -> None:
+        self._entries.put(uid, ctx)
+
+    def invalidate(self, uid: str) -> None:
+        """uid のエントリを破棄する"""
+        self._entries.invalidate(uid)
+
+    def stats(self) -> dict[str, int]:
+        """ヒット・ミス件数と現在のエントリ数を返す"""
+        return self._entries.stats()
+
+
+def _build_family_context_cache() -> FamilyContextCache | None:
+    ttl = float(os.environ.get("FAMILY_CONTEXT_CACHE_TTL_SECONDS", "5"))
+    if ttl <= 0:
+        return None
+    logger.info("Family context cache enabled: ttl=%.1fs", ttl)
+    return FamilyContextCache(
+        ttl_seconds=ttl,
+        max_entries=int(os.environ.get("FAMILY_CONTEXT_CACHE_MAX_ENTRIES", "4096")),
+    )
+
+
+_family_context_cache: ProcessSingleton = ProcessSingleton(_build_family_context_cache)
+
+
+def get_family_context_cache() -> FamilyContextCache | None:
+    """
+    プロセス共有の FamilyContextCache を返す。
+
+    FAMILY_CONTEXT_CACHE_TTL_SECONDS が 0 以下の場合は None（キャッシュ無効）。
+    """
+    return _family_context_cache.get()
+
+
+def invalidate_family_context(uid: str) -> None:
+    """uid の FamilyContext キャッシュを破棄する（キャッシュ無効時は何もしない）"""
+    cache = get_family_context_cache()
+    if cache is not None:
+        cache.invalidate(uid)
@@ -0,0 +1,40 @@
+"""一覧 API 向けの高速 JSON レスポンス
+
+response_model 付きのルートでは、要素ごとに Pydantic モデルを作り、FastAPI がそれを
+response_model で再検証し jsonable_encoder で dict に戻してから JSON 化する。
+数千件のイベント・タスクを返すファミリーではこれがリクエストの CPU の大半を占める。
+
+FastJSONResponse はドメインの dataclass（slots 付き）やその dict をそのまま bytes に
+直列化する。ルートから Response を返すと FastAPI は response_model の検証を行わないため、
+response_model は OpenAPI スキーマ用として残し、レスポンスの形（null を含まないことも）は
+テストで固定する（tests/unit/test_json_response.py）。
+
+直列化は orjson で行う。dataclass（slots 付きを含む）を中間の dict を作らずに直接書き出し、
+出力は Starlette の JSONResponse と同じ（区切り文字なし・非 ASCII はそのまま）。
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from starlette.responses import Response
+
+
+def dumps(content: Any) -> bytes:
+    """
+    content を JSON の bytes にする（dataclass はフィールドの object として出力）。
+
+    Raises:
+        TypeError: 直列化できない値を含む場合（orjson.JSONEncodeError は TypeError のサブクラス）
+    """
+    return orjson.dumps(content)
+
+
+class FastJSONResponse(Response):
+    """dumps() で直列化する JSON レスポンス"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
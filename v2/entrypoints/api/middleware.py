@@ -0,0 +1,130 @@
+"""API の ASGI ミドルウェア
+
+app.middleware("http") の関数ミドルウェアは Starlette の BaseHTTPMiddleware で包まれ、
+リクエストごとに call_next 用のタスクとレスポンスボディ中継のストリームが作られる。
+ここでは同じ処理を ASGI の (scope, receive, send) を直接扱う形で実装し、その分の
+オーバーヘッドを省く。
+
+- AccessLogMiddleware: access_log（Firestore 件数付き）の出力
+- UnhandledExceptionMiddleware: 未処理例外を 500 JSON にする
+
+access_log の uid はルートの認証依存（get_auth_info）が検証後に request.state.uid へ
+入れた値を使う。JWT をミドルウェアで改めてデコードしない。
+認証のないルート・認証に失敗したリクエストでは None になる。
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from v2.adapters.firestore_instrumentation import firestore_request_stats
+from v2.analytics import log_event
+
+logger = logging.getLogger(__name__)
+
+# access_log を出さないパス
+_UNLOGGED_PATH = "/health"
+_UNLOGGED_PREFIX = "/worker/"
+
+
+class AccessLogMiddleware:
+    """
+    アクセスログミドルウェア（ExceptionMiddleware より外、UnhandledExceptionMiddleware より内）。
+
+    /health と /worker/* は除外する。
+    リクエスト中の Firestore 読み取り・書き込み件数、クエリ数、RPC 時間も記録する。
+    応答時間と Firestore 件数はレスポンス本文の最後のメッセージを送る時点で確定させ、
+    その後に走る BackgroundTasks（プロフィール同期など）は含めない。
+    ルートで未処理例外が発生した場合は status_code=500 として記録し、例外は外側へ送る。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.monotonic()
+        status_code = 500
+        # レスポンス本文を送り終えた時点の応答時間と Firestore 件数
+        measured: dict[str, int] = {}
+
+        def measure() -> dict[str, int]:
+            return {
+                "response_time_ms": round((time.monotonic() - start) * 1000),
+                **firestore_stats.as_log_fields(),
+            }
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                # BackgroundTasks とクライアントへの送信待ちを含めない
+                measured.update(measure())
+            await send(message)
+
+        with firestore_request_stats() as firestore_stats:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                path = scope["path"]
+                if path != _UNLOGGED_PATH and not path.startswith(_UNLOGGED_PREFIX):
+                    log_event(
+                        "access_log",
+                        uid=scope.get("state", {}).get("uid"),
+                        method=scope["method"],
+                        path=path,
+                        status_code=status_code,
+                        **(measured or measure()),
+                    )
+
+
+class UnhandledExceptionMiddleware:
+    """ルートの未処理例外をログに残し、500 JSON レスポンスを返す
+
+    CORSMiddleware の内側に置くことで、500 レスポンスにも CORS ヘッダーが付く。
+    レスポンス送信開始後の例外はレスポンスを差し替えられないため、そのまま外側へ送る。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_tracking_start(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_tracking_start)
+        except Exception as exc:
+            logger.error(
+                "Unhandled exception: %s %s - %s",
+                scope["method"],
+                scope["path"],
+                exc,
+                exc_info=True,
+            )
+            if response_started:
+                raise
+            response = JSONResponse(
+                status_code=500,
+                content={"detail": "Internal server error"},
+            )
+            await response(scope, receive, send)
@@ -22,6 +22,7 @@ from v2.entrypoints.api.deps import (
     get_family_repo,
     get_user_config_repo,
 )
+from v2.entrypoints.api.family_context_cache import invalidate_family_context
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/account", tags=["account"])
@@ -62,6 +63,7 @@ def delete_account(
 
     # users/{uid} 削除
     user_repo.delete_user(uid)
+    invalidate_family_context(uid)
     # Firebase Auth アカウント削除
     try:
         fb_auth.delete_user(uid)
@@ -14,6 +14,7 @@ from google.cloud import firestore
 from pydantic import BaseModel
 
 from v2.entrypoints.api.deps import AuthInfo, _get_firestore_client, get_auth_info
+from v2.entrypoints.api.family_context_cache import invalidate_family_context
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -107,6 +108,7 @@ def register_with_code(
 
     transaction = db.transaction()
     _activate(transaction)
+    invalidate_family_context(auth_info.uid)
 
     # Custom Claims を設定 — 次回 JWT 取得時にフロントエンドが API 呼び出し不要で
     # is_activated を確認できるようにする（Cold Start 回避）
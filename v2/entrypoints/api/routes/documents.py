@@ -1,46 +1,49 @@
 """ドキュメント API ルート
 
 POST /api/documents/upload  → 202 { id, status }
-GET  /api/documents          → 200 [DocumentRecord...]
+GET  /api/documents          → 200 [DocumentRecord...]（?limit=&cursor= でページング、既定 50 件）
 GET  /api/documents/{id}     → 200 DocumentRecord
 DELETE /api/documents/{id}   → 204
 """
 
 from __future__ import annotations
 
+import base64
 import hashlib
 import io
 import logging
 import os
 import uuid
+from datetime import UTC, datetime
 
 from fastapi import (
     APIRouter,
     BackgroundTasks,
     Depends,
     HTTPException,
+    Query,
+    Response,
     UploadFile,
     status,
 )
 from pydantic import BaseModel
-from pypdf import PdfReader
 
 from v2.adapters.cloud_storage import GCSBlobStorage
 from v2.adapters.cloud_tasks_queue import CloudTasksQueue
-from v2.adapters.firestore_repository import (
-    FirestoreDocumentRepository,
-    FirestoreFamilyRepository,
-)
+from v2.adapters.firestore_repository import FirestoreFamilyRepository
 from v2.analytics import log_event
 from v2.domain.models import DocumentRecord
+from v2.domain.ports import AsyncDocumentRepository, DocumentRepository
 from v2.entrypoints.api.deps import (
     FamilyContext,
+    get_async_document_repo,
     get_blob_storage,
     get_document_repo,
     get_family_context,
     get_family_repo,
     get_task_queue,
 )
+from v2.entrypoints.api.json_response import FastJSONResponse
 from v2.entrypoints.api.routes.events import EventResponse
 from v2.entrypoints.api.routes.tasks import TaskResponse
 from v2.entrypoints.api.usage import ensure_monthly_reset
@@ -52,6 +55,10 @@ _FREE_PLAN_LIMIT = 20  # 月間解析枚数上限
 _MAX_UPLOAD_SIZE_MB = int(os.environ.get("MAX_UPLOAD_SIZE_MB", "10"))
 _MAX_UPLOAD_SIZE_BYTES = _MAX_UPLOAD_SIZE_MB * 1024 * 1024
 _MAX_PDF_PAGES = int(os.environ.get("MAX_PDF_PAGES", "3"))
+_DEFAULT_LIST_LIMIT = 50  # 一覧 API の1ページあたり件数（limit 省略時）
+_MAX_LIST_LIMIT = 100  # 一覧 API の1ページあたり最大件数
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+_CURSOR_SEP = "|"  # カーソル内の created_at とドキュメント ID の区切り
 
 
 class UploadResponse(BaseModel):
@@ -101,6 +108,21 @@ class DocumentUrlResponse(BaseModel):
     filename: str
 
 
+def _to_row(record: DocumentRecord) -> dict:
+    """DocumentResponse と同じ形の dict（一覧の FastJSONResponse 用）"""
+    return {
+        "id": record.id,
+        "status": record.status,
+        "original_filename": record.original_filename,
+        "mime_type": record.mime_type,
+        "summary": record.summary,
+        "category": record.category,
+        "archive_filename": record.archive_filename or "",
+        "error_message": record.error_message,
+        "created_at": record.created_at.isoformat() if record.created_at else None,
+    }
+
+
 def _to_response(record: DocumentRecord) -> DocumentResponse:
     return DocumentResponse(
         id=record.id,
@@ -122,7 +144,7 @@ def upload_document(
     file: UploadFile,
     background_tasks: BackgroundTasks,
     ctx: FamilyContext = Depends(get_family_context),
-    doc_repo: FirestoreDocumentRepository = Depends(get_document_repo),
+    doc_repo: DocumentRepository = Depends(get_document_repo),
     family_repo: FirestoreFamilyRepository = Depends(get_family_repo),
     storage: GCSBlobStorage = Depends(get_blob_storage),
     queue: CloudTasksQueue = Depends(get_task_queue),
@@ -182,6 +204,9 @@ def upload_document(
     # ── PDF ページ数チェック ───────────────────────────────────────────────
     num_pages: int | None = None
     if mime_type == "application/pdf":
+        # pypdf は PDF アップロード時にだけ必要なため遅延 import する
+        from pypdf import PdfReader
+
         try:
             reader = PdfReader(io.BytesIO(content))
             num_pages = len(reader.pages)
@@ -261,24 +286,88 @@ def upload_document(
     return UploadResponse(id=document_id, status="pending")
 
 
+def _encode_cursor(created_at: datetime, document_id: str) -> str:
+    """
+    一覧のカーソル（created_at とタイブレーク用のドキュメント ID）を不透明な文字列にする。
+
+    ISO 8601 の "+" や ":" がクエリ文字列でエスケープ漏れしないよう、URL セーフな
+    Base64（パディングなし）にする。
+    """
+    raw = f"{created_at.isoformat()}{_CURSOR_SEP}{document_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """
+    X-Next-Cursor の値を (created_at, ドキュメント ID) に戻す。
+
+    Raises:
+        HTTPException(400): 形式が不正な場合
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, _, document_id = raw.partition(_CURSOR_SEP)
+        start_after = datetime.fromisoformat(created_at)
+    except ValueError as e:  # binascii.Error / UnicodeDecodeError を含む
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        ) from e
+    if not document_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    if start_after.tzinfo is None:
+        start_after = start_after.replace(tzinfo=UTC)
+    return start_after, document_id
+
+
 @router.get("", response_model=list[DocumentResponse])
-def list_documents(
+async def list_documents(
+    limit: int = Query(default=_DEFAULT_LIST_LIMIT, ge=1, le=_MAX_LIST_LIMIT),
+    cursor: str | None = None,
     ctx: FamilyContext = Depends(get_family_context),
-    doc_repo: FirestoreDocumentRepository = Depends(get_document_repo),
-) -> list[DocumentResponse]:
-    """ファミリーのドキュメント一覧を返す（新しい順）"""
-    records = doc_repo.list(ctx.family_id)
-    return [_to_response(r) for r in records]
+    doc_repo: AsyncDocumentRepository = Depends(get_async_document_repo),
+) -> Response:
+    """
+    ファミリーのドキュメント一覧を返す（新しい順）。
+
+    クエリパラメータ:
+        limit: 1ページの最大件数（省略時は _DEFAULT_LIST_LIMIT 件）
+        cursor: 前ページのレスポンスヘッダー X-Next-Cursor の値（不透明な文字列）
+
+    続きがある場合はレスポンスヘッダー X-Next-Cursor に次ページのカーソル
+    （最後の要素の created_at とドキュメント ID を Base64 にしたもの）を返す。
+    created_at が同じドキュメントはドキュメント ID の降順で並べ、ID でページ境界を決める。
+    """
+    start_after: datetime | None = None
+    start_after_id: str | None = None
+    if cursor:
+        start_after, start_after_id = _decode_cursor(cursor)
+
+    # 1件多く取得して次ページの有無を判定する
+    records = await doc_repo.list(
+        ctx.family_id,
+        limit=limit + 1,
+        start_after=start_after,
+        start_after_id=start_after_id,
+    )
+    headers = {}
+    if len(records) > limit:
+        records = records[:limit]
+        last = records[-1]
+        if last.created_at is not None:
+            headers[NEXT_CURSOR_HEADER] = _encode_cursor(last.created_at, last.id)
+    return FastJSONResponse([_to_row(r) for r in records], headers=headers)
 
 
 @router.get("/{document_id}", response_model=DocumentResponse)
-def get_document(
+async def get_document(
     document_id: str,
     ctx: FamilyContext = Depends(get_family_context),
-    doc_repo: FirestoreDocumentRepository = Depends(get_document_repo),
+    doc_repo: AsyncDocumentRepository = Depends(get_async_document_repo),
 ) -> DocumentResponse:
     """指定ドキュメントの詳細を返す"""
-    record = doc_repo.get(ctx.family_id, document_id)
+    record = await doc_repo.get(ctx.family_id, document_id)
     if record is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Document not found"
@@ -287,21 +376,19 @@ def get_document(
 
 
 @router.get("/{document_id}/detail", response_model=DocumentDetailResponse)
-def get_document_detail(
+async def get_document_detail(
     document_id: str,
     ctx: FamilyContext = Depends(get_family_context),
-    doc_repo: FirestoreDocumentRepository = Depends(get_document_repo),
+    doc_repo: AsyncDocumentRepository = Depends(get_async_document_repo),
 ) -> DocumentDetailResponse:
     """指定ドキュメントの関連イベント・タスクを返す（アコーディオン展開用）"""
-    record = doc_repo.get(ctx.family_id, document_id)
-    if record is None:
+    detail = await doc_repo.get_document_detail(ctx.family_id, document_id)
+    if detail is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Document not found"
         )
 
-    events = doc_repo.list_events_by_document(ctx.family_id, document_id)
-    tasks = doc_repo.list_tasks_by_document(ctx.family_id, document_id)
-    extras_raw = doc_repo.get_document_extras_raw(ctx.family_id, document_id)
+    extras_raw = detail.extras
 
     extras: ExtrasResponse | None = None
     if extras_raw and isinstance(extras_raw, dict):
@@ -339,7 +426,7 @@ def get_document_detail(
                 description=e.description,
                 confidence=e.confidence,
             )
-            for e in events
+            for e in detail.events
         ],
         tasks=[
             TaskResponse(
@@ -350,7 +437,7 @@ def get_document_detail(
                 note=t.note,
                 completed=t.completed,
             )
-            for t in tasks
+            for t in detail.tasks
         ],
         extras=extras,
     )
@@ -360,7 +447,7 @@ def get_document_detail(
 def get_document_url(
     document_id: str,
     ctx: FamilyContext = Depends(get_family_context),
-    doc_repo: FirestoreDocumentRepository = Depends(get_document_repo),
+    doc_repo: DocumentRepository = Depends(get_document_repo),
     storage: GCSBlobStorage = Depends(get_blob_storage),
 ) -> DocumentUrlResponse:
     """アップロード済みファイルの署名付きダウンロード URL を返す（15 分有効）"""
@@ -379,7 +466,7 @@ def get_document_url(
 def delete_document(
     document_id: str,
     ctx: FamilyContext = Depends(get_family_context),
-    doc_repo: FirestoreDocumentRepository = Depends(get_document_repo),
+    doc_repo: DocumentRepository = Depends(get_document_repo),
     storage: GCSBlobStorage = Depends(get_blob_storage),
 ) -> None:
     """ドキュメントと GCS ファイルを削除する"""
@@ -28,8 +28,11 @@ from v2.entrypoints.api.deps import (
     get_family_context,
     get_family_repo,
     get_user_config_repo,
+    member_snapshot_update,
+    require_member,
     require_owner,
 )
+from v2.entrypoints.api.family_context_cache import invalidate_family_context
 from v2.entrypoints.api.usage import ensure_monthly_reset
 
 logger = logging.getLogger(__name__)
@@ -129,7 +132,7 @@ def get_my_family(
 
 @router.get("/members", response_model=list[MemberResponse])
 def list_members(
-    ctx: FamilyContext = Depends(get_family_context),
+    ctx: FamilyContext = Depends(require_member),
     family_repo: FirestoreFamilyRepository = Depends(get_family_repo),
 ) -> list[MemberResponse]:
     """ファミリーメンバー一覧を返す"""
@@ -195,7 +198,7 @@ def join_family(
     2. 有効な招待（pending かつ期限内）であることを確認
     3. 招待 email とログイン email が一致することを確認
     4. 現在のファミリーを離れて新しいファミリーに参加
-    5. users/{uid} の family_id と is_activated を更新
+    5. users/{uid} の family_id と is_activated、メンバースナップショットを更新
 
     注意: get_auth_info を使用（get_family_context は不使用）。
     未アクティベートユーザーが join フローを通じてアクティベートできるようにするため。
@@ -244,19 +247,25 @@ def join_family(
 
     # メンバーとして追加
     user = user_repo.get_user(auth_info.uid)
-    family_repo.add_member(
-        family_id=new_family_id,
-        uid=auth_info.uid,
-        role="member",
-        display_name=auth_info.display_name
+    member = {
+        "role": "member",
+        "display_name": auth_info.display_name
         or user.get("display_name", user.get("email", auth_info.uid)),
-        email=auth_info.email or user.get("email", ""),
-    )
+        "email": auth_info.email or user.get("email", ""),
+    }
+    family_repo.add_member(family_id=new_family_id, uid=auth_info.uid, **member)
 
-    # users/{uid} の family_id と is_activated を更新
+    # users/{uid} の family_id と is_activated、メンバースナップショットを更新
+    # （同じファミリーへの再参加でもロールが古いスナップショットのまま残らないように）
     user_repo.update_user(
-        auth_info.uid, {"family_id": new_family_id, "is_activated": True}
+        auth_info.uid,
+        {
+            "family_id": new_family_id,
+            "is_activated": True,
+            **member_snapshot_update(new_family_id, member),
+        },
     )
+    invalidate_family_context(auth_info.uid)
 
     # ① Custom Claims を設定 — 次回 JWT 取得時にフロントエンドが API 呼び出し不要で
     #    is_activated を確認できるようにする（Cold Start 回避）
@@ -309,6 +318,7 @@ def remove_member(
 
     family_repo.remove_member(ctx.family_id, member_uid)
     user_repo.update_user(member_uid, {"family_id": "", "is_activated": False})
+    invalidate_family_context(member_uid)
 
     # ① Custom Claims をクリア — 削除されたメンバーがキャッシュ済み JWT でアクセスできないようにする
     try:
@@ -14,8 +14,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import PlainTextResponse
 from google.cloud import firestore
 
-from v2.adapters.firestore_repository import FirestoreDocumentRepository
 from v2.adapters.ical_renderer import ICalRenderer
+from v2.domain.ports import DocumentRepository
 from v2.entrypoints.api.deps import get_document_repo, get_ical_renderer
 
 logger = logging.getLogger(__name__)
@@ -25,7 +25,7 @@ router = APIRouter(prefix="/ical", tags=["ical"])
 @router.get("/{token}", response_class=PlainTextResponse)
 def get_ical_feed(
     token: str,
-    doc_repo: FirestoreDocumentRepository = Depends(get_document_repo),
+    doc_repo: DocumentRepository = Depends(get_document_repo),
     renderer: ICalRenderer = Depends(get_ical_renderer),
 ) -> str:
     """
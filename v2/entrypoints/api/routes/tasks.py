@@ -6,11 +6,16 @@ PATCH /api/tasks/{id}             → 200 { completed: true }
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from pydantic import BaseModel
 
-from v2.adapters.firestore_repository import FirestoreDocumentRepository
-from v2.entrypoints.api.deps import FamilyContext, get_document_repo, get_family_context
+from v2.domain.ports import AsyncDocumentRepository
+from v2.entrypoints.api.deps import (
+    FamilyContext,
+    get_async_document_repo,
+    get_family_context,
+)
+from v2.entrypoints.api.json_response import FastJSONResponse
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
@@ -33,40 +38,32 @@ class TaskUpdateResponse(BaseModel):
 
 
 @router.get("", response_model=list[TaskResponse])
-def list_tasks(
+async def list_tasks(
     completed: bool | None = None,
     ctx: FamilyContext = Depends(get_family_context),
-    doc_repo: FirestoreDocumentRepository = Depends(get_document_repo),
-) -> list[TaskResponse]:
+    doc_repo: AsyncDocumentRepository = Depends(get_async_document_repo),
+) -> Response:
     """
     全ドキュメントをまたいだタスク一覧を返す。
 
+    StoredTaskData のフィールドは TaskResponse と同じため、モデルを作らずそのまま直列化する。
+
     クエリパラメータ:
         completed: true/false でフィルター（省略時は全件）
     """
-    tasks = doc_repo.list_tasks(ctx.family_id, completed=completed)
-    return [
-        TaskResponse(
-            id=t.id,
-            title=t.title,
-            due_date=t.due_date,
-            assignee=t.assignee,
-            note=t.note,
-            completed=t.completed,
-        )
-        for t in tasks
-    ]
+    tasks = await doc_repo.list_tasks(ctx.family_id, completed=completed)
+    return FastJSONResponse(tasks)
 
 
 @router.patch("/{task_id}", response_model=TaskUpdateResponse)
-def update_task(
+async def update_task(
     task_id: str,
     body: TaskUpdateRequest,
     ctx: FamilyContext = Depends(get_family_context),
-    doc_repo: FirestoreDocumentRepository = Depends(get_document_repo),
+    doc_repo: AsyncDocumentRepository = Depends(get_async_document_repo),
 ) -> TaskUpdateResponse:
     """タスクの完了状態を更新する"""
-    found = doc_repo.update_task_completed(ctx.family_id, task_id, body.completed)
+    found = await doc_repo.update_task_completed(ctx.family_id, task_id, body.completed)
     if not found:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
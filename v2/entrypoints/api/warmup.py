@@ -0,0 +1,169 @@
+"""起動時ウォームアップとレディネス
+
+コールドスタート直後の最初のリクエストは、Firebase Admin の初期化・ID トークン検証用の
+公開鍵（x509 証明書）取得・Firestore / GCS / Cloud Tasks クライアントの生成を
+すべて直列に負担する。起動直後にこれらを並行して済ませ、終わるまで /health を
+503 にして Cloud Run のスタートアッププローブにトラフィックを待たせる。
+
+各ステップの失敗は警告ログのみで、レディネスは妨げない（初回リクエストで
+従来どおり遅延初期化される）。PREWARM_TIMEOUT_SECONDS を超えた場合も
+完了を待たずにレディにする。所要時間は log_event("startup_warmup") で出力し、
+最小インスタンス数の調整に使う。
+
+PREWARM_ON_STARTUP 未設定時は Cloud Run 上（K_SERVICE あり、LOCAL_MODE なし）でのみ実行する。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import contextlib
+import json
+import logging
+import os
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from fastapi import FastAPI
+
+from v2.analytics import log_event
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmupState:
+    """ウォームアップの進捗（app.state.warmup に保持する）"""
+
+    ready: bool = False
+    duration_ms: int | None = None
+    step_ms: dict[str, int] = field(default_factory=dict)
+    failed: list[str] = field(default_factory=list)
+
+
+def warmup_enabled() -> bool:
+    """PREWARM_ON_STARTUP（未設定なら Cloud Run 上かどうか）でウォームアップの要否を決める"""
+    value = os.environ.get("PREWARM_ON_STARTUP")
+    if value is not None:
+        return value.strip().lower() in ("1", "true", "yes")
+    return bool(os.environ.get("K_SERVICE")) and not os.environ.get("LOCAL_MODE")
+
+
+def _b64url_json(data: dict) -> str:
+    raw = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _dummy_id_token(project_id: str) -> str:
+    """署名以外の事前チェック（kid・alg・aud・iss・sub）を通るダミーの ID トークン"""
+    now = int(time.time())
+    header = {"alg": "RS256", "kid": "warmup", "typ": "JWT"}
+    payload = {
+        "aud": project_id,
+        "iss": f"https://securetoken.google.com/{project_id}",
+        "sub": "warmup",
+        "iat": now,
+        "exp": now + 300,
+    }
+    return f"{_b64url_json(header)}.{_b64url_json(payload)}.c2lnbmF0dXJl"
+
+
+def _prime_firebase_auth() -> None:
+    """Firebase Admin を初期化し、ID トークン検証用の公開鍵を取得してキャッシュに載せる
+
+    公開 API の verify_id_token() にダミーのトークンを渡す。証明書を取得してから
+    署名検証で InvalidIdTokenError になるため、それだけを握りつぶす。証明書の取得に
+    失敗した場合（CertificateFetchError）はそのまま送出し、ステップの失敗として記録する。
+    """
+    import firebase_admin.auth as fb_auth
+
+    from v2.entrypoints.api import deps
+
+    app = deps._get_firebase_app()
+    with contextlib.suppress(fb_auth.InvalidIdTokenError):
+        fb_auth.verify_id_token(_dummy_id_token(app.project_id), app=app)
+
+
+def _warmup_steps(role: str) -> dict[str, Callable[[], object]]:
+    """ロールごとのウォームアップ対象（名前 → 同期の初期化関数）"""
+    from v2.entrypoints.api import deps
+
+    # worker も Firestore を使うため、認証情報の取得と gRPC チャネルの確立を先に済ませる
+    steps: dict[str, Callable[[], object]] = {
+        "gcs": deps.get_blob_storage,
+        "firestore": deps._get_firestore_client,
+    }
+    if role in ("all", "api"):
+        steps.update(
+            {
+                "firebase_auth": _prime_firebase_auth,
+                "firestore_async": deps._get_async_firestore_client,
+                "cloud_tasks": deps.get_task_queue,
+            }
+        )
+    return steps
+
+
+async def _run_step(name: str, fn: Callable[[], object], state: WarmupState) -> None:
+    start = time.monotonic()
+    try:
+        await asyncio.to_thread(fn)
+    except Exception as e:
+        state.failed.append(name)
+        logger.warning("Warm-up step %s failed: %s", name, e)
+    # タイムアウトでキャンセルされたステップは記録しない（pending として扱う）
+    state.step_ms[name] = round((time.monotonic() - start) * 1000)
+
+
+async def run_warmup(role: str, state: WarmupState) -> None:
+    """
+    ウォームアップの各ステップを並行に実行し、終わったら state.ready を立てる。
+
+    Args:
+        role: APP_ROLE（"all" | "api" | "worker"）
+        state: 進捗の書き込み先
+    """
+    timeout = float(os.environ.get("PREWARM_TIMEOUT_SECONDS", "20"))
+    start = time.monotonic()
+    steps = _warmup_steps(role)
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(_run_step(n, fn, state) for n, fn in steps.items())),
+            timeout=timeout,
+        )
+    except TimeoutError:
+        pending = sorted(set(steps) - set(state.step_ms))
+        state.failed.extend(pending)
+        logger.warning("Warm-up timed out after %.1fs: pending=%s", timeout, pending)
+    finally:
+        state.duration_ms = round((time.monotonic() - start) * 1000)
+        state.ready = True
+
+    logger.info("Warm-up finished in %d ms (role=%s)", state.duration_ms, role)
+    log_event(
+        "startup_warmup",
+        role=role,
+        duration_ms=state.duration_ms,
+        step_ms=state.step_ms,
+        failed_steps=state.failed,
+    )
+
+
+def install_warmup(app: FastAPI, role: str) -> None:
+    """
+    app.state.warmup を用意し、有効なら startup でウォームアップを開始する。
+
+    ウォームアップはバックグラウンドタスクとして走らせ、起動（ポートの listen）は待たせない。
+    無効時は最初からレディ。
+    """
+    enabled = warmup_enabled()
+    app.state.warmup = WarmupState(ready=not enabled)
+    if not enabled:
+        return
+
+    async def _start_warmup() -> None:
+        # タスクが GC されないよう app.state に参照を持たせる
+        app.state.warmup_task = asyncio.create_task(run_warmup(role, app.state.warmup))
+
+    app.on_event("startup")(_start_warmup)
@@ -21,25 +21,36 @@ Cloud Tasks から HTTP POST を受け取り、ドキュメント解析を非同
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 
 import firebase_admin
-import vertexai
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from firebase_admin import credentials as fb_creds
 from google.cloud import firestore
 from pydantic import BaseModel
-from vertexai.generative_models import GenerativeModel
 
-from v2.adapters.cloud_storage import GCSBlobStorage
+from v2.adapters.caching_repository import (
+    CachingDocumentRepository,
+    get_document_cache,
+)
 from v2.adapters.firestore_repository import (
     FirestoreDocumentRepository,
     FirestoreFamilyRepository,
     FirestoreUserConfigRepository,
 )
-from v2.adapters.gemini import GeminiDocumentAnalyzer
+from v2.adapters.resilience import CircuitBreaker, LatencyTracker
 from v2.analytics import log_event
+from v2.domain.errors import AnalysisUnavailableError
+from v2.domain.models import AnalysisResult, UserProfile
+from v2.domain.ports import (
+    BlobStorage,
+    DocumentRepository,
+    FamilyRepository,
+    UserConfigRepository,
+)
+from v2.entrypoints.api.deps import get_blob_storage
 from v2.entrypoints.api.worker_auth import verify_worker_token
 from v2.services.document_processor import DocumentProcessor
 
@@ -58,16 +69,77 @@ def _ensure_firebase_init() -> None:
         logger.info("Firebase Admin initialized (worker)")
 
 
+# ヘッジ判定用レイテンシとサーキットブレーカーはリクエストをまたいで共有する
+_latency_tracker: LatencyTracker | None = None
+_circuit_breaker: CircuitBreaker | None = None
+
+
+def _get_latency_tracker() -> LatencyTracker:
+    global _latency_tracker
+    if _latency_tracker is None:
+        _latency_tracker = LatencyTracker()
+    return _latency_tracker
+
+
+def _get_circuit_breaker() -> CircuitBreaker | None:
+    """
+    プロセス共有のサーキットブレーカーを返す。
+
+    GEMINI_CIRCUIT_FAILURE_RATE=0 の場合は無効（None）。
+    """
+    global _circuit_breaker
+    if _circuit_breaker is None:
+        failure_rate = float(os.environ.get("GEMINI_CIRCUIT_FAILURE_RATE", "0.5"))
+        if failure_rate <= 0:
+            return None
+        _circuit_breaker = CircuitBreaker(
+            failure_rate_threshold=failure_rate,
+            window_seconds=float(
+                os.environ.get("GEMINI_CIRCUIT_WINDOW_SECONDS", "120")
+            ),
+            min_calls=int(os.environ.get("GEMINI_CIRCUIT_MIN_CALLS", "5")),
+            open_seconds=float(os.environ.get("GEMINI_CIRCUIT_OPEN_SECONDS", "60")),
+        )
+        logger.info("Gemini circuit breaker enabled: failure_rate=%.2f", failure_rate)
+    return _circuit_breaker
+
+
 def _build_processor() -> DocumentProcessor:
-    """DocumentProcessor を組み立てる"""
+    """
+    DocumentProcessor を組み立てる
+
+    GEMINI_HEDGE_PERCENTILE（例: "95"）を設定すると、直近レイテンシの
+    そのパーセンタイルを超えた呼び出しにヘッジリクエストを送る（未設定で無効）。
+    TEXT_LAYER_MIN_CHARS_PER_PAGE（デフォルト 200、0 で無効）以上の文字を全ページに持つ
+    PDF はバイナリではなくテキストレイヤーを送信する。
+
+    Vertex AI SDK は import だけで数秒かかるため、API のコールドスタートに含めないよう
+    ここで遅延 import する（初回の解析時に1回だけ読み込まれる）。
+    """
+    import vertexai
+    from vertexai.generative_models import GenerativeModel
+
+    from v2.adapters.gemini import GeminiDocumentAnalyzer
+    from v2.adapters.pdf_text_layer import PypdfTextLayerExtractor
+
     project_id = os.environ["PROJECT_ID"]
     location = os.environ.get("VERTEX_AI_LOCATION", "us-central1")
     model_name = os.environ.get("GEMINI_MODEL", "gemini-2.5-pro")
+    hedge_percentile_env = os.environ.get("GEMINI_HEDGE_PERCENTILE", "")
 
     vertexai.init(project=project_id, location=location)
     model = GenerativeModel(model_name)
-    analyzer = GeminiDocumentAnalyzer(model=model)
-    return DocumentProcessor(analyzer=analyzer)
+    analyzer = GeminiDocumentAnalyzer(
+        model=model,
+        hedge_percentile=float(hedge_percentile_env) if hedge_percentile_env else None,
+        latency_tracker=_get_latency_tracker(),
+        circuit_breaker=_get_circuit_breaker(),
+    )
+    return DocumentProcessor(
+        analyzer=analyzer,
+        text_extractor=PypdfTextLayerExtractor(),
+        min_chars_per_page=int(os.environ.get("TEXT_LAYER_MIN_CHARS_PER_PAGE", "200")),
+    )
 
 
 def run_analysis_sync(
@@ -76,12 +148,18 @@ def run_analysis_sync(
     document_id: str,
     storage_path: str,
     mime_type: str,
+    *,
+    doc_repo: DocumentRepository | None = None,
+    family_repo: FamilyRepository | None = None,
+    user_repo: UserConfigRepository | None = None,
+    blob_storage: BlobStorage | None = None,
+    processor: DocumentProcessor | None = None,
 ) -> None:
     """
     ドキュメント解析のコアロジック。
 
-    Cloud Tasks HTTP ハンドラーとローカル開発の BackgroundTasks の両方から
-    呼び出される共通実装。
+    ローカル開発の BackgroundTasks とベンチマークから呼び出される同期実装。
+    Cloud Tasks HTTP ハンドラーは非同期版の run_analysis_async() を使う。
 
     Args:
         uid: アップロードした個人の Firebase Auth UID（通知送信に使用）
@@ -89,78 +167,251 @@ def run_analysis_sync(
         document_id: ドキュメント ID
         storage_path: GCS 上のファイルパス
         mime_type: MIME タイプ
+        doc_repo, family_repo, user_repo, blob_storage, processor:
+            依存の差し替え用（ベンチマーク・テストで in-memory 実装等を渡す）。
+            省略時は Firestore / GCS / Gemini の実装を組み立てる
+
+    Raises:
+        AnalysisUnavailableError: サーキットブレーカーが open の場合。
+            ドキュメントは pending のまま残り、呼び出し元の再試行で処理される
     """
-    _ensure_firebase_init()
+    _check_circuit(family_id, document_id)
     logger.info(
         "Analysis started: family_id=%s, uid=%s, doc_id=%s",
         family_id,
         uid,
         document_id,
     )
-
-    db = firestore.Client()
-    doc_repo = FirestoreDocumentRepository(db)
-    family_repo = FirestoreFamilyRepository(db)
-    user_repo = FirestoreUserConfigRepository(db)
-    blob_storage = GCSBlobStorage(bucket_name=os.environ["GCS_BUCKET_NAME"])
+    doc_repo, family_repo, user_repo, blob_storage = _resolve_dependencies(
+        doc_repo, family_repo, user_repo, blob_storage
+    )
 
     try:
         doc_repo.update_status(family_id, document_id, "processing")
+        content, profiles = _load_inputs(
+            family_id, storage_path, family_repo, blob_storage
+        )
+        if processor is None:
+            processor = _build_processor()
+        result = processor.process(content, mime_type, profiles)
+        _complete_analysis(
+            uid, family_id, document_id, mime_type, content, result, doc_repo, user_repo
+        )
+    except AnalysisUnavailableError as e:
+        _defer_analysis(uid, family_id, document_id, e, doc_repo)
+        raise
+    except Exception as e:
+        _fail_analysis(uid, family_id, document_id, e, doc_repo)
+        raise
 
-        content = blob_storage.download(storage_path)
-        logger.info("Downloaded: path=%s, size=%d bytes", storage_path, len(content))
 
-        # ファミリーのプロファイルを取得して Gemini に渡す
-        user_profiles = family_repo.list_profiles(family_id)
-        profiles = {p.id: p for p in user_profiles}
+async def run_analysis_async(
+    uid: str,
+    family_id: str,
+    document_id: str,
+    storage_path: str,
+    mime_type: str,
+    *,
+    doc_repo: DocumentRepository | None = None,
+    family_repo: FamilyRepository | None = None,
+    user_repo: UserConfigRepository | None = None,
+    blob_storage: BlobStorage | None = None,
+    processor: DocumentProcessor | None = None,
+) -> None:
+    """
+    run_analysis_sync() の非同期版（Cloud Tasks HTTP ハンドラーから呼び出す）。
 
-        processor = _build_processor()
-        result = processor.process(content, mime_type, profiles)
-        analysis = result.analysis
+    数十秒かかる Gemini の応答待ちはイベントループ上で行うため、
+    1プロセスで多数の解析を同時に進められる。
+    Firestore / GCS の同期 I/O は asyncio.to_thread で実行する。
 
-        doc_repo.save_analysis(family_id, document_id, analysis)
-        logger.info(
-            "Analysis saved: family_id=%s, doc_id=%s, category=%s",
+    引数・例外は run_analysis_sync() と同じ。
+    """
+    _check_circuit(family_id, document_id)
+    logger.info(
+        "Analysis started (async): family_id=%s, uid=%s, doc_id=%s",
+        family_id,
+        uid,
+        document_id,
+    )
+    doc_repo, family_repo, user_repo, blob_storage = await asyncio.to_thread(
+        _resolve_dependencies, doc_repo, family_repo, user_repo, blob_storage
+    )
+
+    try:
+        await asyncio.to_thread(
+            doc_repo.update_status, family_id, document_id, "processing"
+        )
+        content, profiles = await asyncio.to_thread(
+            _load_inputs, family_id, storage_path, family_repo, blob_storage
+        )
+        if processor is None:
+            processor = await asyncio.to_thread(_build_processor)
+        result = await processor.process_async(content, mime_type, profiles)
+        await asyncio.to_thread(
+            _complete_analysis,
+            uid,
             family_id,
             document_id,
-            analysis.category.value,
+            mime_type,
+            content,
+            result,
+            doc_repo,
+            user_repo,
         )
-
-        tu = result.token_usage
-        log_event(
-            "document_analysis_completed",
-            family_id=family_id,
-            uid=uid,
-            document_id=document_id,
-            file_size=len(content),
-            mime_type=mime_type,
-            category=analysis.category.value,
-            events_count=len(analysis.events),
-            tasks_count=len(analysis.tasks),
-            prompt_tokens=tu.prompt_tokens if tu else None,
-            candidates_tokens=tu.candidates_tokens if tu else None,
-            total_tokens=tu.total_tokens if tu else None,
+    except AnalysisUnavailableError as e:
+        await asyncio.to_thread(
+            _defer_analysis, uid, family_id, document_id, e, doc_repo
         )
-
-        # 通知はアップロードした個人の設定に従って送信
-        _try_send_notification(uid, family_id, document_id, analysis, user_repo, db)
-
+        raise
     except Exception as e:
-        logger.exception(
-            "Worker failed: family_id=%s, doc_id=%s", family_id, document_id
-        )
-        error_msg = str(e)[:200]
-        doc_repo.update_status(family_id, document_id, "error", error_message=error_msg)
-        log_event(
-            "document_analysis_failed",
-            family_id=family_id,
-            uid=uid,
-            document_id=document_id,
-            error=error_msg,
+        await asyncio.to_thread(
+            _fail_analysis, uid, family_id, document_id, e, doc_repo
         )
         raise
 
 
+def _check_circuit(family_id: str, document_id: str) -> None:
+    """ブレーカー open 中はダウンロード等の I/O 前に即時失敗させる"""
+    breaker = _get_circuit_breaker()
+    if breaker is not None and not breaker.allows_call():
+        logger.warning(
+            "Analysis deferred (circuit open): family_id=%s, doc_id=%s",
+            family_id,
+            document_id,
+        )
+        raise AnalysisUnavailableError("Circuit breaker is open")
+
+
+def _resolve_dependencies(
+    doc_repo: DocumentRepository | None,
+    family_repo: FamilyRepository | None,
+    user_repo: UserConfigRepository | None,
+    blob_storage: BlobStorage | None,
+) -> tuple[DocumentRepository, FamilyRepository, UserConfigRepository, BlobStorage]:
+    """差し替えられていない依存を Firestore / GCS 実装で補う"""
+    if doc_repo is None or family_repo is None or user_repo is None:
+        _ensure_firebase_init()
+        db = firestore.Client()
+        if doc_repo is None:
+            doc_repo = FirestoreDocumentRepository(db)
+            # API と同じプロセスで動く場合、解析結果の保存で一覧キャッシュを無効化する
+            cache = get_document_cache()
+            if cache is not None:
+                doc_repo = CachingDocumentRepository(doc_repo, cache)
+        family_repo = family_repo or FirestoreFamilyRepository(db)
+        user_repo = user_repo or FirestoreUserConfigRepository(db)
+    if blob_storage is None:
+        # API と同じプロセスの storage.Client（コネクションプール）を共有する
+        blob_storage = get_blob_storage()
+    return doc_repo, family_repo, user_repo, blob_storage
+
+
+def _load_inputs(
+    family_id: str,
+    storage_path: str,
+    family_repo: FamilyRepository,
+    blob_storage: BlobStorage,
+) -> tuple[bytes, dict[str, UserProfile]]:
+    """解析対象のファイルとファミリーのプロファイル（Gemini に渡す）を取得する"""
+    content = blob_storage.download(storage_path)
+    logger.info("Downloaded: path=%s, size=%d bytes", storage_path, len(content))
+
+    user_profiles = family_repo.list_profiles(family_id)
+    return content, {p.id: p for p in user_profiles}
+
+
+def _complete_analysis(
+    uid: str,
+    family_id: str,
+    document_id: str,
+    mime_type: str,
+    content: bytes,
+    result: AnalysisResult,
+    doc_repo: DocumentRepository,
+    user_repo: UserConfigRepository,
+) -> None:
+    """解析結果を保存し、分析イベントと通知を送る"""
+    analysis = result.analysis
+    doc_repo.save_analysis(family_id, document_id, analysis)
+    logger.info(
+        "Analysis saved: family_id=%s, doc_id=%s, category=%s",
+        family_id,
+        document_id,
+        analysis.category.value,
+    )
+
+    tu = result.token_usage
+    log_event(
+        "document_analysis_completed",
+        family_id=family_id,
+        uid=uid,
+        document_id=document_id,
+        file_size=len(content),
+        mime_type=mime_type,
+        category=analysis.category.value,
+        events_count=len(analysis.events),
+        tasks_count=len(analysis.tasks),
+        prompt_tokens=tu.prompt_tokens if tu else None,
+        candidates_tokens=tu.candidates_tokens if tu else None,
+        total_tokens=tu.total_tokens if tu else None,
+        input_mode=tu.input_mode if tu else None,
+    )
+
+    # 通知はアップロードした個人の設定に従って送信
+    _try_send_notification(uid, family_id, document_id, analysis, user_repo, doc_repo)
+
+
+def _defer_analysis(
+    uid: str,
+    family_id: str,
+    document_id: str,
+    error: AnalysisUnavailableError,
+    doc_repo: DocumentRepository,
+) -> None:
+    """解析基盤の障害: エラーにせず pending に戻し、Cloud Tasks の再試行に任せる"""
+    logger.warning(
+        "Analysis deferred: family_id=%s, doc_id=%s, reason=%s",
+        family_id,
+        document_id,
+        error,
+    )
+    doc_repo.update_status(family_id, document_id, "pending")
+    log_event(
+        "document_analysis_deferred",
+        family_id=family_id,
+        uid=uid,
+        document_id=document_id,
+        reason=str(error)[:200],
+    )
+
+
+def _fail_analysis(
+    uid: str,
+    family_id: str,
+    document_id: str,
+    error: Exception,
+    doc_repo: DocumentRepository,
+) -> None:
+    """ドキュメントをエラー状態にして失敗イベントを記録する"""
+    # to_thread 経由で呼ばれる場合に備え、トレースバックは例外オブジェクトから出力する
+    logger.error(
+        "Worker failed: family_id=%s, doc_id=%s",
+        family_id,
+        document_id,
+        exc_info=error,
+    )
+    error_msg = str(error)[:200]
+    doc_repo.update_status(family_id, document_id, "error", error_message=error_msg)
+    log_event(
+        "document_analysis_failed",
+        family_id=family_id,
+        uid=uid,
+        document_id=document_id,
+        error=error_msg,
+    )
+
+
 # ── Worker ルーター（app.py で /worker プレフィックスにマウント） ───────────────
 
 router = APIRouter(dependencies=[Depends(verify_worker_token)])
@@ -175,14 +426,16 @@ class AnalyzePayload(BaseModel):
 
 
 @router.post("/analyze", status_code=status.HTTP_200_OK)
-def analyze_document(payload: AnalyzePayload) -> dict:
+async def analyze_document(payload: AnalyzePayload) -> dict:
     """
     Cloud Tasks から呼び出されるドキュメント解析エンドポイント。
 
     OIDC トークン検証は verify_worker_token Depends によりアプリレベルで実施済み。
+    サーキットブレーカー open 中は 503 を返し、Cloud Tasks のバックオフ再試行に任せる。
+    解析はイベントループ上で非同期に行い、Gemini の応答待ちでスレッドを占有しない。
     """
     try:
-        run_analysis_sync(
+        await run_analysis_async(
             payload.uid,
             payload.family_id,
             payload.document_id,
@@ -190,6 +443,14 @@ def analyze_document(payload: AnalyzePayload) -> dict:
             payload.mime_type,
         )
         return {"status": "completed", "document_id": payload.document_id}
+    except AnalysisUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Analysis deferred: {e}",
+            headers={
+                "Retry-After": os.environ.get("GEMINI_CIRCUIT_OPEN_SECONDS", "60")
+            },
+        ) from e
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -427,8 +688,8 @@ def _try_send_notification(
     family_id: str,
     document_id: str,
     analysis,
-    user_repo: FirestoreUserConfigRepository,
-    db: firestore.Client,
+    user_repo: UserConfigRepository,
+    doc_repo: DocumentRepository,
 ) -> None:
     """
     通知設定に基づいて全端末の WebPush 通知を試みる。
@@ -463,16 +724,8 @@ def _try_send_notification(
                 claims_email=vapid_email,
             )
         )
-        doc_snap = (
-            db.collection("families")
-            .document(family_id)
-            .collection("documents")
-            .document(document_id)
-            .get()
-        )
-        original_filename = (
-            doc_snap.get("original_filename") if doc_snap.exists else None
-        ) or "document"
+        record = doc_repo.get(family_id, document_id)
+        original_filename = (record.original_filename if record else None) or "document"
         filename = analysis.archive_filename or original_filename
 
         for field_key, subscription_data in all_subs:
@@ -498,9 +751,7 @@ def _try_send_notification(
                         uid,
                         field_key,
                     )
-                    db.collection("users").document(uid).update(
-                        {field_key: DELETE_FIELD}
-                    )
+                    user_repo.update_user(uid, {field_key: DELETE_FIELD})
                 else:
                     raise
 
@@ -9,12 +9,18 @@ Cloud Run / Cloud Logging 環境ではJSON形式、ローカルではテキス
 環境変数:
     LOG_LEVEL: ログレベル (DEBUG, INFO, WARNING, ERROR, CRITICAL) デフォルト: INFO
     K_SERVICE: Cloud Run Service 環境判定（自動設定される）
+    LOG_QUEUE_MAX_RECORDS: Cloud Run 環境で出力待ちにできるログレコード数の上限
+        デフォルト: 10000（0 で従来どおりログを出した処理の中で同期的に書き込む）
 """
 
+import contextlib
 import json
 import logging
 import os
+import queue
 import sys
+import threading
+from typing import TextIO
 
 
 class CloudLoggingFormatter(logging.Formatter):
@@ -47,11 +53,135 @@ class CloudLoggingFormatter(logging.Formatter):
         return json.dumps(log_entry, ensure_ascii=False)
 
 
+class BatchingStreamHandler(logging.StreamHandler):
+    """ログの整形と書き込みをバックグラウンドスレッドでまとめて行う StreamHandler
+
+    emit() はレコードを有界キューに積むだけで、JSON 化（フォーマッタ）と stream への
+    書き込みはバックグラウンドスレッドが行う。キューに溜まっているレコードは
+    最大 batch_size 件を1回の write() / flush() でまとめて出力する。
+    アクセスログなどを出すリクエスト処理（イベントループ）はログ I/O を待たない。
+
+    キューが満杯のときはレコードを捨てて dropped に数え、次の書き込み時に
+    捨てた件数を WARNING として1行出力する。
+    プロセス終了時は logging.shutdown() が flush() / close() を呼び、残りを書き出す。
+    """
+
+    def __init__(
+        self,
+        stream: TextIO | None = None,
+        max_records: int = 10000,
+        batch_size: int = 256,
+    ) -> None:
+        """
+        Args:
+            stream: 出力先（省略時は sys.stderr。StreamHandler と同じ）
+            max_records: 出力待ちにできるレコード数の上限
+            batch_size: 1回の書き込みでまとめる最大レコード数
+        """
+        super().__init__(stream)
+        self._queue: queue.Queue[logging.LogRecord | None] = queue.Queue(max_records)
+        self._batch_size = batch_size
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            # 引数はログを出した時点の値で確定させる（整形は別スレッドで後から行う）
+            record.msg = record.getMessage()
+            record.args = None
+        except Exception:
+            self.handleError(record)
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1  # emit() は Handler のロック内で呼ばれる
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """キューに積まれたレコードが書き出されるまで最大 timeout 秒待つ"""
+        if not self._thread.is_alive():
+            return
+        with self._queue.all_tasks_done:
+            if self._queue.unfinished_tasks:
+                self._queue.all_tasks_done.wait_for(
+                    lambda: not self._queue.unfinished_tasks, timeout=timeout
+                )
+
+    def close(self) -> None:
+        """残りを書き出してからバックグラウンドスレッドを止める"""
+        if self._thread.is_alive():
+            self.flush()
+            with contextlib.suppress(queue.Full):
+                self._queue.put(None, timeout=1.0)
+            self._thread.join(timeout=1.0)
+        super().close()
+
+    def stats(self) -> dict[str, int]:
+        """出力待ちのレコード数と、キュー満杯で捨てた累計件数を返す"""
+        return {"queued": self._queue.qsize(), "dropped": self.dropped}
+
+    def _run(self) -> None:
+        while True:
+            record = self._queue.get()
+            batch = [record]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            records = [r for r in batch if r is not None]
+            if records:
+                self._write(records)
+            for _ in batch:
+                self._queue.task_done()
+            if len(records) < len(batch):
+                return
+
+    def _write(self, records: list[logging.LogRecord]) -> None:
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.format(record))
+            except Exception:
+                self.handleError(record)
+        dropped = self.dropped - self._reported_dropped
+        if dropped:
+            self._reported_dropped += dropped
+            lines.append(self.format(self._dropped_record(dropped)))
+        if not lines:
+            return
+        try:
+            self.stream.write(self.terminator.join(lines) + self.terminator)
+            self.stream.flush()
+        except Exception:
+            self.handleError(records[-1])
+
+    @staticmethod
+    def _dropped_record(dropped: int) -> logging.LogRecord:
+        record = logging.LogRecord(
+            name=__name__,
+            level=logging.WARNING,
+            pathname=__file__,
+            lineno=0,
+            msg="Dropped %d log records (log queue full)",
+            args=(dropped,),
+            exc_info=None,
+        )
+        record.extra_fields = {"dropped_log_records": dropped}
+        return record
+
+
 def setup_logging() -> None:
     """ログ設定を初期化する
 
     Cloud Run 環境（K_SERVICE または CLOUD_RUN_JOB 環境変数が存在する場合）では
     Cloud Logging 互換の JSON フォーマットを使用し、ローカルではテキスト形式を使用する。
+    Cloud Run 環境では BatchingStreamHandler で JSON 化と stdout への書き込みを
+    バックグラウンドスレッドに回す。
     """
     log_level = os.getenv("LOG_LEVEL", "INFO").upper()
 
@@ -61,7 +191,13 @@ def setup_logging() -> None:
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, log_level, logging.INFO))
 
-    handler = logging.StreamHandler(stream=sys.stdout)
+    max_records = int(os.getenv("LOG_QUEUE_MAX_RECORDS", "10000"))
+    if is_cloud and max_records > 0:
+        handler: logging.StreamHandler = BatchingStreamHandler(
+            stream=sys.stdout, max_records=max_records
+        )
+    else:
+        handler = logging.StreamHandler(stream=sys.stdout)
     if is_cloud:
         handler.setFormatter(CloudLoggingFormatter())
     else:
@@ -72,5 +208,8 @@ def setup_logging() -> None:
             )
         )
 
+    for old in root_logger.handlers:
+        if isinstance(old, BatchingStreamHandler):
+            old.close()  # 書き込みスレッドを止める
     root_logger.handlers.clear()
     root_logger.addHandler(handler)
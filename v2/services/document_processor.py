@@ -3,17 +3,30 @@
 設計方針:
 - ストレージ操作（GCS）はここでは行わない
 - 「content → DocumentAnalysis」の変換のみに責務を絞る
+- デジタル生成 PDF はテキストレイヤーを優先して送り、スキャン PDF はバイナリで送る
 """
 
 from __future__ import annotations
 
+import asyncio
+import dataclasses
 import logging
+import re
 
-from v2.domain.models import AnalysisResult, UserProfile
-from v2.domain.ports import DocumentAnalyzer
+from v2.domain.models import AnalysisResult, DocumentInput, UserProfile
+from v2.domain.ports import DocumentAnalyzer, TextLayerExtractor
 
 logger = logging.getLogger(__name__)
 
+_TEXT_MIME_TYPE = "text/plain"
+_TEXT_LAYER_HEADER = (
+    "以下は PDF 文書から抽出したテキストです（[page N] はページ区切り）。\n"
+)
+# 文字化け判定: 置換文字・制御文字がこの割合を超えるページはテキストレイヤーを信用しない
+_MAX_GARBLED_RATIO = 0.05
+_HORIZONTAL_SPACES = re.compile(r"[ \t\u3000]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
 
 class DocumentProcessor:
     """
@@ -24,12 +37,22 @@ class DocumentProcessor:
     バッチ・API ワーカーの両方から共通利用できる。
     """
 
-    def __init__(self, analyzer: DocumentAnalyzer) -> None:
+    def __init__(
+        self,
+        analyzer: DocumentAnalyzer,
+        text_extractor: TextLayerExtractor | None = None,
+        min_chars_per_page: int = 200,
+    ) -> None:
         """
         Args:
             analyzer: 文書解析器（GeminiDocumentAnalyzer 等）
+            text_extractor: テキストレイヤー抽出器（省略時は常にバイナリを送信）
+            min_chars_per_page: テキストレイヤーを採用するために全ページで必要な
+                最小文字数（空白除く）。1ページでも下回ればスキャンとみなしバイナリを送る
         """
         self._analyzer = analyzer
+        self._text_extractor = text_extractor
+        self._min_chars_per_page = min_chars_per_page
 
     def process(
         self,
@@ -60,15 +83,171 @@ class DocumentProcessor:
             len(profiles),
         )
 
+        input_mode = None
+        try:
+            send_content, send_mime_type, input_mode = self._prepare_input(
+                content, mime_type
+            )
+            result = self._analyzer.analyze(
+                send_content, send_mime_type, profiles, rules
+            )
+            result = _with_input_mode(result, input_mode)
+            logger.info(
+                "Processing complete: category=%s, events=%d, tasks=%d, input_mode=%s",
+                result.analysis.category.value,
+                len(result.analysis.events),
+                len(result.analysis.tasks),
+                input_mode,
+            )
+            return result
+        except Exception:
+            # mime_type は元ファイルのもの（テキストレイヤー送信時も text/plain にしない）
+            logger.exception(
+                "Document processing failed: mime_type=%s, input_mode=%s",
+                mime_type,
+                input_mode,
+            )
+            raise
+
+    async def process_async(
+        self,
+        content: bytes,
+        mime_type: str,
+        profiles: dict[str, UserProfile],
+        rules: list | None = None,
+    ) -> AnalysisResult:
+        """
+        process() の非同期版。
+
+        Gemini の応答待ちはイベントループ上で行い（analyze_async）、
+        CPU を使うテキストレイヤー抽出はスレッドプールに逃がす。
+        """
+        logger.info(
+            "Processing document (async): mime_type=%s, size=%d bytes, profiles=%d",
+            mime_type,
+            len(content),
+            len(profiles),
+        )
+
+        input_mode = None
         try:
-            result = self._analyzer.analyze(content, mime_type, profiles, rules)
+            send_content, send_mime_type, input_mode = await asyncio.to_thread(
+                self._prepare_input, content, mime_type
+            )
+            result = await self._analyzer.analyze_async(
+                send_content, send_mime_type, profiles, rules
+            )
+            result = _with_input_mode(result, input_mode)
             logger.info(
-                "Processing complete: category=%s, events=%d, tasks=%d",
+                "Processing complete: category=%s, events=%d, tasks=%d, input_mode=%s",
                 result.analysis.category.value,
                 len(result.analysis.events),
                 len(result.analysis.tasks),
+                input_mode,
             )
             return result
         except Exception:
-            logger.exception("Document processing failed: mime_type=%s", mime_type)
+            logger.exception(
+                "Document processing failed: mime_type=%s, input_mode=%s",
+                mime_type,
+                input_mode,
+            )
+            raise
+
+    def process_packed(
+        self,
+        documents: list[DocumentInput],
+        profiles: dict[str, UserProfile],
+        rules: list | None = None,
+    ) -> list[AnalysisResult]:
+        """
+        複数のファイルをまとめて解析する（バックフィル・一括アップロード向け）。
+
+        同一ファミリー（同じ profiles / rules）の文書のみを渡すこと。
+        各文書には process() と同じテキストレイヤー判定を適用する。
+
+        Returns:
+            documents と同じ順序の AnalysisResult リスト
+
+        Raises:
+            Exception: 解析に失敗した場合（ログ記録後に再送出）
+        """
+        logger.info(
+            "Processing packed documents: count=%d, total_size=%d bytes, profiles=%d",
+            len(documents),
+            sum(len(d.content) for d in documents),
+            len(profiles),
+        )
+
+        try:
+            prepared = [self._prepare_input(d.content, d.mime_type) for d in documents]
+            results = self._analyzer.analyze_packed(
+                [DocumentInput(content=c, mime_type=m) for c, m, _ in prepared],
+                profiles,
+                rules,
+            )
+            results = [
+                _with_input_mode(result, input_mode)
+                for result, (_, _, input_mode) in zip(results, prepared, strict=True)
+            ]
+            logger.info("Packed processing complete: count=%d", len(results))
+            return results
+        except Exception:
+            logger.exception("Packed processing failed: count=%d", len(documents))
             raise
+
+    def _prepare_input(self, content: bytes, mime_type: str) -> tuple[bytes, str, str]:
+        """送信する内容・MIMEタイプ・入力モードを決める"""
+        text = self._extract_text_layer(content, mime_type)
+        if text is None:
+            return content, mime_type, "binary"
+        encoded = text.encode("utf-8")
+        logger.info(
+            "Using text layer: pdf_size=%d bytes, text_size=%d bytes",
+            len(content),
+            len(encoded),
+        )
+        return encoded, _TEXT_MIME_TYPE, "text_layer"
+
+    def _extract_text_layer(self, content: bytes, mime_type: str) -> str | None:
+        """
+        十分な品質のテキストレイヤーがあればプロンプト用に整形して返す。
+
+        全ページが min_chars_per_page 以上の文字を持ち、文字化けしていない場合のみ採用する。
+        スキャンページが1枚でも含まれる場合は None（バイナリ送信にフォールバック）。
+        """
+        if self._text_extractor is None or self._min_chars_per_page <= 0:
+            return None
+
+        pages = self._text_extractor.extract_pages(content, mime_type)
+        if not pages:
+            return None
+
+        for page_text in pages:
+            visible = [c for c in page_text if not c.isspace()]
+            if len(visible) < self._min_chars_per_page:
+                return None
+            garbled = sum(1 for c in visible if c == "\ufffd" or ord(c) < 0x20)
+            if garbled / len(visible) > _MAX_GARBLED_RATIO:
+                return None
+
+        sections = [
+            f"[page {i}]\n{_compact(page_text)}" for i, page_text in enumerate(pages, 1)
+        ]
+        return _TEXT_LAYER_HEADER + "\n\n".join(sections)
+
+
+def _with_input_mode(result: AnalysisResult, input_mode: str) -> AnalysisResult:
+    """トークン使用量に入力モードを記録する"""
+    if result.token_usage is None or result.token_usage.input_mode == input_mode:
+        return result
+    return dataclasses.replace(
+        result,
+        token_usage=dataclasses.replace(result.token_usage, input_mode=input_mode),
+    )
+
+
+def _compact(text: str) -> str:
+    """連続する空白・空行を詰めてトークン数を抑える"""
+    text = _HORIZONTAL_SPACES.sub(" ", text)
+    return _BLANK_LINES.sub("\n\n", text).strip()